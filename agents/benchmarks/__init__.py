@@ -0,0 +1,12 @@
+"""
+RAG 파이프라인 벤치마크 스크립트 모음
+
+agents/ 디렉터리에서 모듈로 실행합니다.
+    python -m benchmarks.bench_pdf_extraction
+    python -m benchmarks.bench_vector_tiers
+    python -m benchmarks.bench_ann_index
+    python -m benchmarks.bench_embedding_providers
+    python -m benchmarks.bench_dedup
+    python -m benchmarks.bench_hierarchical
+    python -m benchmarks.bench_section_router
+"""
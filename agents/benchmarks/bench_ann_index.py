@@ -0,0 +1,120 @@
+"""
+ANN 인덱스 벤치마크: flat vs HNSW vs IVF (지연 / recall@k)
+
+저장소 PDF의 텍스트로 합성 코퍼스를 만듭니다: 연속 토큰 구간을 무작위로 잘라 이어 붙이고
+일부 토큰을 치환해 대형 공용 코퍼스를 흉내 냅니다. 임베딩 API 없이 돌릴 수 있도록
+토큰 + 한글 음절 bigram 해싱 벡터로 임베딩하고, flat 전수 검색 결과를 기준으로
+HNSW(efSearch) / IVF(nprobe) 설정별 구축 시간, 질의 지연, recall@k를 비교합니다.
+
+실행 (agents/ 디렉터리에서):
+    python -m benchmarks.bench_ann_index
+    python -m benchmarks.bench_ann_index --num-docs 200000 --dim 384
+"""
+
+import argparse
+import re
+import time
+import zlib
+
+import numpy as np
+
+from benchmarks.bench_pdf_extraction import default_pdfs
+from benchmarks.bench_vector_tiers import recall_at_k
+from jm.utils import index_factory
+from jm.utils.index_factory import build_index, factory_string, tune_index
+from jm.utils.ingestion import load_pdf_pages
+from jm.utils.vector_tiers import normalize
+
+_TOKEN = re.compile(r"[가-힣]+|[A-Za-z]+|\d+(?:[.,]\d+)*")
+
+
+def repo_tokens() -> list:
+    """저장소 PDF 전체 텍스트의 토큰 리스트"""
+    tokens = []
+    for pdf in default_pdfs():
+        for page in load_pdf_pages(pdf, workers=1):
+            tokens.extend(_TOKEN.findall(page.page_content))
+    return tokens
+
+
+def synthetic_docs(tokens: list, num_docs: int, window: int = 40, noise: float = 0.2, seed: int = 0) -> list:
+    """원문 토큰 구간 두 개를 이어 붙이고 noise 비율만큼 무작위 토큰으로 치환한 합성 문서"""
+    rng = np.random.default_rng(seed)
+    tokens = np.asarray(tokens, dtype=object)
+    docs = []
+    for _ in range(num_docs):
+        starts = rng.integers(0, len(tokens) - window, 2)
+        doc = np.concatenate([tokens[s:s + window // 2] for s in starts])
+        mask = rng.random(len(doc)) < noise
+        doc[mask] = tokens[rng.integers(0, len(tokens), mask.sum())]
+        docs.append(" ".join(doc))
+    return docs
+
+
+def hashing_embed(texts: list, dim: int) -> np.ndarray:
+    """토큰 + 한글 음절 bigram 해싱 임베딩 (정규화)"""
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token in _TOKEN.findall(text):
+            features = [token] + [token[i:i + 2] for i in range(len(token) - 1)]
+            for feature in features:
+                h = zlib.crc32(feature.encode("utf-8"))
+                vectors[row, h % dim] += 1.0 if h & 0x80000000 else -1.0
+    return normalize(vectors)
+
+
+def timed_search(index, queries: np.ndarray, k: int):
+    started = time.perf_counter()
+    _, ids = index.search(queries, k)
+    return (time.perf_counter() - started) * 1000 / len(queries), ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ANN 인덱스 지연/recall 벤치마크")
+    parser.add_argument("--num-docs", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--ef-search", type=int, nargs="*", default=[16, 64, 256])
+    parser.add_argument("--nprobe", type=int, nargs="*", default=[4, 16, 64])
+    args = parser.parse_args()
+
+    tokens = repo_tokens()
+    if len(tokens) < 100:
+        raise SystemExit("저장소 PDF에서 토큰을 충분히 추출하지 못했습니다")
+
+    docs = synthetic_docs(tokens, args.num_docs)
+    vectors = hashing_embed(docs, args.dim)
+    # 질의: 코퍼스 문서를 다시 치환한 변형 (같은 내용을 다르게 묻는 질문처럼)
+    rng = np.random.default_rng(1)
+    query_docs = [docs[i] for i in rng.integers(0, len(docs), args.queries)]
+    queries = hashing_embed(synthetic_docs(" ".join(query_docs).split(), args.queries, seed=2), args.dim)
+
+    print(f"📊 합성 코퍼스 {len(docs)}개 (원문 토큰 {len(tokens)}개), {args.dim}차원, 질의 {args.queries}개, k={args.k}")
+    print(f"\n{'index':<22}{'build s':>9}{'ms/query':>10}{'recall@k':>10}")
+
+    started = time.perf_counter()
+    flat = build_index(vectors, "Flat")
+    build_sec = time.perf_counter() - started
+    ms, truth = timed_search(flat, queries, args.k)
+    print(f"{'Flat':<22}{build_sec:>9.2f}{ms:>10.3f}{1.0:>10.3f}")
+
+    for ann, knob, values in (("hnsw", "ef_search", args.ef_search), ("ivf", "nprobe", args.nprobe)):
+        factory = factory_string(len(vectors), args.dim, ann)
+        started = time.perf_counter()
+        index = build_index(vectors, factory)
+        build_sec = time.perf_counter() - started
+        for value in values:
+            tune_index(index, **{knob: value})
+            ms, found = timed_search(index, queries, args.k)
+            label = f"{factory} {knob}={value}"
+            print(f"{label:<22}{build_sec:>9.2f}{ms:>10.3f}{recall_at_k(truth, found, args.k):>10.3f}")
+
+    print(
+        f"\n기본값: flat ≤ {index_factory.RAG_ANN_FLAT_MAX}개 < hnsw ≤ {index_factory.RAG_ANN_HNSW_MAX}개 < ivf, "
+        f"efSearch={index_factory.RAG_HNSW_EF_SEARCH}, nprobe={index_factory.RAG_IVF_NPROBE}"
+    )
+
+
+if __name__ == "__main__":
+    main()
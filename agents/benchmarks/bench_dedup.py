@@ -0,0 +1,78 @@
+"""
+근사 중복 제거 벤치마크: 인덱스 크기 / 검색 지연 / 상위 k 중복
+
+저장소 샘플 PDF를 여러 번 이어 붙여 같은 슬라이드·면책 조항이 반복되는 대형 자료를 만든 뒤,
+setup_rag_pipeline을 dedup 켜기/끄기로 구축해 청크 수, 인덱스 크기, 질의당 검색 지연,
+상위 k개 결과 중 서로 다른 내용의 비율을 비교합니다.
+임베딩 API 없이 돌 수 있도록 해싱 임베딩을 사용합니다.
+
+실행 (agents/ 디렉터리에서):
+    python -m benchmarks.bench_dedup
+    python -m benchmarks.bench_dedup --multiply 20 --repeat 50
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import faiss
+
+from benchmarks.bench_pdf_extraction import build_large_pdf, default_pdfs
+from jm.prompts.bessemer_questions import get_bessemer_questions
+from jm.utils.dedup import simhash
+from jm.utils.rag_tools import setup_rag_pipeline
+
+
+def index_bytes(retriever) -> int:
+    return len(faiss.serialize_index(retriever.vectorstore.index))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="근사 중복 제거 벤치마크")
+    parser.add_argument("--pdf", nargs="*", default=None, help="원본 PDF (기본값: 저장소 샘플 PDF)")
+    parser.add_argument("--multiply", type=int, default=10, help="샘플 PDF 반복 횟수")
+    parser.add_argument("--repeat", type=int, default=20, help="질의 반복 횟수")
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    queries = [q["question"] for q in get_bessemer_questions()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "large.pdf")
+        num_pages = build_large_pdf(args.pdf or default_pdfs(), args.multiply, pdf_path)
+        print(f"📊 {num_pages}페이지 (샘플 PDF {args.multiply}회 반복), 질의 {len(queries)}개 × {args.repeat}회")
+
+        rows = {}
+        for dedup in (False, True):
+            retriever = setup_rag_pipeline(
+                pdf_path, use_cache=False, hybrid=False, embedding_provider="hashing", dedup=dedup,
+            )
+            retriever.search_kwargs["k"] = args.k
+
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                results = [retriever.invoke(q) for q in queries]
+            ms = (time.perf_counter() - started) * 1000 / (args.repeat * len(queries))
+
+            distinct = sum(len({simhash(doc.page_content) for doc in docs}) for docs in results)
+            rows[dedup] = (
+                retriever.vectorstore.index.ntotal,
+                index_bytes(retriever),
+                ms,
+                distinct / sum(len(docs) for docs in results),
+            )
+
+    print(f"\n{'dedup':<8}{'chunks':>8}{'index KB':>10}{'ms/query':>10}{'distinct@k':>12}")
+    for dedup, (chunks, size, ms, distinct) in rows.items():
+        print(f"{'on' if dedup else 'off':<8}{chunks:>8}{size / 1e3:>10.1f}{ms:>10.3f}{distinct:>12.2f}")
+
+    (off_chunks, off_size, off_ms, _), (on_chunks, on_size, on_ms, _) = rows[False], rows[True]
+    print(
+        f"\n인덱스 {1 - on_chunks / off_chunks:.1%} 감소 ({off_size / 1e3:.0f}KB → {on_size / 1e3:.0f}KB), "
+        f"검색 지연 {off_ms:.3f}ms → {on_ms:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+임베딩 제공자 처리량 벤치마크: OpenAI API vs 로컬 CPU 모델 vs 해싱
+
+저장소 샘플 PDF를 setup_rag_pipeline과 같은 설정(1000/200)으로 청크 분할한 뒤,
+제공자별로 청크 임베딩 처리량(청크/초)과 단일 질의 임베딩 지연을 측정합니다.
+임베딩 캐시는 거치지 않습니다 (제공자 자체 속도 비교).
+
+설치되지 않았거나 네트워크/API 키가 없어 만들 수 없는 제공자는 건너뜁니다.
+
+실행 (agents/ 디렉터리에서):
+    python -m benchmarks.bench_embedding_providers
+    python -m benchmarks.bench_embedding_providers --providers hashing local --multiply 5
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.bench_pdf_extraction import default_pdfs
+from jm.prompts.bessemer_questions import get_bessemer_questions
+from jm.utils.embedding_providers import PROVIDERS, create_embeddings, provider_model_key
+from jm.utils.ingestion import create_text_splitter, load_pdf_pages
+
+
+def sample_chunks(multiply: int) -> list:
+    """저장소 샘플 PDF 청크 텍스트 (multiply번 반복)"""
+    splitter = create_text_splitter(1000, 200)
+    chunks = []
+    for pdf in default_pdfs():
+        chunks.extend(doc.page_content for doc in splitter.split_documents(load_pdf_pages(pdf, workers=1)))
+    return chunks * multiply
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 제공자 처리량 벤치마크")
+    default_providers = ["hashing", "local"] + (["openai"] if os.getenv("OPENAI_API_KEY") else [])
+    parser.add_argument("--providers", nargs="*", choices=PROVIDERS, default=default_providers)
+    parser.add_argument("--multiply", type=int, default=3, help="샘플 청크 반복 횟수")
+    args = parser.parse_args()
+
+    chunks = sample_chunks(args.multiply)
+    if not chunks:
+        raise SystemExit("저장소 PDF에서 청크를 추출하지 못했습니다")
+    queries = [q["question"] for q in get_bessemer_questions()]
+    total_chars = sum(len(c) for c in chunks)
+
+    print(f"📊 청크 {len(chunks)}개 ({total_chars / 1e3:.0f}K자), 질의 {len(queries)}개")
+    print(f"\n{'provider':<10}{'dim':>6}{'load s':>9}{'chunks/s':>11}{'ms/query':>10}  model key")
+
+    for provider in args.providers:
+        started = time.perf_counter()
+        try:
+            embeddings = create_embeddings(provider)
+            # 첫 호출에 모델 다운로드/세션 초기화가 포함되므로 준비 시간으로 따로 측정
+            dim = len(embeddings.embed_query("warmup"))
+        except Exception as e:
+            print(f"{provider:<10}  건너뜀: {e}")
+            continue
+        load_sec = time.perf_counter() - started
+
+        started = time.perf_counter()
+        embeddings.embed_documents(chunks)
+        chunks_per_sec = len(chunks) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for query in queries:
+            embeddings.embed_query(query)
+        ms_per_query = (time.perf_counter() - started) * 1000 / len(queries)
+
+        key = getattr(embeddings, "cache_key", None) or provider_model_key(provider)
+        print(f"{provider:<10}{dim:>6}{load_sec:>9.2f}{chunks_per_sec:>11.1f}{ms_per_query:>10.2f}  {key}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+페이지 요약 2단계 인덱스 벤치마크: Bessemer 질문별 검색 비용 / 프롬프트 토큰
+
+저장소 PDF 텍스트로 300페이지 이상 합성 보고서를 만듭니다. 페이지마다 원문의 연속 구간을 잘라
+겹치는 청크(setup_rag_pipeline과 같은 1000/200 비율)로 나누므로 페이지 안의 청크는 주제가 같습니다.
+해싱 임베딩으로 flat 전수 검색과 PageSummaryIndex를 비교하여 Bessemer 질문마다
+비교한 벡터 수, flat 대비 recall@k, 컨텍스트 패킹 후 프롬프트 토큰을 출력합니다.
+
+실행 (agents/ 디렉터리에서):
+    python -m benchmarks.bench_hierarchical
+    python -m benchmarks.bench_hierarchical --pages 1000 --top-sections 4 16 --pages-per-section 2
+"""
+
+import argparse
+
+import numpy as np
+from langchain_core.documents import Document
+
+from benchmarks.bench_ann_index import repo_tokens
+from jm.prompts.bessemer_questions import get_bessemer_questions
+from jm.utils.context_packer import pack_context
+from jm.utils.embedding_providers import HashingEmbeddings
+from jm.utils.hierarchical_index import PageSummaryIndex
+from jm.utils.retrieval_hit import RetrievalHit
+from jm.utils.vector_tiers import normalize
+
+
+def synthetic_report(tokens: list, num_pages: int, chunks_per_page: int, seed: int = 0) -> list:
+    """페이지마다 원문 연속 구간을 겹치는 청크로 나눈 합성 보고서 청크"""
+    rng = np.random.default_rng(seed)
+    chunk_tokens, overlap = 150, 30
+    page_tokens = chunk_tokens + (chunks_per_page - 1) * (chunk_tokens - overlap)
+    documents = []
+    for page in range(num_pages):
+        start = int(rng.integers(0, max(1, len(tokens) - page_tokens)))
+        text = " ".join(tokens[start:start + page_tokens])
+        words = text.split(" ")
+        offset = 0
+        for i in range(chunks_per_page):
+            chunk_words = words[i * (chunk_tokens - overlap):i * (chunk_tokens - overlap) + chunk_tokens]
+            chunk = " ".join(chunk_words)
+            start_index = text.find(chunk, offset)
+            offset = max(start_index, 0)
+            documents.append(Document(
+                page_content=chunk,
+                metadata={"source": "report.pdf", "page": page, "start_index": start_index},
+            ))
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지 요약 2단계 인덱스 벤치마크")
+    parser.add_argument("--pages", type=int, default=320)
+    parser.add_argument("--chunks-per-page", type=int, default=3)
+    parser.add_argument("--top-sections", type=int, nargs="*", default=[4, 16, 32])
+    parser.add_argument("--pages-per-section", type=int, default=1)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    tokens = repo_tokens()
+    if len(tokens) < 1000:
+        raise SystemExit("저장소 PDF에서 토큰을 충분히 추출하지 못했습니다")
+
+    documents = synthetic_report(tokens, args.pages, args.chunks_per_page)
+    embeddings = HashingEmbeddings(args.dim)
+    vectors = normalize(np.asarray(embeddings.embed_documents([d.page_content for d in documents])))
+    questions = get_bessemer_questions()
+    print(f"📊 합성 보고서 {args.pages}페이지 / 청크 {len(documents)}개, k={args.k}")
+    for top_sections in args.top_sections:
+        index = PageSummaryIndex(vectors, documents, embeddings, args.pages_per_section, top_sections)
+        print(f"\n▶ 섹션 {len(index.sections)}개 중 상위 {top_sections}개")
+        compare(index, vectors, documents, embeddings, questions, args.k)
+
+
+def compare(index, vectors, documents, embeddings, questions, k):
+    """Bessemer 질문별 flat 전수 검색 vs 2단계 인덱스 비교"""
+    print(f"{'question':<30}{'flat cmp':>9}{'hier cmp':>9}{'saved':>8}{'recall':>8}{'flat tok':>10}{'hier tok':>10}")
+
+    totals = np.zeros(4)
+    for question in questions:
+        query = normalize(np.asarray([embeddings.embed_query(question["question"])], dtype=np.float32))
+
+        flat_scores = vectors @ query[0]
+        flat_top = np.argsort(-flat_scores)[:k]
+        hier_scores, hier_ids, costs = index.search_by_vectors(query, k)
+
+        recall = len(set(flat_top) & set(hier_ids[0])) / k
+        # 유사도 컷오프 없이 패킹하여 병합 + 토큰 예산 효과만 비교
+        flat_hits = [RetrievalHit.from_document(documents[i], float(flat_scores[i])) for i in flat_top]
+        hier_hits = [RetrievalHit.from_document(documents[i], float(s)) for s, i in zip(hier_scores[0], hier_ids[0])]
+        flat_tokens = pack_context(flat_hits, min_score=-1.0).tokens_after
+        hier_tokens = pack_context(hier_hits, min_score=-1.0).tokens_after
+
+        cost = costs[0]
+        saved = 1 - cost["compared"] / cost["full_scan"]
+        totals += (cost["full_scan"], cost["compared"], flat_tokens, hier_tokens)
+        print(
+            f"{question['key']:<30}{cost['full_scan']:>9}{cost['compared']:>9}{saved:>8.1%}"
+            f"{recall:>8.2f}{flat_tokens:>10}{hier_tokens:>10}"
+        )
+
+    print(
+        f"평균: 비교 벡터 {1 - totals[1] / totals[0]:.1%} 절감, "
+        f"프롬프트 토큰 {totals[2] / len(questions):.0f} → {totals[3] / len(questions):.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+하이브리드 검색 벤치마크: 벡터 전용 vs BM25 + 벡터(RRF)의 재작성 / 웹 검색 왕복 수
+
+시장성 평가 그래프를 같은 PDF로 hybrid=False / hybrid=True 두 번 실행하고
+Bessemer 질문 전체에 대해 질문 재작성 횟수, 웹 검색 대체 횟수, 관련성 평가(grade) 횟수를 비교합니다.
+관련성 평가는 노드 실행 수(grade + grade_web_result)와 그중 실제 LLM 호출 수(유사도 게이트 통과분)를 따로 셉니다.
+LLM / Tavily를 실제로 호출하므로 OPENAI_API_KEY, TAVILY_API_KEY가 필요합니다.
+
+실행 (agents/ 디렉터리에서):
+    python -m benchmarks.bench_hybrid_retrieval
+    python -m benchmarks.bench_hybrid_retrieval --pdf reports/Lunit_IR_2025.pdf --startup Lunit
+"""
+
+import argparse
+import functools
+
+from benchmarks.bench_pdf_extraction import default_pdfs
+from jm.agents import nodes
+from jm.market_analyst import market_analyst_agent
+from jm.utils.rag_tools import setup_rag_pipeline
+from jm.utils.run_metrics import collect_run_metrics
+
+GRADE_NODES = ("grade", "grade_web_result")
+
+
+def run_mode(pdf: str, startup: str, hybrid: bool) -> dict:
+    """시장성 평가 1회 실행 → 재작성 / 웹 검색 / 관련성 평가 횟수"""
+    # 공용 코퍼스 대신 PDF별 파이프라인을 쓰고, 검색 방식만 바꿔서 실행
+    nodes.RAG_SHARED_CORPUS = False
+    nodes.setup_rag_pipeline = functools.partial(setup_rag_pipeline, hybrid=hybrid)
+
+    with collect_run_metrics(f"{startup}:{'hybrid' if hybrid else 'dense'}") as metrics:
+        report = market_analyst_agent(startup, pdf)
+    stats = report.get("retrieval_stats", {})
+    node_totals = metrics.totals()["nodes"]
+    return {
+        "mode": stats.get("retrieval_mode", "hybrid" if hybrid else "dense"),
+        "questions": stats.get("questions", 0),
+        "rewrites": stats.get("total_rewrites", 0),
+        "fallbacks": stats.get("web_fallbacks", 0),
+        "grades": sum(node_totals.get(name, {}).get("calls", 0) for name in GRADE_NODES),
+        "grade_llm": sum(node_totals.get(name, {}).get("llm_calls", 0) for name in GRADE_NODES),
+        "llm_calls": metrics.totals()["llm"]["llm_calls"],
+        "wall": metrics.totals()["wall"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="하이브리드 검색 재작성 / 웹 검색 왕복 벤치마크")
+    parser.add_argument("--pdf", default=None, help="평가할 PDF (기본값: 저장소 첫 번째 샘플 PDF)")
+    parser.add_argument("--startup", default="Benchmark", help="스타트업 이름")
+    args = parser.parse_args()
+
+    pdf = args.pdf or next(iter(default_pdfs()), None)
+    if pdf is None:
+        raise SystemExit("벤치마크할 PDF가 없습니다 (--pdf 로 지정하세요)")
+
+    rows = [run_mode(pdf, args.startup, hybrid) for hybrid in (False, True)]
+
+    print(f"\n📄 {pdf}")
+    print(f"{'mode':<8}{'questions':>10}{'rewrites':>10}{'fallbacks':>11}{'grades':>8}{'grade LLM':>11}{'LLM':>6}{'sec':>8}")
+    for row in rows:
+        print(
+            f"{row['mode']:<8}{row['questions']:>10}{row['rewrites']:>10}{row['fallbacks']:>11}"
+            f"{row['grades']:>8}{row['grade_llm']:>11}{row['llm_calls']:>6}{row['wall']:>8.1f}"
+        )
+    dense, hybrid = rows
+    print(
+        f"\n벡터 전용 → 하이브리드: 재작성 {dense['rewrites']} → {hybrid['rewrites']}회, "
+        f"웹 검색 {dense['fallbacks']} → {hybrid['fallbacks']}회, "
+        f"관련성 평가 {dense['grades']} → {hybrid['grades']}회 (LLM {dense['grade_llm']} → {hybrid['grade_llm']}회)"
+    )
+
+
+if __name__ == "__main__":
+    main()
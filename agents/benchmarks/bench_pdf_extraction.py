@@ -0,0 +1,94 @@
+"""
+PDF 텍스트 추출 벤치마크: 순차 로더 vs 프로세스 풀 병렬 추출
+
+저장소의 샘플 PDF를 여러 번 이어 붙여 대형 IR 자료(기본 200페이지 이상)를 만든 뒤,
+기존 PyPDFLoader/PDFPlumberLoader와 iter_pdf_pages(workers=N)의 소요 시간을 비교하고
+페이지 순서/텍스트가 동일한지 확인합니다.
+
+실행 (agents/ 디렉터리에서):
+    python -m benchmarks.bench_pdf_extraction
+    python -m benchmarks.bench_pdf_extraction --pdf health.pdf --multiply 30 --workers 1 2 4 8
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+from jm.utils import ingestion
+from jm.utils.ingestion import _serial_loader, load_pdf_pages
+
+
+def default_pdfs() -> list:
+    """저장소에 포함된 샘플 PDF (health.pdf, 상위 디렉터리 PDF)"""
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return sorted(glob.glob(os.path.join(here, "*.pdf")) + glob.glob(os.path.join(here, "..", "*.pdf")))
+
+
+def build_large_pdf(pdf_paths: list, multiply: int, out_path: str) -> int:
+    """샘플 PDF들을 multiply번 이어 붙여 대형 PDF 생성, 페이지 수 반환"""
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    readers = [PdfReader(p) for p in pdf_paths]
+    for _ in range(multiply):
+        for reader in readers:
+            for page in reader.pages:
+                writer.add_page(page)
+    with open(out_path, "wb") as f:
+        writer.write(f)
+    return len(writer.pages)
+
+
+def timed(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 텍스트 추출 벤치마크")
+    parser.add_argument("--pdf", nargs="*", default=None, help="원본 PDF (기본값: 저장소 샘플 PDF)")
+    parser.add_argument("--multiply", type=int, default=15, help="샘플 PDF 반복 횟수")
+    parser.add_argument("--workers", type=int, nargs="*", default=[2, 4, os.cpu_count() or 1])
+    parser.add_argument("--engine", choices=["pypdf", "pdfplumber"], default="pypdf")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pdfs = args.pdf or default_pdfs()
+    if not pdfs:
+        raise SystemExit("벤치마크할 PDF가 없습니다 (--pdf 로 지정하세요)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        big_pdf = os.path.join(tmp, "bench_deck.pdf")
+        n_pages = build_large_pdf(pdfs, args.multiply, big_pdf)
+        print(f"📄 벤치마크 PDF: {n_pages}페이지 (원본 {len(pdfs)}개 x {args.multiply}), engine={args.engine}")
+
+        serial_sec, serial_docs = timed(lambda: _serial_loader(big_pdf, args.engine).load(), args.repeat)
+        # 로더 버전에 따라 페이지 앞뒤 공백 처리가 달라 strip 후 비교
+        serial_texts = [d.page_content.strip() for d in serial_docs]
+
+        print(f"\n{'mode':<16}{'sec':>10}{'pages/s':>12}{'speedup':>10}  same_text")
+        print(f"{'serial loader':<16}{serial_sec:>10.3f}{n_pages / serial_sec:>12.1f}{1.0:>10.2f}  -")
+
+        # 작은 PDF 기준값을 무시하고 항상 병렬 경로를 측정
+        # (페이지 텍스트 캐시를 쓰면 두 번째 반복부터 캐시 읽기만 재므로 끔)
+        ingestion.RAG_PDF_PARALLEL_MIN_PAGES = 0
+        for workers in sorted(set(w for w in args.workers if w > 1)):
+            sec, docs = timed(
+                lambda: load_pdf_pages(big_pdf, workers=workers, engine=args.engine, use_cache=False), args.repeat
+            )
+            same = [d.page_content.strip() for d in docs] == serial_texts
+            pages_in_order = [d.metadata["page"] for d in docs] == list(range(n_pages))
+            print(
+                f"{f'workers={workers}':<16}{sec:>10.3f}{n_pages / sec:>12.1f}"
+                f"{serial_sec / sec:>10.2f}  {same and pages_in_order}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+섹션 샤드 라우팅 벤치마크: Bessemer 질문별 검색 범위 / 상위 k 섹션 적합도
+
+저장소 샘플 PDF와 reports/ 투자 보고서를 setup_rag_pipeline과 같은 설정(1000/200)으로 분할하고
+섹션 유형을 분류한 뒤, Bessemer 질문마다 flat 전수 검색과 SectionShardIndex를 비교합니다.
+비교한 청크 수와, 상위 k개 중 질문이 라우팅된 섹션(+ general)에 속한 청크 비율(on-topic)을 출력합니다.
+임베딩 API 없이 돌 수 있도록 해싱 임베딩을 사용합니다.
+
+실행 (agents/ 디렉터리에서):
+    python -m benchmarks.bench_section_router
+    python -m benchmarks.bench_section_router --pdf reports/*.pdf --k 8
+"""
+
+import argparse
+import glob
+import os
+
+import numpy as np
+
+from benchmarks.bench_pdf_extraction import default_pdfs
+from jm.prompts.bessemer_questions import get_bessemer_questions
+from jm.utils.embedding_providers import HashingEmbeddings
+from jm.utils.ingestion import create_text_splitter, load_pdf_pages
+from jm.utils.section_router import GENERAL, SectionShardIndex, classify_sections
+from jm.utils.vector_tiers import normalize
+
+
+def sample_pdfs() -> list:
+    """저장소 샘플 PDF + reports/ 투자 보고서"""
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return default_pdfs() + sorted(glob.glob(os.path.join(here, "reports", "*.pdf")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="섹션 샤드 라우팅 벤치마크")
+    parser.add_argument("--pdf", nargs="*", default=None, help="입력 PDF (기본값: 샘플 PDF + reports/)")
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    splitter = create_text_splitter(1000, 200)
+    documents = []
+    for pdf in args.pdf or sample_pdfs():
+        documents.extend(splitter.split_documents(load_pdf_pages(pdf, workers=1)))
+    if not documents:
+        raise SystemExit("PDF에서 청크를 추출하지 못했습니다")
+
+    counts = classify_sections(documents)
+    embeddings = HashingEmbeddings(args.dim)
+    vectors = normalize(np.asarray(embeddings.embed_documents([d.page_content for d in documents])))
+    index = SectionShardIndex(vectors, documents, embeddings)
+    print(f"📊 청크 {len(documents)}개, 섹션 분류 {dict(counts.most_common())}, k={args.k}\n")
+
+    rows = []
+    for question in get_bessemer_questions():
+        query = question["question"]
+        routed = set(index.route(query) or [])
+        flat_scores = vectors @ normalize(np.asarray([embeddings.embed_query(query)]))[0]
+        flat_top = [documents[i] for i in np.argsort(-flat_scores)[:args.k]]
+        shard_top = [doc for doc, _ in index.search(query, args.k)]
+
+        def on_topic(docs):
+            if not routed:
+                return 1.0
+            return sum(d.metadata["section"] in routed | {GENERAL} for d in docs) / len(docs)
+
+        compared = index.stats["compared"] - sum(r[1] for r in rows)
+        rows.append((question["key"], compared, on_topic(flat_top), on_topic(shard_top), sorted(routed)))
+
+    print(f"\n{'question':<30}{'flat cmp':>9}{'shard cmp':>10}{'flat on':>9}{'shard on':>10}  routed")
+    for key, compared, flat_on, shard_on, routed in rows:
+        print(f"{key:<30}{len(documents):>9}{compared:>10}{flat_on:>9.2f}{shard_on:>10.2f}  {', '.join(routed) or '전체'}")
+
+    cost = index.cost_summary()
+    print(
+        f"\n평균 검색 범위 {cost['avg_compared']:.0f}/{len(documents)}개 청크 ({cost['saved']:.1%} 감소), "
+        f"전체 검색 대체 {cost['fallback']}회"
+    )
+
+
+if __name__ == "__main__":
+    main()
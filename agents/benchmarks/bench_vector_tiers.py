@@ -0,0 +1,80 @@
+"""
+벡터 저장 계층 벤치마크: recall@k vs 메모리
+
+임베딩 API 없이 측정할 수 있도록 군집 구조가 있는 합성 벡터(OpenAI 임베딩과 같은 정규화 벡터)를
+만들고, 정확 검색(flat float32) 결과를 기준으로 각 계층의 recall@k, RAM 사용량, 질의 지연을 비교합니다.
+재채점(rescore) 유무에 따른 차이도 함께 출력합니다.
+
+실행 (agents/ 디렉터리에서):
+    python -m benchmarks.bench_vector_tiers
+    python -m benchmarks.bench_vector_tiers --num-vectors 200000 --dim 1536 --k 5
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_core.documents import Document
+
+from jm.utils.vector_tiers import TIERS, TieredVectorStore, normalize
+
+
+def synthetic_corpus(num_vectors: int, dim: int, num_clusters: int, seed: int = 0) -> np.ndarray:
+    """군집 중심 + 노이즈로 만든 정규화 벡터 (실제 문서 임베딩처럼 주제별로 뭉쳐 있음)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((num_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, num_clusters, num_vectors)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((num_vectors, dim)).astype(np.float32)
+    return normalize(vectors)
+
+
+def recall_at_k(truth: np.ndarray, found: np.ndarray, k: int) -> float:
+    """정확 검색 결과 대비 상위 k개 재현율"""
+    hits = sum(len(set(t[:k]) & set(f[:k])) for t, f in zip(truth, found))
+    return hits / (len(truth) * k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터 저장 계층 recall@k vs 메모리 벤치마크")
+    parser.add_argument("--num-vectors", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    vectors = synthetic_corpus(args.num_vectors, args.dim, args.clusters)
+    rng = np.random.default_rng(1)
+    queries = normalize(
+        vectors[rng.integers(0, len(vectors), args.queries)]
+        + 0.3 * rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+    )
+    truth = np.argsort(-(queries @ vectors.T), axis=1)[:, :args.k]
+    documents = [Document(page_content=str(i)) for i in range(len(vectors))]
+
+    print(f"📊 벡터 {args.num_vectors}개 x {args.dim}차원, 질의 {args.queries}개, k={args.k}")
+    print(f"\n{'tier':<8}{'rescore':>9}{'recall@k':>10}{'RAM MB':>10}{'disk MB':>10}{'ms/query':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for tier in TIERS:
+            store = TieredVectorStore.build(vectors, documents, None, tier, Path(tmp) / tier)
+            memory = store.memory_bytes()
+            for rescore_factor in sorted({0, args.rescore_factor}):
+                if tier == "flat" and rescore_factor:
+                    continue
+                store.rescore_factor = rescore_factor
+                started = time.perf_counter()
+                _, found = store.search_by_vectors(queries, args.k)
+                ms = (time.perf_counter() - started) * 1000 / len(queries)
+                disk = memory["exact_vector_bytes"] if rescore_factor else 0
+                print(
+                    f"{store.tier:<8}{rescore_factor:>9}{recall_at_k(truth, found, args.k):>10.3f}"
+                    f"{memory['index_bytes'] / 1e6:>10.1f}{disk / 1e6:>10.1f}{ms:>10.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
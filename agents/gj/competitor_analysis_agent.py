@@ -5,6 +5,7 @@
 # - RAG 통합 준비
 # ------------------------------------------------------------
 
+import asyncio
 import os
 import re
 from typing import Literal, Optional
@@ -19,7 +20,6 @@ from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
 
 # LangGraph imports
 from langgraph.graph import END, START, StateGraph
@@ -28,37 +28,50 @@ from langgraph.graph import END, START, StateGraph
 from langchain_core.messages import AIMessage, ToolMessage
 from typing import Sequence
 
-def create_tool_node(tools: Sequence):
-    """도구 실행 노드 생성 (ToolNode 대체)"""
+def create_tool_node(tools: Sequence, use_async: bool = False):
+    """도구 실행 노드 생성 (ToolNode 대체, use_async=True면 도구 호출들을 동시에 실행)"""
     tools_by_name = {tool.name: tool for tool in tools}
 
-    def tool_node(state):
-        """도구 실행"""
+    def pending_tool_calls(state):
         messages = state.get("messages", [])
         if not messages:
-            return {"messages": []}
+            return []
 
         last_message = messages[-1]
         if not isinstance(last_message, AIMessage) or not hasattr(last_message, 'tool_calls') or not last_message.tool_calls:
-            return {"messages": []}
+            return []
+        return [tool_call for tool_call in last_message.tool_calls if tool_call["name"] in tools_by_name]
 
+    def tool_message(tool_call, result=None, error=None):
+        content = f"Error: {str(error)}" if error is not None else str(result)
+        return ToolMessage(content=content, tool_call_id=tool_call["id"])
+
+    def tool_node(state):
+        """도구 실행"""
         tool_messages = []
-        for tool_call in last_message.tool_calls:
-            tool = tools_by_name.get(tool_call["name"])
-            if tool:
-                try:
-                    result = tool.invoke(tool_call["args"])
-                    tool_messages.append(
-                        ToolMessage(content=str(result), tool_call_id=tool_call["id"])
-                    )
-                except Exception as e:
-                    tool_messages.append(
-                        ToolMessage(content=f"Error: {str(e)}", tool_call_id=tool_call["id"])
-                    )
+        for tool_call in pending_tool_calls(state):
+            tool = tools_by_name[tool_call["name"]]
+            try:
+                result = tool.invoke(tool_call["args"])
+                tool_messages.append(tool_message(tool_call, result))
+            except Exception as e:
+                tool_messages.append(tool_message(tool_call, error=e))
 
         return {"messages": tool_messages}
 
-    return tool_node
+    async def atool_node(state):
+        """도구 실행 (비동기, 도구 호출들을 동시에 실행)"""
+        async def run(tool_call):
+            try:
+                result = await tools_by_name[tool_call["name"]].ainvoke(tool_call["args"])
+                return tool_message(tool_call, result)
+            except Exception as e:
+                return tool_message(tool_call, error=e)
+
+        tool_messages = await asyncio.gather(*(run(tool_call) for tool_call in pending_tool_calls(state)))
+        return {"messages": list(tool_messages)}
+
+    return atool_node if use_async else tool_node
 
 def tools_condition(state):
     """도구 사용 여부 판단 (tools_condition 대체)"""
@@ -88,11 +101,15 @@ from gj.prompts import (
     COMPETITOR_ANALYSIS_PROMPT,
     PARSE_ANALYSIS_PROMPT
 )
+# 공용 LLM 클라이언트 레지스트리 (노드 간 커넥션 풀 재사용)
+from jm.utils.llm_clients import get_chat_model
+from jm.utils.rate_limiter import rate_limited
 # -----------------------------
 # 환경 변수 설정
 # -----------------------------
 load_dotenv()
 MODEL_NAME = get_model_name(LLMs.GPT4o_MINI)
+LLM_NAMESPACE = "competitor"  # LLM 응답 캐시 네임스페이스
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -113,13 +130,15 @@ def search_competitors(query: str) -> str:
     """
     try:
         tavily_tool = TavilySearch()
-        search_results = tavily_tool.search(
-            query=query,
-            topic="general",
-            days=365,
-            max_results=5,
-            format_output=True,
-        )
+        # 다른 에이전트와 공용 Tavily 한도 (초과 시 실패 대신 대기)
+        with rate_limited("tavily"):
+            search_results = tavily_tool.search(
+                query=query,
+                topic="general",
+                days=365,
+                max_results=5,
+                format_output=True,
+            )
         formatted_results = "\n\n".join(search_results)
         return f"Web search results for: {query}\n\n{formatted_results}"
     except Exception as e:
@@ -147,13 +166,14 @@ def fetch_competitor_details(competitor_name: str, focus_area: str = "technology
 
         all_results = []
         for query in queries:
-            search_results = tavily_tool.search(
-                query=query,
-                topic="general",
-                days=365,
-                max_results=3,
-                format_output=True,
-            )
+            with rate_limited("tavily"):
+                search_results = tavily_tool.search(
+                    query=query,
+                    topic="general",
+                    days=365,
+                    max_results=3,
+                    format_output=True,
+                )
             all_results.extend(search_results)
 
         formatted_results = "\n\n".join(all_results)
@@ -168,39 +188,48 @@ tools = [search_competitors, fetch_competitor_details]
 # -----------------------------
 # 노드 함수들
 # -----------------------------
+def _agent_model():
+    model = get_chat_model(MODEL_NAME, temperature=0, streaming=True, namespace=LLM_NAMESPACE)
+    return model.bind_tools(tools)
+
+
 def agent(state):
     """에이전트 - 도구 사용 결정"""
-    messages = state["messages"]
-    model = ChatOpenAI(temperature=0, streaming=True, model=MODEL_NAME)
-    model = model.bind_tools(tools)
-    response = model.invoke(messages)
+    response = _agent_model().invoke(state["messages"])
     return {"messages": [response]}
 
 
-def grade_competitor_info(state) -> Literal["analyze", "search_more"]:
-    """경쟁사 정보 충분성 평가"""
-    model = ChatOpenAI(temperature=0, model=MODEL_NAME, streaming=True)
-    llm_with_tool = model.with_structured_output(CompetitorGrade)
+async def aagent(state):
+    """에이전트 - 도구 사용 결정 (비동기)"""
+    response = await _agent_model().ainvoke(state["messages"])
+    return {"messages": [response]}
 
-    messages = state["messages"]
-    startup_info = state.get("startup_info", {})
-    tech_summary = state.get("tech_summary", "")
 
-    # 메시지에서 경쟁사 정보 추출
-    competitor_info = "\n\n".join([
+def _competitor_info(messages) -> str:
+    """메시지에서 경쟁사 정보 추출"""
+    return "\n\n".join([
         msg.content for msg in messages
         if hasattr(msg, 'content') and isinstance(msg.content, str)
     ])
 
-    scored_result = llm_with_tool.invoke(
-        GRADE_COMPETITOR_INFO_PROMPT.format(
-            startup_name=startup_info.get("name", "Unknown"),
-            category=startup_info.get("category", "Technology"),
-            tech_summary=tech_summary,
-            competitor_info=competitor_info
-        )
+
+def _grade_model():
+    return get_chat_model(
+        MODEL_NAME, temperature=0, streaming=True, schema=CompetitorGrade, namespace=LLM_NAMESPACE
+    )
+
+
+def _grade_prompt(state) -> str:
+    startup_info = state.get("startup_info", {})
+    return GRADE_COMPETITOR_INFO_PROMPT.format(
+        startup_name=startup_info.get("name", "Unknown"),
+        category=startup_info.get("category", "Technology"),
+        tech_summary=state.get("tech_summary", ""),
+        competitor_info=_competitor_info(state["messages"])
     )
 
+
+def _route_by_grade(scored_result) -> Literal["analyze", "search_more"]:
     decision = scored_result.binary_score.strip().lower()
 
     if decision == "yes":
@@ -211,9 +240,17 @@ def grade_competitor_info(state) -> Literal["analyze", "search_more"]:
         return "search_more"
 
 
-def search_more(state):
-    """추가 경쟁사 정보 검색"""
-    print("==== [SEARCHING MORE COMPETITORS] ====")
+def grade_competitor_info(state) -> Literal["analyze", "search_more"]:
+    """경쟁사 정보 충분성 평가"""
+    return _route_by_grade(_grade_model().invoke(_grade_prompt(state)))
+
+
+async def agrade_competitor_info(state) -> Literal["analyze", "search_more"]:
+    """경쟁사 정보 충분성 평가 (비동기)"""
+    return _route_by_grade(await _grade_model().ainvoke(_grade_prompt(state)))
+
+
+def _search_more_messages(state):
     messages = state["messages"]
     startup_info = state.get("startup_info", {})
 
@@ -236,37 +273,43 @@ def search_more(state):
             f"Focus on their technology, FDA/CE certifications, funding, and partnerships."
         )
 
-    msg = [HumanMessage(content=msg_content)]
-    model = ChatOpenAI(temperature=0, model=MODEL_NAME, streaming=True)
-    response = model.invoke(msg)
+    return [HumanMessage(content=msg_content)]
+
+
+def search_more(state):
+    """추가 경쟁사 정보 검색"""
+    print("==== [SEARCHING MORE COMPETITORS] ====")
+    model = get_chat_model(MODEL_NAME, temperature=0, streaming=True, namespace=LLM_NAMESPACE)
+    response = model.invoke(_search_more_messages(state))
     return {"messages": [response]}
 
 
-def analyze(state):
-    """경쟁사 비교 분석"""
-    print("==== [ANALYZING COMPETITORS] ====")
-    messages = state["messages"]
-    startup_info = state.get("startup_info", {})
-    tech_summary = state.get("tech_summary", "")
-    rag_context = "Industry context not provided."
+async def asearch_more(state):
+    """추가 경쟁사 정보 검색 (비동기)"""
+    print("==== [SEARCHING MORE COMPETITORS] ====")
+    model = get_chat_model(MODEL_NAME, temperature=0, streaming=True, namespace=LLM_NAMESPACE)
+    response = await model.ainvoke(_search_more_messages(state))
+    return {"messages": [response]}
 
-    # 경쟁사 정보 추출
-    competitor_info = "\n\n".join([
-        msg.content for msg in messages
-        if hasattr(msg, 'content') and isinstance(msg.content, str)
-    ])
 
-    llm = ChatOpenAI(model=MODEL_NAME, temperature=0, streaming=True)
-    chain = COMPETITOR_ANALYSIS_PROMPT | llm | StrOutputParser()
+def _analysis_chain():
+    llm = get_chat_model(MODEL_NAME, temperature=0, streaming=True, namespace=LLM_NAMESPACE)
+    return COMPETITOR_ANALYSIS_PROMPT | llm | StrOutputParser()
 
-    response = chain.invoke({
+
+def _analysis_inputs(state) -> dict:
+    startup_info = state.get("startup_info", {})
+    return {
         "startup_name": startup_info.get("name", "Target Startup"),
         "category": startup_info.get("category", "Technology"),
-        "tech_summary": tech_summary,
-        "competitor_info": competitor_info,
-        "rag_context": rag_context
-    })
+        "tech_summary": state.get("tech_summary", ""),
+        "competitor_info": _competitor_info(state["messages"]),
+        "rag_context": "Industry context not provided."
+    }
+
 
+def _analyzed(state, response: str) -> dict:
+    startup_info = state.get("startup_info", {})
     return {
         "messages": [AIMessage(content=response)],
         "competitor_analysis": {
@@ -276,19 +319,32 @@ def analyze(state):
     }
 
 
-def parse_analysis(state):
-    """분석 결과 파싱"""
-    print("==== [PARSING ANALYSIS RESULTS] ====")
-    competitor_analysis = state.get("competitor_analysis", {})
-    analysis_text = competitor_analysis.get("analysis", "")
+def analyze(state):
+    """경쟁사 비교 분석"""
+    print("==== [ANALYZING COMPETITORS] ====")
+    return _analyzed(state, _analysis_chain().invoke(_analysis_inputs(state)))
 
-    model = ChatOpenAI(temperature=0, model=MODEL_NAME)
-    llm_with_structure = model.with_structured_output(CompetitorAnalysisParsed)
 
-    result = llm_with_structure.invoke(
-        PARSE_ANALYSIS_PROMPT.format(analysis=analysis_text)
+async def aanalyze(state):
+    """경쟁사 비교 분석 (비동기)"""
+    print("==== [ANALYZING COMPETITORS] ====")
+    return _analyzed(state, await _analysis_chain().ainvoke(_analysis_inputs(state)))
+
+
+def _parse_model():
+    return get_chat_model(
+        MODEL_NAME, temperature=0, schema=CompetitorAnalysisParsed, namespace=LLM_NAMESPACE
     )
 
+
+def _parse_prompt(state) -> str:
+    analysis_text = state.get("competitor_analysis", {}).get("analysis", "")
+    return PARSE_ANALYSIS_PROMPT.format(analysis=analysis_text)
+
+
+def _parsed(state, result) -> dict:
+    competitor_analysis = state.get("competitor_analysis", {})
+
     print(f"==== COMPETITIVE POSITIONING: {result.competitive_positioning} ====")
     print(f"Advantages: {len(result.competitive_advantages)} identified")
     print(f"Disadvantages: {len(result.competitive_disadvantages)} identified")
@@ -307,6 +363,18 @@ def parse_analysis(state):
     }
 
 
+def parse_analysis(state):
+    """분석 결과 파싱"""
+    print("==== [PARSING ANALYSIS RESULTS] ====")
+    return _parsed(state, _parse_model().invoke(_parse_prompt(state)))
+
+
+async def aparse_analysis(state):
+    """분석 결과 파싱 (비동기)"""
+    print("==== [PARSING ANALYSIS RESULTS] ====")
+    return _parsed(state, await _parse_model().ainvoke(_parse_prompt(state)))
+
+
 def format_output(state):
     """최종 출력 포맷팅 (투자 판단 에이전트용)"""
     print("==== [FORMATTING OUTPUT] ====")
@@ -410,17 +478,21 @@ def format_output(state):
 # -----------------------------
 # 그래프 구성
 # -----------------------------
-def build_graph():
-    """LangGraph 워크플로우 구성"""
+def build_graph(use_async: bool = False):
+    """
+    LangGraph 워크플로우 구성
+
+    use_async=True면 LLM / 도구 노드를 비동기 버전으로 등록 → `await graph.ainvoke(...)`
+    """
     workflow = StateGraph(CompetitorAgentState)
 
     # 노드 추가
-    workflow.add_node("agent", agent)
-    retrieve = create_tool_node(tools)
+    workflow.add_node("agent", aagent if use_async else agent)
+    retrieve = create_tool_node(tools, use_async=use_async)
     workflow.add_node("retrieve", retrieve)
-    workflow.add_node("search_more", search_more)
-    workflow.add_node("analyze", analyze)
-    workflow.add_node("parse_analysis", parse_analysis)
+    workflow.add_node("search_more", asearch_more if use_async else search_more)
+    workflow.add_node("analyze", aanalyze if use_async else analyze)
+    workflow.add_node("parse_analysis", aparse_analysis if use_async else parse_analysis)
     workflow.add_node("format_output", format_output)
 
     # 엣지 정의
@@ -436,7 +508,7 @@ def build_graph():
     # retrieve 후 정보 충분성 평가
     workflow.add_conditional_edges(
         "retrieve",
-        grade_competitor_info,
+        agrade_competitor_info if use_async else grade_competitor_info,
         {"analyze": "analyze", "search_more": "search_more"}
     )
 
@@ -478,13 +550,42 @@ def run_competitor_analysis(
     """
     graph = build_graph()
 
-    # 기본 config 생성
-    if config is None:
-        config = RunnableConfig(
-            recursion_limit=25,
-            configurable={"thread_id": random_uuid()}
-        )
+    # 그래프 실행
+    final_state = graph.invoke(
+        _initial_inputs(company_name, tech_summary, startup_info), config or _default_config()
+    )
+
+    return final_state
+
+
+async def arun_competitor_analysis(
+    company_name: str,
+    tech_summary: str,
+    startup_info: dict,
+    config: Optional[RunnableConfig] = None
+):
+    """
+    경쟁사 비교 분석 비동기 실행 (run_competitor_analysis와 같은 결과)
+
+    여러 스타트업 분석을 asyncio.gather로 한 이벤트 루프에서 동시에 실행할 수 있습니다.
+    """
+    graph = build_graph(use_async=True)
 
+    return await graph.ainvoke(
+        _initial_inputs(company_name, tech_summary, startup_info), config or _default_config()
+    )
+
+
+def _default_config() -> RunnableConfig:
+    """기본 config 생성"""
+    return RunnableConfig(
+        recursion_limit=25,
+        configurable={"thread_id": random_uuid()}
+    )
+
+
+def _initial_inputs(company_name: str, tech_summary: str, startup_info: dict) -> dict:
+    """그래프 초기 입력"""
     initial_message = HumanMessage(
         content=(
             f"Analyze competitors for {company_name}, "
@@ -493,7 +594,7 @@ def run_competitor_analysis(
         )
     )
 
-    inputs = {
+    return {
         "messages": [initial_message],
         "company_name": company_name,
         "tech_summary": tech_summary,
@@ -509,11 +610,6 @@ def run_competitor_analysis(
         "final_output": {}
     }
 
-    # 그래프 실행
-    final_state = graph.invoke(inputs, config)
-
-    return final_state
-
 
 if __name__ == "__main__":
     print("=" * 80)
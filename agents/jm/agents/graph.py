@@ -18,7 +18,16 @@ from jm.agents.nodes import (
     skip_question,
     calculate_scorecard,
     analyze_industry_insights,
-    finalize_report
+    finalize_report,
+    ainitialize_analysis,
+    asearch_industry_news,
+    aretrieve_documents,
+    agrade_relevance,
+    arewrite_question,
+    aweb_search_fallback,
+    agenerate_answer,
+    acalculate_scorecard,
+    aanalyze_industry_insights,
 )
 
 
@@ -83,29 +92,38 @@ def check_completion(state: MarketAnalysisState) -> str:
 
 # ========== LangGraph 워크플로우 구축 ==========
 
-def build_market_analysis_graph():
-    """시장성 평가 에이전트 그래프 구축 (v0.3.0 - 산업 뉴스 추가)"""
+def build_market_analysis_graph(use_async: bool = False):
+    """
+    시장성 평가 에이전트 그래프 구축 (v0.3.0 - 산업 뉴스 추가)
+
+    Args:
+        use_async: True면 LLM / 검색 노드를 비동기 버전(ainvoke)으로 등록
+                   → `await graph.ainvoke(...)`로 여러 평가를 한 이벤트 루프에서 동시에 실행
+    """
 
     # StateGraph 초기화
     workflow = StateGraph(MarketAnalysisState)
 
+    def node(sync_fn, async_fn):
+        return async_fn if use_async else sync_fn
+
     # ========== 노드 추가 ==========
-    workflow.add_node("initialize", initialize_analysis)
-    workflow.add_node("industry_news", search_industry_news)  # 🆕 v0.3.0
+    workflow.add_node("initialize", node(initialize_analysis, ainitialize_analysis))
+    workflow.add_node("industry_news", node(search_industry_news, asearch_industry_news))  # 🆕 v0.3.0
     workflow.add_node("select_question", select_next_question)
-    workflow.add_node("retrieve", retrieve_documents)
-    workflow.add_node("grade", grade_relevance)
-    workflow.add_node("rewrite", rewrite_question)
-    workflow.add_node("web_search", web_search_fallback)
-    workflow.add_node("generate", generate_answer)
+    workflow.add_node("retrieve", node(retrieve_documents, aretrieve_documents))
+    workflow.add_node("grade", node(grade_relevance, agrade_relevance))
+    workflow.add_node("rewrite", node(rewrite_question, arewrite_question))
+    workflow.add_node("web_search", node(web_search_fallback, aweb_search_fallback))
+    workflow.add_node("generate", node(generate_answer, agenerate_answer))
     workflow.add_node("skip", skip_question)
-    workflow.add_node("scorecard", calculate_scorecard)
-    workflow.add_node("industry_insights", analyze_industry_insights)  # 🆕 v0.3.0
+    workflow.add_node("scorecard", node(calculate_scorecard, acalculate_scorecard))
+    workflow.add_node("industry_insights", node(analyze_industry_insights, aanalyze_industry_insights))  # 🆕 v0.3.0
     workflow.add_node("finalize", finalize_report)
 
     # 중간 라우터 노드 (조건 분기용)
     workflow.add_node("check_rewrite_count", lambda s: s)  # Pass-through 노드
-    workflow.add_node("grade_web_result", grade_relevance)  # 웹 검색 결과 평가
+    workflow.add_node("grade_web_result", node(grade_relevance, agrade_relevance))  # 웹 검색 결과 평가
 
     # ========== 엣지 연결 ==========
 
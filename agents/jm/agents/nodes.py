@@ -3,9 +3,9 @@
 Reference: 16-AgenticRAG, 21-Agent, 22-LangGraph
 """
 
+import asyncio
 import re
 from typing import Dict
-from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import StrOutputParser
 from langchain_teddynote.evaluator import GroundednessChecker
 from langchain_teddynote.tools.tavily import TavilySearch
@@ -14,7 +14,33 @@ from jm.agents.state import MarketAnalysisState
 from jm.prompts.bessemer_questions import get_bessemer_questions
 from jm.prompts.query_rewrite_prompt import get_query_rewrite_prompt
 from jm.prompts.scorecard_prompt import get_scorecard_prompt
-from jm.utils.rag_tools import setup_rag_pipeline, retrieve_with_sources
+from jm.utils.lexical_index import HybridRetriever
+from jm.utils.llm_clients import get_chat_model
+from jm.utils.relevance_gate import (
+    ACCEPT,
+    LLM,
+    RAG_RELEVANCE_GATE,
+    gate_decision,
+    log_gate_decision,
+    should_audit,
+    top_score,
+)
+from jm.utils.rag_tools import (
+    RAG_SHARED_CORPUS,
+    batch_retrieve_with_sources,
+    format_hits,
+    retrieve_with_sources,
+    setup_rag_pipeline,
+    setup_shared_corpus_retriever,
+)
+from jm.utils.retrieval_hit import RetrievalHit, hit_sources
+from jm.utils.rate_limiter import rate_limited
+from jm.utils.run_metrics import track_call
+
+# LLM 응답 캐시 네임스페이스 (시장성 평가 에이전트 캐시만 비울 때 사용)
+LLM_NAMESPACE = "market"
+# 산업 분류용 첫 검색 쿼리
+INDUSTRY_QUERY = "What industry does this company belong to? medical, fintech, e-commerce, AI, etc."
 
 
 # ========== 노드 1: 초기화 ==========
@@ -25,7 +51,8 @@ def initialize_analysis(state: MarketAnalysisState) -> Dict:
     작업:
     1. PDF 로딩, 텍스트 분할, FAISS 벡터 스토어 구축 (1회만)
     2. Bessemer 질문 리스트 생성
-    3. State에 retriever와 질문 저장
+    3. 모든 질문을 한 번에 검색 (batch_retrieve)
+    4. State에 retriever, 질문, 일괄 검색 결과 저장
 
     Reference: 16-AgenticRAG/01-NaiveRAG.ipynb
     """
@@ -36,7 +63,11 @@ def initialize_analysis(state: MarketAnalysisState) -> Dict:
 
     # 1. RAG 파이프라인 구축 (핵심 개선: 1회만 실행)
     try:
-        retriever = setup_rag_pipeline(state["document_path"])
+        if RAG_SHARED_CORPUS:
+            # 공용 코퍼스: 스타트업 메타데이터로 필터링하여 다른 스타트업 벡터는 검색하지 않음
+            retriever = setup_shared_corpus_retriever(state["document_path"], state["startup_name"])
+        else:
+            retriever = setup_rag_pipeline(state["document_path"])
     except Exception as e:
         print(f" [ERROR] RAG 파이프라인 구축 실패: {e}")
         # 실패 시 더미 retriever 반환 (에러 처리)
@@ -49,9 +80,21 @@ def initialize_analysis(state: MarketAnalysisState) -> Dict:
     for i, q in enumerate(sub_questions, 1):
         print(f"  {i}. {q['key']}: {q['question'][:50]}...")
 
-    # 3. State 업데이트
+    # 3. 전체 질문 일괄 검색 (임베딩 요청 1회 + 행렬 검색 1회) → 이후 검색 노드는 딕셔너리 조회
+    prefetched_retrievals = {}
+    if retriever is not None:
+        try:
+            prefetched_retrievals = batch_retrieve_with_sources(
+                retriever, [q["question"] for q in sub_questions]
+            )
+            print(f"\n [초기화] Bessemer 질문 {len(prefetched_retrievals)}개 일괄 검색 완료")
+        except Exception as e:
+            print(f" [WARN] 일괄 검색 실패, 질문별로 검색합니다: {e}")
+
+    # 4. State 업데이트
     return {
         "retriever": retriever,
+        "prefetched_retrievals": prefetched_retrievals,
         "sub_questions": sub_questions,
         "current_question_idx": 0,
         "rewrite_count": 0,
@@ -60,6 +103,11 @@ def initialize_analysis(state: MarketAnalysisState) -> Dict:
     }
 
 
+async def ainitialize_analysis(state: MarketAnalysisState) -> Dict:
+    """[노드 1: 초기화] 비동기 버전 (PDF 로딩 / 인덱스 구축은 워커 스레드에서 실행)"""
+    return await asyncio.to_thread(initialize_analysis, state)
+
+
 # ========== 노드 1.5: 산업 뉴스 검색 (v0.3.0) ==========
 def search_industry_news(state: MarketAnalysisState) -> Dict:
     """
@@ -81,63 +129,103 @@ def search_industry_news(state: MarketAnalysisState) -> Dict:
     print(" [MarketAgent] 산업 뉴스 검색 시작")
     print("="*60)
 
-    # 1. 산업 카테고리 추출 (간단한 LLM 호출)
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-
     retriever = state["retriever"]
 
     if retriever is None:
         print(" [WARNING] Retriever가 없어 산업 분류를 건너뜁니다.")
-        return {
-            "industry_category": "General",
-            "industry_news": {
-                "industry": "General",
-                "search_date": "2025-10-13",
-                "news_categories": {}
-            }
-        }
+        return _industry_news_result("General", {})
 
-    # Retriever로 첫 페이지 검색
+    # 1. 산업 카테고리 추출 (간단한 LLM 호출)
     try:
-        first_docs = retriever.invoke(
-            "What industry does this company belong to? medical, fintech, e-commerce, AI, etc."
-        )
-        from jm.utils.rag_tools import format_docs
-        context = format_docs(first_docs)
+        first_docs = retriever.invoke(INDUSTRY_QUERY)
+        industry = _llm().invoke(_industry_prompt(first_docs)).content.strip()
+        print(f"\n [산업 분류] {industry}")
+
+    except Exception as e:
+        print(f" [WARNING] 산업 분류 실패: {e}, 기본값 사용")
+        industry = "Technology"
 
-        prompt = f"""Based on this document, identify the industry category in 2-3 words:
+    # 2. Tavily 검색 도구 초기화
+    tavily_tool = TavilySearch(max_results=5)
 
-{context[:1000]}
+    # 3. 3가지 뉴스 쿼리 실행
+    news_categories = {
+        category: _search_news(tavily_tool, category, query)
+        for category, query in _news_queries(industry).items()
+    }
 
-Return ONLY the industry name (e.g., "Healthcare AI", "Fintech", "E-commerce SaaS")"""
+    return _industry_news_result(industry, news_categories)
+
+
+async def asearch_industry_news(state: MarketAnalysisState) -> Dict:
+    """
+    [노드 1.5: 산업 뉴스 검색] 비동기 버전
+
+    산업 분류는 ainvoke로, 3가지 뉴스 쿼리는 동시에 실행합니다.
+    (TavilySearch는 동기 클라이언트라 쿼리마다 워커 스레드에서 실행)
+    """
+
+    print("\n" + "="*60)
+    print(" [MarketAgent] 산업 뉴스 검색 시작")
+    print("="*60)
+
+    retriever = state["retriever"]
 
-        industry = llm.invoke(prompt).content.strip()
+    if retriever is None:
+        print(" [WARNING] Retriever가 없어 산업 분류를 건너뜁니다.")
+        return _industry_news_result("General", {})
+
+    try:
+        first_docs = await retriever.ainvoke(INDUSTRY_QUERY)
+        industry = (await _llm().ainvoke(_industry_prompt(first_docs))).content.strip()
         print(f"\n [산업 분류] {industry}")
 
     except Exception as e:
         print(f" [WARNING] 산업 분류 실패: {e}, 기본값 사용")
         industry = "Technology"
 
-    # 2. Tavily 검색 도구 초기화
     tavily_tool = TavilySearch(max_results=5)
+    queries = _news_queries(industry)
+    results = await asyncio.gather(*(
+        asyncio.to_thread(_search_news, tavily_tool, category, query)
+        for category, query in queries.items()
+    ))
 
-    # 3. 3가지 뉴스 쿼리 실행
-    news_queries = {
+    return _industry_news_result(industry, dict(zip(queries, results)))
+
+
+def _llm():
+    """공용 레지스트리의 gpt-4o-mini (시장성 평가 캐시 네임스페이스)"""
+    return get_chat_model("gpt-4o-mini", temperature=0, namespace=LLM_NAMESPACE)
+
+
+def _industry_prompt(first_docs) -> str:
+    """첫 검색 결과로 산업 카테고리를 묻는 프롬프트"""
+    from jm.utils.rag_tools import format_docs
+    context = format_docs(first_docs)
+
+    return f"""Based on this document, identify the industry category in 2-3 words:
+
+{context[:1000]}
+
+Return ONLY the industry name (e.g., "Healthcare AI", "Fintech", "E-commerce SaaS")"""
+
+
+def _news_queries(industry: str) -> Dict[str, str]:
+    """뉴스 카테고리 → 검색 쿼리"""
+    return {
         "market_trends": f"{industry} market trends growth 2025",
         "competitor_moves": f"{industry} startup funding investment news",
         "regulatory_changes": f"{industry} regulation policy changes"
     }
 
-    industry_news = {
-        "industry": industry,
-        "search_date": "2025-10-13",
-        "news_categories": {}
-    }
 
-    for category, query in news_queries.items():
-        print(f"\n [뉴스 검색] {category}: {query}")
+def _search_news(tavily_tool, category: str, query: str) -> list:
+    """뉴스 카테고리 하나 검색 (실패 시 빈 리스트)"""
+    print(f"\n [뉴스 검색] {category}: {query}")
 
-        try:
+    try:
+        with track_call("tool", "tavily_news"), rate_limited("tavily"):
             search_results = tavily_tool.search(
                 query=query,
                 topic="news",           # 뉴스 주제로 한정
@@ -145,21 +233,27 @@ Return ONLY the industry name (e.g., "Healthcare AI", "Fintech", "E-commerce Saa
                 max_results=5,          # 각 카테고리당 5개
                 format_output=True      # 포맷팅된 출력
             )
+        print(f" ✅ {len(search_results)}개 뉴스 수집 완료")
+        return search_results
 
-            industry_news["news_categories"][category] = search_results
-            print(f" ✅ {len(search_results)}개 뉴스 수집 완료")
+    except Exception as e:
+        print(f" ⚠️ {category} 검색 실패: {e}")
+        return []
 
-        except Exception as e:
-            print(f" ⚠️ {category} 검색 실패: {e}")
-            industry_news["news_categories"][category] = []
 
-    # 4. 요약 통계
-    total_news = sum(len(v) for v in industry_news["news_categories"].values())
-    print(f"\n [검색 완료] 총 {total_news}개 산업 뉴스 수집")
+def _industry_news_result(industry: str, news_categories: Dict[str, list]) -> Dict:
+    """산업 뉴스 노드의 State 업데이트 (요약 통계 출력)"""
+    if news_categories:
+        total_news = sum(len(v) for v in news_categories.values())
+        print(f"\n [검색 완료] 총 {total_news}개 산업 뉴스 수집")
 
     return {
         "industry_category": industry,
-        "industry_news": industry_news
+        "industry_news": {
+            "industry": industry,
+            "search_date": "2025-10-13",
+            "news_categories": news_categories
+        }
     }
 
 
@@ -200,7 +294,8 @@ def retrieve_documents(state: MarketAnalysisState) -> Dict:
     """
     [노드 3: 검색] State에 저장된 Retriever로 문서 검색
 
-    개선점: retriever를 매번 생성하지 않고 State에서 재사용
+    개선점: retriever를 매번 생성하지 않고 State에서 재사용,
+           원래 질문은 initialize_analysis에서 일괄 검색한 결과를 조회
 
     Reference: 16-AgenticRAG/01-NaiveRAG.ipynb
     """
@@ -211,23 +306,33 @@ def retrieve_documents(state: MarketAnalysisState) -> Dict:
 
     if retriever is None:
         print(" [ERROR] Retriever가 초기화되지 않았습니다.")
-        return {"retrieved_docs": "", "is_relevant": "no"}
+        return {"retrieved_hits": [], "is_relevant": "no"}
 
     # 문서 검색 (출처 포함)
     try:
-        formatted_docs, sources = retrieve_with_sources(
-            retriever,
-            state["current_question"]
-        )
-
-        print(f" [문서 검색] {len(sources)}개 출처에서 관련 문서 검색 완료")
+        # 원래 질문은 초기화 때 일괄 검색한 결과 사용, 재작성된 질문만 새로 검색
+        hits = state.get("prefetched_retrievals", {}).get(state["current_question"])
+        if hits is None:
+            hits = retrieve_with_sources(retriever, state["current_question"])
+        sources = hit_sources(hits)
+
+        best = top_score([hit.score for hit in hits])
+        print(f" [문서 검색] {len(sources)}개 출처에서 관련 문서 검색 완료" + (f" (최고 유사도 {best:.3f})" if best is not None else ""))
         print(f"   출처: {sources[:3]}")  # 최대 3개만 출력
 
-        return {"retrieved_docs": formatted_docs}
+        # 문자열로 합치지 않고 hit 참조만 State에 저장 (포맷팅은 프롬프트 생성 시)
+        return {"retrieved_hits": hits}
 
     except Exception as e:
         print(f" [ERROR] 문서 검색 실패: {e}")
-        return {"retrieved_docs": "", "is_relevant": "no"}
+        return {"retrieved_hits": [], "is_relevant": "no"}
+
+
+async def aretrieve_documents(state: MarketAnalysisState) -> Dict:
+    """[노드 3: 검색] 비동기 버전 (일괄 검색 결과는 바로 조회, 재작성된 질문만 워커 스레드에서 검색)"""
+    if state["current_question"] in state.get("prefetched_retrievals", {}):
+        return retrieve_documents(state)
+    return await asyncio.to_thread(retrieve_documents, state)
 
 
 # ========== 노드 4: 관련성 평가 ==========
@@ -235,34 +340,103 @@ def grade_relevance(state: MarketAnalysisState) -> Dict:
     """
     [노드 4: 관련성 평가] 검색 결과가 질문과 관련 있는지 평가
 
+    검색 유사도가 충분히 높거나 낮으면 LLM 호출 없이 판정하고 (relevance_gate),
+    애매한 구간이나 점수가 없는 웹 검색 결과만 LLM으로 평가합니다.
+
     Reference: 16-AgenticRAG/02-RelevanceCheck.ipynb
     """
 
     print(f"\n⚖️ [관련성 평가] 검색 결과 평가 중...")
 
-    # GroundednessChecker 생성 (02-RelevanceCheck.ipynb 패턴)
-    checker = GroundednessChecker(
-        # LLM을 함수 내에서 초기화
-        llm=ChatOpenAI(model="gpt-4o-mini", temperature=0),
+    question = state["current_question"]
+    hits = state["retrieved_hits"]
+    scores = [hit.score for hit in hits]
+    decision = gate_decision(scores) if RAG_RELEVANCE_GATE else LLM
+
+    if decision != LLM:
+        # 보정용 표본: 일부 게이트 판정은 LLM 평가도 함께 기록
+        verdict = _llm_relevance(question, hits) if should_audit() else None
+        return _gated_relevance(question, scores, decision, verdict)
+
+    return _graded_relevance(question, scores, _llm_relevance(question, hits))
+
+
+async def agrade_relevance(state: MarketAnalysisState) -> Dict:
+    """[노드 4: 관련성 평가] 비동기 버전 (게이트 판정은 동일, LLM 평가만 ainvoke)"""
+
+    print(f"\n⚖️ [관련성 평가] 검색 결과 평가 중...")
+
+    question = state["current_question"]
+    hits = state["retrieved_hits"]
+    scores = [hit.score for hit in hits]
+    decision = gate_decision(scores) if RAG_RELEVANCE_GATE else LLM
+
+    if decision != LLM:
+        verdict = await _allm_relevance(question, hits) if should_audit() else None
+        return _gated_relevance(question, scores, decision, verdict)
+
+    return _graded_relevance(question, scores, await _allm_relevance(question, hits))
+
+
+def _gated_relevance(question: str, scores, decision: str, verdict) -> Dict:
+    """유사도 게이트 판정 결과 기록 (verdict: 보정용 LLM 평가, 표본이 아니면 None)"""
+    relevance = "yes" if decision == ACCEPT else "no"
+    log_gate_decision(question, scores, decision, verdict)
+    print(f" [관련성 평가] 유사도 게이트 판정: {relevance} (최고 유사도 {top_score(scores):.3f}, LLM 호출 생략)")
+    return {"is_relevant": relevance}
+
+
+def _graded_relevance(question: str, scores, relevance) -> Dict:
+    """LLM 평가 결과 기록 (실패(None)는 "no"로 처리)"""
+    log_gate_decision(question, scores, LLM, relevance)
+    if relevance is None:
+        return {"is_relevant": "no"}
+
+    print(f" [관련성 평가] 결과: {relevance}")
+
+    return {"is_relevant": relevance}
+
+
+def _relevance_checker():
+    """GroundednessChecker 체인 (02-RelevanceCheck.ipynb 패턴)"""
+    return GroundednessChecker(
+        # 공용 레지스트리의 LLM (커넥션 풀 재사용)
+        llm=_llm(),
         target="question-retrieval"
     ).create()
 
+
+def _llm_relevance(question: str, hits):
+    """GroundednessChecker LLM 평가 ("yes" | "no", 실패 시 None)"""
+
     try:
         # 관련성 체크
-        response = checker.invoke({
-            "question": state["current_question"],
-            "context": state["retrieved_docs"]
+        response = _relevance_checker().invoke({
+            "question": question,
+            "context": format_hits(hits)
         })
 
-        relevance = response.score  # "yes" or "no"
+        return response.score  # "yes" or "no"
+
+    except Exception as e:
+        print(f" [ERROR] 관련성 평가 실패: {e}")
+        return None
 
-        print(f" [관련성 평가] 결과: {relevance}")
 
-        return {"is_relevant": relevance}
+async def _allm_relevance(question: str, hits):
+    """_llm_relevance의 비동기 버전"""
+
+    try:
+        response = await _relevance_checker().ainvoke({
+            "question": question,
+            "context": format_hits(hits)
+        })
+
+        return response.score
 
     except Exception as e:
         print(f" [ERROR] 관련성 평가 실패: {e}")
-        return {"is_relevant": "no"}
+        return None
 
 
 # ========== 노드 5: 질문 재작성 ==========
@@ -275,34 +449,51 @@ def rewrite_question(state: MarketAnalysisState) -> Dict:
 
     print(f"\n [질문 재작성] 재작성 시도 중... (횟수: {state['rewrite_count'] + 1})")
 
-    # Query Rewrite 프롬프트
-    rewrite_prompt = get_query_rewrite_prompt()
-    question_rewriter = (
-        rewrite_prompt |
-        ChatOpenAI(model="gpt-4o-mini", temperature=0) | # LLM을 함수 내에서 초기화
-        StrOutputParser()
-    )
-
     try:
         # 질문 재작성
-        rewritten_question = question_rewriter.invoke({
+        rewritten_question = _question_rewriter().invoke({
             "question": state["current_question"]
         })
+        return _rewritten(state, rewritten_question)
+
+    except Exception as e:
+        print(f" [ERROR] 질문 재작성 실패: {e}")
+        return {"rewrite_count": state["rewrite_count"] + 1}
 
-        print(f"✅ [질문 재작성] 완료")
-        print(f"   원본: {state['current_question'][:50]}...")
-        print(f"   재작성: {rewritten_question[:50]}...")
 
-        return {
-            "current_question": rewritten_question,
-            "rewrite_count": state["rewrite_count"] + 1
-        }
+async def arewrite_question(state: MarketAnalysisState) -> Dict:
+    """[노드 5: 질문 재작성] 비동기 버전"""
+
+    print(f"\n [질문 재작성] 재작성 시도 중... (횟수: {state['rewrite_count'] + 1})")
+
+    try:
+        rewritten_question = await _question_rewriter().ainvoke({
+            "question": state["current_question"]
+        })
+        return _rewritten(state, rewritten_question)
 
     except Exception as e:
         print(f" [ERROR] 질문 재작성 실패: {e}")
         return {"rewrite_count": state["rewrite_count"] + 1}
 
 
+def _question_rewriter():
+    """Query Rewrite 체인 (공용 레지스트리의 LLM, 커넥션 풀 재사용)"""
+    return get_query_rewrite_prompt() | _llm() | StrOutputParser()
+
+
+def _rewritten(state: MarketAnalysisState, rewritten_question: str) -> Dict:
+    """재작성된 질문으로 State 업데이트"""
+    print(f"✅ [질문 재작성] 완료")
+    print(f"   원본: {state['current_question'][:50]}...")
+    print(f"   재작성: {rewritten_question[:50]}...")
+
+    return {
+        "current_question": rewritten_question,
+        "rewrite_count": state["rewrite_count"] + 1
+    }
+
+
 # ========== 노드 6: 웹 검색 Fallback ==========
 def web_search_fallback(state: MarketAnalysisState) -> Dict:
     """
@@ -317,31 +508,37 @@ def web_search_fallback(state: MarketAnalysisState) -> Dict:
 
     try:
         # 웹 검색 실행
-        search_results = tavily_tool.search(
-            query=state["current_question"],
-            topic="general",
-            max_results=3,
-            format_output=True
-        )
+        with track_call("tool", "tavily_web"), rate_limited("tavily"):
+            search_results = tavily_tool.search(
+                query=state["current_question"],
+                topic="general",
+                max_results=3,
+                format_output=True
+            )
 
-        # 검색 결과를 문서 형식으로 변환
-        web_docs = "\n\n".join(search_results)
+        # 검색 결과를 점수 없는 hit으로 변환 (유사도가 없으므로 관련성은 LLM으로 평가)
+        web_hits = [RetrievalHit.from_text(result, source="web") for result in search_results]
 
         print(f" [웹 검색] 완료 (검색 결과 {len(search_results)}개)")
 
         return {
-            "retrieved_docs": web_docs,
+            "retrieved_hits": web_hits,
             "fallback_attempted": True
         }
 
     except Exception as e:
         print(f" [ERROR] 웹 검색 실패: {e}")
         return {
-            "retrieved_docs": "",
+            "retrieved_hits": [],
             "fallback_attempted": True
         }
 
 
+async def aweb_search_fallback(state: MarketAnalysisState) -> Dict:
+    """[노드 6: 웹 검색] 비동기 버전 (TavilySearch는 동기 클라이언트라 워커 스레드에서 실행)"""
+    return await asyncio.to_thread(web_search_fallback, state)
+
+
 # ========== 노드 7: 답변 생성 ==========
 def generate_answer(state: MarketAnalysisState) -> Dict:
     """
@@ -352,8 +549,32 @@ def generate_answer(state: MarketAnalysisState) -> Dict:
 
     print(f"\n💬 [답변 생성] LLM 답변 생성 중...")
 
-    # 답변 생성 프롬프트
-    answer_prompt = f"""너는 스타트업 투자 분석 전문가야.
+    try:
+        response = _llm().invoke(_answer_prompt(state))
+        return _answered(state, response.content)
+
+    except Exception as e:
+        print(f" [ERROR] 답변 생성 실패: {e}")
+        return {}
+
+
+async def agenerate_answer(state: MarketAnalysisState) -> Dict:
+    """[노드 7: 답변 생성] 비동기 버전"""
+
+    print(f"\n💬 [답변 생성] LLM 답변 생성 중...")
+
+    try:
+        response = await _llm().ainvoke(_answer_prompt(state))
+        return _answered(state, response.content)
+
+    except Exception as e:
+        print(f" [ERROR] 답변 생성 실패: {e}")
+        return {}
+
+
+def _answer_prompt(state: MarketAnalysisState) -> str:
+    """답변 생성 프롬프트"""
+    return f"""너는 스타트업 투자 분석 전문가야.
 주어진 문서에서 정확한 정보만 추출해서 질문에 답변해.
 
 **중요**: 반드시 출처(페이지 번호, 섹션 등)를 명시해야 해.
@@ -361,42 +582,38 @@ def generate_answer(state: MarketAnalysisState) -> Dict:
 질문: {state['current_question']}
 
 관련 문서:
-{state['retrieved_docs']}
+{format_hits(state['retrieved_hits'])}
 
 답변 형식:
 - 답변 내용 (구체적인 수치, 데이터 포함)
 - 출처: [출처 정보]
 """
 
-    try:
-        response = ChatOpenAI(model="gpt-4o-mini", temperature=0).invoke(answer_prompt)
-        answer = response.content
-
-        print(f" [답변 생성] 완료")
-        print(f"   답변 미리보기: {answer[:100]}...")
-
-        # 현재 질문의 키 추출
-        current_idx = state["current_question_idx"]
-        question_key = state["sub_questions"][current_idx]["key"]
-
-        # bessemer_answers에 저장
-        bessemer_answers = state["bessemer_answers"]
-        bessemer_answers[question_key] = {
-            "question": state["current_question"],
-            "answer": answer,
-            "rewrite_count": state["rewrite_count"],
-            "fallback_used": state["fallback_attempted"],
-            "status": "success"
-        }
 
-        return {
-            "bessemer_answers": bessemer_answers,
-            "current_question_idx": state["current_question_idx"] + 1  # 다음 질문으로
-        }
+def _answered(state: MarketAnalysisState, answer: str) -> Dict:
+    """답변을 bessemer_answers에 저장하고 다음 질문으로 이동"""
+    print(f" [답변 생성] 완료")
+    print(f"   답변 미리보기: {answer[:100]}...")
 
-    except Exception as e:
-        print(f" [ERROR] 답변 생성 실패: {e}")
-        return {}
+    # 현재 질문의 키 추출
+    current_idx = state["current_question_idx"]
+    question_key = state["sub_questions"][current_idx]["key"]
+
+    # bessemer_answers에 저장
+    bessemer_answers = state["bessemer_answers"]
+    bessemer_answers[question_key] = {
+        "question": state["current_question"],
+        "answer": answer,
+        "sources": hit_sources(state["retrieved_hits"]),
+        "rewrite_count": state["rewrite_count"],
+        "fallback_used": state["fallback_attempted"],
+        "status": "success"
+    }
+
+    return {
+        "bessemer_answers": bessemer_answers,
+        "current_question_idx": state["current_question_idx"] + 1  # 다음 질문으로
+    }
 
 
 # ========== 노드 8: 질문 스킵 (실패 케이스 처리) ==========
@@ -441,7 +658,43 @@ def calculate_scorecard(state: MarketAnalysisState) -> Dict:
     print("📊 [Scorecard] 시장성 점수 계산 중...")
     print("="*60)
 
-    # Bessemer 답변 종합
+    try:
+        response = _llm().invoke(_scorecard_prompt(state))
+        return _scored(response.content)
+
+    except Exception as e:
+        print(f" [ERROR] Scorecard 계산 실패: {e}")
+        return {
+            "scorecard_result": {
+                "market_score": 100,
+                "error": str(e)
+            }
+        }
+
+
+async def acalculate_scorecard(state: MarketAnalysisState) -> Dict:
+    """[노드 9: 점수 계산] 비동기 버전"""
+
+    print("\n" + "="*60)
+    print("📊 [Scorecard] 시장성 점수 계산 중...")
+    print("="*60)
+
+    try:
+        response = await _llm().ainvoke(_scorecard_prompt(state))
+        return _scored(response.content)
+
+    except Exception as e:
+        print(f" [ERROR] Scorecard 계산 실패: {e}")
+        return {
+            "scorecard_result": {
+                "market_score": 100,
+                "error": str(e)
+            }
+        }
+
+
+def _scorecard_prompt(state: MarketAnalysisState) -> str:
+    """Bessemer 답변을 종합한 Scorecard 평가 프롬프트"""
     bessemer_answers = state["bessemer_answers"]
 
     market_data = f"""
@@ -455,45 +708,33 @@ def calculate_scorecard(state: MarketAnalysisState) -> Dict:
 {bessemer_answers.get('business_model', {}).get('answer', 'N/A')}
 """
 
-    # Scorecard 평가 프롬프트
-    scorecard_prompt = get_scorecard_prompt()
-    evaluation_prompt = scorecard_prompt.format(market_data=market_data)
+    return get_scorecard_prompt().format(market_data=market_data)
 
-    try:
-        response = ChatOpenAI(model="gpt-4o-mini", temperature=0).invoke(evaluation_prompt)
-        evaluation_text = response.content
 
-        # 점수 파싱 (정규표현식)
-        score_match = re.search(r"점수:\s*(\d+)점", evaluation_text)
-        market_score = int(score_match.group(1)) if score_match else 100
+def _scored(evaluation_text: str) -> Dict:
+    """Scorecard 평가 응답에서 점수 / 근거 파싱"""
+    # 점수 파싱 (정규표현식)
+    score_match = re.search(r"점수:\s*(\d+)점", evaluation_text)
+    market_score = int(score_match.group(1)) if score_match else 100
 
-        # 근거 추출
-        reasoning_match = re.search(r"근거:(.*)", evaluation_text, re.DOTALL)
-        reasoning = reasoning_match.group(1).strip() if reasoning_match else evaluation_text
+    # 근거 추출
+    reasoning_match = re.search(r"근거:(.*)", evaluation_text, re.DOTALL)
+    reasoning = reasoning_match.group(1).strip() if reasoning_match else evaluation_text
 
-        print(f"\n✅ [Scorecard] 계산 완료")
-        print(f"   시장성 점수: {market_score}점 (비중 25%)")
-        print(f"   근거: {reasoning[:100]}...")
+    print(f"\n✅ [Scorecard] 계산 완료")
+    print(f"   시장성 점수: {market_score}점 (비중 25%)")
+    print(f"   근거: {reasoning[:100]}...")
 
-        scorecard_result = {
-            "market_score": market_score,
-            "weight_percentage": 25,
-            "weighted_contribution": market_score * 0.25,
-            "reasoning": reasoning,
-            "evaluation_method": "Scorecard Valuation Method",
-            "evaluation_date": "2025-04-16"
-        }
-
-        return {"scorecard_result": scorecard_result}
+    scorecard_result = {
+        "market_score": market_score,
+        "weight_percentage": 25,
+        "weighted_contribution": market_score * 0.25,
+        "reasoning": reasoning,
+        "evaluation_method": "Scorecard Valuation Method",
+        "evaluation_date": "2025-04-16"
+    }
 
-    except Exception as e:
-        print(f" [ERROR] Scorecard 계산 실패: {e}")
-        return {
-            "scorecard_result": {
-                "market_score": 100,
-                "error": str(e)
-            }
-        }
+    return {"scorecard_result": scorecard_result}
 
 
 # ========== 노드 9.5: 산업 인사이트 분석 (v0.3.0) ==========
@@ -513,20 +754,44 @@ def analyze_industry_insights(state: MarketAnalysisState) -> Dict:
     print(" [MarketAgent] 산업 인사이트 분석 시작")
     print("="*60)
 
+    prompt = _insights_prompt(state)
+    if prompt is None:
+        return _no_insights(state)
+
+    try:
+        return _insights(state, _llm().invoke(prompt).content)
+
+    except Exception as e:
+        return _insights_failed(state, e)
+
+
+async def aanalyze_industry_insights(state: MarketAnalysisState) -> Dict:
+    """[노드 9.5: 산업 인사이트 분석] 비동기 버전"""
+
+    print("\n" + "="*60)
+    print(" [MarketAgent] 산업 인사이트 분석 시작")
+    print("="*60)
+
+    prompt = _insights_prompt(state)
+    if prompt is None:
+        return _no_insights(state)
+
+    try:
+        return _insights(state, (await _llm().ainvoke(prompt)).content)
+
+    except Exception as e:
+        return _insights_failed(state, e)
+
+
+def _insights_prompt(state: MarketAnalysisState):
+    """산업 뉴스 + Bessemer 답변 요약 프롬프트 (수집된 뉴스가 없으면 None)"""
     industry_news = state.get("industry_news", {})
     industry_category = state.get("industry_category", "Unknown")
     bessemer_answers = state["bessemer_answers"]
 
     # 뉴스가 없으면 스킵
     if not industry_news or not industry_news.get("news_categories"):
-        print(" [WARNING] 수집된 뉴스가 없어 인사이트 분석을 건너뜁니다.")
-        return {
-            "industry_insights": {
-                "summary": "산업 뉴스 데이터 부족으로 인사이트 분석 불가",
-                "news_count": 0,
-                "analysis_date": industry_news.get("search_date", "N/A")
-            }
-        }
+        return None
 
     # 뉴스 텍스트 통합
     all_news_text = []
@@ -541,10 +806,7 @@ def analyze_industry_insights(state: MarketAnalysisState) -> Dict:
     market_size_answer = bessemer_answers.get('market_size', {}).get('answer', 'N/A')[:200]
     differentiation_answer = bessemer_answers.get('differentiation', {}).get('answer', 'N/A')[:200]
 
-    # LLM 프롬프트
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-
-    prompt = f"""너는 벤처 투자 전문가야. 아래 산업 뉴스를 분석하고, 투자 관점에서 핵심 인사이트 3가지를 추출해줘.
+    return f"""너는 벤처 투자 전문가야. 아래 산업 뉴스를 분석하고, 투자 관점에서 핵심 인사이트 3가지를 추출해줘.
 
 ## 분석 대상 스타트업 정보
 - 산업: {industry_category}
@@ -562,29 +824,45 @@ def analyze_industry_insights(state: MarketAnalysisState) -> Dict:
 **투자 타이밍 평가**: [현재 시장 상황이 이 스타트업 투자에 유리한지 2줄로 평가]
 """
 
-    try:
-        insights = llm.invoke(prompt).content
 
-        print(f"\n✅ [인사이트 분석 완료]")
-        print(f"   {insights[:150]}...")
+def _no_insights(state: MarketAnalysisState) -> Dict:
+    """수집된 뉴스가 없을 때의 인사이트 결과"""
+    print(" [WARNING] 수집된 뉴스가 없어 인사이트 분석을 건너뜁니다.")
+    return {
+        "industry_insights": {
+            "summary": "산업 뉴스 데이터 부족으로 인사이트 분석 불가",
+            "news_count": 0,
+            "analysis_date": state.get("industry_news", {}).get("search_date", "N/A")
+        }
+    }
 
-        return {
-            "industry_insights": {
-                "summary": insights,
-                "news_count": sum(len(v) for v in industry_news["news_categories"].values()),
-                "analysis_date": industry_news["search_date"]
-            }
+
+def _insights(state: MarketAnalysisState, insights: str) -> Dict:
+    """LLM 인사이트를 State에 저장"""
+    industry_news = state["industry_news"]
+
+    print(f"\n✅ [인사이트 분석 완료]")
+    print(f"   {insights[:150]}...")
+
+    return {
+        "industry_insights": {
+            "summary": insights,
+            "news_count": sum(len(v) for v in industry_news["news_categories"].values()),
+            "analysis_date": industry_news["search_date"]
         }
+    }
 
-    except Exception as e:
-        print(f" [ERROR] 인사이트 분석 실패: {e}")
-        return {
-            "industry_insights": {
-                "summary": f"인사이트 분석 중 오류 발생: {str(e)}",
-                "news_count": 0,
-                "analysis_date": industry_news.get("search_date", "N/A")
-            }
+
+def _insights_failed(state: MarketAnalysisState, error: Exception) -> Dict:
+    """인사이트 분석 실패 결과"""
+    print(f" [ERROR] 인사이트 분석 실패: {error}")
+    return {
+        "industry_insights": {
+            "summary": f"인사이트 분석 중 오류 발생: {str(error)}",
+            "news_count": 0,
+            "analysis_date": state.get("industry_news", {}).get("search_date", "N/A")
         }
+    }
 
 
 # ========== 노드 10: 최종 보고서 생성 ==========
@@ -620,6 +898,18 @@ def finalize_report(state: MarketAnalysisState) -> Dict:
         }
     }
 
+    # 검색 품질 지표: 질문당 재작성/웹 검색 횟수 (dense vs 하이브리드 비교용)
+    answers = state["bessemer_answers"].values()
+    total_rewrites = sum(ans.get("rewrite_count", 0) for ans in answers)
+    web_fallbacks = sum(1 for ans in answers if ans.get("fallback_used"))
+    final_report["retrieval_stats"] = {
+        "retrieval_mode": "hybrid" if isinstance(state["retriever"], HybridRetriever) else "dense",
+        "questions": len(answers),
+        "total_rewrites": total_rewrites,
+        "web_fallbacks": web_fallbacks,
+        "rewrites_per_question": round(total_rewrites / len(answers), 2) if answers else 0.0,
+    }
+
     # 🆕 v0.3.0: 산업 뉴스 인텔리전스 섹션 추가
     industry_news = state.get("industry_news", {})
     industry_insights = state.get("industry_insights", {})
@@ -656,5 +946,9 @@ def finalize_report(state: MarketAnalysisState) -> Dict:
     print(f"   실패: {final_report['summary']['failed_count']}개 질문")
     print(f"   시장성 점수: {final_report['summary']['market_score']}점")
     print(f"   산업 뉴스: {final_report['industry_intelligence']['total_news_analyzed']}개 분석")
+    print(
+        f"   검색({final_report['retrieval_stats']['retrieval_mode']}): "
+        f"재작성 {total_rewrites}회, 웹 검색 {web_fallbacks}회"
+    )
 
     return {"final_report": final_report}
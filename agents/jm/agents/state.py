@@ -15,11 +15,12 @@ class MarketAnalysisState(TypedDict):
 
     # ========== RAG 엔진 (1회 구축 후 재사용) ==========
     retriever: Any                          # [생성] FAISS Retriever 객체 (BaseRetriever)
+    prefetched_retrievals: Dict[str, Any]   # [생성] Bessemer 질문 일괄 검색 결과 {질문: [RetrievalHit, ...]}
 
     # ========== 루프 제어 변수 ==========
     current_question_idx: int               # [업데이트] 현재 분석 중인 질문의 인덱스
     current_question: str                   # [업데이트] 현재 분석 중인 질문 텍스트
-    retrieved_docs: str                     # [업데이트] 검색된 문서 내용
+    retrieved_hits: List[Any]               # [업데이트] 검색 결과 RetrievalHit 목록 (청크 id, 유사도, 페이지, 위치)
     is_relevant: Literal["yes", "no"]       # [업데이트] 검색 결과 관련성 ("yes" or "no")
     rewrite_count: int                      # [업데이트] 현재 질문의 재작성 횟수 (무한 루프 방지)
     fallback_attempted: bool                # [업데이트] 웹 검색 시도 여부 (무한 루프 방지)
@@ -78,9 +79,10 @@ def create_initial_state(document_path: str, startup_name: str) -> MarketAnalysi
         startup_name=startup_name,
         sub_questions=[],
         retriever=None,
+        prefetched_retrievals={},
         current_question_idx=0,
         current_question="",
-        retrieved_docs="",
+        retrieved_hits=[],
         is_relevant="no",
         rewrite_count=0,
         fallback_attempted=False,
@@ -5,6 +5,9 @@
 
 from jm.agents.state import create_initial_state
 from jm.agents.graph import build_market_analysis_graph
+from jm.utils.llm_clients import print_llm_pool_stats
+from jm.utils.relevance_gate import print_gate_stats
+from jm.utils.retrieval_cache import print_retrieval_cache_stats
 
 
 def market_analyst_agent(startup_name: str, document_path: str) -> dict:
@@ -49,21 +52,61 @@ def market_analyst_agent(startup_name: str, document_path: str) -> dict:
         )
 
         # 4. 최종 보고서 추출
-        final_report = result.get("final_report", {})
+        return _final_report(result)
 
-        print("\n" + "="*70)
-        print(" 시장성 평가 완료!")
-        print("="*70)
+    except Exception as e:
+        return _failed_report(startup_name, e)
+
+
+async def amarket_analyst_agent(startup_name: str, document_path: str) -> dict:
+    """
+    시장성 평가 에이전트 비동기 실행 함수 (market_analyst_agent와 같은 결과)
+
+    비동기 노드로 구성한 그래프를 ainvoke하므로, 여러 스타트업 평가를
+    asyncio.gather로 한 이벤트 루프에서 동시에 실행할 수 있습니다.
+    """
+
+    print("\n" + "="*70)
+    print(f" 시장성 평가 에이전트 시작: {startup_name}")
+    print("="*70)
+
+    initial_state = create_initial_state(
+        document_path=document_path,
+        startup_name=startup_name
+    )
 
-        return final_report
+    market_graph = build_market_analysis_graph(use_async=True)
+
+    try:
+        result = await market_graph.ainvoke(
+            initial_state,
+            config={"recursion_limit": 100}
+        )
+        return _final_report(result)
 
     except Exception as e:
-        print(f"\n [ERROR] 시장성 평가 중 오류 발생: {e}")
-        return {
-            "startup_name": startup_name,
-            "error": str(e),
-            "status": "failed"
-        }
+        return _failed_report(startup_name, e)
+
+
+def _final_report(result: dict) -> dict:
+    """그래프 최종 State에서 보고서 추출"""
+    final_report = result.get("final_report", {})
+
+    print("\n" + "="*70)
+    print(" 시장성 평가 완료!")
+    print("="*70)
+
+    return final_report
+
+
+def _failed_report(startup_name: str, error: Exception) -> dict:
+    """그래프 실행 실패 시 반환할 보고서"""
+    print(f"\n [ERROR] 시장성 평가 중 오류 발생: {error}")
+    return {
+        "startup_name": startup_name,
+        "error": str(error),
+        "status": "failed"
+    }
 
 
 # 메인 그래프 State와 통합할 때 사용하는 래퍼 함수
@@ -101,6 +144,22 @@ def market_analyst_node(state: dict) -> dict:
     }
 
 
+async def amarket_analyst_node(state: dict) -> dict:
+    """market_analyst_node의 비동기 버전 (비동기 메인 그래프용)"""
+
+    startup_name = state.get("startup_name", "Unknown")
+    document_path = state.get("document_path", f"data/{startup_name}_IR.pdf")
+
+    market_analysis = await amarket_analyst_agent(
+        startup_name=startup_name,
+        document_path=document_path
+    )
+
+    return {
+        "market_analysis": market_analysis
+    }
+
+
 if __name__ == "__main__":
     # 테스트 실행
     print("시장성 평가 에이전트 테스트 실행")
@@ -113,3 +172,8 @@ if __name__ == "__main__":
 
     print("\n[테스트 결과]")
     print(test_result)
+
+    # 관련성 게이트 / 검색 캐시 / 클라이언트 풀은 프로세스 공용이라 보고서 대신 실행 종료 시 한 번 출력
+    print_llm_pool_stats()
+    print_gate_stats()
+    print_retrieval_cache_stats()
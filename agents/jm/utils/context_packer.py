@@ -0,0 +1,205 @@
+"""
+유사도 컷오프 + 토큰 예산 기반 컨텍스트 패킹
+
+format_docs는 상위 5개 청크를 그대로 이어 붙이므로 chunk_overlap=200으로 겹치는 인접 청크의
+중복 텍스트가 관련성 평가 / 답변 생성 프롬프트마다 반복해서 과금됩니다.
+검색 결과를 프롬프트에 넣기 전에 다음 순서로 정리합니다.
+
+    1. 유사도 컷오프 미만 청크 제거 (최소 1개는 유지 → 적응형 k)
+    2. 같은 페이지에서 겹치는 인접 청크를 하나로 병합 (겹친 구간은 한 번만)
+    3. 점수 순으로 토큰 예산을 채움 (예산을 넘는 블록은 건너뛰고, 첫 블록은 잘라서라도 포함)
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from jm.utils.embedding_batcher import build_token_counter
+from jm.utils.retrieval_hit import RetrievalHit
+
+# ===== 설정값 =====
+RAG_CONTEXT_PACKING = os.getenv("RAG_CONTEXT_PACKING", "true").lower() == "true"
+# 코사인 유사도가 이 값 미만인 청크는 제외 (점수를 모르는 청크는 유지)
+RAG_MIN_SIMILARITY = float(os.getenv("RAG_MIN_SIMILARITY", "0.25"))
+# 검색 결과 컨텍스트 최대 토큰 수
+RAG_CONTEXT_TOKEN_BUDGET = int(os.getenv("RAG_CONTEXT_TOKEN_BUDGET", "3000"))
+# start_index가 없는 청크에서 텍스트로 겹침을 판정할 최소 길이
+MIN_OVERLAP_CHARS = 20
+
+_SEPARATOR = "\n\n"
+
+count_tokens = build_token_counter()
+
+
+@dataclass
+class PackedContext:
+    """패킹된 컨텍스트와 절감 통계"""
+
+    text: str
+    documents: List[Document] = field(default_factory=list)
+    tokens_before: int = 0
+    tokens_after: int = 0
+    dropped: int = 0
+    merged: int = 0
+    over_budget: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+@dataclass
+class _Block:
+    text: str
+    metadata: dict
+    score: Optional[float]
+    rank: int
+    start: Optional[int]
+
+    @property
+    def end(self) -> Optional[int]:
+        return None if self.start is None else self.start + len(self.text)
+
+
+def _sort_score(score: Optional[float]) -> float:
+    return float("-inf") if score is None else score
+
+
+def _max_score(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def text_overlap(left: str, right: str, max_chars: int = 1000) -> int:
+    """left의 끝과 right의 시작이 겹치는 글자 수 (MIN_OVERLAP_CHARS 미만이면 0)"""
+    limit = min(len(left), len(right), max_chars)
+    for size in range(limit, MIN_OVERLAP_CHARS - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def _try_merge(left: _Block, right: _Block) -> Optional[_Block]:
+    """left 뒤에 right가 이어지면 병합한 블록, 아니면 None"""
+    if left.start is not None and right.start is not None:
+        if right.start < left.start or right.start > left.end:
+            return None
+        if right.end <= left.end:
+            # right가 left 안에 완전히 포함됨
+            text = left.text
+        else:
+            text = left.text + right.text[left.end - right.start:]
+    else:
+        size = text_overlap(left.text, right.text)
+        if size == 0:
+            return None
+        text = left.text + right.text[size:]
+
+    return _Block(
+        text=text,
+        metadata=left.metadata,
+        score=_max_score(left.score, right.score),
+        rank=min(left.rank, right.rank),
+        start=left.start,
+    )
+
+
+def _merge_neighbours(blocks: List[_Block]) -> Tuple[List[_Block], int]:
+    """같은 (source, page)의 겹치는 청크 병합 → (블록 목록, 병합 횟수)"""
+    groups = {}
+    for block in blocks:
+        key = (block.metadata.get("source"), block.metadata.get("page"))
+        groups.setdefault(key, []).append(block)
+
+    merged_blocks = []
+    merges = 0
+    for group in groups.values():
+        if all(block.start is not None for block in group):
+            group.sort(key=lambda block: block.start)
+        pending = list(group)
+        # 텍스트 겹침 판정은 순서를 모르므로 병합이 더 없을 때까지 양방향으로 시도
+        changed = True
+        while changed and len(pending) > 1:
+            changed = False
+            for i in range(len(pending)):
+                for j in range(len(pending)):
+                    if i == j:
+                        continue
+                    combined = _try_merge(pending[i], pending[j])
+                    if combined is not None:
+                        pending = [b for n, b in enumerate(pending) if n not in (i, j)] + [combined]
+                        merges += 1
+                        changed = True
+                        break
+                if changed:
+                    break
+        merged_blocks.extend(pending)
+    return merged_blocks, merges
+
+
+def pack_context(
+    hits: Sequence[RetrievalHit],
+    min_score: float = RAG_MIN_SIMILARITY,
+    token_budget: int = RAG_CONTEXT_TOKEN_BUDGET,
+) -> PackedContext:
+    """
+    검색 결과를 프롬프트용 컨텍스트로 패킹
+
+    Args:
+        hits: 검색 순위 순서의 RetrievalHit
+        min_score: 유사도 컷오프
+        token_budget: 최대 토큰 수 (0 이하면 제한 없음)
+
+    Returns:
+        PackedContext: 패킹된 텍스트, 포함된 블록 Document, 토큰 절감 통계
+    """
+    if not hits:
+        return PackedContext(text="")
+
+    tokens_before = count_tokens(_SEPARATOR.join(hit.text for hit in hits))
+
+    # 1. 유사도 컷오프 (모두 미달이면 최상위 1개만 유지)
+    kept = [(rank, hit) for rank, hit in enumerate(hits) if hit.score is None or hit.score >= min_score]
+    if not kept:
+        best = max(range(len(hits)), key=lambda i: _sort_score(hits[i].score))
+        kept = [(best, hits[best])]
+    dropped = len(hits) - len(kept)
+
+    # 2. 겹치는 인접 청크 병합
+    blocks = [_Block(hit.text, hit.document.metadata, hit.score, rank, hit.start) for rank, hit in kept]
+    blocks, merged = _merge_neighbours(blocks)
+
+    # 3. 점수 순(동점은 검색 순위 순)으로 토큰 예산 채우기
+    blocks.sort(key=lambda block: (-_sort_score(block.score), block.rank))
+    selected: List[_Block] = []
+    used = 0
+    over_budget = 0
+    for block in blocks:
+        tokens = count_tokens(block.text)
+        if token_budget > 0 and used + tokens > token_budget:
+            if not selected:
+                # 첫 블록이 예산보다 크면 예산에 맞게 비율로 자름
+                block.text = block.text[:max(1, len(block.text) * token_budget // tokens)]
+                selected.append(block)
+                used = count_tokens(block.text)
+            else:
+                over_budget += 1
+            continue
+        selected.append(block)
+        used += tokens
+
+    text = _SEPARATOR.join(block.text for block in selected)
+    return PackedContext(
+        text=text,
+        documents=[Document(page_content=block.text, metadata=block.metadata) for block in selected],
+        tokens_before=tokens_before,
+        tokens_after=count_tokens(text),
+        dropped=dropped,
+        merged=merged,
+        over_budget=over_budget,
+    )
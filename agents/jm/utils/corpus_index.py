@@ -0,0 +1,445 @@
+"""
+증분(incremental) 다중 문서 코퍼스 인덱스
+
+기술 요약 에이전트는 import 시점에 하드코딩된 file_path 목록 전체로 인덱스를 새로 만들었기 때문에
+백서 하나를 추가해도 전부 다시 임베딩하고, 프로세스가 뜰 때마다 전체 구축 비용을 냈습니다.
+CorpusIndex는 PDF 단위로 추가/삭제(add_documents / delete 의미)를 지원하고,
+무엇이 인덱싱되어 있는지 manifest로 관리하며 디스크에 유지되므로 시작 시에는 로딩만 합니다.
+
+저장 구조 (RAG_CACHE_DIR/corpus/<name>/):
+    index.faiss    FAISS IndexIDMap2(IndexFlatIP) — 정규화 벡터, id = 청크 row id
+                   (청크가 많아지면 IVF로 전환, IVF는 row id를 직접 저장하고 삭제도 지원)
+    docstore.pkl   row id → Document
+    manifest.json  설정 + 문서별 (해시, row id 목록, 메타데이터)
+"""
+
+import json
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from jm.utils.embedding_cache import embed_queries
+from jm.utils.index_cache import RAG_CACHE_DIR, file_sha256, temp_path
+from jm.utils.index_factory import ann_kind, build_index, choose_ann, factory_string, tune_index
+from jm.utils.ingestion import create_text_splitter, iter_chunk_batches, iter_pdf_pages
+
+MANIFEST_VERSION = 1
+
+
+class CorpusIndex:
+    """
+    PDF 단위로 추가/삭제 가능한 영속 벡터 인덱스
+
+    Args:
+        name: 코퍼스 이름 (저장 디렉터리명)
+        embeddings: 청크/질의 임베딩에 사용할 Embeddings
+        embedding_model: manifest에 기록할 임베딩 모델명 (바뀌면 인덱스 재구축)
+        chunk_size / chunk_overlap: 청크 설정 (바뀌면 인덱스 재구축)
+        engine: PDF 텍스트 추출 엔진 ("pypdf" | "pdfplumber")
+        root: 저장 루트 디렉터리 (기본값: RAG_CACHE_DIR/corpus)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        embeddings: Embeddings,
+        embedding_model: str,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        engine: str = "pypdf",
+        root: Optional[str] = None,
+    ):
+        self.name = name
+        self.embeddings = embeddings
+        self.embedding_model = embedding_model
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.engine = engine
+        self.path = Path(root or Path(RAG_CACHE_DIR) / "corpus") / name
+        self._lock = threading.RLock()
+        self._reset()
+
+    # ========== 생성 / 로딩 / 저장 ==========
+
+    @classmethod
+    def open(cls, name: str, embeddings: Embeddings, embedding_model: str, **kwargs) -> "CorpusIndex":
+        """저장된 코퍼스가 있으면 로딩, 없거나 설정이 다르면 빈 코퍼스 생성"""
+        corpus = cls(name, embeddings, embedding_model, **kwargs)
+        corpus._load()
+        return corpus
+
+    def _reset(self) -> None:
+        self.index = None
+        self.docstore: Dict[int, Document] = {}
+        self.manifest = {
+            "version": MANIFEST_VERSION,
+            "embedding_model": self.embedding_model,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "engine": self.engine,
+            "dim": None,
+            "next_id": 0,
+            "revision": 0,
+            "documents": {},
+        }
+
+    def _settings_match(self, manifest: dict) -> bool:
+        return all(
+            manifest.get(key) == self.manifest[key]
+            for key in ("version", "embedding_model", "chunk_size", "chunk_overlap", "engine")
+        )
+
+    def _load(self) -> None:
+        manifest_file = self.path / "manifest.json"
+        if not manifest_file.exists():
+            return
+
+        import faiss
+
+        with open(manifest_file, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        if not self._settings_match(manifest):
+            print(f"⚠️ [Corpus:{self.name}] 임베딩/청크 설정이 바뀌어 인덱스를 새로 구축합니다.")
+            return
+
+        try:
+            index = faiss.read_index(str(self.path / "index.faiss")) if manifest["dim"] else None
+            if index is not None:
+                tune_index(index)
+            with open(self.path / "docstore.pkl", "rb") as f:
+                docstore = pickle.load(f)
+        except Exception as e:
+            print(f"⚠️ [Corpus:{self.name}] 인덱스 로딩 실패, 새로 구축합니다: {e}")
+            return
+
+        self.index, self.docstore, self.manifest = index, docstore, manifest
+        print(f"⚡ [Corpus:{self.name}] 인덱스 로딩: 문서 {len(self.manifest['documents'])}개, 청크 {len(self)}개")
+
+    def save(self) -> None:
+        """인덱스/docstore/manifest 저장 (manifest를 마지막에 교체)"""
+        import faiss
+
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            if self.index is not None:
+                tmp = temp_path(self.path / "index.faiss")
+                faiss.write_index(self.index, str(tmp))
+                os.replace(tmp, self.path / "index.faiss")
+            tmp = temp_path(self.path / "docstore.pkl")
+            with open(tmp, "wb") as f:
+                pickle.dump(self.docstore, f)
+            os.replace(tmp, self.path / "docstore.pkl")
+            tmp = temp_path(self.path / "manifest.json")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path / "manifest.json")
+
+    # ========== 문서 추가 / 삭제 ==========
+
+    def __len__(self) -> int:
+        return len(self.docstore)
+
+    @property
+    def documents(self) -> Dict[str, dict]:
+        """인덱싱된 문서 manifest (절대 경로 → 정보)"""
+        return self.manifest["documents"]
+
+    @property
+    def revision(self) -> int:
+        """추가/삭제가 일어날 때마다 증가하는 인덱스 버전"""
+        return self.manifest["revision"]
+
+    def _ensure_index(self, dim: int) -> None:
+        import faiss
+
+        if self.index is None:
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+            self.manifest["dim"] = dim
+
+    def _maybe_upgrade_index(self) -> None:
+        """
+        청크 수가 RAG_ANN_FLAT_MAX를 넘으면 flat 인덱스를 IVF로 전환
+
+        삭제를 지원해야 하므로 HNSW 대신 IVF를 사용하고, 중심은 현재 코퍼스로 학습합니다.
+        이후 추가되는 청크는 가장 가까운 기존 중심에 배정됩니다.
+        """
+        import faiss
+
+        if self.index is None or ann_kind(self.index) != "flat":
+            return
+        if choose_ann(len(self), deletable=True) != "ivf":
+            return
+
+        vectors = self.index.index.reconstruct_n(0, self.index.ntotal)
+        row_ids = faiss.vector_to_array(self.index.id_map)
+        factory = factory_string(len(vectors), vectors.shape[1], "ivf")
+        print(f"🔧 [Corpus:{self.name}] 청크 {len(vectors)}개 → {factory} 인덱스로 전환")
+        self.index = build_index(vectors, factory, ids=row_ids)
+
+    def _add_chunks(self, chunks: List[Document]) -> List[int]:
+        vectors = np.asarray(self.embeddings.embed_documents([c.page_content for c in chunks]), dtype=np.float32)
+        self._ensure_index(vectors.shape[1])
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        start = self.manifest["next_id"]
+        row_ids = np.arange(start, start + len(chunks), dtype=np.int64)
+        self.index.add_with_ids(vectors, row_ids)
+        for row_id, chunk in zip(row_ids.tolist(), chunks):
+            self.docstore[row_id] = chunk
+        self.manifest["next_id"] = start + len(chunks)
+        return row_ids.tolist()
+
+    def add_pdf(self, pdf_path: str, metadata: Optional[dict] = None, save: bool = True) -> int:
+        """
+        PDF 하나를 인덱스에 추가 (이미 있으면 교체)
+
+        Args:
+            pdf_path: PDF 파일 경로
+            metadata: 모든 청크에 덧붙일 메타데이터
+            save: 추가 후 디스크에 저장할지 여부
+
+        Returns:
+            int: 추가된 청크 수
+        """
+        key = os.path.abspath(pdf_path)
+        file_hash = file_sha256(pdf_path)
+
+        with self._lock:
+            if key in self.documents:
+                self.remove_pdf(pdf_path, save=False)
+
+            print(f"📄 [Corpus:{self.name}] 문서 추가: {pdf_path}")
+            text_splitter = create_text_splitter(self.chunk_size, self.chunk_overlap)
+            pages = iter_pdf_pages(pdf_path, engine=self.engine)
+
+            row_ids: List[int] = []
+            for batch in iter_chunk_batches(pages, text_splitter):
+                for i, chunk in enumerate(batch, start=len(row_ids)):
+                    chunk.metadata.update(metadata or {})
+                    chunk.metadata["chunk_id"] = f"{file_hash[:16]}-{i}"
+                row_ids.extend(self._add_chunks(batch))
+
+            self.documents[key] = {
+                "sha256": file_hash,
+                "row_ids": row_ids,
+                "num_chunks": len(row_ids),
+                "metadata": metadata or {},
+                "added_at": time.time(),
+            }
+            self.manifest["revision"] += 1
+            self._maybe_upgrade_index()
+
+            if save:
+                self.save()
+
+        print(f"✅ [Corpus:{self.name}] {len(row_ids)}개 청크 추가 (총 {len(self)}개)")
+        return len(row_ids)
+
+    def remove_pdf(self, pdf_path: str, save: bool = True) -> int:
+        """PDF 하나를 인덱스에서 삭제, 삭제된 청크 수 반환"""
+        key = os.path.abspath(pdf_path)
+
+        with self._lock:
+            entry = self.documents.pop(key, None)
+            if entry is None:
+                return 0
+
+            row_ids = np.asarray(entry["row_ids"], dtype=np.int64)
+            if self.index is not None and len(row_ids):
+                self.index.remove_ids(row_ids)
+            for row_id in entry["row_ids"]:
+                self.docstore.pop(row_id, None)
+            self.manifest["revision"] += 1
+
+            if save:
+                self.save()
+
+        print(f"🗑️ [Corpus:{self.name}] 문서 삭제: {pdf_path} ({len(row_ids)}개 청크)")
+        return len(row_ids)
+
+    def sync(self, pdf_paths: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        인덱스를 주어진 PDF 목록과 일치시킴
+
+        새 문서/내용이 바뀐 문서만 임베딩하고, 목록에서 빠진 문서는 삭제합니다.
+        아무것도 바뀌지 않았다면 파일 해시만 확인하고 끝납니다.
+        """
+        wanted = {os.path.abspath(p): p for p in pdf_paths}
+        report = {"added": [], "updated": [], "removed": [], "unchanged": []}
+
+        with self._lock:
+            for key in list(self.documents):
+                if key not in wanted:
+                    self.remove_pdf(key, save=False)
+                    report["removed"].append(key)
+
+            for key, pdf_path in wanted.items():
+                entry = self.documents.get(key)
+                if entry is None:
+                    self.add_pdf(pdf_path, save=False)
+                    report["added"].append(pdf_path)
+                elif entry["sha256"] != file_sha256(pdf_path):
+                    self.add_pdf(pdf_path, metadata=entry.get("metadata"), save=False)
+                    report["updated"].append(pdf_path)
+                else:
+                    report["unchanged"].append(pdf_path)
+
+            if report["added"] or report["updated"] or report["removed"]:
+                self.save()
+
+        print(
+            f"🔄 [Corpus:{self.name}] 동기화: 추가 {len(report['added'])}, 갱신 {len(report['updated'])}, "
+            f"삭제 {len(report['removed'])}, 유지 {len(report['unchanged'])}"
+        )
+        return report
+
+    # ========== 메타데이터 필터 ==========
+
+    def _postings(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        메타데이터 역색인: 필드 → 값 → row id 배열
+
+        메타데이터는 문서 단위로 붙으므로 manifest에서 바로 만들 수 있고,
+        인덱스 revision이 바뀔 때만 다시 만듭니다.
+        """
+        with self._lock:
+            if getattr(self, "_postings_revision", None) != self.revision:
+                postings: Dict[str, Dict[str, list]] = {}
+                for entry in self.documents.values():
+                    for field, value in entry.get("metadata", {}).items():
+                        postings.setdefault(field, {}).setdefault(str(value), []).extend(entry["row_ids"])
+                self._postings_cache = {
+                    field: {value: np.asarray(ids, dtype=np.int64) for value, ids in values.items()}
+                    for field, values in postings.items()
+                }
+                self._postings_revision = self.revision
+            return self._postings_cache
+
+    def select_ids(self, filter: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        필터 조건에 맞는 row id (조건 없으면 None)
+
+        filter 예시: {"startup": "헬스케어AI", "doc_type": ["ir", "report"]}
+        값이 리스트면 OR, 필드끼리는 AND
+        """
+        if not filter:
+            return None
+
+        postings = self._postings()
+        selected: Optional[np.ndarray] = None
+        for field, value in filter.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            ids = [postings.get(field, {}).get(str(v)) for v in values]
+            ids = np.unique(np.concatenate([i for i in ids if i is not None] or [np.empty(0, dtype=np.int64)]))
+            selected = ids if selected is None else np.intersect1d(selected, ids, assume_unique=True)
+        return selected
+
+    def metadata_values(self, field: str) -> List[str]:
+        """인덱싱된 문서에 있는 메타데이터 값 목록 (예: 스타트업 이름들)"""
+        return sorted(self._postings().get(field, {}))
+
+    # ========== 검색 ==========
+
+    def embed_query(self, query: str) -> np.ndarray:
+        vector = np.asarray([self.embeddings.embed_query(query)], dtype=np.float32)
+        vector /= np.maximum(np.linalg.norm(vector, axis=1, keepdims=True), 1e-12)
+        return vector
+
+    def search_batch(
+        self, queries: List[str], k: int = 5, filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """여러 질의를 한 번의 임베딩 요청 + 한 번의 행렬 검색으로 처리"""
+        vectors = np.asarray(embed_queries(self.embeddings, queries), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return self.search_by_vectors(vectors, k, filter)
+
+    def search(
+        self, query: str, k: int = 5, filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        """질의와 코사인 유사도가 높은 청크 상위 k개 (Document, 점수), filter로 메타데이터 제한"""
+        return self.search_by_vector(self.embed_query(query), k, filter)
+
+    def search_by_vector(
+        self, vector: np.ndarray, k: int = 5, filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Document, float]]:
+        return self.search_by_vectors(vector, k, filter)[0]
+
+    def search_by_vectors(
+        self, vectors: np.ndarray, k: int = 5, filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        (n, dim) 정규화 질의 행렬을 한 번의 인덱스 검색으로 처리, 질의별 (Document, 점수) 리스트
+
+        add_pdf / remove_pdf / IVF 전환이 인덱스와 docstore를 바꾸는 도중에 검색하지 않도록
+        같은 lock 안에서 검색하고 Document를 꺼냅니다 (병렬 평가에서 같은 코퍼스를 공유).
+        """
+        with self._lock:
+            if self.index is None or len(self) == 0:
+                return [[] for _ in range(len(vectors))]
+
+            selected = self.select_ids(filter)
+            if selected is None:
+                scores, ids = self.index.search(vectors, min(k, len(self)))
+            elif len(selected) == 0:
+                return [[] for _ in range(len(vectors))]
+            else:
+                import faiss
+
+                # IDSelector로 선택된 row id의 벡터만 거리 계산 (다른 스타트업 벡터는 건너뜀)
+                selector = faiss.IDSelectorBatch(len(selected), faiss.swig_ptr(selected))
+                ivf = faiss.try_extract_index_ivf(self.index)
+                if ivf is None:
+                    params = faiss.SearchParameters(sel=selector)
+                else:
+                    # 선택된 청크가 일부 리스트에만 있을 수 있으므로 모든 리스트를 훑되,
+                    # 거리 계산은 선택된 id에만 수행
+                    params = faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nlist)
+                scores, ids = self.index.search(vectors, min(k, len(selected)), params=params)
+
+            return [
+                [
+                    (self.docstore[int(row_id)], float(score))
+                    for score, row_id in zip(row_scores, row_ids)
+                    if row_id != -1
+                ]
+                for row_scores, row_ids in zip(scores, ids)
+            ]
+
+    def search_by_startup(
+        self,
+        query: str,
+        startups: Optional[Iterable[str]] = None,
+        k_per_startup: int = 3,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, List[Tuple[Document, float]]]:
+        """
+        스타트업 간 비교 질의 (포트폴리오 비교용)
+
+        질의 임베딩은 한 번만 만들고, 스타트업마다 상위 k_per_startup개씩 반환합니다.
+
+        Args:
+            query: 검색 질의
+            startups: 비교할 스타트업 목록 (기본값: 인덱싱된 전체)
+            k_per_startup: 스타트업별 결과 수
+            filter: 추가 메타데이터 조건 (예: {"doc_type": "ir"})
+        """
+        vector = self.embed_query(query)
+        startups = list(startups) if startups is not None else self.metadata_values("startup")
+        return {
+            startup: self.search_by_vector(vector, k_per_startup, {**(filter or {}), "startup": startup})
+            for startup in startups
+        }
+
+    def as_retriever(self, k: int = 5, filter: Optional[Dict[str, Any]] = None):
+        """LangChain Retriever로 변환 (filter를 주면 해당 메타데이터 청크만 검색)"""
+        from jm.utils.retrievers import CorpusRetriever
+
+        return CorpusRetriever(corpus=self, k=k, filter=filter)
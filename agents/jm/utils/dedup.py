@@ -0,0 +1,151 @@
+"""
+수집 단계 근사 중복 청크 제거 (SimHash)
+
+IR 자료와 시장 보고서는 면책 조항, 머리글/바닥글, 같은 슬라이드 요약이 페이지마다 반복됩니다.
+이런 청크는 상위 5개 검색 결과를 차지하고 임베딩 비용만 늘리므로, 청크마다 64비트 SimHash를
+계산해 해밍 거리가 RAG_DEDUP_MAX_DISTANCE 이하인 청크는 처음 나온 청크 하나로 합칩니다.
+합쳐진 청크의 페이지는 남은 청크의 metadata["pages"]에 모아 출처 표기에 그대로 사용합니다.
+
+후보 검색은 지문을 (max_distance + 1)개 구간으로 나눈 구간별 해시 테이블로 합니다
+(비둘기집 원리: 해밍 거리 ≤ max_distance면 최소 한 구간은 정확히 같음).
+"""
+
+import hashlib
+import os
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from jm.utils.lexical_index import tokenize
+
+# ===== 설정값 =====
+RAG_DEDUP = os.getenv("RAG_DEDUP", "true").lower() == "true"
+# 이 해밍 거리(64비트 중) 이하면 근사 중복으로 판단
+RAG_DEDUP_MAX_DISTANCE = int(os.getenv("RAG_DEDUP_MAX_DISTANCE", "3"))
+
+_BITS = 64
+_SHIFTS = np.arange(_BITS, dtype=np.uint64)
+
+
+@lru_cache(maxsize=200000)
+def _token_signs(token: str) -> np.ndarray:
+    """토큰 해시의 각 비트를 ±1로 (SimHash 가중치 방향)"""
+    h = np.uint64(int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little"))
+    bits = (h >> _SHIFTS) & np.uint64(1)
+    return bits.astype(np.int32) * 2 - 1
+
+
+def simhash(text: str) -> int:
+    """BM25와 같은 토큰(한글 어절 + 음절 bigram, 영문/숫자)의 빈도 가중 64비트 SimHash"""
+    counts = Counter(tokenize(text))
+    if not counts:
+        return 0
+    acc = np.zeros(_BITS, dtype=np.int64)
+    for token, weight in counts.items():
+        acc += weight * _token_signs(token)
+    return int(((acc > 0).astype(np.uint64) << _SHIFTS).sum())
+
+
+def _chunk_key(doc: Document) -> Tuple:
+    return doc.metadata.get("source"), doc.metadata.get("page"), doc.metadata.get("start_index"), doc.page_content
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateFilter:
+    """
+    청크 스트림에서 근사 중복을 걸러내는 필터 (처음 나온 청크 유지)
+
+    배치 단위로 여러 번 호출할 수 있고, 이전 배치에서 본 청크와도 비교합니다.
+
+    Args:
+        max_distance: 중복으로 볼 최대 해밍 거리 (0이면 토큰 구성이 같은 청크만)
+    """
+
+    def __init__(self, max_distance: int = RAG_DEDUP_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.num_bands = max_distance + 1
+        self.band_width = _BITS // self.num_bands
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(self.num_bands)]
+        self._fingerprints: List[int] = []
+        self._keys: List[Tuple] = []
+        self._pages: Dict[Tuple, Set] = {}
+        self.seen = 0
+        self.dropped = 0
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        mask = (1 << self.band_width) - 1
+        return [(fingerprint >> (i * self.band_width)) & mask for i in range(self.num_bands)]
+
+    def _find(self, fingerprint: int) -> int:
+        """이미 유지한 청크 중 근사 중복의 번호 (없으면 -1)"""
+        checked = set()
+        for band, value in zip(self._bands, self._band_values(fingerprint)):
+            for kept in band.get(value, ()):
+                if kept in checked:
+                    continue
+                checked.add(kept)
+                if hamming(fingerprint, self._fingerprints[kept]) <= self.max_distance:
+                    return kept
+        return -1
+
+    def filter(self, docs: Iterable[Document]) -> List[Document]:
+        """근사 중복을 뺀 청크 목록 (중복된 청크의 페이지는 유지된 청크에 기록)"""
+        kept_docs = []
+        for doc in docs:
+            self.seen += 1
+            fingerprint = simhash(doc.page_content)
+            match = self._find(fingerprint)
+            if match >= 0:
+                self.dropped += 1
+                page = doc.metadata.get("page")
+                if page is not None:
+                    self._pages.setdefault(self._keys[match], set()).add(page)
+                continue
+
+            number = len(self._fingerprints)
+            self._fingerprints.append(fingerprint)
+            self._keys.append(_chunk_key(doc))
+            for band, value in zip(self._bands, self._band_values(fingerprint)):
+                band.setdefault(value, []).append(number)
+            kept_docs.append(doc)
+        return kept_docs
+
+    def filter_batches(self, batches: Iterable[List[Document]]) -> Iterator[List[Document]]:
+        """스트리밍 수집용: 배치별로 걸러서 반환 (전부 중복인 배치는 건너뜀)"""
+        for batch in batches:
+            kept = self.filter(batch)
+            if kept:
+                yield kept
+
+    def annotate(self, docs: Iterable[Document]) -> int:
+        """
+        유지된 청크 metadata["pages"]에 중복 청크들의 페이지를 합침 → 갱신한 청크 수
+
+        벡터 스토어가 Document를 새로 만들어 저장하므로, 인덱싱 후 저장된 Document에 적용합니다.
+        """
+        updated = 0
+        for doc in docs:
+            extra = self._pages.get(_chunk_key(doc))
+            if not extra:
+                continue
+            own = doc.metadata.get("page")
+            doc.metadata["pages"] = sorted(extra | ({own} if own is not None else set()))
+            updated += 1
+        return updated
+
+    @property
+    def reduction(self) -> float:
+        """제거 비율"""
+        return self.dropped / self.seen if self.seen else 0.0
+
+    def report(self) -> str:
+        return (
+            f"청크 {self.seen}개 → {self.seen - self.dropped}개 "
+            f"(근사 중복 {self.dropped}개 제거, 인덱스 {self.reduction:.1%} 감소)"
+        )
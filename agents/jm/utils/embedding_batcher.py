@@ -0,0 +1,168 @@
+"""
+동시 실행 + 레이트 리밋 인지 배치 임베딩
+
+FAISS.from_documents(splits, embeddings)는 클라이언트 하나로 순차 임베딩하므로
+200페이지짜리 IR 자료에서는 initialize_analysis 노드 전체가 오래 멈춥니다.
+청크를 토큰 한도 기준 배치로 나누고, RPM/TPM 한도 안에서 여러 배치를 동시에
+보내며, 429 응답은 백오프 후 재시도합니다.
+RPM/TPM 버킷은 레이트 리미터(rate_limiter)의 임베딩 모델 공용 거버너를 사용합니다.
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from jm.utils.rate_limiter import rate_governor
+
+# ===== 설정값 =====
+EMBED_MAX_BATCH_TOKENS = int(os.getenv("EMBED_MAX_BATCH_TOKENS", "100000"))
+EMBED_MAX_BATCH_SIZE = int(os.getenv("EMBED_MAX_BATCH_SIZE", "512"))
+EMBED_MAX_CONCURRENCY = int(os.getenv("EMBED_MAX_CONCURRENCY", "4"))
+EMBED_RPM = int(os.getenv("EMBED_RPM", "3000"))
+EMBED_TPM = int(os.getenv("EMBED_TPM", "1000000"))
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "6"))
+
+
+def build_token_counter() -> Callable[[str], int]:
+    """tiktoken이 있으면 정확히, 없으면 UTF-8 바이트 기반으로 근사"""
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception:
+        # 영문 ~4바이트/토큰, 한글 ~3바이트/글자 → 보수적으로 4바이트당 1토큰
+        return lambda text: max(1, len(text.encode("utf-8")) // 4)
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or "rate limit" in str(error).lower()
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class BatchedEmbeddings(Embeddings):
+    """
+    토큰 한도 배치 + 동시 실행 + RPM/TPM 제어 + 429 재시도를 적용한 Embeddings 래퍼
+
+    Args:
+        underlying: 실제 임베딩 모델 (예: OpenAIEmbeddings(max_retries=0))
+                    SDK 자체 재시도를 켜 두면 429 백오프가 이중으로 쌓이므로 끄고 넘깁니다.
+        max_batch_tokens: 배치 하나의 최대 토큰 수
+        max_batch_size: 배치 하나의 최대 청크 수
+        max_concurrency: 동시에 보낼 배치 수
+        rpm / tpm: 분당 요청 수 / 토큰 수 한도 (임베딩 모델의 공용 거버너를 처음 만들 때 적용)
+        max_retries: 429 재시도 횟수
+    """
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        max_batch_tokens: int = EMBED_MAX_BATCH_TOKENS,
+        max_batch_size: int = EMBED_MAX_BATCH_SIZE,
+        max_concurrency: int = EMBED_MAX_CONCURRENCY,
+        rpm: int = EMBED_RPM,
+        tpm: int = EMBED_TPM,
+        max_retries: int = EMBED_MAX_RETRIES,
+    ):
+        self.underlying = underlying
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        # 같은 임베딩 모델을 쓰는 다른 인스턴스(에이전트)와 한도를 공유
+        model = getattr(underlying, "model", None) or type(underlying).__name__
+        self.governor = rate_governor("openai", model, rpm=rpm, tpm=tpm, concurrency=0)
+        self.count_tokens = build_token_counter()
+        # 여러 스레드(병렬 평가 / 배치 워커)가 같은 인스턴스를 쓰므로 통계는 lock으로 보호
+        self._stats_lock = threading.Lock()
+        self.last_stats: dict = {}
+        self.total_retries = 0
+
+    def _make_batches(self, token_counts: List[int]) -> List[Tuple[int, int, int]]:
+        """(시작, 끝, 토큰 수) 배치 목록 — 순서 유지"""
+        batches = []
+        start, batch_tokens = 0, 0
+        for i, n_tokens in enumerate(token_counts):
+            too_many_tokens = batch_tokens + n_tokens > self.max_batch_tokens
+            too_many_items = i - start >= self.max_batch_size
+            if i > start and (too_many_tokens or too_many_items):
+                batches.append((start, i, batch_tokens))
+                start, batch_tokens = i, 0
+            batch_tokens += n_tokens
+        if start < len(token_counts):
+            batches.append((start, len(token_counts), batch_tokens))
+        return batches
+
+    def _call_with_retry(self, fn: Callable, tokens: int) -> Tuple[Any, int]:
+        """거버너 통과 후 호출, 429면 지수 백오프 재시도 → (결과, 재시도 횟수)"""
+        for attempt in range(self.max_retries + 1):
+            self.governor.acquire(tokens)
+            try:
+                return fn(), attempt
+            except Exception as e:
+                if not _is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                retry_after = _retry_after_seconds(e)
+                self.governor.throttled(retry_after)
+                delay = retry_after or min(60.0, 2 ** attempt) * (0.5 + random.random())
+                print(f"⏳ [Embedding] 429 Rate limit, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                with self._stats_lock:
+                    self.total_retries += 1
+                time.sleep(delay)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        started = time.perf_counter()
+        token_counts = [self.count_tokens(t) for t in texts]
+        batches = self._make_batches(token_counts)
+
+        def run(batch: Tuple[int, int, int]) -> Tuple[List[List[float]], int]:
+            start, end, n_tokens = batch
+            return self._call_with_retry(lambda: self.underlying.embed_documents(texts[start:end]), n_tokens)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+            results = list(executor.map(run, batches))
+
+        # 재시도 횟수는 이 호출의 배치들 것만 합산 (다른 스레드의 동시 호출과 섞이지 않음)
+        vectors = [vector for batch_vectors, _ in results for vector in batch_vectors]
+        retries = sum(batch_retries for _, batch_retries in results)
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        total_tokens = sum(token_counts)
+        stats = {
+            "chunks": len(texts),
+            "tokens": total_tokens,
+            "batches": len(batches),
+            "retries": retries,
+            "seconds": elapsed,
+            "chunks_per_sec": len(texts) / elapsed,
+            "tokens_per_sec": total_tokens / elapsed,
+        }
+        with self._stats_lock:
+            self.last_stats = stats
+        print(
+            f"⚡ [Embedding] {len(texts)}개 청크 / {total_tokens}토큰, {len(batches)}개 배치 "
+            f"{elapsed:.1f}초 ({stats['chunks_per_sec']:.1f} chunks/s, "
+            f"{stats['tokens_per_sec']:.0f} tokens/s)"
+        )
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._call_with_retry(lambda: self.underlying.embed_query(text), self.count_tokens(text))[0]
@@ -0,0 +1,190 @@
+"""
+청크 단위 임베딩 캐시 (모든 에이전트 공용)
+
+시장성 평가(rag_tools)와 기술 요약(tech_summary_agent)이 같은 PDF(예: health.pdf)의
+겹치는 텍스트를 각각 임베딩하지 않도록, (모델, 청크 텍스트 SHA-256) 키로
+float32 벡터를 SQLite에 저장해두고 캐시 미스만 임베딩 API로 보냅니다.
+PDF가 조금 바뀌어도 바뀐 청크만 다시 임베딩됩니다.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from jm.utils.index_cache import RAG_CACHE_DIR
+from jm.utils.retrieval_cache import query_embedding_cache
+
+# ===== 설정값 =====
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH", str(Path(RAG_CACHE_DIR) / "embeddings.sqlite3")
+)
+
+
+def text_sha256(text: str) -> str:
+    """청크 텍스트의 SHA-256 해시"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """(모델, 텍스트 해시) → float32 벡터 저장소 (SQLite)"""
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, List[float]]:
+        """저장된 벡터 조회 (없는 해시는 결과에서 빠짐)"""
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(hashes))
+        # SQLite 파라미터 개수 제한을 넘지 않도록 나눠서 조회
+        for start in range(0, len(unique), 500):
+            batch = unique[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+            for text_hash, blob in rows:
+                found[text_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, model: str, items: Dict[str, List[float]]) -> None:
+        """벡터 저장 (이미 있으면 덮어씀)"""
+        rows = []
+        for text_hash, vector in items.items():
+            arr = np.asarray(vector, dtype=np.float32)
+            rows.append((model, text_hash, int(arr.shape[0]), arr.tobytes()))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, dim, vector) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def count(self, model: Optional[str] = None) -> int:
+        """저장된 벡터 개수"""
+        with self._lock:
+            if model is None:
+                return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM embeddings WHERE model = ?", (model,)
+            ).fetchone()[0]
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    캐시를 먼저 확인하고 미스만 실제 임베딩 모델로 보내는 Embeddings 래퍼
+
+    Args:
+        underlying: 실제 임베딩 모델 (예: OpenAIEmbeddings)
+        model_name: 캐시 키에 사용할 모델명
+        store: 임베딩 저장소 (기본값: 프로세스 공용 저장소)
+    """
+
+    def __init__(self, underlying: Embeddings, model_name: str, store: Optional[EmbeddingStore] = None):
+        self.underlying = underlying
+        self.model_name = model_name
+        self.store = store or get_embedding_store()
+        # 공용 인스턴스를 여러 스레드(병렬 평가 / 배치 워커)가 함께 쓰므로 적중 카운터는 lock으로 보호
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [text_sha256(t) for t in texts]
+        cached = self.store.get_many(self.model_name, hashes)
+
+        # 캐시 미스 (같은 텍스트가 여러 번 나오면 한 번만 임베딩)
+        missing: Dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in cached and text_hash not in missing:
+                missing[text_hash] = text
+
+        if missing:
+            vectors = self.underlying.embed_documents(list(missing.values()))
+            new_items = dict(zip(missing.keys(), vectors))
+            self.store.put_many(self.model_name, new_items)
+            cached.update(new_items)
+
+        n_hits = len(texts) - len(missing)
+        with self._stats_lock:
+            self.hits += n_hits
+            self.misses += len(missing)
+        if texts:
+            print(f"🧠 [Embedding Cache] {len(texts)}개 청크 중 {n_hits}개 캐시 적중, {len(missing)}개 신규 임베딩")
+
+        return [cached[h] for h in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        # 질의는 디스크 캐시 대신 프로세스 내 LRU 캐시 사용 (표준 Bessemer 질문 반복 검색)
+        key = (self.model_name, text)
+        vector = query_embedding_cache.get(key)
+        if vector is None:
+            vector = self.underlying.embed_query(text)
+            query_embedding_cache.put(key, vector)
+        return vector
+
+
+def embed_queries(embeddings: Embeddings, queries: List[str]) -> List[List[float]]:
+    """
+    여러 질의를 한 번의 임베딩 요청으로 처리
+
+    embed_query를 질의마다 호출하면 요청이 N번 나가므로 embed_documents 배치 경로를 사용합니다.
+    (OpenAI 임베딩은 질의/문서 임베딩이 동일) 질의는 청크 캐시 대신 질의 임베딩 LRU 캐시에 저장합니다.
+    """
+    if not isinstance(embeddings, CachedEmbeddings):
+        return embeddings.embed_documents(queries)
+
+    # 질의 임베딩 LRU 캐시 적중분은 제외하고 나머지만 한 번에 요청
+    keys = [(embeddings.model_name, q) for q in queries]
+    vectors = {key: query_embedding_cache.get(key) for key in dict.fromkeys(keys)}
+    missing = [key for key, vector in vectors.items() if vector is None]
+    if missing:
+        new_vectors = embeddings.underlying.embed_documents([text for _, text in missing])
+        for key, vector in zip(missing, new_vectors):
+            query_embedding_cache.put(key, vector)
+            vectors[key] = vector
+    return [vectors[key] for key in keys]
+
+
+_default_store: Optional[EmbeddingStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_embedding_store() -> EmbeddingStore:
+    """프로세스 공용 임베딩 저장소"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = EmbeddingStore()
+        return _default_store
+
+
+def cached_openai_embeddings(model: str) -> CachedEmbeddings:
+    """캐시 + 배치/동시 실행이 적용된 OpenAI 임베딩 생성 (캐시 미스만 배치로 전송)"""
+    from jm.utils.embedding_providers import cached_embeddings
+
+    return cached_embeddings("openai", model)
@@ -0,0 +1,206 @@
+"""
+임베딩 제공자 (OpenAI / 로컬 CPU / 해싱)
+
+모든 청크 임베딩이 네트워크로 text-embedding-3-small에 가면 수집 지연의 하한이 API 왕복으로 정해지고
+인터넷이 없는 환경에서는 실행할 수 없습니다. RAG_EMBEDDING_PROVIDER로 제공자를 고릅니다.
+
+    openai    OpenAI 임베딩 API (기본값, 배치/레이트 리밋 적용)
+    local     sentence-transformers 모델을 CPU에서 실행 (기본 ONNX 8비트 양자화 가중치)
+    hashing   토큰 해싱 벡터 (의존성/네트워크 없음, 테스트·벤치마크용)
+
+제공자마다 벡터 공간이 다르므로 캐시 키에 쓰는 모델 키(provider_model_key)에 제공자를 포함해
+임베딩 캐시 / FAISS 인덱스 캐시 / 코퍼스가 제공자별로 따로 저장되게 합니다.
+(OpenAI는 기존 캐시와 호환되도록 모델명 그대로 사용)
+"""
+
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from jm.utils.embedding_cache import CachedEmbeddings
+from jm.utils.lexical_index import tokenize
+
+# ===== 설정값 =====
+RAG_EMBEDDING_PROVIDER = os.getenv("RAG_EMBEDDING_PROVIDER", "openai")  # openai | local | hashing
+RAG_EMBEDDING_MODEL = os.getenv("RAG_EMBEDDING_MODEL", "text-embedding-3-small")
+# 한국어 IR 자료를 다루므로 다국어 모델 기본값
+RAG_LOCAL_EMBEDDING_MODEL = os.getenv(
+    "RAG_LOCAL_EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+)
+RAG_LOCAL_EMBEDDING_BACKEND = os.getenv("RAG_LOCAL_EMBEDDING_BACKEND", "onnx")  # onnx | torch
+# ONNX 양자화 가중치 파일 (모델 저장소 내 경로, 비우면 기본 fp32 model.onnx)
+RAG_LOCAL_EMBEDDING_ONNX_FILE = os.getenv("RAG_LOCAL_EMBEDDING_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+RAG_LOCAL_EMBEDDING_BATCH_SIZE = int(os.getenv("RAG_LOCAL_EMBEDDING_BATCH_SIZE", "32"))
+RAG_HASHING_DIM = int(os.getenv("RAG_HASHING_DIM", "512"))
+
+PROVIDERS = ("openai", "local", "hashing")
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    BM25와 같은 토큰화(한글 어절 + 음절 bigram)를 부호 있는 해싱으로 고정 차원에 투영한 임베딩
+
+    학습/다운로드가 필요 없고 결정적이므로 테스트와 벤치마크에 사용합니다.
+    """
+
+    def __init__(self, dim: int = RAG_HASHING_DIM):
+        self.dim = dim
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in tokenize(text):
+            h = zlib.crc32(token.encode("utf-8"))
+            vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text).tolist() for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text).tolist()
+
+
+class LocalEmbeddings(Embeddings):
+    """
+    sentence-transformers 모델을 CPU에서 실행하는 임베딩 (정규화 벡터)
+
+    backend="onnx"면 onnx_file의 양자화 가중치를 ONNX Runtime으로 실행하고,
+    ONNX 런타임/가중치를 쓸 수 없으면 PyTorch 백엔드로 대체합니다.
+    """
+
+    def __init__(
+        self,
+        model: str = RAG_LOCAL_EMBEDDING_MODEL,
+        backend: str = RAG_LOCAL_EMBEDDING_BACKEND,
+        onnx_file: Optional[str] = RAG_LOCAL_EMBEDDING_ONNX_FILE,
+        batch_size: int = RAG_LOCAL_EMBEDDING_BATCH_SIZE,
+    ):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "로컬 임베딩에는 sentence-transformers가 필요합니다: pip install \"sentence-transformers[onnx]\""
+            ) from e
+
+        self.model_name = model
+        self.batch_size = batch_size
+        self.backend = backend
+        if backend == "onnx":
+            try:
+                model_kwargs = {"file_name": onnx_file} if onnx_file else None
+                self.model = SentenceTransformer(model, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+            except Exception as e:
+                print(f"⚠️ [Local Embeddings] ONNX 백엔드 로딩 실패, PyTorch로 실행합니다: {e}")
+                self.backend = "torch"
+        if self.backend != "onnx":
+            self.model = SentenceTransformer(model, device="cpu")
+        # 실제로 로딩된 백엔드 기준 캐시 키 (ONNX 양자화 벡터와 PyTorch 벡터를 섞지 않음)
+        self.cache_key = _local_model_key(model, self.backend, onnx_file)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True
+        )
+        return vectors.astype(np.float32).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def default_model(provider: str) -> str:
+    """제공자별 기본 모델"""
+    if provider == "openai":
+        return RAG_EMBEDDING_MODEL
+    if provider == "local":
+        return RAG_LOCAL_EMBEDDING_MODEL
+    if provider == "hashing":
+        return str(RAG_HASHING_DIM)
+    raise ValueError(f"알 수 없는 임베딩 제공자: {provider} (가능: {', '.join(PROVIDERS)})")
+
+
+def _local_model_key(model: str, backend: str, onnx_file: Optional[str]) -> str:
+    if backend == "onnx" and onnx_file:
+        backend = f"onnx/{os.path.basename(onnx_file)}"
+    return f"local:{model}:{backend}"
+
+
+def provider_model_key(provider: str, model: Optional[str] = None) -> str:
+    """
+    임베딩 캐시 / 인덱스 캐시 키에 쓰는 모델 키
+
+    예: ("openai", "text-embedding-3-small") → "text-embedding-3-small"
+        ("local", "sentence-transformers/...") → "local:sentence-transformers/...:onnx/model_qint8_....onnx"
+        ("hashing", "512") → "hashing:512"
+    """
+    model = model or default_model(provider)
+    if provider == "openai":
+        return model
+    if provider == "local":
+        return _local_model_key(model, RAG_LOCAL_EMBEDDING_BACKEND, RAG_LOCAL_EMBEDDING_ONNX_FILE)
+    return f"{provider}:{model}"
+
+
+def scoped_index_name(name: str, model_key: str) -> str:
+    """
+    제공자별로 분리된 코퍼스 이름 (OpenAI는 기존 이름 유지)
+
+    CorpusIndex는 임베딩 모델이 바뀌면 빈 코퍼스로 다시 시작하므로,
+    같은 이름을 공유하면 제공자를 바꿀 때마다 기존 인덱스가 지워집니다.
+    model_key는 실제로 로딩된 임베딩의 키(CachedEmbeddings.model_name)를 넘겨야
+    ONNX → PyTorch 대체 같은 경우에도 다른 설정의 인덱스와 겹치지 않습니다.
+    """
+    if not model_key.startswith(tuple(f"{p}:" for p in PROVIDERS if p != "openai")):
+        return name
+    return f"{name}--{re.sub(r'[^A-Za-z0-9._-]+', '_', model_key)}"
+
+
+def create_embeddings(provider: str = RAG_EMBEDDING_PROVIDER, model: Optional[str] = None) -> Embeddings:
+    """캐시 없이 제공자의 임베딩 모델 생성 (벤치마크 / 캐시 래핑용)"""
+    model = model or default_model(provider)
+    if provider == "openai":
+        from langchain_openai import OpenAIEmbeddings
+
+        from jm.utils.embedding_batcher import BatchedEmbeddings
+
+        # 429 재시도는 BatchedEmbeddings가 공용 거버너와 함께 처리 (SDK 재시도와 겹치지 않게 끔)
+        return BatchedEmbeddings(OpenAIEmbeddings(model=model, max_retries=0))
+    if provider == "local":
+        return LocalEmbeddings(model)
+    if provider == "hashing":
+        return HashingEmbeddings(int(model))
+    raise ValueError(f"알 수 없는 임베딩 제공자: {provider} (가능: {', '.join(PROVIDERS)})")
+
+
+_shared_models: Dict[Tuple[str, str], Embeddings] = {}
+_shared_models_lock = threading.Lock()
+
+
+def shared_embeddings(provider: str = RAG_EMBEDDING_PROVIDER, model: Optional[str] = None) -> Embeddings:
+    """
+    (제공자, 모델)당 한 번만 만드는 프로세스 공용 임베딩 모델
+
+    로컬 모델은 로딩(가중치 읽기 / ONNX 세션 생성)이 임베딩보다 오래 걸리므로
+    실행 / PDF마다 새로 만들지 않습니다. 같은 모델을 동시에 두 번 로딩하지 않도록 lock 안에서 생성.
+    """
+    key = (provider, model or default_model(provider))
+    with _shared_models_lock:
+        if key not in _shared_models:
+            _shared_models[key] = create_embeddings(*key)
+        return _shared_models[key]
+
+
+def cached_embeddings(provider: str = RAG_EMBEDDING_PROVIDER, model: Optional[str] = None) -> CachedEmbeddings:
+    """
+    청크 임베딩 캐시가 적용된 제공자 임베딩 (실제 모델은 shared_embeddings로 공유)
+
+    CachedEmbeddings.model_name이 provider_model_key이므로 인덱스 캐시 키에도 그대로 사용합니다.
+    """
+    underlying = shared_embeddings(provider, model)
+    model_key = getattr(underlying, "cache_key", None) or provider_model_key(provider, model)
+    return CachedEmbeddings(underlying, model_name=model_key)
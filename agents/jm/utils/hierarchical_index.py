@@ -0,0 +1,190 @@
+"""
+페이지(섹션) 요약 2단계 인덱스
+
+300페이지 이상 산업 보고서에서 "시장 규모와 성장률" 같은 넓은 질문은 flat 청크 인덱스 전체와 비교되고,
+여러 페이지에 흩어진 작은 청크들이 상위 k개를 채워 생성 프롬프트가 길어집니다.
+페이지 묶음(섹션)마다 청크 벡터의 중심(정규화 평균)을 요약 벡터로 두고,
+질의를 먼저 섹션 요약과 비교해 상위 섹션을 고른 뒤 그 섹션의 청크만 정확히 비교합니다.
+
+    1단계: 질의 ↔ 섹션 요약 벡터 S개
+    2단계: 질의 ↔ 선택된 섹션의 청크 벡터 (flat 전수 비교 N개 대신)
+
+요약 벡터는 청크 벡터에서 계산하므로 추가 임베딩/LLM 호출이 없고, 인덱스를 로딩할 때마다 다시 만듭니다.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from jm.utils.embedding_cache import embed_queries
+from jm.utils.vector_tiers import normalize
+
+# ===== 설정값 =====
+RAG_HIERARCHICAL = os.getenv("RAG_HIERARCHICAL", "auto")  # auto | true | false
+# auto일 때 이 페이지 수 이상이면 2단계 인덱스 사용
+RAG_HIER_MIN_PAGES = int(os.getenv("RAG_HIER_MIN_PAGES", "300"))
+# 섹션 하나로 묶을 연속 페이지 수
+RAG_HIER_PAGES_PER_SECTION = int(os.getenv("RAG_HIER_PAGES_PER_SECTION", "1"))
+# 질의마다 청크를 비교할 상위 섹션 수
+RAG_HIER_TOP_SECTIONS = int(os.getenv("RAG_HIER_TOP_SECTIONS", "4"))
+# 섹션 요약 미리보기 글자 수
+SECTION_LEAD_CHARS = 200
+
+
+def count_pages(documents: Sequence[Document]) -> int:
+    """청크들이 걸쳐 있는 (출처, 페이지) 수"""
+    return len({(doc.metadata.get("source"), doc.metadata.get("page")) for doc in documents})
+
+
+def use_hierarchical(documents: Sequence[Document], mode: str = RAG_HIERARCHICAL) -> bool:
+    """2단계 인덱스 사용 여부 (auto면 페이지 수로 결정)"""
+    if mode == "auto":
+        return count_pages(documents) >= RAG_HIER_MIN_PAGES
+    return mode == "true"
+
+
+class PageSummaryIndex:
+    """
+    섹션 요약 벡터로 검색 범위를 좁힌 뒤 섹션 내 청크만 비교하는 2단계 인덱스
+
+    CorpusIndex / TieredVectorStore와 같은 search / search_batch 인터페이스를 제공하므로
+    CorpusRetriever로 감싸 배치 검색 / 하이브리드 검색에 그대로 사용할 수 있습니다.
+
+    Args:
+        vectors: (N, dim) 청크 벡터 (row 순서 = documents 순서, 메모리 매핑 배열 가능)
+        documents: row 순서 청크 Document
+        embeddings: 질의 임베딩
+        pages_per_section: 섹션 하나로 묶을 연속 페이지 수
+        top_sections: 질의마다 청크를 비교할 섹션 수
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        documents: List[Document],
+        embeddings: Embeddings,
+        pages_per_section: int = RAG_HIER_PAGES_PER_SECTION,
+        top_sections: int = RAG_HIER_TOP_SECTIONS,
+    ):
+        self.vectors = vectors
+        self.documents = documents
+        self.embeddings = embeddings
+        self.top_sections = top_sections
+        self.sections = self._group_sections(documents, max(1, pages_per_section))
+        self.centroids = self._centroids()
+        # 병렬 평가에서 여러 스레드가 같은 인덱스를 검색하므로 통계는 lock으로 보호
+        self._stats_lock = threading.Lock()
+        self.stats = {"queries": 0, "compared": 0, "full_scan": 0}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @staticmethod
+    def _group_sections(documents: Sequence[Document], pages_per_section: int) -> List[Dict]:
+        groups: Dict[Tuple, List[int]] = {}
+        for row, doc in enumerate(documents):
+            page = doc.metadata.get("page")
+            bucket = page // pages_per_section if isinstance(page, int) else page
+            groups.setdefault((doc.metadata.get("source"), bucket), []).append(row)
+
+        sections = []
+        for (source, _), rows in groups.items():
+            pages = [documents[row].metadata.get("page") for row in rows]
+            known = [page for page in pages if isinstance(page, int)]
+            sections.append({
+                "source": source,
+                "pages": (min(known), max(known)) if known else (None, None),
+                "rows": np.asarray(rows, dtype=np.int64),
+                "lead": documents[rows[0]].page_content[:SECTION_LEAD_CHARS],
+            })
+        return sections
+
+    def _centroids(self) -> np.ndarray:
+        dim = self.vectors.shape[1] if len(self.vectors) else 0
+        centroids = np.zeros((len(self.sections), dim), dtype=np.float32)
+        for i, section in enumerate(self.sections):
+            centroids[i] = normalize(np.asarray(self.vectors[np.sort(section["rows"])], dtype=np.float32)).mean(axis=0)
+        return normalize(centroids)
+
+    def route(self, query_vector: np.ndarray, min_rows: int = 1) -> List[int]:
+        """요약 벡터 유사도 순 상위 섹션 번호 (청크가 min_rows개 이상 모일 때까지 추가)"""
+        order = np.argsort(-(self.centroids @ query_vector))
+        selected, rows = [], 0
+        for section in order:
+            if len(selected) >= self.top_sections and rows >= min_rows:
+                break
+            selected.append(int(section))
+            rows += len(self.sections[section]["rows"])
+        return selected
+
+    def search_by_vectors(self, queries: np.ndarray, k: int = 5) -> Tuple[np.ndarray, np.ndarray, List[Dict]]:
+        """
+        (n, dim) 질의 행렬 검색 → (점수, row id) 각각 (n, k) 및 질의별 비교 비용
+
+        비교 비용: {"sections": 선택 섹션 수, "compared": 비교한 벡터 수, "full_scan": flat 전수 비교 수}
+        """
+        queries = normalize(np.asarray(queries, dtype=np.float32))
+        k = min(k, len(self))
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        costs = []
+        for qi, query in enumerate(queries):
+            selected = self.route(query, min_rows=k)
+            rows = np.sort(np.concatenate([self.sections[s]["rows"] for s in selected]))
+            similarities = np.asarray(self.vectors[rows], dtype=np.float32) @ query
+            top = np.argsort(-similarities)[:k]
+            scores[qi, :len(top)] = similarities[top]
+            ids[qi, :len(top)] = rows[top]
+
+            cost = {
+                "sections": len(selected),
+                "compared": len(self.sections) + len(rows),
+                "full_scan": len(self),
+            }
+            costs.append(cost)
+        with self._stats_lock:
+            self.stats["queries"] += len(costs)
+            self.stats["compared"] += sum(cost["compared"] for cost in costs)
+            self.stats["full_scan"] += sum(cost["full_scan"] for cost in costs)
+        return scores, ids, costs
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[Document, float]]:
+        """질의와 코사인 유사도가 높은 청크 상위 k개 (Document, 점수)"""
+        return self.search_batch([query], k)[0]
+
+    def search_batch(self, queries: List[str], k: int = 5) -> List[List[Tuple[Document, float]]]:
+        """여러 질의를 한 번의 임베딩 요청으로 처리 (질의별 비교 비용 출력)"""
+        vectors = np.asarray(embed_queries(self.embeddings, queries), dtype=np.float32)
+        scores, ids, costs = self.search_by_vectors(vectors, k)
+        for query, cost in zip(queries, costs):
+            saved = 1 - cost["compared"] / max(cost["full_scan"], 1)
+            print(
+                f"🗂️ [Page Summary Index] 섹션 {cost['sections']}/{len(self.sections)}개 → "
+                f"벡터 {cost['compared']}/{cost['full_scan']}개 비교 ({saved:.1%} 절감): {query[:30]}..."
+            )
+        return [
+            [(self.documents[int(row)], float(score)) for score, row in zip(row_scores, row_ids) if row != -1]
+            for row_scores, row_ids in zip(scores, ids)
+        ]
+
+    def cost_summary(self) -> Dict[str, float]:
+        """지금까지 검색의 평균 비교 수와 flat 대비 절감률"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        queries = max(stats["queries"], 1)
+        return {
+            "queries": stats["queries"],
+            "avg_compared": stats["compared"] / queries,
+            "avg_full_scan": stats["full_scan"] / queries,
+            "saved": 1 - stats["compared"] / max(stats["full_scan"], 1),
+        }
+
+    def as_retriever(self, k: int = 5):
+        """LangChain Retriever로 변환"""
+        from jm.utils.retrievers import CorpusRetriever
+
+        return CorpusRetriever(corpus=self, k=k)
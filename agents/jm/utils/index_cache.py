@@ -0,0 +1,150 @@
+"""
+FAISS 인덱스 디스크 캐시 (내용 주소 기반)
+
+같은 IR 자료를 하루에도 여러 번 평가하므로, PDF 로딩/분할/임베딩 결과를
+PDF 내용 해시 + 청크 설정 + 임베딩 모델로 만든 키에 저장해두고 재사용합니다.
+키 구성 요소 중 하나라도 바뀌면 다른 키가 되므로 캐시는 자동으로 무효화됩니다.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+# ===== 설정값 =====
+RAG_CACHE_DIR = os.getenv("RAG_CACHE_DIR", ".rag_cache")
+# 캐시 포맷이 바뀌면 올려서 기존 캐시를 일괄 무효화
+INDEX_CACHE_VERSION = 2
+
+
+def temp_path(path: Path) -> Path:
+    """
+    path와 같은 디렉터리의 임시 경로 (다 쓴 뒤 rename / os.replace로 교체)
+
+    PID만 쓰면 한 프로세스의 여러 스레드(병렬 평가)가 같은 임시 경로에 동시에 쓰므로 스레드 id도 포함.
+    앞에 붙여서 확장자(.zst/.gz 등)는 그대로 유지합니다.
+    """
+    return path.with_name(f".tmp-{os.getpid()}-{threading.get_ident()}-{path.name}")
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """파일 내용의 SHA-256 해시 (경로/수정시간이 아니라 내용 기준)"""
+    # 한 실행에서 인덱스 캐시/페이지 캐시가 같은 파일을 반복 해싱하지 않도록
+    # (경로, 크기, 수정시간)이 같으면 이전 결과 재사용
+    stat = os.stat(path)
+    return _file_sha256(os.path.abspath(path), stat.st_size, stat.st_mtime_ns, block_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _file_sha256(path: str, size: int, mtime_ns: int, block_size: int) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def index_cache_key(
+    pdf_hash: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    embedding_model: str,
+    options: Optional[dict] = None,
+) -> str:
+    """캐시 키 생성: PDF 해시 + 청크 설정 + 임베딩 모델 (+ 인덱스 내용을 바꾸는 수집 옵션)"""
+    key_parts = {
+        "version": INDEX_CACHE_VERSION,
+        "pdf_sha256": pdf_hash,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "embedding_model": embedding_model,
+        **(options or {}),
+    }
+    payload = json.dumps(key_parts, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:32]
+
+
+def index_cache_path(key: str) -> Path:
+    """캐시 키에 해당하는 디렉터리 경로"""
+    return Path(RAG_CACHE_DIR) / "faiss" / key
+
+
+def load_cached_vectorstore(key: str, embeddings: Embeddings, mmap: bool = True) -> Optional[FAISS]:
+    """
+    캐시된 FAISS 인덱스와 docstore 로딩
+
+    Args:
+        key: index_cache_key()로 만든 캐시 키
+        embeddings: 질의 임베딩에 사용할 Embeddings
+        mmap: 가능하면 인덱스를 메모리 매핑으로 읽기 (읽기 전용)
+
+    Returns:
+        FAISS | None: 캐시 미스 또는 손상 시 None
+    """
+    path = index_cache_path(key)
+    index_file = path / "index.faiss"
+    store_file = path / "index.pkl"
+
+    if not (index_file.exists() and store_file.exists()):
+        return None
+
+    import faiss
+
+    try:
+        index = None
+        if mmap:
+            try:
+                index = faiss.read_index(str(index_file), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            except Exception:
+                # 메모리 매핑을 지원하지 않는 인덱스 타입이면 일반 로딩
+                index = None
+        if index is None:
+            index = faiss.read_index(str(index_file))
+
+        # 직접 생성한 캐시 파일만 읽으므로 pickle 로딩 허용
+        with open(store_file, "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+
+    except Exception as e:
+        print(f"⚠️ [RAG Cache] 캐시 로딩 실패, 재구축합니다: {e}")
+        shutil.rmtree(path, ignore_errors=True)
+        return None
+
+    return FAISS(embeddings, index, docstore, index_to_docstore_id)
+
+
+def save_vectorstore(key: str, vectorstore: FAISS, meta: Optional[dict] = None) -> Path:
+    """
+    FAISS 벡터 스토어를 캐시에 저장
+
+    임시 디렉터리에 먼저 쓰고 rename 하므로, 동시에 실행된 다른 프로세스가
+    반쯤 쓰인 캐시를 읽는 일이 없습니다.
+    """
+    path = index_cache_path(key)
+    tmp_path = temp_path(path)
+
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    vectorstore.save_local(str(tmp_path))
+
+    with open(tmp_path / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({**(meta or {}), "created_at": time.time()}, f, ensure_ascii=False, indent=2)
+
+    if path.exists():
+        # 다른 프로세스가 먼저 저장한 경우 그대로 사용
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    else:
+        try:
+            tmp_path.rename(path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return path
@@ -0,0 +1,137 @@
+"""
+코퍼스 크기별 근사 최근접 이웃(ANN) 인덱스 선택
+
+flat 인덱스는 질의마다 모든 벡터와 거리를 계산하므로 코퍼스가 커지면 검색 지연이 선형으로 늘어납니다.
+작은 문서(PDF 하나)는 정확한 flat 검색을 유지하고, 큰 공용 코퍼스에서는 IVF 또는 HNSW를
+FAISS index_factory 문자열로 만들어 nprobe / efSearch를 조정해 사용합니다.
+
+구조 (RAG_ANN_INDEX로 고정 가능, auto면 벡터 수로 선택):
+    flat   전수 검색 (정확)
+    hnsw   그래프 탐색, 학습 불필요, 삭제 불가 → 읽기 전용 인덱스용
+    ivf    k-means 중심(nlist개)으로 분할 후 nprobe개 리스트만 탐색, 학습 필요, 삭제 가능
+"""
+
+import math
+import os
+from typing import Optional
+
+import numpy as np
+
+# ===== 설정값 =====
+RAG_ANN_INDEX = os.getenv("RAG_ANN_INDEX", "auto")  # auto | flat | hnsw | ivf
+# 이 이하 벡터 수는 flat 유지 (전수 검색도 충분히 빠름)
+RAG_ANN_FLAT_MAX = int(os.getenv("RAG_ANN_FLAT_MAX", "20000"))
+# 이 이하는 HNSW, 초과하면 IVF (HNSW 그래프 메모리가 부담되는 규모)
+RAG_ANN_HNSW_MAX = int(os.getenv("RAG_ANN_HNSW_MAX", "2000000"))
+RAG_HNSW_M = int(os.getenv("RAG_HNSW_M", "32"))
+RAG_HNSW_EF_CONSTRUCTION = int(os.getenv("RAG_HNSW_EF_CONSTRUCTION", "200"))
+RAG_HNSW_EF_SEARCH = int(os.getenv("RAG_HNSW_EF_SEARCH", "64"))
+RAG_IVF_NPROBE = int(os.getenv("RAG_IVF_NPROBE", "32"))
+# IVF 중심 학습에 사용할 리스트당 최대 샘플 수 (전체 코퍼스로 학습하면 느림)
+IVF_TRAIN_PER_LIST = 64
+
+ANN_KINDS = ("flat", "hnsw", "ivf")
+# 벡터 저장 계층(vector_tiers) → index_factory 인코딩
+_ENCODINGS = {"flat": "Flat", "fp16": "SQfp16", "sq8": "SQ8"}
+
+
+def choose_ann(num_vectors: int, ann: str = RAG_ANN_INDEX, deletable: bool = False) -> str:
+    """
+    벡터 수로 인덱스 구조 선택
+
+    Args:
+        num_vectors: 인덱싱할 벡터 수
+        ann: "auto"가 아니면 그대로 사용
+        deletable: 문서 삭제가 필요한 인덱스면 HNSW 대신 IVF 사용
+    """
+    if ann != "auto":
+        if ann not in ANN_KINDS:
+            raise ValueError(f"알 수 없는 ANN 인덱스: {ann} (가능: auto, {', '.join(ANN_KINDS)})")
+        return "ivf" if ann == "hnsw" and deletable else ann
+    if num_vectors <= RAG_ANN_FLAT_MAX:
+        return "flat"
+    if num_vectors <= RAG_ANN_HNSW_MAX and not deletable:
+        return "hnsw"
+    return "ivf"
+
+
+def ivf_nlist(num_vectors: int) -> int:
+    """IVF 리스트 수 (일반적인 4 * sqrt(N) 기준, 리스트당 최소 39개 학습 벡터 확보)"""
+    return max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // 39))
+
+
+def factory_string(num_vectors: int, dim: int, ann: str, tier: str = "flat") -> str:
+    """
+    index_factory 문자열 생성
+
+    예: ("flat", "sq8") → "SQ8", ("hnsw", "flat") → "HNSW32", ("ivf", "pq") → "IVF1024,PQ96"
+    """
+    encoding = _ENCODINGS.get(tier) or f"PQ{dim // 8}"
+    if ann == "hnsw":
+        return f"HNSW{RAG_HNSW_M}" if encoding == "Flat" else f"HNSW{RAG_HNSW_M}_{encoding}"
+    if ann == "ivf":
+        return f"IVF{ivf_nlist(num_vectors)},{encoding}"
+    return encoding
+
+
+def build_index(
+    vectors: np.ndarray,
+    factory: str,
+    ids: Optional[np.ndarray] = None,
+    seed: int = 0,
+):
+    """
+    index_factory로 내적(정규화 벡터 = 코사인) 인덱스 생성, 학습 후 벡터 추가
+
+    IVF 중심 / PQ 코드북 학습은 최대 nlist * IVF_TRAIN_PER_LIST개 샘플로 수행합니다.
+    ids를 주면 add_with_ids (IVF처럼 id를 직접 저장하는 인덱스만 지원)
+    """
+    import faiss
+
+    dim = vectors.shape[1]
+    index = faiss.index_factory(dim, factory, faiss.METRIC_INNER_PRODUCT)
+
+    if not index.is_trained:
+        ivf = faiss.try_extract_index_ivf(index)
+        sample_size = len(vectors) if ivf is None else min(len(vectors), ivf.nlist * IVF_TRAIN_PER_LIST)
+        sample = vectors
+        if sample_size < len(vectors):
+            rng = np.random.default_rng(seed)
+            sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+        print(f"🎯 [ANN Index] {factory} 학습 ({len(sample)}개 샘플)")
+        index.train(np.ascontiguousarray(sample, dtype=np.float32))
+
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efConstruction = RAG_HNSW_EF_CONSTRUCTION
+
+    if ids is None:
+        index.add(vectors)
+    else:
+        index.add_with_ids(vectors, np.asarray(ids, dtype=np.int64))
+
+    tune_index(index)
+    return index
+
+
+def tune_index(index, nprobe: int = RAG_IVF_NPROBE, ef_search: int = RAG_HNSW_EF_SEARCH):
+    """검색 정확도/속도 파라미터 설정 (IVF: nprobe, HNSW: efSearch), 로딩 직후에도 호출"""
+    import faiss
+
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(nprobe, ivf.nlist)
+    hnsw = faiss.downcast_index(index)
+    if isinstance(hnsw, faiss.IndexHNSW):
+        hnsw.hnsw.efSearch = ef_search
+    return index
+
+
+def ann_kind(index) -> str:
+    """인덱스 구조 이름 (flat | hnsw | ivf)"""
+    import faiss
+
+    if faiss.try_extract_index_ivf(index) is not None:
+        return "ivf"
+    if isinstance(faiss.downcast_index(index), faiss.IndexHNSW):
+        return "hnsw"
+    return "flat"
@@ -0,0 +1,286 @@
+"""
+스트리밍 PDF 수집(ingestion) 파이프라인
+
+PDF 전체를 load() → split_documents() 한 뒤에야 임베딩을 시작하면
+문서 크기만큼 메모리를 쓰고, 파싱과 임베딩이 겹치지 못합니다.
+여기서는 페이지 단위로 파싱 → 분할 → 임베딩 → 인덱스 추가를 제너레이터로 연결하여
+메모리 사용량을 일정하게 유지하고, 첫 배치가 끝나는 즉시 검색이 가능하게 합니다.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from langchain_community.document_loaders import PDFPlumberLoader, PyPDFLoader
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from jm.utils.index_cache import file_sha256
+from jm.utils.page_cache import cache_pages, load_cached_pages
+
+# ===== 설정값 =====
+INGEST_BATCH_CHUNKS = int(os.getenv("INGEST_BATCH_CHUNKS", "64"))
+# 파싱 스레드가 임베딩보다 앞서 나갈 수 있는 최대 배치 수 (메모리 상한)
+INGEST_PREFETCH_BATCHES = int(os.getenv("INGEST_PREFETCH_BATCHES", "2"))
+# 병렬 텍스트 추출 설정 (1이면 기존 단일 프로세스 로더 사용)
+RAG_PDF_WORKERS = int(os.getenv("RAG_PDF_WORKERS", str(os.cpu_count() or 1)))
+RAG_PDF_PAGES_PER_SHARD = int(os.getenv("RAG_PDF_PAGES_PER_SHARD", "8"))
+# 이보다 페이지가 적으면 프로세스 풀 기동 비용이 더 크므로 순차 추출
+RAG_PDF_PARALLEL_MIN_PAGES = int(os.getenv("RAG_PDF_PARALLEL_MIN_PAGES", "16"))
+RAG_PAGE_CACHE = os.getenv("RAG_PAGE_CACHE", "true").lower() == "true"
+# 추출 워커 생성 방식: 스레드가 도는 프로세스(prefetch, httpx, 비동기 평가)에서 fork하지 않도록
+# forkserver(없으면 spawn) 사용. 워커가 진입 스크립트를 다시 import하므로 풀은 프로세스당 하나만 만들어 재사용
+RAG_PDF_START_METHOD = os.getenv(
+    "RAG_PDF_START_METHOD", "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+_END = object()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def create_text_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """시장성 평가 RAG용 텍스트 분할기"""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", ".", " ", ""],
+        # 청크의 페이지 내 시작 위치 (context_packer가 겹치는 인접 청크를 병합할 때 사용)
+        add_start_index=True,
+    )
+
+
+def count_pdf_pages(pdf_path: str) -> int:
+    """PDF 페이지 수 (텍스트 추출 없이 페이지 트리만 읽음)"""
+    from pypdf import PdfReader
+
+    return len(PdfReader(pdf_path).pages)
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int, engine: str) -> List[Tuple[int, str]]:
+    """[프로세스 풀 작업] start~end-1 페이지의 텍스트 추출 (로더와 같은 추출 호출)"""
+    if engine == "pdfplumber":
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            return [(i, pdf.pages[i].extract_text() or "") for i in range(start, end)]
+
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    return [(i, reader.pages[i].extract_text()) for i in range(start, end)]
+
+
+def _page_document(pdf_path: str, page: int, total_pages: int, text: str) -> Document:
+    """
+    순차 로더 / 프로세스 풀 공통 페이지 Document
+
+    두 경로가 같은 텍스트(앞뒤 공백 제거)와 같은 메타데이터를 내야
+    청크 내용과 인덱스 / BM25 / 페이지 캐시가 워커 수와 무관해집니다.
+    (로더가 붙이는 PDF 정보 메타데이터는 쓰는 곳이 없어 source / page / total_pages만 유지)
+    """
+    return Document(
+        page_content=text.strip(),
+        metadata={"source": pdf_path, "page": page, "total_pages": total_pages},
+    )
+
+
+def _serial_loader(pdf_path: str, engine: str):
+    if engine == "pdfplumber":
+        return PDFPlumberLoader(pdf_path)
+    return PyPDFLoader(pdf_path)
+
+
+def iter_pdf_pages(
+    pdf_path: str,
+    workers: int = RAG_PDF_WORKERS,
+    engine: str = "pypdf",
+    use_cache: bool = RAG_PAGE_CACHE,
+) -> Iterator[Document]:
+    """
+    PDF를 한 페이지씩 파싱하여 Document로 반환 (페이지 순서 보장)
+
+    이전에 파싱한 적 있는 PDF(같은 내용 해시)는 추출 텍스트 캐시에서 바로 읽습니다.
+    workers > 1이고 페이지가 충분히 많으면 페이지 범위를 샤드로 나눠
+    프로세스 풀에서 병렬 추출하고, 완료 순서와 무관하게 페이지 순서대로 합칩니다.
+
+    Args:
+        pdf_path: PDF 파일 경로
+        workers: 추출 프로세스 수
+        engine: "pypdf" (PyPDFLoader와 동일) 또는 "pdfplumber" (PDFPlumberLoader와 동일)
+        use_cache: 추출 텍스트 캐시 사용 여부
+    """
+    if not use_cache:
+        yield from _extract_pages(pdf_path, workers, engine)
+        return
+
+    file_hash = file_sha256(pdf_path)
+    cached = load_cached_pages(pdf_path, file_hash, engine)
+    if cached is not None:
+        print(f"⚡ [Page Cache] 캐시된 페이지 텍스트 로딩: {pdf_path} ({len(cached)}페이지)")
+        yield from cached
+        return
+
+    yield from cache_pages(_extract_pages(pdf_path, workers, engine), file_hash, engine)
+
+
+def _serial_pages(pdf_path: str, engine: str) -> Iterator[Document]:
+    total_pages = None
+    for doc in _serial_loader(pdf_path, engine).lazy_load():
+        if total_pages is None:
+            total_pages = doc.metadata.get("total_pages") or count_pdf_pages(pdf_path)
+        yield _page_document(pdf_path, doc.metadata["page"], total_pages, doc.page_content)
+
+
+def _extraction_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    프로세스 공용 추출 풀 (처음 요청한 워커 수로 생성)
+
+    forkserver / spawn 워커는 기동할 때 진입 스크립트를 다시 import하므로
+    PDF마다 풀을 새로 만들지 않고 재사용합니다.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max(workers, RAG_PDF_WORKERS),
+                mp_context=multiprocessing.get_context(RAG_PDF_START_METHOD),
+            )
+        return _pool
+
+
+def _reset_extraction_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _extract_pages(pdf_path: str, workers: int, engine: str) -> Iterator[Document]:
+    """PDF 파서로 페이지 텍스트 추출 (순차 또는 프로세스 풀)"""
+    # 추출 워커 안에서는(진입 스크립트 재import 중 인덱싱 등) 풀을 만들 수 없으므로 순차 추출
+    # (_inheriting: multiprocessing이 워커 기동 중 새 프로세스 생성을 막을 때 보는 표시)
+    worker = multiprocessing.current_process()
+    if workers <= 1 or worker.daemon or getattr(worker, "_inheriting", False):
+        yield from _serial_pages(pdf_path, engine)
+        return
+
+    total_pages = count_pdf_pages(pdf_path)
+    if total_pages < RAG_PDF_PARALLEL_MIN_PAGES:
+        yield from _serial_pages(pdf_path, engine)
+        return
+
+    shards = [
+        (start, min(start + RAG_PDF_PAGES_PER_SHARD, total_pages))
+        for start in range(0, total_pages, RAG_PDF_PAGES_PER_SHARD)
+    ]
+
+    executor = _extraction_pool(workers)
+    # 진행 중인 샤드 수를 제한하여 스트리밍 시에도 메모리 상한 유지
+    pending = deque()
+    shard_iter = iter(shards)
+    try:
+        for start, end in shard_iter:
+            pending.append(executor.submit(_extract_page_range, pdf_path, start, end, engine))
+            if len(pending) >= workers * 2:
+                break
+
+        while pending:
+            for page, text in pending.popleft().result():
+                yield _page_document(pdf_path, page, total_pages, text)
+            next_shard = next(shard_iter, None)
+            if next_shard is not None:
+                pending.append(executor.submit(_extract_page_range, pdf_path, *next_shard, engine))
+    except BrokenProcessPool:
+        # 워커가 죽은 풀은 다시 쓸 수 없으므로 다음 호출에서 새로 만듦
+        _reset_extraction_pool()
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def load_pdf_pages(
+    pdf_path: str,
+    workers: int = RAG_PDF_WORKERS,
+    engine: str = "pypdf",
+    use_cache: bool = RAG_PAGE_CACHE,
+) -> List[Document]:
+    """PDF 전체 페이지 로딩 (추출 텍스트 캐시 + 병렬 추출 지원)"""
+    return list(iter_pdf_pages(pdf_path, workers=workers, engine=engine, use_cache=use_cache))
+
+
+def iter_chunk_batches(
+    pages: Iterable[Document],
+    text_splitter: RecursiveCharacterTextSplitter,
+    batch_chunks: int = INGEST_BATCH_CHUNKS,
+) -> Iterator[List[Document]]:
+    """페이지를 분할하면서 batch_chunks개 단위로 청크 배치 반환"""
+    batch: List[Document] = []
+    for page in pages:
+        batch.extend(text_splitter.split_documents([page]))
+        while len(batch) >= batch_chunks:
+            yield batch[:batch_chunks]
+            batch = batch[batch_chunks:]
+    if batch:
+        yield batch
+
+
+def prefetch(iterator: Iterator, max_buffered: int = INGEST_PREFETCH_BATCHES) -> Iterator:
+    """
+    백그라운드 스레드에서 iterator를 미리 진행 (파싱과 임베딩을 겹치기 위함)
+
+    버퍼가 max_buffered개로 제한되므로 파싱이 임베딩보다 너무 앞서 나가지 않습니다.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max(1, max_buffered))
+
+    def producer():
+        try:
+            for item in iterator:
+                buffer.put(item)
+            buffer.put(_END)
+        except BaseException as e:  # 소비자 쪽에서 다시 발생시킴
+            buffer.put(e)
+
+    threading.Thread(target=producer, daemon=True).start()
+
+    while True:
+        item = buffer.get()
+        if item is _END:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+
+def stream_into_vectorstore(
+    chunk_batches: Iterable[List[Document]],
+    embeddings: Embeddings,
+    vectorstore: Optional[FAISS] = None,
+) -> Iterator[FAISS]:
+    """
+    청크 배치를 임베딩하여 FAISS 인덱스에 계속 추가
+
+    배치 하나가 추가될 때마다 (같은) 벡터 스토어를 yield 하므로,
+    호출 측은 첫 yield 이후 바로 검색을 시작할 수 있습니다.
+    """
+    for batch in chunk_batches:
+        texts = [doc.page_content for doc in batch]
+        metadatas = [doc.metadata for doc in batch]
+        vectors = embeddings.embed_documents(texts)
+        text_embeddings = list(zip(texts, vectors))
+
+        if vectorstore is None:
+            vectorstore = FAISS.from_embeddings(text_embeddings, embeddings, metadatas=metadatas)
+        else:
+            vectorstore.add_embeddings(text_embeddings, metadatas=metadatas)
+
+        yield vectorstore
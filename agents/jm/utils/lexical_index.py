@@ -0,0 +1,226 @@
+"""
+BM25 역색인 + 벡터 검색 하이브리드 (Reciprocal Rank Fusion)
+
+TAM 수치, FDA 510(k), CE 인증처럼 키워드가 핵심인 Bessemer 질문은 dense 검색만으로는 자주 놓치고,
+그러면 관련성 평가 → 질문 재작성 → 재검색 (→ Tavily) 루프로 이어져 LLM/웹 호출이 늘어납니다.
+setup_rag_pipeline 수집 시 청크 단위 BM25 역색인을 함께 만들고, 검색 시 두 순위를 RRF로 합칩니다.
+
+한국어는 조사가 붙어 어절 단위 매칭이 잘 되지 않으므로 ("시장규모는" vs "시장 규모")
+한글 어절은 어절 자체 + 음절 bigram으로, 영문/숫자는 소문자 단어로 토큰화합니다.
+"""
+
+import math
+import os
+import pickle
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from jm.utils.index_cache import RAG_CACHE_DIR, temp_path
+
+# ===== 설정값 =====
+RAG_HYBRID_SEARCH = os.getenv("RAG_HYBRID_SEARCH", "true").lower() == "true"
+# 각 검색기에서 RRF 후보로 가져올 개수
+RAG_HYBRID_FETCH_K = int(os.getenv("RAG_HYBRID_FETCH_K", "20"))
+# RRF 상수 (클수록 하위 순위 가중치가 상대적으로 커짐, 원 논문 기본값 60)
+RAG_RRF_K = int(os.getenv("RAG_RRF_K", "60"))
+
+# 한글 어절 | 영문/숫자 (510(k) → 510k, 1,000 → 1000)
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+(?:[.,(][a-z0-9]+\)?)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    BM25용 토큰화 (한국어 음절 bigram + 영문/숫자 단어)
+
+    예: "FDA 510(k) 인허가를" → ["fda", "510k", "인허가를", "인허", "허가", "가를"]
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.findall(text.lower()):
+        if "가" <= match[0] <= "힣":
+            tokens.append(match)
+            if len(match) > 2:
+                tokens.extend(match[i:i + 2] for i in range(len(match) - 1))
+        else:
+            tokens.append(re.sub(r"[.,()]", "", match))
+    return tokens
+
+
+class BM25Index:
+    """
+    청크 row 단위 BM25 역색인
+
+    Args:
+        k1: 단어 빈도 포화 파라미터
+        b: 문서 길이 정규화 파라미터
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.doc_len = np.zeros(0, dtype=np.float32)
+        self.avgdl = 0.0
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    @classmethod
+    def from_texts(cls, texts: Sequence[str], **kwargs) -> "BM25Index":
+        """청크 텍스트 목록으로 역색인 구축 (row = 목록 순서)"""
+        index = cls(**kwargs)
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        doc_len = []
+        for row, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            doc_len.append(sum(counts.values()))
+            for term, tf in counts.items():
+                rows, tfs = postings.setdefault(term, ([], []))
+                rows.append(row)
+                tfs.append(tf)
+
+        index.postings = {
+            term: (np.asarray(rows, dtype=np.int32), np.asarray(tfs, dtype=np.float32))
+            for term, (rows, tfs) in postings.items()
+        }
+        index.doc_len = np.asarray(doc_len, dtype=np.float32)
+        index.avgdl = float(index.doc_len.mean()) if doc_len else 0.0
+        return index
+
+    def scores(self, query: str) -> np.ndarray:
+        """모든 row의 BM25 점수 (질의 단어가 나오는 row만 계산)"""
+        scores = np.zeros(len(self), dtype=np.float32)
+        n = len(self)
+        if n == 0:
+            return scores
+
+        norm = self.k1 * (1 - self.b + self.b * self.doc_len / max(self.avgdl, 1e-9))
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            rows, tfs = posting
+            idf = math.log(1 + (n - len(rows) + 0.5) / (len(rows) + 0.5))
+            scores[rows] += idf * tfs * (self.k1 + 1) / (tfs + norm[rows])
+        return scores
+
+    def search(self, query: str, k: int = 5, rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """BM25 상위 k개 (row, 점수), 점수 0인 row는 제외 (rows를 주면 그 row 중에서만)"""
+        scores = self.scores(query)
+        if rows is not None:
+            mask = np.zeros(len(scores), dtype=bool)
+            mask[rows] = True
+            scores[~mask] = 0.0
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(row), float(scores[row])) for row in top if scores[row] > 0]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Any]], rrf_k: int = RAG_RRF_K) -> List[Tuple[Any, float]]:
+    """
+    여러 순위 목록을 RRF로 합침: score(d) = Σ 1 / (rrf_k + rank)
+
+    점수 척도가 다른 BM25와 코사인 유사도를 정규화 없이 합칠 수 있습니다.
+    """
+    fused: Dict[Any, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+def _doc_key(doc: Document) -> Tuple[Any, Any, str]:
+    # 벡터 스토어와 역색인이 같은 청크를 서로 다른 Document 객체로 가질 수 있어 내용으로 식별
+    return doc.metadata.get("source"), doc.metadata.get("page"), doc.page_content
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Dense Retriever + BM25 역색인 결과를 RRF로 합치는 Retriever
+
+    dense는 fetch_k개를 반환하도록 설정된 Retriever여야 합니다.
+    shards(SectionShardIndex)를 주면 BM25 후보도 질문이 라우팅된 섹션 샤드로 제한합니다.
+    """
+
+    dense: BaseRetriever
+    lexical: Any
+    documents: List[Document]
+    k: int = 5
+    fetch_k: int = RAG_HYBRID_FETCH_K
+    rrf_k: int = RAG_RRF_K
+    shards: Optional[Any] = None
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self.fuse(query, self.dense.invoke(query))
+
+    def fuse(self, query: str, dense_docs: List[Document]) -> List[Document]:
+        """이미 가져온 dense 결과에 BM25 결과를 RRF로 합침 (배치 검색에서 재사용)"""
+        return [doc for doc, _ in self.fuse_scored(query, [(doc, None) for doc in dense_docs])]
+
+    def fuse_scored(
+        self, query: str, dense_hits: List[Tuple[Document, Optional[float]]]
+    ) -> List[Tuple[Document, Optional[float]]]:
+        """
+        (Document, 코사인 유사도) dense 결과에 BM25 결과를 RRF로 합침
+
+        순위는 RRF로 정하고, 점수는 dense 유사도를 그대로 전달합니다 (BM25로만 찾은 청크는 None).
+        """
+        rows = self.shards.rows_for(query, min_rows=self.k) if self.shards is not None else None
+        lexical_docs = [self.documents[row] for row, _ in self.lexical.search(query, self.fetch_k, rows)]
+
+        by_key = {}
+        similarity = {}
+        rankings = []
+        for hits in (dense_hits, [(doc, None) for doc in lexical_docs]):
+            keys = []
+            for doc, score in hits:
+                key = _doc_key(doc)
+                by_key.setdefault(key, doc)
+                if score is not None:
+                    similarity.setdefault(key, score)
+                keys.append(key)
+            rankings.append(keys)
+
+        return [
+            (by_key[key], similarity.get(key))
+            for key, _ in reciprocal_rank_fusion(rankings, self.rrf_k)[:self.k]
+        ]
+
+
+def lexical_index_path(key: str) -> Path:
+    """캐시 키에 해당하는 역색인 파일 경로 (FAISS 인덱스 캐시와 같은 키)"""
+    return Path(RAG_CACHE_DIR) / "lexical" / f"{key}.pkl"
+
+
+def load_or_build_lexical_index(key: Optional[str], documents: List[Document]) -> BM25Index:
+    """캐시된 역색인 로딩, 없으면 청크로 구축 후 저장 (row 수가 다르면 재구축)"""
+    path = lexical_index_path(key) if key else None
+    if path is not None and path.exists():
+        try:
+            with open(path, "rb") as f:
+                index = pickle.load(f)
+            if len(index) == len(documents):
+                return index
+        except Exception as e:
+            print(f"⚠️ [Lexical Index] 캐시 로딩 실패, 재구축합니다: {e}")
+
+    index = BM25Index.from_texts([doc.page_content for doc in documents])
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = temp_path(path)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(index, f)
+        os.replace(tmp_path, path)
+    print(f"🔤 [Lexical Index] BM25 역색인 구축 완료 ({len(documents)}개 청크, {len(index.postings)}개 단어)")
+    return index
@@ -0,0 +1,323 @@
+"""
+디스크 기반 LLM 응답 캐시 (모든 에이전트 공용)
+
+모든 에이전트가 gpt-4o-mini를 temperature=0으로 호출하므로, 같은 스타트업 / 같은 문서로
+평가를 다시 돌리면 관련성 평가, 질문 재작성, 답변 생성, 스코어카드 프롬프트가 그대로 반복됩니다.
+(모델 + 호출 파라미터, 정규화된 메시지) 키로 응답을 SQLite에 저장해 두고 재실행 시 재사용합니다.
+
+    키: LangChain llm_string (모델, temperature, bind_tools 도구 / 구조화 출력 스키마 포함)
+        + 메시지 직렬화 (메시지 id 제거) → SHA-256
+    값: 직렬화된 ChatGeneration 목록
+
+에이전트(네임스페이스)별로 항목을 구분하여 한 에이전트의 캐시만 비울 수 있고,
+TTL이 지난 항목은 조회 시 버리며, 항목 수가 상한을 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다.
+
+    python -m jm.utils.llm_cache --stats
+    python -m jm.utils.llm_cache --clear market
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from jm.utils.index_cache import RAG_CACHE_DIR
+from jm.utils.run_metrics import track_call
+
+# ===== 설정값 =====
+LLM_CACHE = os.getenv("LLM_CACHE", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", str(Path(RAG_CACHE_DIR) / "llm_cache.sqlite3"))
+# 항목 유효 기간 (초, 0이면 만료 없음) - 기본 7일
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+# 최대 항목 수 (넘으면 LRU 제거)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+DEFAULT_NAMESPACE = "default"
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """(메시지 직렬화, 모델/파라미터 문자열) → SHA-256"""
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseStore:
+    """
+    (네임스페이스, 키) → 응답 텍스트 SQLite 저장소 (TTL + LRU 상한 + 적중률)
+
+    Args:
+        path: SQLite 파일 경로
+        ttl: 항목 유효 기간 (초, 0이면 만료 없음)
+        max_entries: 최대 항목 수 (전체 네임스페이스 합계)
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl: float = LLM_CACHE_TTL,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)")
+        self._conn.commit()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, namespace: str, field: str) -> None:
+        counters = self.stats.setdefault(namespace, {"hits": 0, "misses": 0, "expired": 0, "evicted": 0})
+        counters[field] += 1
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """저장된 응답 (없거나 만료되면 None, 적중 시 사용 시각 갱신)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM llm_cache WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is None:
+                self._count(namespace, "misses")
+                return None
+            value, created = row
+            if self.ttl and now - created > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE namespace = ? AND key = ?", (namespace, key))
+                self._conn.commit()
+                self._count(namespace, "expired")
+                self._count(namespace, "misses")
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed = ? WHERE namespace = ? AND key = ?", (now, namespace, key)
+            )
+            self._conn.commit()
+            self._count(namespace, "hits")
+            return value
+
+    def put(self, namespace: str, key: str, value: str) -> None:
+        """응답 저장 (이미 있으면 덮어씀), 상한을 넘으면 가장 오래 사용하지 않은 항목 제거"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (namespace, key, value, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, value, now, now),
+            )
+            (total,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            if self.max_entries and total > self.max_entries:
+                evicted = self._conn.execute(
+                    "DELETE FROM llm_cache WHERE rowid IN "
+                    "(SELECT rowid FROM llm_cache ORDER BY accessed LIMIT ?) RETURNING namespace",
+                    (total - self.max_entries,),
+                ).fetchall()
+                for (evicted_namespace,) in evicted:
+                    self._count(evicted_namespace, "evicted")
+            self._conn.commit()
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """네임스페이스(없으면 전체) 항목 삭제 → 삭제한 항목 수"""
+        with self._lock:
+            if namespace is None:
+                cursor = self._conn.execute("DELETE FROM llm_cache")
+            else:
+                cursor = self._conn.execute("DELETE FROM llm_cache WHERE namespace = ?", (namespace,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def entries(self) -> Dict[str, int]:
+        """네임스페이스별 저장 항목 수"""
+        with self._lock:
+            rows = self._conn.execute("SELECT namespace, COUNT(*) FROM llm_cache GROUP BY namespace").fetchall()
+        return dict(rows)
+
+    def report(self) -> Dict[str, Any]:
+        """네임스페이스별 / 전체 적중률 (이번 프로세스 기준) 및 저장 항목 수"""
+        entries = self.entries()
+        namespaces = {}
+        for namespace in sorted(set(self.stats) | set(entries)):
+            counters = self.stats.get(namespace, {"hits": 0, "misses": 0, "expired": 0, "evicted": 0})
+            lookups = counters["hits"] + counters["misses"]
+            namespaces[namespace] = {
+                **counters,
+                "entries": entries.get(namespace, 0),
+                "hit_rate": round(counters["hits"] / lookups, 3) if lookups else 0.0,
+            }
+        hits = sum(ns["hits"] for ns in namespaces.values())
+        lookups = hits + sum(ns["misses"] for ns in namespaces.values())
+        return {
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": sum(entries.values()),
+            "namespaces": namespaces,
+        }
+
+
+def _serializable(generations: RETURN_VAL_TYPE) -> list:
+    """
+    구조화 출력(with_structured_output)의 additional_kwargs["parsed"] pydantic 객체를 dict로 변환
+
+    pydantic 객체는 직렬화되지 않고, ChatOpenAI 파서는 dict로 저장된 parsed도 스키마로 복원합니다.
+    """
+    converted = []
+    for generation in generations:
+        message = getattr(generation, "message", None)
+        parsed = message.additional_kwargs.get("parsed") if message is not None else None
+        if hasattr(parsed, "model_dump"):
+            message = message.model_copy(
+                update={"additional_kwargs": {**message.additional_kwargs, "parsed": parsed.model_dump()}}
+            )
+            generation = generation.model_copy(update={"message": message})
+        converted.append(generation)
+    return converted
+
+
+class LLMResponseCache(BaseCache):
+    """
+    LangChain 채팅 모델용 캐시 (ChatOpenAI(cache=...))
+
+    같은 LLMResponseStore를 네임스페이스만 다르게 여러 개 만들어 에이전트별로 사용합니다.
+    """
+
+    def __init__(self, store: LLMResponseStore, namespace: str = DEFAULT_NAMESPACE):
+        self.store = store
+        self.namespace = namespace
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        value = self.store.get(self.namespace, cache_key(prompt, llm_string))
+        if value is None:
+            return None
+        try:
+            return loads(value, allowed_objects="core")
+        except Exception as e:
+            print(f"⚠️ [LLM Cache] 캐시 항목 복원 실패, 다시 호출합니다: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.store.put(self.namespace, cache_key(prompt, llm_string), dumps(_serializable(return_val)))
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear(self.namespace)
+
+
+_store: Optional[LLMResponseStore] = None
+_store_lock = threading.Lock()
+
+
+def llm_response_store() -> LLMResponseStore:
+    """프로세스 공용 응답 저장소 (처음 사용할 때 생성)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LLMResponseStore()
+        return _store
+
+
+def is_cacheable(temperature: float) -> bool:
+    """
+    응답을 캐시할 호출인지 (LLM_CACHE가 켜져 있고 temperature=0인 결정적 호출만)
+
+    샘플링하는 호출을 캐시하면 한 번 뽑힌 결과가 재실행마다 고정되므로 캐시하지 않습니다.
+    """
+    return LLM_CACHE and temperature == 0
+
+
+def llm_response_cache(namespace: str = DEFAULT_NAMESPACE, temperature: float = 0) -> Optional[LLMResponseCache]:
+    """네임스페이스 캐시 (LLM_CACHE가 꺼져 있거나 temperature가 0이 아니면 None)"""
+    if not is_cacheable(temperature):
+        return None
+    return LLMResponseCache(llm_response_store(), namespace)
+
+
+def cached_chat_completion(
+    client,
+    messages: list,
+    params: Dict[str, Any],
+    namespace: str = DEFAULT_NAMESPACE,
+    parse: Callable[[str], Any] = json.loads,
+) -> Any:
+    """
+    OpenAI SDK chat.completions 호출 + LLM 응답 캐시 (LangChain 밖에서 직접 부르는 호출용)
+
+    (params, messages) 키로 응답 텍스트를 저장하고, 다시 부르면 API 대신 저장된 응답을 씁니다.
+    parse에 성공한 응답만 저장하므로 깨진 응답이 캐시에 고정되지 않습니다.
+    캐시 적중은 run_metrics에 cached 호출로 기록됩니다.
+
+    Returns:
+        parse(응답 텍스트)
+    """
+    key = cache_key(json.dumps(messages, ensure_ascii=False), json.dumps(params, sort_keys=True))
+    store = llm_response_store() if is_cacheable(params.get("temperature", 1)) else None
+    with track_call("llm", params["model"]) as call:
+        txt = store.get(namespace, key) if store is not None else None
+        if txt is not None:
+            call.cached = True
+            return parse(txt)
+        resp = client.chat.completions.create(messages=messages, **params)
+        txt = resp.choices[0].message.content
+        if resp.usage is not None:
+            call.add_usage(params["model"], resp.usage.prompt_tokens, resp.usage.completion_tokens)
+    parsed = parse(txt)
+    if store is not None:
+        store.put(namespace, key, txt)
+    return parsed
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    """이번 프로세스의 LLM 응답 캐시 적중률 (캐시를 쓰지 않았으면 빈 dict)"""
+    return _store.report() if _store is not None else {}
+
+
+def print_llm_cache_stats() -> None:
+    """네임스페이스별 적중률 출력 (실행 종료 시 호출)"""
+    stats = llm_cache_stats()
+    if not stats:
+        return
+    print(
+        f"🗄️ [LLM Cache] 적중 {stats['hits']}회 / 미스 {stats['misses']}회 "
+        f"(적중률 {stats['hit_rate']:.1%}, 저장 {stats['entries']}개)"
+    )
+    for namespace, ns in stats["namespaces"].items():
+        if ns["hits"] or ns["misses"]:
+            print(
+                f"   - {namespace}: 적중 {ns['hits']} / 미스 {ns['misses']} "
+                f"(적중률 {ns['hit_rate']:.1%}, 만료 {ns['expired']}, LRU 제거 {ns['evicted']})"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 응답 캐시 관리")
+    parser.add_argument("--stats", action="store_true", help="네임스페이스별 저장 항목 수 출력")
+    parser.add_argument("--clear", nargs="?", const="*", metavar="NAMESPACE", help="네임스페이스(생략 시 전체) 삭제")
+    args = parser.parse_args()
+
+    store = llm_response_store()
+    if args.clear:
+        namespace = None if args.clear == "*" else args.clear
+        print(f"🗑️ [LLM Cache] {store.clear(namespace)}개 항목 삭제 ({args.clear})")
+    if args.stats or not args.clear:
+        for namespace, count in sorted(store.entries().items()):
+            print(f"{namespace:<16}{count:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+프로세스 공용 LLM 클라이언트 레지스트리
+
+노드마다 ChatOpenAI(...)를 새로 만들면 OpenAI SDK 클라이언트와 HTTP 커넥션 풀이 매번 새로 생기고,
+첫 요청마다 TCP/TLS 핸드셰이크를 다시 합니다 (질문 6개 × 관련성 평가/재작성/답변 생성).
+(모델, temperature, streaming, 구조화 출력 스키마) 조합마다 채팅 모델을 한 번만 만들고,
+모든 모델이 keep-alive 커넥션 풀 하나(httpx.Client / httpx.AsyncClient)를 공유합니다.
+
+    llm = get_chat_model()                                   # gpt-4o-mini, temperature=0
+    grader = get_chat_model(MODEL_NAME, schema=Grade)        # with_structured_output(Grade)
+    agent = get_chat_model(MODEL_NAME, streaming=True).bind_tools(tools)
+
+httpx 클라이언트는 스레드 안전하므로 병렬 노드 / 스레드 풀에서 그대로 공유합니다.
+모든 요청은 레이트 리미터(rate_limiter) 트랜스포트를 거쳐 모델별 RPM / TPM 한도 안에서 순서대로 나갑니다.
+namespace(에이전트 이름)를 주면 temperature=0 모델의 응답이 디스크 LLM 응답 캐시(llm_cache)의
+해당 네임스페이스에 저장됩니다.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from jm.utils.llm_cache import DEFAULT_NAMESPACE, llm_response_cache
+from jm.utils.rate_limiter import RATE_LIMIT, AsyncGovernedTransport, GovernedTransport
+from jm.utils.run_metrics import note_http_request
+
+# ===== 설정값 =====
+LLM_DEFAULT_MODEL = os.getenv("LLM_DEFAULT_MODEL", "gpt-4o-mini")
+# 공용 커넥션 풀 크기 (동시 요청 상한 / 유지할 유휴 커넥션 수)
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))
+# 유휴 커넥션 유지 시간 (초)
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+
+
+class LLMClientRegistry:
+    """
+    (모델, temperature, streaming, 스키마, 캐시 네임스페이스, 추가 옵션) → 채팅 모델 캐시 + 공용 HTTP 커넥션 풀
+
+    Args:
+        max_connections: 커넥션 풀 동시 커넥션 상한
+        max_keepalive: 유지할 유휴 keep-alive 커넥션 수
+        keepalive_expiry: 유휴 커넥션 유지 시간 (초)
+        timeout: 요청 타임아웃 (초)
+    """
+
+    def __init__(
+        self,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+        max_keepalive: int = LLM_MAX_KEEPALIVE,
+        keepalive_expiry: float = LLM_KEEPALIVE_EXPIRY,
+        timeout: float = LLM_TIMEOUT,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._models: Dict[Tuple, Any] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+        self.stats = {"hits": 0, "misses": 0, "requests": 0, "async_requests": 0}
+
+    def _count_request(self, request: httpx.Request) -> None:
+        # 스레드 풀의 여러 노드가 같은 클라이언트로 동시에 요청하므로 잠금 아래에서 집계
+        with self._lock:
+            self.stats["requests"] += 1
+        # 진행 중인 LLM 호출의 대기 시간 / SDK 재시도 계측 (run_metrics)
+        note_http_request()
+
+    async def _count_async_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.stats["async_requests"] += 1
+        note_http_request()
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """공용 동기 HTTP 클라이언트 (처음 사용할 때 생성)"""
+        with self._lock:
+            if self._http_client is None:
+                transport = httpx.HTTPTransport(limits=self.limits)
+                self._http_client = httpx.Client(
+                    transport=GovernedTransport(transport) if RATE_LIMIT else transport,
+                    timeout=self.timeout,
+                    event_hooks={"request": [self._count_request]},
+                )
+            return self._http_client
+
+    @property
+    def http_async_client(self) -> httpx.AsyncClient:
+        """공용 비동기 HTTP 클라이언트 (ainvoke / astream용)"""
+        with self._lock:
+            if self._http_async_client is None:
+                transport = httpx.AsyncHTTPTransport(limits=self.limits)
+                self._http_async_client = httpx.AsyncClient(
+                    transport=AsyncGovernedTransport(transport) if RATE_LIMIT else transport,
+                    timeout=self.timeout,
+                    event_hooks={"request": [self._count_async_request]},
+                )
+            return self._http_async_client
+
+    def get(
+        self,
+        model: str = LLM_DEFAULT_MODEL,
+        temperature: float = 0,
+        streaming: bool = False,
+        schema: Optional[Hashable] = None,
+        namespace: str = DEFAULT_NAMESPACE,
+        **kwargs,
+    ):
+        """
+        공용 채팅 모델 (같은 조합이면 같은 객체)
+
+        Args:
+            model: 모델명
+            temperature: 샘플링 온도
+            streaming: 스트리밍 응답 여부
+            schema: with_structured_output에 넘길 pydantic 모델 (None이면 일반 채팅 모델)
+            namespace: LLM 응답 캐시 네임스페이스 (에이전트 이름, 에이전트별 무효화 단위)
+            **kwargs: ChatOpenAI 추가 옵션 (해시 가능한 값만)
+        """
+        key = (model, temperature, streaming, schema, namespace, tuple(sorted(kwargs.items())))
+        with self._lock:
+            cached = self._models.get(key)
+            if cached is not None:
+                self.stats["hits"] += 1
+                return cached
+            self.stats["misses"] += 1
+
+        if schema is not None:
+            llm = self.get(model, temperature, streaming, namespace=namespace, **kwargs).with_structured_output(schema)
+        else:
+            llm = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                streaming=streaming,
+                http_client=self.http_client,
+                http_async_client=self.http_async_client,
+                # temperature=0인 결정적 호출만 디스크 캐시 사용 (llm_cache.is_cacheable)
+                cache=llm_response_cache(namespace, temperature),
+                **kwargs,
+            )
+
+        with self._lock:
+            # 동시에 같은 조합을 만든 경우 먼저 등록된 객체를 사용
+            return self._models.setdefault(key, llm)
+
+    def pool_stats(self) -> Dict[str, int]:
+        """공용 커넥션 풀 상태 (열린 커넥션 / 유휴 keep-alive 커넥션 / 누적 요청 수)"""
+        connections = []
+        for client in (self._http_client, self._http_async_client):
+            # httpx 공개 API에 풀 상태가 없어 httpcore 풀을 직접 확인 (레이트 리미터 래퍼는 벗겨서)
+            transport = getattr(client, "_transport", None)
+            pool = getattr(getattr(transport, "inner", transport), "_pool", None)
+            connections.extend(getattr(pool, "connections", []))
+        return {
+            "models": len(self._models),
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"],
+            "requests": self.stats["requests"] + self.stats["async_requests"],
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for conn in connections if conn.is_idle()),
+            "max_connections": self.limits.max_connections,
+        }
+
+    def close(self) -> None:
+        """동기 HTTP 클라이언트를 닫고 캐시된 모델을 비움 (비동기 클라이언트는 이벤트 루프에서 aclose)"""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._http_async_client = None
+            self._models.clear()
+
+
+llm_registry = LLMClientRegistry()
+
+
+def get_chat_model(
+    model: str = LLM_DEFAULT_MODEL,
+    temperature: float = 0,
+    streaming: bool = False,
+    schema: Optional[Hashable] = None,
+    namespace: str = DEFAULT_NAMESPACE,
+    **kwargs,
+):
+    """프로세스 공용 레지스트리의 채팅 모델 (LLMClientRegistry.get 참고)"""
+    return llm_registry.get(model, temperature, streaming, schema, namespace, **kwargs)
+
+
+def llm_pool_stats() -> Dict[str, int]:
+    """프로세스 공용 LLM 클라이언트 / 커넥션 풀 통계"""
+    return llm_registry.pool_stats()
+
+
+def print_llm_pool_stats() -> None:
+    """공용 클라이언트 재사용 / 커넥션 풀 상태 출력 (실행 종료 시 호출)"""
+    pool = llm_pool_stats()
+    if not pool["requests"]:
+        return
+    print(
+        f"🔌 [LLM Pool] 모델 {pool['models']}개 재사용 {pool['hits']}회, "
+        f"HTTP 요청 {pool['requests']}회 / 커넥션 {pool['open_connections']}개"
+    )
@@ -0,0 +1,108 @@
+"""
+PDF 추출 텍스트 캐시 (PDF는 한 번만 파싱)
+
+임베딩이 캐시되어도 매 실행마다 PDF 파싱 비용은 다시 듭니다.
+페이지별 텍스트 + 메타데이터를 파일 해시 키로 압축 JSONL(zstd, 없으면 gzip)에
+저장해두고, 이후 실행에서는 PDF 파서를 거치지 않고 바로 읽습니다.
+"""
+
+import gzip
+import io
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from langchain_core.documents import Document
+
+from jm.utils.index_cache import RAG_CACHE_DIR, temp_path
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: 없으면 gzip 사용
+    zstandard = None
+
+# 페이지 Document 형식이 바뀌면 올려서 기존 캐시를 무효화
+PAGE_CACHE_VERSION = 2
+# 경로마다 달라지는 메타데이터는 저장하지 않고 로딩 시 현재 경로로 채움
+_PATH_METADATA_KEYS = ("source", "file_path")
+
+
+def _suffix() -> str:
+    return ".jsonl.zst" if zstandard is not None else ".jsonl.gz"
+
+
+def page_cache_path(file_hash: str, engine: str) -> Path:
+    """파일 해시 + 추출 엔진별 캐시 파일 경로"""
+    return Path(RAG_CACHE_DIR) / "pages" / f"{file_hash}.{engine}.v{PAGE_CACHE_VERSION}{_suffix()}"
+
+
+def _open_text(path: Path, mode: str):
+    if path.suffix == ".zst":
+        if mode == "r":
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        else:
+            raw = zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"), closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+
+
+def load_cached_pages(pdf_path: str, file_hash: str, engine: str) -> Optional[List[Document]]:
+    """
+    캐시된 페이지 로딩
+
+    Returns:
+        List[Document] | None: 캐시 미스 또는 손상 시 None
+    """
+    path = page_cache_path(file_hash, engine)
+    if not path.exists():
+        return None
+
+    pages = []
+    try:
+        with _open_text(path, "r") as f:
+            for line in f:
+                record = json.loads(line)
+                metadata = record["metadata"]
+                metadata["source"] = pdf_path
+                if "file_path" in record.get("path_keys", ()):
+                    metadata["file_path"] = pdf_path
+                pages.append(Document(page_content=record["text"], metadata=metadata))
+    except Exception as e:
+        print(f"⚠️ [Page Cache] 캐시 로딩 실패, PDF를 다시 파싱합니다: {e}")
+        path.unlink(missing_ok=True)
+        return None
+
+    return pages
+
+
+def cache_pages(pages: Iterable[Document], file_hash: str, engine: str) -> Iterator[Document]:
+    """
+    페이지를 그대로 전달하면서 캐시 파일에 기록 (write-through)
+
+    모든 페이지를 끝까지 읽었을 때만 캐시 파일이 확정되므로,
+    중간에 중단되어도 불완전한 캐시가 남지 않습니다.
+    """
+    path = page_cache_path(file_hash, engine)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 확장자(.zst/.gz)를 유지해야 같은 압축 형식으로 쓰고 읽음
+    tmp_path = temp_path(path)
+
+    completed = False
+    try:
+        with _open_text(tmp_path, "w") as f:
+            for page in pages:
+                metadata = {k: v for k, v in page.metadata.items() if k not in _PATH_METADATA_KEYS}
+                path_keys = [k for k in _PATH_METADATA_KEYS if k in page.metadata]
+                f.write(json.dumps(
+                    {"text": page.page_content, "metadata": metadata, "path_keys": path_keys},
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                    default=str,
+                ) + "\n")
+                yield page
+        os.replace(tmp_path, path)
+        completed = True
+    finally:
+        if not completed:
+            tmp_path.unlink(missing_ok=True)
@@ -3,11 +3,82 @@ RAG 파이프라인 구축 유틸리티
 Reference: 15-RAG/01-Basic-PDF.ipynb, 16-AgenticRAG/01-NaiveRAG.ipynb
 """
 
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
+import os
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
 from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.vectorstores import VectorStoreRetriever
+
+from jm.utils.context_packer import RAG_CONTEXT_PACKING, pack_context
+from jm.utils.corpus_index import CorpusIndex
+from jm.utils.dedup import RAG_DEDUP, RAG_DEDUP_MAX_DISTANCE, NearDuplicateFilter
+from jm.utils.embedding_cache import embed_queries
+from jm.utils.hierarchical_index import (
+    RAG_HIER_PAGES_PER_SECTION,
+    RAG_HIER_TOP_SECTIONS,
+    RAG_HIERARCHICAL,
+    PageSummaryIndex,
+    use_hierarchical,
+)
+from jm.utils.embedding_providers import (
+    RAG_EMBEDDING_MODEL,
+    RAG_EMBEDDING_PROVIDER,
+    cached_embeddings,
+    scoped_index_name,
+)
+from jm.utils.index_cache import (
+    file_sha256,
+    index_cache_key,
+    load_cached_vectorstore,
+    save_vectorstore,
+)
+from jm.utils.index_factory import RAG_ANN_INDEX, choose_ann
+from jm.utils.ingestion import (
+    RAG_PDF_WORKERS,
+    create_text_splitter,
+    iter_chunk_batches,
+    iter_pdf_pages,
+    load_pdf_pages,
+    prefetch,
+    stream_into_vectorstore,
+)
+from jm.utils.lexical_index import (
+    RAG_HYBRID_FETCH_K,
+    RAG_HYBRID_SEARCH,
+    HybridRetriever,
+    load_or_build_lexical_index,
+)
+from jm.utils.retrieval_cache import index_version, retrieval_result_cache
+from jm.utils.retrieval_hit import RetrievalHit
+from jm.utils.retrievers import CorpusRetriever
+from jm.utils.section_router import (
+    RAG_SECTION_SHARDS,
+    SectionShardIndex,
+    classify_section_batches,
+    classify_sections,
+    use_section_shards,
+)
+from jm.utils.vector_tiers import (
+    RAG_VECTOR_TIER,
+    TieredVectorStore,
+    choose_tier,
+    faiss_to_arrays,
+    tiered_store_path,
+)
+
+# ===== 설정값 =====
+RAG_INDEX_CACHE = os.getenv("RAG_INDEX_CACHE", "true").lower() == "true"
+RAG_STREAMING_INGEST = os.getenv("RAG_STREAMING_INGEST", "false").lower() == "true"
+# 스타트업별 개별 인덱스 대신 공용 코퍼스 하나에 모든 스타트업 문서를 저장 (메타데이터 필터 검색)
+RAG_SHARED_CORPUS = os.getenv("RAG_SHARED_CORPUS", "false").lower() == "true"
+RAG_SHARED_CORPUS_NAME = os.getenv("RAG_SHARED_CORPUS_NAME", "startups")
 
 
 def format_docs(docs) -> str:
@@ -15,80 +86,495 @@ def format_docs(docs) -> str:
     return "\n\n".join([doc.page_content for doc in docs])
 
 
-def setup_rag_pipeline(pdf_path: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> BaseRetriever:
+def setup_rag_pipeline(
+    pdf_path: str,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    embedding_model: Optional[str] = None,
+    use_cache: bool = RAG_INDEX_CACHE,
+    streaming: bool = RAG_STREAMING_INGEST,
+    workers: int = RAG_PDF_WORKERS,
+    tier: str = RAG_VECTOR_TIER,
+    ann: str = RAG_ANN_INDEX,
+    hybrid: bool = RAG_HYBRID_SEARCH,
+    embedding_provider: str = RAG_EMBEDDING_PROVIDER,
+    dedup: bool = RAG_DEDUP,
+    hierarchical: str = RAG_HIERARCHICAL,
+    sections: str = RAG_SECTION_SHARDS,
+) -> BaseRetriever:
     """
     RAG 파이프라인 구축 (1회만 실행)
 
+    같은 PDF/청크 설정/임베딩 모델 조합은 디스크 캐시에서 FAISS 인덱스를 바로 로딩합니다.
+    streaming=True면 페이지 단위로 파싱/분할/임베딩/인덱스 추가를 겹쳐서 진행합니다
+    (100페이지 이상 시장 보고서에서 메모리 사용량을 일정하게 유지).
+    청크 수가 많으면 압축(SQ8/PQ/fp16) + 메모리 매핑 계층으로 저장하여 RAM 사용량을 줄이고,
+    전수 검색 대신 HNSW/IVF 근사 검색 인덱스를 사용합니다.
+    hybrid=True면 청크 BM25 역색인을 같은 캐시 키로 저장하고 벡터 검색 결과와 RRF로 합칩니다.
+    dedup=True면 페이지마다 반복되는 면책 조항/머리글 같은 근사 중복 청크를 임베딩 전에 하나로 합칩니다.
+    페이지가 많은 보고서는 페이지 요약 벡터로 상위 섹션을 먼저 고른 뒤 그 청크만 검색합니다.
+    청크마다 섹션 유형(재무/기술/규제/팀/시장)을 기록하고, 질문을 관련 섹션 샤드로만 라우팅합니다.
+
     Args:
         pdf_path: PDF 파일 경로
         chunk_size: 청크 크기
         chunk_overlap: 청크 오버랩
+        embedding_model: 임베딩 모델명 (기본값: 제공자별 기본 모델)
+        use_cache: 인덱스 캐시 사용 여부
+        streaming: 스트리밍 수집 모드 사용 여부
+        workers: PDF 텍스트 추출 프로세스 수 (1이면 순차 추출)
+        tier: 벡터 저장 계층 ("auto"면 청크 수로 선택, "flat" | "fp16" | "sq8" | "pq")
+        ann: 검색 인덱스 구조 ("auto"면 청크 수로 선택, "flat" | "hnsw" | "ivf")
+        hybrid: BM25 역색인을 함께 구축하여 벡터 검색과 RRF로 합칠지 여부
+        embedding_provider: 임베딩 제공자 ("openai" | "local" | "hashing")
+        dedup: 근사 중복 청크 제거 여부 (SimHash)
+        hierarchical: 페이지 요약 2단계 인덱스 ("auto"면 페이지 수로 결정, "true" | "false")
+        sections: 섹션 유형별 샤드 검색 ("auto"면 청크 수로 결정, "true" | "false")
 
     Returns:
         BaseRetriever: FAISS 기반 retriever
     """
 
-    print(f"📄 [RAG Setup] PDF 로딩: {pdf_path}")
+    # 청크 임베딩 캐시 (기술 요약 에이전트와 공유) → 캐시 미스만 임베딩
+    embeddings = cached_embeddings(embedding_provider, embedding_model)
+    # 제공자가 포함된 모델 키 → 제공자마다 다른 인덱스 캐시
+    model_key = embeddings.model_name
 
-    # 1. PDF 로딩
-    loader = PyPDFLoader(pdf_path)
-    documents = loader.load()
+    # 0. 인덱스 캐시 확인 (PDF 내용 해시 + 청크 설정 + 임베딩 제공자/모델)
+    cache_key = index_cache_key(
+        file_sha256(pdf_path), chunk_size, chunk_overlap, model_key,
+        options={"dedup_max_distance": RAG_DEDUP_MAX_DISTANCE} if dedup else None,
+    )
+    lexical_key = cache_key if use_cache else None
+    if use_cache:
+        tiered = None
+        if tier != "flat" or ann != "flat":
+            tiered = TieredVectorStore.load(tiered_store_path(cache_key), embeddings)
+        if tiered is not None and tiered.matches(tier, ann):
+            print(
+                f"⚡ [RAG Setup] 캐시된 {tiered.tier}/{tiered.ann} 계층 인덱스 로딩: {pdf_path} ({len(tiered)}개 청크)"
+            )
+            return _create_retriever(tiered, lexical_key, hybrid, cache_key, hierarchical, sections)
 
-    print(f"✅ [RAG Setup] {len(documents)}개 페이지 로드 완료")
+        vectorstore = load_cached_vectorstore(cache_key, embeddings)
+        if vectorstore is not None:
+            print(f"⚡ [RAG Setup] 캐시된 FAISS 인덱스 로딩: {pdf_path} ({vectorstore.index.ntotal}개 청크)")
+            return _create_retriever(vectorstore, lexical_key, hybrid, cache_key, hierarchical, sections)
 
-    # 2. 텍스트 분할
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        separators=["\n\n", "\n", ".", " ", ""]
-    )
-    splits = text_splitter.split_documents(documents)
+    if streaming:
+        # 1~3. 스트리밍 수집: 페이지 단위 파싱 → 분할 → 임베딩 → 인덱스 추가
+        vectorstore = None
+        for vectorstore in stream_rag_pipeline(pdf_path, chunk_size, chunk_overlap, embeddings, workers, dedup):
+            pass
+        if vectorstore is None:
+            raise ValueError(f"PDF에서 텍스트를 추출하지 못했습니다: {pdf_path}")
+        num_chunks = vectorstore.index.ntotal
+    else:
+        print(f"📄 [RAG Setup] PDF 로딩: {pdf_path}")
+
+        # 1. PDF 로딩 (페이지가 많으면 프로세스 풀에서 병렬 추출)
+        documents = load_pdf_pages(pdf_path, workers=workers)
+
+        print(f"✅ [RAG Setup] {len(documents)}개 페이지 로드 완료")
+
+        # 2. 텍스트 분할
+        text_splitter = create_text_splitter(chunk_size, chunk_overlap)
+        splits = text_splitter.split_documents(documents)
+        num_chunks = len(splits)
+
+        print(f"✅ [RAG Setup] {len(splits)}개 청크로 분할 완료")
+
+        # 2.5 근사 중복 청크 제거 (중복 청크의 페이지는 남은 청크의 출처에 합침)
+        if dedup:
+            duplicates = NearDuplicateFilter()
+            splits = duplicates.filter(splits)
+            duplicates.annotate(splits)
+            num_chunks = len(splits)
+            print(f"🧹 [RAG Setup] 근사 중복 제거: {duplicates.report()}")
 
-    print(f"✅ [RAG Setup] {len(splits)}개 청크로 분할 완료")
+        # 2.6 섹션 유형 분류 (metadata["section"], 질문 라우팅용 샤드 구성에 사용)
+        section_counts = classify_sections(splits)
+        print(f"🏷️ [RAG Setup] 섹션 분류: {dict(section_counts.most_common())}")
 
-    # 3. 임베딩 생성 및 FAISS 벡터 스토어 구축
-    embeddings = OpenAIEmbeddings()
-    vectorstore = FAISS.from_documents(splits, embeddings)
+        # 3. 임베딩 생성 및 FAISS 벡터 스토어 구축
+        vectorstore = FAISS.from_documents(splits, embeddings)
 
     print(f"✅ [RAG Setup] FAISS 벡터 스토어 구축 완료")
 
-    # 4. Retriever 생성
-    retriever = vectorstore.as_retriever(
-        search_type="similarity",
-        search_kwargs={"k": 5}  # 상위 5개 문서 검색
-    )
+    # 4. 대형 코퍼스는 압축 인덱스 + 메모리 매핑 원본 벡터 + ANN 검색 구조로 전환 (float32 flat 인덱스는 버림)
+    resolved_tier = choose_tier(num_chunks, tier)
+    resolved_ann = choose_ann(num_chunks, ann)
+    if resolved_tier != "flat" or resolved_ann != "flat":
+        vectors, docs = faiss_to_arrays(vectorstore)
+        del vectorstore
+        tiered = TieredVectorStore.build(
+            vectors, docs, embeddings, resolved_tier, tiered_store_path(cache_key), ann=resolved_ann
+        )
+        memory = tiered.memory_bytes()
+        print(
+            f"💾 [RAG Setup] {tiered.tier}/{tiered.ann} 계층 인덱스 저장 완료 "
+            f"(RAM {memory['index_bytes'] / 1e6:.1f}MB, 원본 벡터 {memory['exact_vector_bytes'] / 1e6:.1f}MB 메모리 매핑)"
+        )
+        return _create_retriever(tiered, lexical_key, hybrid, cache_key, hierarchical, sections)
+
+    # 5. 인덱스 캐시 저장
+    if use_cache:
+        save_vectorstore(cache_key, vectorstore, meta={
+            "pdf_path": pdf_path,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "embedding_model": model_key,
+            "num_chunks": num_chunks,
+        })
+        print(f"💾 [RAG Setup] FAISS 인덱스 캐시 저장 완료")
+
+    return _create_retriever(vectorstore, lexical_key, hybrid, cache_key, hierarchical, sections)
+
+
+def stream_rag_pipeline(
+    pdf_path: str,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    embeddings=None,
+    workers: int = RAG_PDF_WORKERS,
+    dedup: bool = RAG_DEDUP,
+) -> Iterator[FAISS]:
+    """
+    스트리밍 RAG 파이프라인 (제너레이터)
+
+    청크 배치가 인덱스에 추가될 때마다 벡터 스토어를 yield 합니다.
+    첫 yield 시점부터 검색이 가능하며, 메모리에는 현재 배치와
+    prefetch 버퍼만 올라가므로 문서 크기와 무관하게 사용량이 일정합니다.
+
+    Args:
+        pdf_path: PDF 파일 경로
+        chunk_size: 청크 크기
+        chunk_overlap: 청크 오버랩
+        embeddings: 사용할 Embeddings (기본값: 캐시 적용 RAG_EMBEDDING_PROVIDER 임베딩)
+        workers: PDF 텍스트 추출 프로세스 수
+        dedup: 근사 중복 청크 제거 여부 (앞서 나온 청크와 겹치는 청크는 임베딩하지 않음)
+
+    Yields:
+        FAISS: 지금까지 추가된 청크를 담은 벡터 스토어
+    """
+
+    if embeddings is None:
+        embeddings = cached_embeddings()
+
+    print(f"📄 [RAG Setup] PDF 스트리밍 수집 시작: {pdf_path}")
+
+    started = time.perf_counter()
+    text_splitter = create_text_splitter(chunk_size, chunk_overlap)
+    # 파싱/분할은 백그라운드 스레드에서 진행 → 임베딩과 겹침
+    chunk_batches = iter_chunk_batches(iter_pdf_pages(pdf_path, workers=workers), text_splitter)
+    duplicates = NearDuplicateFilter() if dedup else None
+    if duplicates is not None:
+        chunk_batches = duplicates.filter_batches(chunk_batches)
+    chunk_batches = prefetch(classify_section_batches(chunk_batches))
+
+    vectorstore = None
+    for i, vectorstore in enumerate(stream_into_vectorstore(chunk_batches, embeddings)):
+        if i == 0:
+            print(f"⚡ [RAG Setup] 첫 배치 검색 가능 ({time.perf_counter() - started:.1f}초)")
+        yield vectorstore
+
+    if duplicates is not None and vectorstore is not None:
+        # 벡터 스토어에 저장된 Document에 중복 청크 페이지를 합침
+        duplicates.annotate(
+            vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+            for i in range(vectorstore.index.ntotal)
+        )
+        print(f"🧹 [RAG Setup] 근사 중복 제거: {duplicates.report()}")
+
+    print(f"✅ [RAG Setup] 스트리밍 수집 완료 ({time.perf_counter() - started:.1f}초)")
+
+
+_shared_corpora: Dict[str, CorpusIndex] = {}
+_shared_corpora_lock = threading.Lock()
+
+
+def get_shared_corpus(
+    name: str = RAG_SHARED_CORPUS_NAME,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    embedding_model: Optional[str] = None,
+    embedding_provider: str = RAG_EMBEDDING_PROVIDER,
+) -> CorpusIndex:
+    """여러 스타트업 문서를 담는 공용 코퍼스 (프로세스당 한 번만 로딩, 임베딩 제공자별로 분리)"""
+    embeddings = cached_embeddings(embedding_provider, embedding_model)
+    key = f"{name}:{chunk_size}:{chunk_overlap}:{embeddings.model_name}"
+    with _shared_corpora_lock:
+        if key not in _shared_corpora:
+            _shared_corpora[key] = CorpusIndex.open(
+                scoped_index_name(name, embeddings.model_name),
+                embeddings=embeddings,
+                embedding_model=embeddings.model_name,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+            )
+        return _shared_corpora[key]
+
+
+def setup_shared_corpus_retriever(
+    pdf_path: str,
+    startup_name: str,
+    doc_type: str = "ir",
+    doc_date: Optional[str] = None,
+    doc_types: Optional[Union[str, List[str]]] = None,
+    k: int = 5,
+    corpus: Optional[CorpusIndex] = None,
+) -> BaseRetriever:
+    """
+    공용 코퍼스에 문서를 등록하고 해당 스타트업 청크만 검색하는 Retriever 반환
+
+    문서는 (스타트업, 문서 유형, 날짜) 메타데이터와 함께 한 번만 인덱싱되고,
+    검색 시에는 메타데이터 역색인으로 고른 row id의 벡터만 비교합니다.
+
+    Args:
+        pdf_path: PDF 파일 경로
+        startup_name: 스타트업 이름 (검색 필터)
+        doc_type: 이 문서의 유형 (예: "ir", "market_report")
+        doc_date: 문서 날짜 (기본값: 이미 인덱싱된 같은 내용이면 기존 날짜, 아니면 파일 수정일)
+        doc_types: 검색할 문서 유형 제한 (기본값: 전체)
+        k: 검색 결과 수
+        corpus: 사용할 코퍼스 (기본값: get_shared_corpus())
+
+    Returns:
+        BaseRetriever: 스타트업 필터가 적용된 Retriever
+    """
+    if corpus is None:
+        corpus = get_shared_corpus()
+    file_hash = file_sha256(pdf_path)
+    entry = corpus.documents.get(os.path.abspath(pdf_path))
+    same_content = entry is not None and entry["sha256"] == file_hash
+    if doc_date is None:
+        # 내용이 같으면 기존 날짜 유지 (수정 시각만 바뀐 파일을 다시 인덱싱하지 않음)
+        doc_date = (entry["metadata"].get("date") if same_content else None) or (
+            date.fromtimestamp(os.path.getmtime(pdf_path)).isoformat()
+        )
+    metadata = {"startup": startup_name, "doc_type": doc_type, "date": doc_date}
+
+    if not same_content or entry["metadata"] != metadata:
+        corpus.add_pdf(pdf_path, metadata=metadata)
+    else:
+        print(f"⚡ [RAG Setup] 공용 코퍼스에 이미 인덱싱됨: {pdf_path} ({entry['num_chunks']}개 청크)")
+
+    search_filter = {"startup": startup_name}
+    if doc_types:
+        search_filter["doc_type"] = doc_types
+
+    print(f"🚀 [RAG Setup] 공용 코퍼스 Retriever 준비 완료 (필터: {search_filter}, 검색 k={k})")
+
+    return corpus.as_retriever(k=k, filter=search_filter)
+
+
+def _create_retriever(
+    vectorstore: Union[FAISS, TieredVectorStore],
+    lexical_key: Optional[str] = None,
+    hybrid: bool = RAG_HYBRID_SEARCH,
+    index_key: Optional[str] = None,
+    hierarchical: str = RAG_HIERARCHICAL,
+    sections: str = RAG_SECTION_SHARDS,
+) -> BaseRetriever:
+    """
+    FAISS 벡터 스토어(또는 계층 인덱스)에서 Retriever 생성 (hybrid면 BM25와 RRF 결합)
+
+    index_key(PDF 내용 해시 기반 캐시 키)를 주면 retriever 메타데이터에 인덱스 버전으로 기록되어
+    검색 결과 캐시 키로 사용됩니다. 페이지 수가 많으면 (hierarchical) dense 검색을
+    페이지 요약 2단계 인덱스로, 그 외에 청크가 충분하면 (sections) 섹션 샤드 검색으로 바꿉니다.
+    """
+
+    # 하이브리드 검색은 RRF 후보를 넉넉히 가져온 뒤 상위 5개로 자름
+    dense_k = RAG_HYBRID_FETCH_K if hybrid else 5
+    summary_index = None
+    shard_index = None
+
+    if isinstance(vectorstore, TieredVectorStore):
+        retriever = vectorstore.as_retriever(k=dense_k)
+        documents = vectorstore.documents
+        version = f"{index_key}:{vectorstore.tier}/{vectorstore.ann}:{len(vectorstore)}"
+        if use_hierarchical(documents, hierarchical):
+            summary_index = PageSummaryIndex(vectorstore.vectors, documents, vectorstore.embeddings)
+        elif use_section_shards(documents, sections):
+            shard_index = SectionShardIndex(vectorstore.vectors, documents, vectorstore.embeddings)
+    else:
+        retriever = vectorstore.as_retriever(
+            search_type="similarity",
+            search_kwargs={"k": dense_k}  # 상위 5개 문서 검색 (하이브리드면 RRF 후보 수)
+        )
+        documents = [
+            vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+            for i in range(vectorstore.index.ntotal)
+        ] if hybrid or hierarchical != "false" or sections != "false" else []
+        version = f"{index_key}:flat:{vectorstore.index.ntotal}"
+        if hierarchical != "false" and use_hierarchical(documents, hierarchical):
+            vectors, _ = faiss_to_arrays(vectorstore)
+            summary_index = PageSummaryIndex(vectors, documents, vectorstore.embeddings)
+        elif sections != "false" and use_section_shards(documents, sections):
+            vectors, _ = faiss_to_arrays(vectorstore)
+            shard_index = SectionShardIndex(vectors, documents, vectorstore.embeddings)
+
+    if summary_index is not None:
+        retriever = summary_index.as_retriever(k=dense_k)
+        version = f"{version}:hier{RAG_HIER_PAGES_PER_SECTION}x{RAG_HIER_TOP_SECTIONS}"
+        print(
+            f"🗂️ [RAG Setup] 페이지 요약 인덱스 사용 (섹션 {len(summary_index.sections)}개, "
+            f"질의당 상위 {summary_index.top_sections}개 섹션만 검색)"
+        )
+    elif shard_index is not None:
+        retriever = shard_index.as_retriever(k=dense_k)
+        version = f"{version}:shards"
+        print(f"🧭 [RAG Setup] 섹션 샤드 검색 사용 (샤드별 청크 수: {shard_index.summary()})")
+
+    if index_key is not None:
+        retriever.metadata = {**(retriever.metadata or {}), "index_version": version}
+
+    if hybrid:
+        lexical = load_or_build_lexical_index(lexical_key, documents)
+        retriever = HybridRetriever(
+            dense=retriever, lexical=lexical, documents=documents, k=5, fetch_k=dense_k, shards=shard_index,
+        )
+        retriever.metadata = {"index_version": version} if index_key is not None else None
+        print(f"🚀 [RAG Setup] 하이브리드 Retriever 준비 완료 (BM25 + 벡터 RRF, 후보 {dense_k}개 → 검색 k=5)")
+        return retriever
 
     print(f"🚀 [RAG Setup] Retriever 준비 완료 (검색 k=5)")
 
     return retriever
 
 
-def retrieve_with_sources(retriever: BaseRetriever, query: str) -> tuple[str, list]:
+def retrieve_with_sources(retriever: BaseRetriever, query: str) -> List[RetrievalHit]:
     """
-    문서 검색 및 출처 추출
+    문서 검색 (출처 / 점수 / 위치 포함)
+
+    문서 내용을 이어 붙인 문자열 대신 RetrievalHit 목록을 반환합니다.
+    프롬프트를 만들 때 format_hits로 포맷팅하고, 출처는 hit_sources로 추출합니다.
 
     Args:
         retriever: FAISS Retriever
         query: 검색 질문
 
     Returns:
-        tuple: (포맷팅된 문서 내용, 출처 리스트)
+        List[RetrievalHit]: 검색 순위 순서의 결과
+    """
+    return batch_retrieve_hits(retriever, [query])[0]
+
+
+def format_hits(hits: List[RetrievalHit]) -> str:
+    """
+    검색 결과를 프롬프트용 문자열로 포맷팅
+
+    RAG_CONTEXT_PACKING이 켜져 있으면 context_packer로 컨텍스트를 줄인 뒤 포맷팅합니다.
+    """
+    if not RAG_CONTEXT_PACKING:
+        return format_docs([hit.document for hit in hits])
+
+    packed = pack_context(hits)
+    if packed.tokens_before:
+        print(
+            f"📦 [Context Packer] {len(hits)}개 청크 → {len(packed.documents)}개 블록 "
+            f"(컷오프 제외 {packed.dropped}, 병합 {packed.merged}, 예산 초과 {packed.over_budget}), "
+            f"토큰 {packed.tokens_before} → {packed.tokens_after} ({packed.tokens_saved} 절감)"
+        )
+    return packed.text
+
+
+def batch_retrieve(retriever: BaseRetriever, queries: List[str]) -> List[List[Document]]:
+    """
+    여러 질의를 한 번에 검색 (질의 임베딩 요청 1회 + 인덱스 행렬 검색 1회)
+
+    질의마다 retriever.invoke를 부르면 임베딩 API 왕복과 인덱스 검색이 질의 수만큼 반복됩니다.
+    지원하는 retriever(FAISS / 계층 인덱스 / 코퍼스 / 하이브리드)는 질의 행렬로 한 번에 처리하고,
+    그 외 retriever는 retriever.batch로 대체합니다.
+
+    Returns:
+        List[List[Document]]: queries 순서대로 검색 결과
+    """
+    return [[hit.document for hit in hits] for hits in batch_retrieve_hits(retriever, queries)]
+
+
+def batch_retrieve_hits(retriever: BaseRetriever, queries: List[str]) -> List[List[RetrievalHit]]:
+    """
+    batch_retrieve와 같은 방식으로 검색하되 RetrievalHit(청크 id, 코사인 유사도, 위치) 목록으로 반환
+
+    유사도를 알 수 없는 결과(BM25로만 찾은 청크, 점수를 주지 않는 retriever)는 score가 None
+
+    Returns:
+        List[List[RetrievalHit]]: queries 순서대로 검색 결과
     """
+    if not queries:
+        return []
+
+    # 검색 결과 캐시에 있는 질의는 제외하고 나머지만 한 번에 검색
+    version = index_version(retriever)
+    results: Dict[int, List[RetrievalHit]] = {}
+    if version is not None:
+        for i, query in enumerate(queries):
+            cached = retrieval_result_cache.get((version, query))
+            if cached is not None:
+                results[i] = list(cached)
+    missing = [i for i in range(len(queries)) if i not in results]
+    if not missing:
+        return [results[i] for i in range(len(queries))]
+
+    missing_queries = [queries[i] for i in missing]
+    dense = retriever.dense if isinstance(retriever, HybridRetriever) else retriever
+    searched = _batch_dense_search(dense, missing_queries)
+    if searched is None:
+        searched = [[(doc, None) for doc in docs] for docs in retriever.batch(missing_queries)]
+    elif isinstance(retriever, HybridRetriever):
+        # BM25는 로컬 CPU 연산이라 질의별로 합쳐도 추가 API 호출 없음
+        searched = [retriever.fuse_scored(query, hits) for query, hits in zip(missing_queries, searched)]
+
+    for i, scored_docs in zip(missing, searched):
+        hits = [RetrievalHit.from_document(doc, score) for doc, score in scored_docs]
+        results[i] = hits
+        if version is not None:
+            retrieval_result_cache.put((version, queries[i]), tuple(hits))
+    return [results[i] for i in range(len(queries))]
 
-    # 문서 검색
-    docs = retriever.invoke(query)
 
-    # 문서 내용 포맷팅
-    formatted_docs = format_docs(docs)
+def _batch_dense_search(
+    retriever: BaseRetriever, queries: List[str]
+) -> Optional[List[List[Tuple[Document, float]]]]:
+    """retriever 종류별 행렬 검색 → (Document, 코사인 유사도), 지원하지 않으면 None"""
+    if isinstance(retriever, CorpusRetriever):
+        corpus = retriever.corpus
+        if isinstance(corpus, CorpusIndex):
+            return corpus.search_batch(queries, k=retriever.k, filter=retriever.filter)
+        return corpus.search_batch(queries, k=retriever.k)
 
-    # 출처 추출 (페이지 번호)
-    sources = []
-    for doc in docs:
-        source = doc.metadata.get("source", "unknown")
-        page = doc.metadata.get("page", "unknown")
-        sources.append(f"{source} (page {page})")
+    if isinstance(retriever, VectorStoreRetriever) and isinstance(retriever.vectorstore, FAISS):
+        if retriever.search_type != "similarity":
+            return None
+        vectorstore = retriever.vectorstore
+        k = retriever.search_kwargs.get("k", 4)
+        vectors = np.asarray(embed_queries(vectorstore.embeddings, queries), dtype=np.float32)
+        # FAISS.similarity_search_by_vector와 같은 거리 기준 (정규화 설정 포함)
+        if vectorstore._normalize_L2:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        distances, ids = vectorstore.index.search(vectors, min(k, vectorstore.index.ntotal))
+        if vectorstore.distance_strategy == DistanceStrategy.MAX_INNER_PRODUCT:
+            similarities = distances
+        else:
+            # 정규화 벡터(OpenAI 임베딩)의 제곱 L2 거리 → 코사인 유사도: cos = 1 - d² / 2
+            similarities = 1.0 - distances / 2.0
+        return [
+            [
+                (vectorstore.docstore.search(vectorstore.index_to_docstore_id[int(i)]), float(score))
+                for score, i in zip(row_scores, row) if i != -1
+            ]
+            for row_scores, row in zip(similarities, ids)
+        ]
 
-    # 중복 제거
-    unique_sources = list(set(sources))
+    return None
 
-    return formatted_docs, unique_sources
+
+def batch_retrieve_with_sources(retriever: BaseRetriever, queries: List[str]) -> Dict[str, List[RetrievalHit]]:
+    """
+    여러 질의를 한 번에 검색하고 질의별 RetrievalHit 목록 반환
+
+    Returns:
+        Dict[str, List[RetrievalHit]]: {질의: 검색 결과}
+    """
+    return dict(zip(queries, batch_retrieve_hits(retriever, queries)))
@@ -0,0 +1,587 @@
+"""
+프로세스 공용 레이트 리미터 + 동시 실행 거버너 (OpenAI / Tavily)
+
+노드마다 ChatOpenAI / TavilySearch를 따로 호출하므로, 비동기 그래프로 여러 평가를 동시에 돌리면
+요청이 한꺼번에 몰려 429가 납니다. (제공자, 모델)마다 거버너 하나를 두고 모든 호출이 통과하게 합니다.
+
+    RPM / TPM 토큰 버킷   예약 방식: 호출마다 버킷에서 먼저 차감하고, 모자란 만큼 기다린 뒤 보냄
+                          → 도착 순서대로 공정하게 대기하고, 실패 대신 블록됩니다
+    동시 실행 슬롯         도착 순서대로 슬롯을 넘겨주는 세마포어 (스레드 / asyncio 태스크 공용)
+    429 응답              Retry-After 만큼 버킷을 비워 이후 호출이 함께 물러나게 함
+
+적용 위치
+    OpenAI 채팅          공용 LLM 클라이언트(llm_clients)의 httpx 트랜스포트 (SDK 재시도 요청 포함)
+    OpenAI 임베딩        BatchedEmbeddings (배치마다 토큰 수만큼 차감)
+    Tavily               rate_limited("tavily") 블록
+
+RATE_LIMIT_BACKEND=sqlite면 버킷 상태를 SQLite에 두어 같은 머신의 여러 프로세스가 한도를 나눠 씁니다.
+(동시 실행 슬롯은 프로세스 단위)
+
+    python -m jm.utils.rate_limiter        # 적용될 제공자 한도 / 백엔드 확인
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+import httpx
+
+from jm.utils.index_cache import RAG_CACHE_DIR
+from jm.utils.run_metrics import note_queue_wait
+
+# ===== 설정값 =====
+RATE_LIMIT = os.getenv("RATE_LIMIT", "true").lower() == "true"
+# memory: 프로세스 내 공유 / sqlite: 같은 머신의 여러 프로세스가 공유
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", str(Path(RAG_CACHE_DIR) / "rate_limits.sqlite3"))
+# 제공자 기본 한도 (0이면 제한 없음)
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TPM = int(os.getenv("OPENAI_TPM", "200000"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
+TAVILY_RPM = int(os.getenv("TAVILY_RPM", "100"))
+TAVILY_MAX_CONCURRENCY = int(os.getenv("TAVILY_MAX_CONCURRENCY", "4"))
+# 모델별 한도: RATE_LIMITS='{"openai:gpt-4o": {"rpm": 500, "tpm": 30000, "concurrency": 8}}'
+RATE_LIMITS = json.loads(os.getenv("RATE_LIMITS", "{}"))
+# 요청 본문에 max_tokens가 없을 때 TPM에서 미리 차감할 응답 토큰 수
+LLM_EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "512"))
+
+DEFAULT_MODEL = "default"
+PROVIDER_LIMITS = {
+    "openai": {"rpm": OPENAI_RPM, "tpm": OPENAI_TPM, "concurrency": OPENAI_MAX_CONCURRENCY},
+    "tavily": {"rpm": TAVILY_RPM, "tpm": 0, "concurrency": TAVILY_MAX_CONCURRENCY},
+}
+
+BucketState = Tuple[float, float, float]  # (남은 요청 수, 남은 토큰 수, 갱신 시각)
+
+
+def _reserve(state: BucketState, rpm: int, tpm: int, tokens: int, now: float) -> Tuple[BucketState, float]:
+    """
+    버킷을 채운 뒤 요청 1건 + 토큰 tokens개를 예약 → (새 상태, 기다릴 시간)
+
+    잔량이 음수가 될 수 있고(먼저 예약한 호출들의 빚), 빚이 갚아질 때까지 기다리므로
+    예약 순서대로 보내게 됩니다. 한 호출이 TPM보다 크면 버킷이 가득 찼을 때 보내도록 상한 적용.
+    """
+    requests, token_level, updated = state
+    elapsed = max(0.0, now - updated)
+    wait = 0.0
+    if rpm:
+        requests = min(rpm, requests + elapsed * rpm / 60.0) - 1
+        wait = max(wait, -requests * 60.0 / rpm)
+    if tpm:
+        token_level = min(tpm, token_level + elapsed * tpm / 60.0) - min(tokens, tpm)
+        wait = max(wait, -token_level * 60.0 / tpm)
+    return (requests, token_level, now), wait
+
+
+def _drain(state: BucketState, rpm: int, seconds: float, now: float) -> BucketState:
+    """앞으로 seconds초 동안 요청이 나가지 않도록 요청 버킷을 비움 (429 Retry-After)"""
+    requests, token_level, updated = state
+    if rpm:
+        elapsed = max(0.0, now - updated)
+        requests = min(requests + elapsed * rpm / 60.0, -seconds * rpm / 60.0)
+    return (requests, token_level, now)
+
+
+class MemoryBucketStore:
+    """프로세스 내 버킷 상태"""
+
+    def __init__(self):
+        self._states: Dict[str, BucketState] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, rpm: int, tpm: int, tokens: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            state = self._states.get(key, (float(rpm), float(tpm), now))
+            self._states[key], wait = _reserve(state, rpm, tpm, tokens, now)
+        return wait
+
+    def drain(self, key: str, rpm: int, seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            state = self._states.get(key, (float(rpm), 0.0, now))
+            self._states[key] = _drain(state, rpm, seconds, now)
+
+
+class SQLiteBucketStore:
+    """
+    SQLite 파일에 둔 버킷 상태 (여러 프로세스가 공유)
+
+    예약은 BEGIN IMMEDIATE 트랜잭션 안에서 읽고 쓰므로 프로세스 간에도 원자적이고,
+    시각은 프로세스 간에 비교할 수 있도록 time.time()을 사용합니다.
+    """
+
+    def __init__(self, path: str = RATE_LIMIT_DB):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                key TEXT PRIMARY KEY,
+                requests REAL NOT NULL,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+            """
+        )
+
+    def _update(self, key: str, default: BucketState, fn: Callable[[BucketState], Tuple[BucketState, Any]]) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT requests, tokens, updated FROM rate_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                state, result = fn(tuple(row) if row else default)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (key, requests, tokens, updated) VALUES (?, ?, ?, ?)",
+                    (key, *state),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def reserve(self, key: str, rpm: int, tpm: int, tokens: int) -> float:
+        now = time.time()
+        return self._update(key, (float(rpm), float(tpm), now), lambda s: _reserve(s, rpm, tpm, tokens, now))
+
+    def drain(self, key: str, rpm: int, seconds: float) -> None:
+        now = time.time()
+        self._update(key, (float(rpm), 0.0, now), lambda s: (_drain(s, rpm, seconds, now), None))
+
+
+class FairSemaphore:
+    """
+    도착 순서대로 슬롯을 넘겨주는 세마포어 (스레드 / asyncio 태스크 공용)
+
+    슬롯이 없으면 대기열 맨 뒤에 서고, release는 빈 슬롯을 대기열 맨 앞에 직접 넘겨줍니다.
+    asyncio 대기자는 이벤트 루프를 막지 않고 Future로 기다립니다.
+
+    Args:
+        value: 동시 실행 상한 (0이면 제한 없음)
+    """
+
+    def __init__(self, value: int):
+        self.value = value
+        self.in_flight = 0
+        self.peak = 0
+        self._waiters: Deque[Any] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _take_or_enqueue(self, waiter) -> bool:
+        """(lock 안에서) 슬롯을 바로 잡으면 True, 아니면 대기열에 넣고 False"""
+        if not self.value or (self.in_flight < self.value and not self._waiters):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            return True
+        self._waiters.append(waiter)
+        return False
+
+    def acquire(self) -> None:
+        event = threading.Event()
+        with self._lock:
+            if self._take_or_enqueue(event):
+                return
+        event.wait()
+
+    async def aacquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            if self._take_or_enqueue(waiter):
+                return
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    granted = False
+                except ValueError:
+                    granted = True  # 취소되기 직전에 슬롯을 넘겨받음
+            if granted:
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self.in_flight -= 1
+                return
+            # 슬롯을 반납하지 않고 대기열 맨 앞에 그대로 넘김 (in_flight 유지)
+            waiter = self._waiters.popleft()
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+            return
+        loop, future = waiter
+        try:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+        except RuntimeError:
+            # 대기자의 이벤트 루프가 이미 닫힘 → 다음 대기자에게 넘김
+            self.release()
+
+
+class RateGovernor:
+    """
+    (제공자, 모델) 하나의 RPM / TPM 버킷 + 동시 실행 슬롯 + 사용률 통계
+
+    Args:
+        key: "제공자:모델"
+        rpm / tpm: 분당 요청 수 / 토큰 수 한도 (0이면 제한 없음)
+        max_concurrency: 동시 실행 상한 (0이면 제한 없음)
+        store: 버킷 상태 저장소 (MemoryBucketStore / SQLiteBucketStore)
+    """
+
+    def __init__(self, key: str, rpm: int, tpm: int = 0, max_concurrency: int = 0, store=None):
+        self.key = key
+        self.rpm = rpm
+        self.tpm = tpm
+        self.store = store or MemoryBucketStore()
+        self.slots = FairSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._recent: Deque[Tuple[float, int]] = deque()  # 최근 60초 (시각, 토큰 수)
+        self.stats = {
+            "requests": 0,
+            "tokens": 0,
+            "waited": 0,
+            "wait_seconds": 0.0,
+            "max_wait": 0.0,
+            "slot_wait_seconds": 0.0,
+            "throttled": 0,
+        }
+
+    # ----- 버킷 -----
+    def _reserve(self, tokens: int) -> float:
+        if not self.rpm and not self.tpm:
+            return 0.0
+        return self.store.reserve(self.key, self.rpm, self.tpm, tokens)
+
+    def _record(self, tokens: int, waited: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["tokens"] += tokens
+            if waited > 0:
+                self.stats["waited"] += 1
+                self.stats["wait_seconds"] += waited
+                self.stats["max_wait"] = max(self.stats["max_wait"], waited)
+            self._recent.append((now, tokens))
+            while self._recent and now - self._recent[0][0] > 60:
+                self._recent.popleft()
+        # 진행 중인 호출(run_metrics)의 대기 시간에 포함
+        note_queue_wait(waited)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """요청 1건 + 토큰 tokens개를 쓸 수 있을 때까지 대기 (슬롯 없이 버킷만), 대기 시간(초) 반환"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        self._record(tokens, wait)
+        return wait
+
+    async def _in_store(self, fn: Callable, *args) -> Any:
+        """저장소 호출 (SQLite는 BEGIN IMMEDIATE 잠금을 기다릴 수 있으므로 이벤트 루프 밖 스레드에서 실행)"""
+        if isinstance(self.store, SQLiteBucketStore):
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """acquire의 비동기 버전 (이벤트 루프를 막지 않고 대기)"""
+        wait = await self._in_store(self._reserve, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._record(tokens, wait)
+        return wait
+
+    # ----- 슬롯 + 버킷 -----
+    def enter(self, tokens: int = 0) -> Callable[[], None]:
+        """슬롯을 잡고 버킷을 통과 → 슬롯 반납 함수 (여러 번 불러도 한 번만 반납)"""
+        started = time.perf_counter()
+        self.slots.acquire()
+        self._record_slot_wait(time.perf_counter() - started)
+        try:
+            self.acquire(tokens)
+        except BaseException:
+            # 버킷 예약 실패(SQLite 잠금 등) / 대기 중 중단이면 슬롯을 돌려줘야 동시 실행 수가 줄지 않음
+            self.slots.release()
+            raise
+        return self._releaser()
+
+    async def aenter(self, tokens: int = 0) -> Callable[[], None]:
+        """enter의 비동기 버전"""
+        started = time.perf_counter()
+        await self.slots.aacquire()
+        self._record_slot_wait(time.perf_counter() - started)
+        try:
+            await self.aacquire(tokens)
+        except BaseException:
+            self.slots.release()
+            raise
+        return self._releaser()
+
+    def _record_slot_wait(self, waited: float) -> None:
+        with self._lock:
+            self.stats["slot_wait_seconds"] += waited
+        note_queue_wait(waited)
+
+    def _releaser(self) -> Callable[[], None]:
+        released = threading.Event()
+
+        def release() -> None:
+            if not released.is_set():
+                released.set()
+                self.slots.release()
+
+        return release
+
+    @contextmanager
+    def slot(self, tokens: int = 0) -> Iterator[None]:
+        """with 블록 동안 동시 실행 슬롯 1개 사용"""
+        release = self.enter(tokens)
+        try:
+            yield
+        finally:
+            release()
+
+    @asynccontextmanager
+    async def aslot(self, tokens: int = 0):
+        """slot의 비동기 버전"""
+        release = await self.aenter(tokens)
+        try:
+            yield
+        finally:
+            release()
+
+    def throttled(self, retry_after: Optional[float]) -> None:
+        """429 응답 → Retry-After(없으면 1초) 동안 이후 호출을 멈춤"""
+        with self._lock:
+            self.stats["throttled"] += 1
+        if self.rpm:
+            self.store.drain(self.key, self.rpm, retry_after or 1.0)
+
+    async def athrottled(self, retry_after: Optional[float]) -> None:
+        """throttled의 비동기 버전"""
+        await self._in_store(self.throttled, retry_after)
+
+    def utilisation(self) -> Dict[str, Any]:
+        """최근 60초 사용률과 누적 대기 통계"""
+        now = time.monotonic()
+        with self._lock:
+            recent = [(t, n) for t, n in self._recent if now - t <= 60]
+            stats = dict(self.stats)
+        recent_tokens = sum(n for _, n in recent)
+        return {
+            **stats,
+            "wait_seconds": round(stats["wait_seconds"], 3),
+            "max_wait": round(stats["max_wait"], 3),
+            "slot_wait_seconds": round(stats["slot_wait_seconds"], 3),
+            "rpm_limit": self.rpm,
+            "tpm_limit": self.tpm,
+            "rpm_used": len(recent),
+            "tpm_used": recent_tokens,
+            "rpm_utilisation": round(len(recent) / self.rpm, 3) if self.rpm else None,
+            "tpm_utilisation": round(recent_tokens / self.tpm, 3) if self.tpm else None,
+            "in_flight": self.slots.in_flight,
+            "peak_in_flight": self.slots.peak,
+            "waiting": self.slots.waiting,
+            "max_concurrency": self.slots.value,
+        }
+
+
+# ===== 프로세스 공용 거버너 =====
+_governors: Dict[str, RateGovernor] = {}
+_governors_lock = threading.Lock()
+_store = None
+
+
+def _bucket_store():
+    global _store
+    if _store is None:
+        _store = SQLiteBucketStore() if RATE_LIMIT_BACKEND == "sqlite" else MemoryBucketStore()
+    return _store
+
+
+def _limits_for(provider: str, model: str) -> Dict[str, int]:
+    """제공자 기본 한도 ← RATE_LIMITS의 "제공자" / "제공자:모델" 항목 순으로 덮어씀"""
+    if not RATE_LIMIT:
+        return {"rpm": 0, "tpm": 0, "concurrency": 0}
+    limits = dict(PROVIDER_LIMITS.get(provider, {"rpm": 0, "tpm": 0, "concurrency": 0}))
+    limits.update(RATE_LIMITS.get(provider, {}))
+    limits.update(RATE_LIMITS.get(f"{provider}:{model}", {}))
+    return limits
+
+
+def rate_governor(provider: str, model: str = DEFAULT_MODEL, **limits) -> RateGovernor:
+    """
+    (제공자, 모델) 공용 거버너 (처음 요청할 때 생성)
+
+    limits(rpm / tpm / concurrency)는 처음 만들 때만 적용되며, RATE_LIMITS 설정이 우선합니다.
+    """
+    key = f"{provider}:{model}"
+    with _governors_lock:
+        governor = _governors.get(key)
+        if governor is None:
+            configured = {**_limits_for(provider, model)}
+            if RATE_LIMIT:
+                configured.update({k: v for k, v in limits.items() if k not in RATE_LIMITS.get(key, {})})
+            governor = _governors[key] = RateGovernor(
+                key,
+                rpm=configured.get("rpm", 0),
+                tpm=configured.get("tpm", 0),
+                max_concurrency=configured.get("concurrency", 0),
+                store=_bucket_store(),
+            )
+        return governor
+
+
+@contextmanager
+def rate_limited(provider: str, model: str = DEFAULT_MODEL, tokens: int = 0) -> Iterator[None]:
+    """with 블록의 호출 1건을 거버너에 통과시킴 (예: Tavily 검색)"""
+    with rate_governor(provider, model).slot(tokens):
+        yield
+
+
+# ===== httpx 트랜스포트 (OpenAI 채팅 요청) =====
+def _request_model_and_tokens(request: httpx.Request) -> Tuple[str, int]:
+    """요청 본문의 모델명과 예상 토큰 수 (프롬프트는 본문 4바이트당 1토큰으로 근사 + 예상 응답 토큰)"""
+    try:
+        body = json.loads(request.content or b"{}")
+    except (ValueError, httpx.RequestNotRead):
+        return DEFAULT_MODEL, 0
+    completion = body.get("max_completion_tokens") or body.get("max_tokens") or LLM_EXPECTED_COMPLETION_TOKENS
+    return body.get("model", DEFAULT_MODEL), len(request.content) // 4 + completion
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers.get("retry-after-ms")) / 1000
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """응답 본문(스트리밍 포함)을 다 읽고 닫을 때 슬롯 반납"""
+
+    def __init__(self, stream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class GovernedTransport(httpx.BaseTransport):
+    """요청마다 (provider, 요청 본문의 모델) 거버너를 통과시키는 httpx 트랜스포트 래퍼"""
+
+    def __init__(self, inner: httpx.BaseTransport, provider: str = "openai"):
+        self.inner = inner
+        self.provider = provider
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        model, tokens = _request_model_and_tokens(request)
+        governor = rate_governor(self.provider, model)
+        release = governor.enter(tokens)
+        try:
+            response = self.inner.handle_request(request)
+        except BaseException:
+            release()
+            raise
+        if response.status_code == 429:
+            governor.throttled(_retry_after(response))
+        response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class AsyncGovernedTransport(httpx.AsyncBaseTransport):
+    """GovernedTransport의 비동기 버전 (httpx.AsyncClient용)"""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, provider: str = "openai"):
+        self.inner = inner
+        self.provider = provider
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        model, tokens = _request_model_and_tokens(request)
+        governor = rate_governor(self.provider, model)
+        release = await governor.aenter(tokens)
+        try:
+            response = await self.inner.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        if response.status_code == 429:
+            await governor.athrottled(_retry_after(response))
+        response.stream = _AsyncReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+# ===== 통계 =====
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """거버너별 사용률 / 대기 통계 (이번 프로세스 기준)"""
+    with _governors_lock:
+        governors = list(_governors.values())
+    return {governor.key: governor.utilisation() for governor in governors}
+
+
+def print_rate_limit_stats() -> None:
+    """거버너별 사용률 출력 (실행 종료 시 호출)"""
+    for key, stats in rate_limit_stats().items():
+        if not stats["requests"]:
+            continue
+        rpm = f"{stats['rpm_used']}/{stats['rpm_limit']}" if stats["rpm_limit"] else f"{stats['rpm_used']}/∞"
+        tpm = f", TPM {stats['tpm_used']}/{stats['tpm_limit']}" if stats["tpm_limit"] else ""
+        print(
+            f"🚦 [Rate Limit] {key}: 요청 {stats['requests']}건, 최근 1분 RPM {rpm}{tpm}, "
+            f"대기 {stats['waited']}건 (총 {stats['wait_seconds']:.1f}초, 최대 {stats['max_wait']:.1f}초), "
+            f"동시 최대 {stats['peak_in_flight']} (슬롯 대기 {stats['slot_wait_seconds']:.1f}초), 429 {stats['throttled']}회"
+        )
+
+
+if __name__ == "__main__":
+    print(json.dumps({"backend": RATE_LIMIT_BACKEND, "limits": PROVIDER_LIMITS, "overrides": RATE_LIMITS}, indent=2))
@@ -0,0 +1,224 @@
+"""
+유사도 점수 기반 관련성 평가 게이트
+
+grade_relevance는 검색할 때마다 GroundednessChecker LLM 호출을 하는데,
+상위 청크가 질문과 거의 같은 문장일 때도 마찬가지입니다. 검색 유사도(코사인)로 먼저 판정하고
+애매한 구간에서만 LLM을 부릅니다.
+
+    최고 유사도 ≥ RAG_GATE_ACCEPT   → 바로 관련 있음 ("yes")
+    최고 유사도 <  RAG_GATE_REJECT   → 바로 관련 없음 ("no" → 재작성 / 웹 검색)
+    그 사이 (또는 점수 없음)          → LLM 평가
+
+모든 판정은 JSONL 로그로 남기고, LLM 평가 결과가 쌓이면 오프라인에서 임계값을 다시 맞춥니다.
+게이트를 끈 상태(RAG_RELEVANCE_GATE=false)로 돌리면 모든 질문이 LLM 평가 + 로그되어
+보정용 데이터를 모을 수 있습니다.
+
+보정 실행 (agents/ 디렉터리에서):
+    python -m jm.utils.relevance_gate
+    python -m jm.utils.relevance_gate --log .rag_cache/relevance_gate.jsonl --precision 0.9
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from jm.utils.index_cache import RAG_CACHE_DIR
+
+# ===== 설정값 =====
+RAG_RELEVANCE_GATE = os.getenv("RAG_RELEVANCE_GATE", "true").lower() == "true"
+# 최고 유사도가 이 이상이면 LLM 평가 없이 관련 있음
+RAG_GATE_ACCEPT = float(os.getenv("RAG_GATE_ACCEPT", "0.6"))
+# 최고 유사도가 이 미만이면 LLM 평가 없이 관련 없음
+RAG_GATE_REJECT = float(os.getenv("RAG_GATE_REJECT", "0.2"))
+# 게이트가 판정한 경우에도 이 비율만큼 LLM 평가를 함께 기록 (보정 데이터의 편향 방지)
+RAG_GATE_AUDIT_RATE = float(os.getenv("RAG_GATE_AUDIT_RATE", "0.0"))
+RAG_GATE_LOG = os.getenv("RAG_GATE_LOG", str(Path(RAG_CACHE_DIR) / "relevance_gate.jsonl"))
+
+ACCEPT, REJECT, LLM = "accept", "reject", "llm"
+
+_log_lock = threading.Lock()
+_decision_counts: Counter = Counter()
+
+
+def top_score(scores: Sequence[Optional[float]]) -> Optional[float]:
+    """검색 결과 중 최고 유사도 (점수가 하나도 없으면 None)"""
+    known = [score for score in scores if score is not None]
+    return max(known) if known else None
+
+
+def gate_decision(
+    scores: Sequence[Optional[float]],
+    accept: float = RAG_GATE_ACCEPT,
+    reject: float = RAG_GATE_REJECT,
+) -> str:
+    """검색 유사도로 판정: "accept" | "reject" | "llm" (LLM 평가 필요)"""
+    best = top_score(scores)
+    if best is None:
+        return LLM
+    if best >= accept:
+        return ACCEPT
+    if best < reject:
+        return REJECT
+    return LLM
+
+
+def should_audit(rate: float = RAG_GATE_AUDIT_RATE) -> bool:
+    """게이트 판정을 LLM으로도 확인할지 (보정용 샘플링)"""
+    return rate > 0 and random.random() < rate
+
+
+def log_gate_decision(
+    question: str,
+    scores: Sequence[Optional[float]],
+    decision: str,
+    verdict: Optional[str] = None,
+    path: str = RAG_GATE_LOG,
+) -> None:
+    """
+    게이트 판정 1건을 JSONL로 기록
+
+    Args:
+        question: 검색 질문
+        scores: 검색 결과 유사도 (순위 순)
+        decision: 게이트 판정 ("accept" | "reject" | "llm")
+        verdict: LLM 평가 결과 ("yes" | "no", 호출하지 않았으면 None)
+    """
+    # 병렬 평가 / 배치 prefetch 스레드가 동시에 기록하므로 카운터도 lock 안에서 증가
+    with _log_lock:
+        _decision_counts[decision] += 1
+    record = {
+        "ts": time.time(),
+        "question": question,
+        "top_score": top_score(scores),
+        "scores": list(scores),
+        "decision": decision,
+        "verdict": verdict,
+        "accept": RAG_GATE_ACCEPT,
+        "reject": RAG_GATE_REJECT,
+    }
+    try:
+        log_path = Path(path)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with _log_lock, open(log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"⚠️ [Relevance Gate] 판정 로그 기록 실패: {e}")
+
+
+def gate_stats() -> Dict[str, int]:
+    """이번 프로세스의 판정 횟수 (LLM 호출을 건너뛴 횟수 = accept + reject)"""
+    with _log_lock:
+        return {kind: _decision_counts.get(kind, 0) for kind in (ACCEPT, REJECT, LLM)}
+
+
+def print_gate_stats() -> None:
+    """판정 횟수 출력 (실행 종료 시 호출)"""
+    stats = gate_stats()
+    if any(stats.values()):
+        print(
+            f"🚪 [Relevance Gate] 자동 통과 {stats[ACCEPT]}회, 자동 탈락 {stats[REJECT]}회, "
+            f"LLM 평가 {stats[LLM]}회"
+        )
+
+
+def load_gate_log(path: str = RAG_GATE_LOG) -> List[dict]:
+    """JSONL 판정 로그 로딩 (깨진 줄은 건너뜀)"""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def labeled_scores(records: Iterable[dict]) -> List[Tuple[float, bool]]:
+    """LLM 평가가 있는 기록만 (최고 유사도, 관련 여부)로 추출"""
+    return [
+        (record["top_score"], record["verdict"] == "yes")
+        for record in records
+        if record.get("verdict") in ("yes", "no") and record.get("top_score") is not None
+    ]
+
+
+def fit_thresholds(
+    samples: Sequence[Tuple[float, bool]],
+    precision: float = 0.95,
+    min_support: int = 5,
+) -> Tuple[Optional[float], Optional[float]]:
+    """
+    LLM 평가 결과로 (reject, accept) 임계값 추정
+
+    accept: 이 점수 이상 구간에서 LLM이 "yes"라고 한 비율이 precision 이상인 가장 낮은 점수
+    reject: 이 점수 미만 구간에서 LLM이 "no"라고 한 비율이 precision 이상인 가장 높은 점수
+    구간 표본이 min_support개 미만이면 해당 임계값은 None (기존 값 유지)
+    """
+    ordered = sorted(samples)
+    n = len(ordered)
+    scores = [score for score, _ in ordered]
+    positives = [0] * (n + 1)  # positives[i] = ordered[:i]의 "yes" 수
+    for i, (_, relevant) in enumerate(ordered):
+        positives[i + 1] = positives[i] + relevant
+
+    accept = None
+    for i in range(n - min_support, -1, -1):
+        if i > 0 and scores[i] == scores[i - 1]:
+            continue
+        support = n - i
+        if (positives[n] - positives[i]) / support >= precision:
+            accept = scores[i]
+        else:
+            break
+
+    reject = None
+    for i in range(min_support, n + 1):
+        if i < n and scores[i] == scores[i - 1]:
+            continue
+        if (i - positives[i]) / i >= precision:
+            reject = scores[i] if i < n else scores[-1] + 1e-6
+        else:
+            break
+
+    if accept is not None and reject is not None and reject > accept:
+        reject = accept
+    return reject, accept
+
+
+def main():
+    parser = argparse.ArgumentParser(description="관련성 게이트 임계값 보정 (LLM 평가 로그 기반)")
+    parser.add_argument("--log", default=RAG_GATE_LOG)
+    parser.add_argument("--precision", type=float, default=0.95)
+    parser.add_argument("--min-support", type=int, default=5)
+    args = parser.parse_args()
+
+    records = load_gate_log(args.log)
+    samples = labeled_scores(records)
+    decisions = Counter(record.get("decision") for record in records)
+    print(f"📒 판정 로그 {len(records)}건 (accept {decisions[ACCEPT]}, reject {decisions[REJECT]}, llm {decisions[LLM]})")
+    print(f"   LLM 평가가 있는 기록 {len(samples)}건 (yes {sum(r for _, r in samples)}건)")
+    if not samples:
+        raise SystemExit("LLM 평가 기록이 없습니다. RAG_RELEVANCE_GATE=false로 실행해 데이터를 모으세요.")
+
+    reject, accept = fit_thresholds(samples, args.precision, args.min_support)
+    reject = RAG_GATE_REJECT if reject is None else reject
+    accept = RAG_GATE_ACCEPT if accept is None else accept
+
+    skipped = sum(1 for score, _ in samples if score >= accept or score < reject)
+    errors = sum(1 for score, relevant in samples if (score >= accept and not relevant) or (score < reject and relevant))
+    print(f"\n현재: RAG_GATE_REJECT={RAG_GATE_REJECT} RAG_GATE_ACCEPT={RAG_GATE_ACCEPT}")
+    print(f"추천: RAG_GATE_REJECT={reject:.3f} RAG_GATE_ACCEPT={accept:.3f}")
+    print(
+        f"   추천 값 적용 시 LLM 평가 생략 {skipped}/{len(samples)}건 "
+        f"({skipped / len(samples):.0%}), LLM 판정과 불일치 {errors}건"
+    )
+
+
+if __name__ == "__main__":
+    main()
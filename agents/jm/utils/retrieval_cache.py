@@ -0,0 +1,126 @@
+"""
+질의 임베딩 / 검색 결과 LRU 캐시
+
+표준 Bessemer 질문은 재실행 때마다, 그리고 스타트업이 바뀌어도 같은 문장으로 검색되므로
+질의 임베딩과 검색 결과를 두 단계로 캐시합니다.
+
+    1단계: (임베딩 모델, 질의 텍스트) → 질의 임베딩
+    2단계: (인덱스 버전, 질의) → 순위가 매겨진 RetrievalHit (Document 참조, 텍스트 복사 없음)
+
+인덱스 버전은 PDF 내용 해시 기반 캐시 키 / 코퍼스 revision으로 만들므로
+인덱스가 바뀌면 키가 달라져 이전 결과는 자연스럽게 무효화되고 LRU로 밀려납니다.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# ===== 설정값 =====
+RAG_QUERY_CACHE_SIZE = int(os.getenv("RAG_QUERY_CACHE_SIZE", "1024"))
+RAG_RESULT_CACHE_SIZE = int(os.getenv("RAG_RESULT_CACHE_SIZE", "2048"))
+
+_MISSING = object()
+
+
+class LRUCache:
+    """스레드 안전한 크기 제한 LRU 캐시 (적중/미스 카운터 포함)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+# 프로세스 공용 캐시
+query_embedding_cache = LRUCache(RAG_QUERY_CACHE_SIZE)
+retrieval_result_cache = LRUCache(RAG_RESULT_CACHE_SIZE)
+
+
+def index_version(retriever) -> Optional[str]:
+    """
+    retriever가 검색하는 인덱스의 버전 문자열 (검색 결과 캐시 키)
+
+    인덱스 내용이나 검색 설정(k, 필터)이 바뀌면 다른 값이 되고,
+    버전을 알 수 없는 retriever는 None (캐시하지 않음)
+    """
+    from jm.utils.corpus_index import CorpusIndex
+    from jm.utils.lexical_index import HybridRetriever
+    from jm.utils.retrievers import CorpusRetriever
+
+    if isinstance(retriever, HybridRetriever):
+        dense_version = index_version(retriever.dense)
+        if dense_version is None:
+            return None
+        return f"{dense_version}|hybrid:{retriever.k}:{retriever.fetch_k}:{retriever.rrf_k}"
+
+    if isinstance(retriever, CorpusRetriever) and isinstance(retriever.corpus, CorpusIndex):
+        corpus = retriever.corpus
+        search_filter = json.dumps(retriever.filter, sort_keys=True, ensure_ascii=False, default=str)
+        return f"corpus:{corpus.path}:{corpus.revision}|k:{retriever.k}|filter:{search_filter}"
+
+    version = (retriever.metadata or {}).get("index_version")
+    if version is None:
+        return None
+    k = getattr(retriever, "k", None) or getattr(retriever, "search_kwargs", {}).get("k")
+    return f"{version}|k:{k}"
+
+
+def retrieval_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """질의 임베딩 / 검색 결과 캐시 통계"""
+    return {
+        "query_embedding": query_embedding_cache.stats(),
+        "retrieval_result": retrieval_result_cache.stats(),
+    }
+
+
+def print_retrieval_cache_stats() -> None:
+    """캐시별 적중률 출력 (실행 종료 시 호출)"""
+    for name, stats in retrieval_cache_stats().items():
+        if stats["hits"] or stats["misses"]:
+            print(
+                f"🔁 [Retrieval Cache] {name}: 적중 {stats['hits']} / 미스 {stats['misses']} "
+                f"(적중률 {stats['hit_rate']:.1%}, {stats['size']}/{stats['maxsize']}개, LRU 제거 {stats['evictions']})"
+            )
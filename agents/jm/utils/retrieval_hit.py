@@ -0,0 +1,95 @@
+"""
+구조화된 검색 결과 (RetrievalHit)
+
+검색 결과를 하나의 긴 문자열로 이어 붙여 그래프 State로 넘기면 노드마다 문자열이 복사되고
+출처/점수/위치 정보도 사라집니다. 청크 id, 점수, 페이지, 페이지 내 글자 구간과
+원본 Document 참조만 담고, 텍스트는 프롬프트를 만들 때 참조로 꺼내 씁니다.
+"""
+
+import hashlib
+from dataclasses import dataclass, field, replace
+from typing import Iterable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+
+@dataclass(frozen=True)
+class RetrievalHit:
+    """
+    검색 결과 청크 1개
+
+    Attributes:
+        chunk_id: 청크 식별자 (코퍼스 chunk_id, 없으면 출처 + 페이지 + 시작 위치)
+        score: 질의와의 코사인 유사도 (BM25로만 찾았거나 점수가 없으면 None)
+        source: 출처 파일 경로 또는 URL
+        page: 페이지 번호 (없으면 None)
+        start: 페이지 내 시작 글자 위치 (없으면 None)
+        document: 인덱스가 가진 원본 Document (복사하지 않음)
+    """
+
+    chunk_id: str
+    score: Optional[float]
+    source: str
+    page: Optional[int]
+    start: Optional[int]
+    document: Document = field(repr=False, compare=False)
+
+    @classmethod
+    def from_document(cls, doc: Document, score: Optional[float] = None) -> "RetrievalHit":
+        metadata = doc.metadata
+        source = metadata.get("source", "unknown")
+        page = metadata.get("page")
+        start = metadata.get("start_index")
+        chunk_id = metadata.get("chunk_id")
+        if chunk_id is None:
+            if start is not None:
+                chunk_id = f"{source}#p{page}@{start}"
+            else:
+                chunk_id = hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()[:16]
+        return cls(chunk_id=chunk_id, score=score, source=source, page=page, start=start, document=doc)
+
+    @classmethod
+    def from_text(cls, text: str, source: str) -> "RetrievalHit":
+        """인덱스 밖 텍스트(웹 검색 결과 등)를 점수 없는 hit으로 변환"""
+        return cls.from_document(Document(page_content=text, metadata={"source": source}))
+
+    @property
+    def text(self) -> str:
+        """청크 텍스트 (원본 Document 참조)"""
+        return self.document.page_content
+
+    @property
+    def span(self) -> Optional[Tuple[int, int]]:
+        """페이지 내 (시작, 끝) 글자 구간"""
+        if self.start is None:
+            return None
+        return self.start, self.start + len(self.document.page_content)
+
+    @property
+    def pages(self) -> List[int]:
+        """이 청크가 나오는 모든 페이지 (근사 중복으로 합쳐진 청크의 페이지 포함)"""
+        pages = self.document.metadata.get("pages")
+        if pages:
+            return list(pages)
+        return [] if self.page is None else [self.page]
+
+    @property
+    def citation(self) -> str:
+        """출처 표기 (예: "health.pdf (page 3)", 중복 병합 청크는 "health.pdf (page 1, 4, 7)")"""
+        pages = self.pages
+        return f"{self.source} (page {', '.join(map(str, pages)) if pages else 'unknown'})"
+
+
+def dedupe_hits(hits: Iterable[RetrievalHit]) -> List[RetrievalHit]:
+    """chunk_id 기준 중복 제거 (처음 나온 순서 유지, 점수는 더 높은 쪽)"""
+    best = {}
+    for hit in hits:
+        kept = best.get(hit.chunk_id)
+        if kept is None or (hit.score is not None and (kept.score is None or hit.score > kept.score)):
+            best[hit.chunk_id] = hit if kept is None else replace(kept, score=hit.score)
+    return list(best.values())
+
+
+def hit_sources(hits: Iterable[RetrievalHit]) -> List[str]:
+    """출처 표기 목록 (검색 순위 순서 유지, 중복 제거)"""
+    return list(dict.fromkeys(hit.citation for hit in hits))
@@ -0,0 +1,24 @@
+"""
+자체 인덱스용 LangChain Retriever 어댑터
+"""
+
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+
+class CorpusRetriever(BaseRetriever):
+    """CorpusIndex / TieredVectorStore 검색 결과를 Document 리스트로 반환하는 Retriever"""
+
+    corpus: Any
+    k: int = 5
+    filter: Optional[Dict[str, Any]] = None
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        if self.filter:
+            return [doc for doc, _ in self.corpus.search(query, k=self.k, filter=self.filter)]
+        return [doc for doc, _ in self.corpus.search(query, k=self.k)]
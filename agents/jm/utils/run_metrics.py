@@ -0,0 +1,393 @@
+"""
+실행 단위 계측: 노드 / LLM 호출 / 도구 호출별 시간, 대기, 토큰, 캐시 적중, 재시도, 추정 비용
+
+orchestrator.py 한 번 실행에 LLM 호출이 30회 안팎인데, 어느 노드가 시간과 비용을 차지하는지
+print 로그로는 알 수 없습니다. collect_run_metrics() 블록 안에서 실행한 모든 LangChain 실행
+(LangGraph 노드, 채팅 모델, 도구 — 노드 안에서 따로 invoke한 하위 그래프 포함)에
+콜백 핸들러가 자동으로 붙어 호출 1건마다 CallRecord를 남깁니다.
+
+    with collect_run_metrics("Lunit") as metrics:
+        final = graph.invoke(example)
+    final["run_metrics"] = metrics.totals()
+    metrics.print_summary()
+    metrics.export_jsonl()
+
+CallRecord 항목 (JSONL 한 줄)
+    wall        시작 → 종료 시간 (초, 노드는 하위 그래프 노드 시간을 포함)
+    queue_wait  LLM 호출 시작 → 첫 HTTP 요청 전송까지 대기 (캐시 조회, 레이트 리미터 대기 등, 초)
+    tokens      prompt / completion 토큰 (캐시 적중이면 과금되지 않은 절약 토큰)
+    cached      LLM 응답 캐시 적중 여부
+    retries     같은 호출에서 다시 보낸 HTTP 요청 수 (OpenAI SDK 재시도) + with_retry 재시도
+    cost        MODEL_PRICES 단가 기준 추정 비용 (USD, 캐시 적중은 0)
+
+HTTP 요청 수는 공용 LLM 클라이언트(llm_clients)의 httpx 이벤트 훅이 note_http_request()로 알려 줍니다.
+LangChain을 거치지 않는 호출(Tavily 직접 검색, 보고서 생성의 OpenAI SDK 호출)은 track_call()로 감쌉니다.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables.config import var_child_runnable_config
+from langchain_core.tracers.context import register_configure_hook
+
+from jm.utils.index_cache import RAG_CACHE_DIR
+
+# ===== 설정값 =====
+RUN_METRICS = os.getenv("RUN_METRICS", "true").lower() == "true"
+RUN_METRICS_PATH = os.getenv("RUN_METRICS_PATH", str(Path(RAG_CACHE_DIR) / "run_metrics.jsonl"))
+# 모델별 단가 (USD / 1M 토큰: 입력, 출력), LLM_PRICES='{"모델": [입력, 출력]}'로 추가 / 변경
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    **{model: tuple(price) for model, price in json.loads(os.getenv("LLM_PRICES", "{}")).items()},
+}
+
+NODE, LLM_CALL, TOOL = "node", "llm", "tool"
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """단가표 기준 추정 비용 (USD, 모르는 모델은 0, 날짜 접미사가 붙은 모델명은 앞부분으로 조회)"""
+    price = MODEL_PRICES.get(model) or next(
+        (MODEL_PRICES[known] for known in sorted(MODEL_PRICES, key=len, reverse=True) if model.startswith(known)),
+        None,
+    )
+    if price is None:
+        return 0.0
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+
+@dataclass
+class CallRecord:
+    """노드 실행 / LLM 호출 / 도구 호출 1건"""
+
+    kind: str  # "node" | "llm" | "tool"
+    name: str  # 노드 이름 / 모델명 / 도구 이름
+    node: Optional[str] = None  # 호출이 일어난 LangGraph 노드
+    start: float = field(default_factory=time.time)
+    wall: float = 0.0
+    queue_wait: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached: bool = False
+    retries: int = 0
+    http_requests: int = 0
+    cost: float = 0.0
+    error: Optional[str] = None
+    _t0: float = field(default_factory=time.perf_counter, repr=False)
+
+    def note_request(self) -> None:
+        """HTTP 요청 1건 전송 (첫 요청까지는 대기 시간, 이후 요청은 재시도)"""
+        if self.http_requests == 0:
+            self.queue_wait = time.perf_counter() - self._t0
+        else:
+            self.retries += 1
+        self.http_requests += 1
+
+    def add_usage(self, model: str, prompt_tokens: int, completion_tokens: int, cached: bool = False) -> None:
+        """토큰 사용량 기록 (캐시 적중이면 비용 0)"""
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cached = self.cached or cached
+        if not cached:
+            self.cost += estimate_cost(model, prompt_tokens, completion_tokens)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.wall = time.perf_counter() - self._t0
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    def as_dict(self) -> Dict[str, Any]:
+        record = asdict(self)
+        record.pop("_t0")
+        return record
+
+
+# 현재 컨텍스트의 수집기 (LangChain 콜백 설정 시 자동으로 핸들러로 추가) / 진행 중인 호출
+_active_metrics: ContextVar[Optional["RunMetrics"]] = ContextVar("run_metrics", default=None)
+_current_call: ContextVar[Optional[CallRecord]] = ContextVar("run_metrics_call", default=None)
+
+
+def _current_node() -> Optional[str]:
+    """지금 실행 중인 LangGraph 노드 이름 (노드 밖이면 None)"""
+    config = var_child_runnable_config.get() or {}
+    return (config.get("metadata") or {}).get("langgraph_node")
+
+
+class RunMetrics(BaseCallbackHandler):
+    """
+    실행 1회 계측 수집기 (LangChain 콜백 핸들러)
+
+    run_inline으로 호출 스레드 / 태스크에서 바로 실행되므로, 채팅 모델 시작 시 설정한
+    진행 중 호출(_current_call)을 같은 호출의 httpx 이벤트 훅이 볼 수 있습니다.
+
+    Args:
+        label: 실행 이름 (스타트업 이름 등, JSONL의 run 필드)
+    """
+
+    run_inline = True
+
+    def __init__(self, label: str = "run"):
+        self.label = label
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records: List[CallRecord] = []
+        self._open: Dict[UUID, CallRecord] = {}
+        self._tokens: Dict[UUID, Any] = {}
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self.wall: Optional[float] = None
+
+    # ----- 기록 -----
+    def add(self, record: CallRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def _open_record(self, run_id: UUID, record: CallRecord) -> CallRecord:
+        with self._lock:
+            self._open[run_id] = record
+            self.records.append(record)
+        return record
+
+    def _close_record(self, run_id: UUID, error: Optional[BaseException] = None) -> Optional[CallRecord]:
+        with self._lock:
+            record = self._open.pop(run_id, None)
+        if record is not None:
+            record.finish(error)
+        return record
+
+    # ----- LangGraph 노드 -----
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, metadata=None, **kwargs) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # 노드 안의 체인도 같은 langgraph_node 메타데이터를 가지므로 노드 자신의 실행만 기록
+        if node is not None and kwargs.get("name") == node:
+            self._open_record(run_id, CallRecord(NODE, node, node=node))
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs) -> None:
+        self._close_record(run_id)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs) -> None:
+        self._close_record(run_id, error)
+
+    # ----- 채팅 모델 -----
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs) -> None:
+        metadata = metadata or {}
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or metadata.get("ls_model_name") or "unknown"
+        record = self._open_record(run_id, CallRecord(LLM_CALL, model, node=metadata.get("langgraph_node")))
+        self._tokens[run_id] = _current_call.set(record)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs) -> None:
+        self._reset_current(run_id)
+        record = self._close_record(run_id)
+        if record is None:
+            return
+        generation = response.generations[0][0] if response.generations and response.generations[0] else None
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+        if usage:
+            prompt_tokens, completion_tokens = usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+        else:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            prompt_tokens, completion_tokens = token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0)
+        # 캐시에서 복원한 응답은 langchain_core가 usage_metadata에 total_cost=0을 붙여 돌려줌
+        record.add_usage(record.name, prompt_tokens, completion_tokens, cached="total_cost" in usage)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs) -> None:
+        self._reset_current(run_id)
+        self._close_record(run_id, error)
+
+    def _reset_current(self, run_id: UUID) -> None:
+        token = self._tokens.pop(run_id, None)
+        if token is None:
+            return
+        try:
+            _current_call.reset(token)
+        except ValueError:
+            # 시작 콜백과 다른 컨텍스트에서 종료된 경우
+            _current_call.set(None)
+
+    # ----- 도구 -----
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, metadata=None, **kwargs) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._open_record(run_id, CallRecord(TOOL, name, node=(metadata or {}).get("langgraph_node")))
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs) -> None:
+        self._close_record(run_id)
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs) -> None:
+        self._close_record(run_id, error)
+
+    # ----- with_retry 재시도 -----
+    def on_retry(self, retry_state, *, run_id: UUID, **kwargs) -> None:
+        with self._lock:
+            record = self._open.get(run_id)
+            if record is not None:
+                record.retries += 1
+
+    # ----- 집계 / 출력 -----
+    def finish(self) -> None:
+        self.wall = time.perf_counter() - self._t0
+
+    def totals(self) -> Dict[str, Any]:
+        """실행 전체 / 노드별 / 모델별 / 도구별 합계 (최종 State에 붙이는 요약)"""
+        with self._lock:
+            records = list(self.records)
+
+        def bucket():
+            return {
+                "calls": 0, "wall": 0.0, "llm_calls": 0, "cached": 0, "queue_wait": 0.0,
+                "prompt_tokens": 0, "completion_tokens": 0, "retries": 0, "errors": 0, "cost": 0.0,
+            }
+
+        def add_call(target, record: CallRecord) -> None:
+            target["calls"] += 1
+            target["wall"] += record.wall
+            target["errors"] += record.error is not None
+
+        def add_llm(target, record: CallRecord) -> None:
+            target["llm_calls"] += 1
+            target["cached"] += record.cached
+            target["queue_wait"] += record.queue_wait
+            target["retries"] += record.retries
+            target["cost"] += record.cost
+            # 캐시 적중 토큰은 과금되지 않으므로 saved_tokens로 따로 집계
+            if not record.cached:
+                target["prompt_tokens"] += record.prompt_tokens
+                target["completion_tokens"] += record.completion_tokens
+
+        nodes, models, tools = defaultdict(bucket), defaultdict(bucket), defaultdict(bucket)
+        llm = bucket()
+        for record in records:
+            if record.kind == NODE:
+                add_call(nodes[record.name], record)
+            elif record.kind == TOOL:
+                add_call(tools[record.name], record)
+                tools[record.name]["retries"] += record.retries
+            else:
+                for target in (models[record.name], llm):
+                    add_call(target, record)
+                    add_llm(target, record)
+                # 노드 행에는 노드 실행 횟수 / 시간을 두고, 그 안에서 일어난 LLM 호출만 더함
+                if record.node is not None:
+                    add_llm(nodes[record.node], record)
+        llm["saved_tokens"] = sum(r.prompt_tokens + r.completion_tokens for r in records if r.cached)
+
+        def rounded(values: Dict[str, Any]) -> Dict[str, Any]:
+            return {k: round(v, 6 if k == "cost" else 3) if isinstance(v, float) else v for k, v in values.items()}
+
+        return {
+            "run": self.label,
+            "run_id": self.run_id,
+            "wall": round(self.wall if self.wall is not None else time.perf_counter() - self._t0, 3),
+            "llm": rounded(llm),
+            "nodes": {name: rounded(values) for name, values in nodes.items()},
+            "models": {name: rounded(values) for name, values in models.items()},
+            "tools": {name: rounded(values) for name, values in tools.items()},
+        }
+
+    def print_summary(self, top: int = 20) -> None:
+        """노드별 요약 표 출력 (소요 시간 순)"""
+        totals = self.totals()
+        llm = totals["llm"]
+        print(
+            f"\n📈 [Run Metrics] {self.label} — 총 {totals['wall']:.1f}초, "
+            f"LLM {llm['llm_calls']}회 (캐시 적중 {llm['cached']}, 재시도 {llm['retries']}), "
+            f"토큰 {llm['prompt_tokens']:,} / {llm['completion_tokens']:,} (절약 {llm['saved_tokens']:,}), "
+            f"추정 비용 ${llm['cost']:.4f}"
+        )
+        print(
+            f"{'node':<24}{'runs':>5}{'wall(s)':>9}{'llm':>5}{'cache':>6}{'queue(s)':>9}"
+            f"{'prompt':>8}{'compl':>7}{'retry':>6}{'cost($)':>9}"
+        )
+        rows = sorted(totals["nodes"].items(), key=lambda item: item[1]["wall"], reverse=True)
+        for name, row in rows[:top]:
+            print(
+                f"{name[:23]:<24}{row['calls']:>5}{row['wall']:>9.2f}{row['llm_calls']:>5}{row['cached']:>6}"
+                f"{row['queue_wait']:>9.2f}{row['prompt_tokens']:>8}{row['completion_tokens']:>7}"
+                f"{row['retries']:>6}{row['cost']:>9.4f}"
+            )
+        for name, row in sorted(totals["tools"].items()):
+            print(f"   🔧 {name}: {row['calls']}회, {row['wall']:.2f}초" + (f", 실패 {row['errors']}" if row["errors"] else ""))
+
+    def export_jsonl(self, path: str = RUN_METRICS_PATH) -> Optional[str]:
+        """호출 기록을 JSONL로 추가 (마지막 줄은 kind="run" 합계), 기록이 없으면 None"""
+        with self._lock:
+            records = [record.as_dict() for record in self.records]
+        if not records:
+            return None
+        log_path = Path(path)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with _export_lock, open(log_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps({"run": self.label, "run_id": self.run_id, **record}, ensure_ascii=False) + "\n")
+            f.write(json.dumps({"kind": "run", **self.totals()}, ensure_ascii=False) + "\n")
+        return str(log_path)
+
+
+_export_lock = threading.Lock()
+
+# 컨텍스트에 수집기가 있으면 모든 LangChain 실행의 콜백 매니저에 상속 핸들러로 추가
+register_configure_hook(_active_metrics, True)
+
+
+@contextmanager
+def collect_run_metrics(label: str = "run") -> Iterator[RunMetrics]:
+    """
+    블록 안의 LangChain 실행을 계측 (asyncio 태스크 / 워커 스레드로 복사된 컨텍스트 포함)
+
+    RUN_METRICS가 꺼져 있으면 빈 수집기를 돌려줍니다.
+    """
+    metrics = RunMetrics(label)
+    token = _active_metrics.set(metrics) if RUN_METRICS else None
+    try:
+        yield metrics
+    finally:
+        metrics.finish()
+        if token is not None:
+            _active_metrics.reset(token)
+
+
+@contextmanager
+def track_call(kind: str, name: str) -> Iterator[CallRecord]:
+    """
+    LangChain을 거치지 않는 호출 1건 계측 (Tavily 직접 검색, OpenAI SDK 직접 호출 등)
+
+    수집 중이 아니어도 CallRecord를 돌려주므로 호출부는 조건 없이 add_usage를 부르면 됩니다.
+    """
+    metrics = _active_metrics.get()
+    record = CallRecord(kind, name, node=_current_node())
+    token = _current_call.set(record)
+    try:
+        yield record
+    except BaseException as e:
+        record.finish(e)
+        raise
+    else:
+        record.finish()
+    finally:
+        _current_call.reset(token)
+        if metrics is not None:
+            metrics.add(record)
+
+
+def note_http_request() -> None:
+    """진행 중인 호출에 HTTP 요청 1건 기록 (공용 httpx 클라이언트 이벤트 훅에서 호출)"""
+    record = _current_call.get()
+    if record is not None:
+        record.note_request()
+
+
+def note_queue_wait(seconds: float) -> None:
+    """진행 중인 호출의 대기 시간에 레이트 리미터 대기 추가 (요청 전송 훅 이후 트랜스포트에서 기다리므로 따로 더함)"""
+    record = _current_call.get()
+    if record is not None and seconds > 0:
+        record.queue_wait += seconds
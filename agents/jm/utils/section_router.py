@@ -0,0 +1,244 @@
+"""
+섹션 유형별 샤드 인덱스 + 질의 라우터
+
+IR 자료에서 재무, 기술, 규제/인허가, 팀, 시장 내용은 서로 다른 페이지에 모여 있는데,
+flat 인덱스는 "수익 모델은 명확한가?" 같은 질문도 팀 소개나 임상 결과 청크와 모두 비교하고
+비슷한 표현의 엉뚱한 섹션 청크가 상위 5개에 섞입니다.
+
+수집 단계에서 청크마다 키워드 사전으로 섹션 유형을 분류해 metadata["section"]에 기록하고
+(LLM 호출 없음), 유형별 row 샤드를 만듭니다. 검색할 때는 질문(current_question)의 키워드로
+관련 샤드만 고르고 그 샤드의 청크만 비교합니다.
+
+    수집: 청크 → 섹션 유형 (financials / technology / regulation / team / market / general)
+    검색: 질문 → 관련 유형 + general 샤드 → 샤드 내 청크만 벡터 / BM25 검색
+
+키워드가 하나도 맞지 않는 질문과, 고른 샤드의 청크가 k개보다 적은 질문은 전체 청크를 검색합니다.
+"""
+
+import os
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from jm.utils.embedding_cache import embed_queries
+from jm.utils.lexical_index import tokenize
+from jm.utils.vector_tiers import normalize
+
+# ===== 설정값 =====
+RAG_SECTION_SHARDS = os.getenv("RAG_SECTION_SHARDS", "auto")  # auto | true | false
+# auto일 때 이 청크 수 이상이면 섹션 샤드 사용 (작은 문서는 전체 검색이 더 쌈)
+RAG_SECTION_MIN_CHUNKS = int(os.getenv("RAG_SECTION_MIN_CHUNKS", "40"))
+# 청크를 특정 섹션으로 분류할 최소 키워드 적중 수 (미만이면 general)
+RAG_SECTION_MIN_HITS = int(os.getenv("RAG_SECTION_MIN_HITS", "2"))
+# 질문 라우팅: 최고 점수 유형 대비 이 비율 이상인 유형까지 함께 검색
+RAG_SECTION_ROUTE_RATIO = float(os.getenv("RAG_SECTION_ROUTE_RATIO", "0.3"))
+
+GENERAL = "general"
+
+# 섹션 유형별 키워드 (한글은 부분 문자열, 영문/숫자는 BM25와 같은 토큰 단위로 매칭)
+SECTION_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "financials": (
+        "매출", "수익", "영업이익", "손익", "재무", "비용", "가격", "과금", "구독", "투자", "밸류",
+        "자금", "흑자", "적자", "현금", "이익률",
+        "revenue", "ebitda", "arr", "mrr", "margin", "pricing", "price", "funding", "valuation", "profit",
+    ),
+    "technology": (
+        "기술", "알고리즘", "인공지능", "딥러닝", "머신러닝", "모델", "특허", "정확도", "민감도",
+        "특이도", "데이터", "플랫폼", "솔루션", "제품",
+        "ai", "algorithm", "deep", "model", "patent", "accuracy", "auc", "sensitivity", "platform", "software",
+    ),
+    "regulation": (
+        "규제", "인허가", "허가", "승인", "식약처", "인증", "보험", "수가", "법률", "법적", "개인정보",
+        "임상", "소송", "리스크", "위험",
+        "fda", "ce", "510k", "mfds", "hipaa", "gdpr", "clearance", "approval", "regulatory", "compliance",
+    ),
+    "team": (
+        "대표", "창업자", "창업", "경영진", "인력", "임직원", "이사회", "경력", "조직", "채용", "운영",
+        "ceo", "cto", "cfo", "founder", "team", "board", "employees",
+    ),
+    "market": (
+        "시장", "규모", "성장률", "고객", "경쟁", "점유율", "수요", "타겟", "차별",
+        "tam", "sam", "som", "cagr", "market", "customer", "competitor", "competition",
+    ),
+}
+
+_HANGUL_KEYWORDS = {
+    section: [kw for kw in keywords if "가" <= kw[0] <= "힣"]
+    for section, keywords in SECTION_KEYWORDS.items()
+}
+_TOKEN_KEYWORDS = {
+    section: {kw for kw in keywords if not "가" <= kw[0] <= "힣"}
+    for section, keywords in SECTION_KEYWORDS.items()
+}
+
+
+def section_scores(text: str) -> Dict[str, int]:
+    """섹션 유형별 키워드 적중 수"""
+    lowered = text.lower()
+    tokens = Counter(tokenize(lowered))
+    return {
+        section: sum(lowered.count(kw) for kw in _HANGUL_KEYWORDS[section])
+        + sum(tokens[kw] for kw in _TOKEN_KEYWORDS[section])
+        for section in SECTION_KEYWORDS
+    }
+
+
+def classify_sections(docs: Sequence[Document], min_hits: int = RAG_SECTION_MIN_HITS) -> Counter:
+    """
+    청크 metadata["section"]에 섹션 유형 기록 → 유형별 청크 수
+
+    IR 자료는 페이지 하나가 한 주제이므로 같은 페이지 청크들의 적중 수를 절반 가중치로 더해
+    키워드가 적은 청크도 페이지 주제를 따라가게 합니다.
+    """
+    own = [section_scores(doc.page_content) for doc in docs]
+    pages: Dict[Tuple, Counter] = {}
+    for doc, scores in zip(docs, own):
+        pages.setdefault((doc.metadata.get("source"), doc.metadata.get("page")), Counter()).update(scores)
+
+    counts = Counter()
+    for doc, scores in zip(docs, own):
+        page = pages[(doc.metadata.get("source"), doc.metadata.get("page"))]
+        combined = {section: scores[section] + 0.5 * page[section] for section in SECTION_KEYWORDS}
+        best = max(combined, key=combined.get)
+        label = best if scores[best] + page[best] >= min_hits else GENERAL
+        doc.metadata["section"] = label
+        counts[label] += 1
+    return counts
+
+
+def classify_section_batches(batches: Iterable[List[Document]]) -> Iterator[List[Document]]:
+    """스트리밍 수집용: 배치마다 섹션 유형을 기록하며 그대로 전달"""
+    for batch in batches:
+        classify_sections(batch)
+        yield batch
+
+
+def route_query(query: str, ratio: float = RAG_SECTION_ROUTE_RATIO) -> Optional[List[str]]:
+    """질문과 관련된 섹션 유형 (점수 순), 키워드가 하나도 없으면 None (전체 검색)"""
+    scores = section_scores(query)
+    best = max(scores.values())
+    if best == 0:
+        return None
+    return [
+        section for section, score in sorted(scores.items(), key=lambda item: -item[1])
+        if score >= best * ratio
+    ]
+
+
+def use_section_shards(documents: Sequence[Document], mode: str = RAG_SECTION_SHARDS) -> bool:
+    """섹션 샤드 사용 여부 (auto면 청크 수로 결정)"""
+    if mode == "auto":
+        return len(documents) >= RAG_SECTION_MIN_CHUNKS
+    return mode == "true"
+
+
+class SectionShardIndex:
+    """
+    섹션 유형별 row 샤드에서만 검색하는 인덱스
+
+    metadata["section"]이 없는 청크(이 기능 이전에 만든 캐시 인덱스)는 로딩 시 분류합니다.
+    PageSummaryIndex와 같은 search / search_batch 인터페이스로 CorpusRetriever에 넣어 사용하고,
+    HybridRetriever에 shards로 넘기면 BM25 후보도 같은 샤드로 제한됩니다.
+
+    Args:
+        vectors: (N, dim) 정규화 청크 벡터 (row 순서 = documents 순서, 메모리 매핑 배열 가능)
+        documents: row 순서 청크 Document
+        embeddings: 질의 임베딩
+    """
+
+    def __init__(self, vectors: np.ndarray, documents: List[Document], embeddings: Embeddings):
+        self.vectors = vectors
+        self.documents = documents
+        self.embeddings = embeddings
+
+        untagged = [doc for doc in documents if "section" not in doc.metadata]
+        if untagged:
+            classify_sections(untagged)
+        rows: Dict[str, List[int]] = {}
+        for row, doc in enumerate(documents):
+            rows.setdefault(doc.metadata["section"], []).append(row)
+        self.shards = {section: np.asarray(r, dtype=np.int64) for section, r in rows.items()}
+        # 병렬 평가에서 여러 스레드가 같은 인덱스를 검색하므로 통계는 lock으로 보호
+        self._stats_lock = threading.Lock()
+        self.stats = {"queries": 0, "compared": 0, "full_scan": 0, "fallback": 0}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def route(self, query: str) -> Optional[List[str]]:
+        """질문이 검색할 샤드 (general 포함), None이면 전체"""
+        sections = route_query(query)
+        if sections is None:
+            return None
+        return [s for s in sections + [GENERAL] if s in self.shards]
+
+    def rows_for(self, query: str, min_rows: int = 1) -> Optional[np.ndarray]:
+        """질문이 검색할 row 목록, 샤드 청크가 min_rows개 미만이면 None (전체)"""
+        sections = self.route(query)
+        if not sections:
+            return None
+        rows = np.sort(np.concatenate([self.shards[s] for s in sections]))
+        return rows if len(rows) >= min_rows else None
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[Document, float]]:
+        """질의와 코사인 유사도가 높은 청크 상위 k개 (Document, 점수)"""
+        return self.search_batch([query], k)[0]
+
+    def search_batch(self, queries: List[str], k: int = 5) -> List[List[Tuple[Document, float]]]:
+        """여러 질의를 한 번의 임베딩 요청으로 처리, 질의마다 라우팅된 샤드만 비교 (라우팅 요약은 배치당 1줄)"""
+        vectors = normalize(np.asarray(embed_queries(self.embeddings, queries), dtype=np.float32))
+        k = min(k, len(self))
+        results = []
+        routed = Counter()
+        fallback = compared = 0
+        for query, vector in zip(queries, vectors):
+            rows = self.rows_for(query, min_rows=k)
+            if rows is None:
+                fallback += 1
+                similarities = np.asarray(self.vectors, dtype=np.float32) @ vector
+                rows = np.arange(len(self))
+            else:
+                routed.update(self.route(query))
+                similarities = np.asarray(self.vectors[rows], dtype=np.float32) @ vector
+            top = np.argsort(-similarities)[:k]
+            compared += len(rows)
+            results.append([(self.documents[int(rows[i])], float(similarities[i])) for i in top])
+
+        full_scan = len(self) * len(queries)
+        with self._stats_lock:
+            self.stats["queries"] += len(queries)
+            self.stats["fallback"] += fallback
+            self.stats["compared"] += compared
+            self.stats["full_scan"] += full_scan
+        shards = ", ".join(f"{section} {n}" for section, n in routed.most_common()) or "없음"
+        print(
+            f"🧭 [Section Router] 질문 {len(queries)}개 (전체 검색 {fallback}개, 샤드: {shards}) → "
+            f"청크 {compared}/{full_scan}개 비교 ({1 - compared / max(full_scan, 1):.1%} 절감)"
+        )
+        return results
+
+    def summary(self) -> Dict[str, int]:
+        """섹션 유형별 청크 수"""
+        return {section: len(rows) for section, rows in sorted(self.shards.items())}
+
+    def cost_summary(self) -> Dict[str, float]:
+        """지금까지 검색의 평균 비교 수와 전체 검색 대비 절감률"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        queries = max(stats["queries"], 1)
+        return {
+            "queries": stats["queries"],
+            "fallback": stats["fallback"],
+            "avg_compared": stats["compared"] / queries,
+            "saved": 1 - stats["compared"] / max(stats["full_scan"], 1),
+        }
+
+    def as_retriever(self, k: int = 5):
+        """LangChain Retriever로 변환"""
+        from jm.utils.retrievers import CorpusRetriever
+
+        return CorpusRetriever(corpus=self, k=k)
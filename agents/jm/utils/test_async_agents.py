@@ -0,0 +1,78 @@
+"""
+비동기 에이전트 경로 테스트 (경쟁사 에이전트 도구 노드)
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_async_agents.py
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from gj.competitor_analysis_agent import _analysis_inputs, create_tool_node
+
+
+def tool_call_message(*calls) -> dict:
+    return {"messages": [AIMessage(
+        content="",
+        tool_calls=[{"name": name, "args": args, "id": f"call-{i}"} for i, (name, args) in enumerate(calls)],
+    )]}
+
+
+def test_async_tool_node_runs_calls_concurrently():
+    """두 도구가 서로를 기다려도 끝나야 함 (순차 실행이면 시간 초과), 결과는 호출 순서 / 오류는 메시지로"""
+    started = asyncio.Event()
+
+    @tool
+    async def first(query: str) -> str:
+        """먼저 호출되지만 두 번째 도구가 시작될 때까지 기다림"""
+        await asyncio.wait_for(started.wait(), timeout=1)
+        return f"first:{query}"
+
+    @tool
+    async def second(query: str) -> str:
+        """시작 신호를 보냄"""
+        started.set()
+        return f"second:{query}"
+
+    @tool
+    def broken(query: str) -> str:
+        """항상 실패"""
+        raise RuntimeError("Tavily 오류")
+
+    node = create_tool_node([first, second, broken], use_async=True)
+    state = tool_call_message(("first", {"query": "a"}), ("second", {"query": "b"}), ("broken", {"query": "c"}))
+    messages = asyncio.run(node(state))["messages"]
+
+    assert [m.tool_call_id for m in messages] == ["call-0", "call-1", "call-2"]
+    assert [m.content for m in messages[:2]] == ["first:a", "second:b"]
+    assert messages[2].content.startswith("Error:")
+
+
+def test_sync_and_async_tool_nodes_agree():
+    """동기 / 비동기 도구 노드는 같은 메시지를 만들고, 도구 호출이 없으면 빈 결과"""
+
+    @tool
+    def echo(text: str) -> str:
+        """입력을 그대로 반환"""
+        return text
+
+    state = tool_call_message(("echo", {"text": "x"}), ("unknown", {"text": "y"}))
+    sync_messages = create_tool_node([echo])(state)["messages"]
+    async_messages = asyncio.run(create_tool_node([echo], use_async=True)(state))["messages"]
+
+    assert [(m.tool_call_id, m.content) for m in sync_messages] == [("call-0", "x")]
+    assert [(m.tool_call_id, m.content) for m in async_messages] == [("call-0", "x")]
+    assert asyncio.run(create_tool_node([echo], use_async=True)({"messages": []})) == {"messages": []}
+
+
+def test_prompt_helpers_do_not_log(capsys):
+    """동기 / 비동기 노드가 공유하는 입력 헬퍼는 출력 없이 값만 만듦 (진행 로그는 노드에서)"""
+    inputs = _analysis_inputs({
+        "startup_info": {"name": "Lunit", "category": "Medical AI"},
+        "messages": [AIMessage(content="경쟁사 A")],
+    })
+    assert inputs["startup_name"] == "Lunit"
+    assert inputs["competitor_info"] == "경쟁사 A"
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,102 @@
+"""
+Bessemer 질문 일괄 검색 (질의 행렬 검색) 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_batch_retrieval.py
+"""
+
+from typing import List
+
+import numpy as np
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from jm.utils.embedding_providers import HashingEmbeddings
+from jm.utils.lexical_index import BM25Index, HybridRetriever
+from jm.utils.rag_tools import batch_retrieve
+from jm.utils.retrieval_cache import query_embedding_cache, retrieval_result_cache
+from jm.utils.vector_tiers import TieredVectorStore
+
+TOPICS = ["시장 규모 성장률", "매출 수익 모델", "경쟁사 차별화", "FDA 인허가 승인", "팀 경영진 채용", "고객 지불 의사"]
+QUERIES = ["시장 규모는 얼마인가?", "수익 모델과 매출 구조는?", "FDA 승인 현황은?", "경쟁사 대비 차별점은?"]
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    """임베딩 요청(embed_documents / embed_query 호출) 수를 세는 해싱 임베딩"""
+
+    def __init__(self):
+        super().__init__(dim=64)
+        self.requests = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.requests += 1
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        self.requests += 1
+        return super().embed_documents([text])[0]
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    query_embedding_cache.clear()
+    retrieval_result_cache.clear()
+    yield
+    query_embedding_cache.clear()
+    retrieval_result_cache.clear()
+
+
+@pytest.fixture
+def documents():
+    return [
+        Document(page_content=f"{TOPICS[i % len(TOPICS)]} 설명 {i}", metadata={"source": "ir.pdf", "page": i})
+        for i in range(30)
+    ]
+
+
+def contents(results) -> List[List[str]]:
+    return [[doc.page_content for doc in docs] for docs in results]
+
+
+def assert_batch_matches_invoke(retriever, embeddings):
+    """일괄 검색 결과 = 질의별 invoke 결과, 일괄 검색의 질의 임베딩 요청은 1회"""
+    expected = contents([retriever.invoke(query) for query in QUERIES])
+    embeddings.requests = 0
+    assert contents(batch_retrieve(retriever, QUERIES)) == expected
+    assert embeddings.requests == 1
+
+
+def test_faiss_batch_matches_invoke(documents):
+    embeddings = CountingEmbeddings()
+    vectorstore = FAISS.from_documents(documents, embeddings)
+    assert_batch_matches_invoke(vectorstore.as_retriever(search_kwargs={"k": 4}), embeddings)
+
+
+def test_tiered_store_batch_matches_invoke(documents, tmp_path):
+    embeddings = CountingEmbeddings()
+    vectors = np.asarray(embeddings.embed_documents([doc.page_content for doc in documents]), dtype=np.float32)
+    store = TieredVectorStore.build(vectors, documents, embeddings, "fp16", tmp_path / "tier")
+    assert_batch_matches_invoke(store.as_retriever(k=4), embeddings)
+
+
+def test_hybrid_batch_matches_invoke(documents):
+    """하이브리드: dense 후보는 한 번에 검색하고 BM25 융합은 질의별로 같은 결과"""
+    embeddings = CountingEmbeddings()
+    vectorstore = FAISS.from_documents(documents, embeddings)
+    retriever = HybridRetriever(
+        dense=vectorstore.as_retriever(search_kwargs={"k": 8}),
+        lexical=BM25Index.from_texts([doc.page_content for doc in documents]),
+        documents=documents,
+        k=4,
+        fetch_k=8,
+    )
+    assert_batch_matches_invoke(retriever, embeddings)
+
+
+def test_unsupported_retriever_falls_back_to_batch(documents):
+    """행렬 검색을 지원하지 않는 검색 방식(MMR)은 retriever.batch로 같은 결과"""
+    vectorstore = FAISS.from_documents(documents, CountingEmbeddings())
+    retriever = vectorstore.as_retriever(search_type="mmr", search_kwargs={"k": 3, "fetch_k": 10})
+    assert contents(batch_retrieve(retriever, QUERIES)) == contents([retriever.invoke(q) for q in QUERIES])
+    assert batch_retrieve(retriever, []) == []
@@ -0,0 +1,83 @@
+"""
+컨텍스트 패킹 (유사도 컷오프 / 인접 청크 병합 / 토큰 예산) 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_context_packer.py
+"""
+
+from langchain_core.documents import Document
+
+from jm.utils.context_packer import count_tokens, pack_context, text_overlap
+from jm.utils.retrieval_hit import RetrievalHit
+
+# 겹침이 우연히 생기지 않도록 모든 위치가 다른 페이지 텍스트
+PAGE = "".join(f"[{i:03d}]" for i in range(200))
+
+
+def hit(start, end, score, page=1, source="ir.pdf", with_start=True):
+    metadata = {"source": source, "page": page}
+    if with_start:
+        metadata["start_index"] = start
+    return RetrievalHit.from_document(Document(page_content=PAGE[start:end], metadata=metadata), score)
+
+
+def test_text_overlap():
+    """왼쪽 끝과 오른쪽 시작이 겹치는 길이, MIN_OVERLAP_CHARS 미만이면 0"""
+    assert text_overlap(PAGE[0:100], PAGE[60:160]) == 40
+    assert text_overlap(PAGE[0:100], PAGE[90:160]) == 0
+    assert text_overlap(PAGE[0:100], PAGE[200:300]) == 0
+
+
+def test_merges_overlapping_neighbours_by_start_index():
+    """같은 페이지의 겹치는 청크는 겹친 구간을 한 번만 넣어 병합, 점수는 높은 쪽"""
+    packed = pack_context([hit(60, 160, 0.7), hit(0, 100, 0.9)], min_score=0.0, token_budget=0)
+    assert packed.text == PAGE[0:160]
+    assert packed.merged == 1
+    assert len(packed.documents) == 1
+    assert packed.tokens_saved > 0
+
+
+def test_merges_by_text_when_start_index_missing():
+    """start_index가 없으면 텍스트 겹침으로 병합 (검색 순서와 무관)"""
+    hits = [hit(60, 160, 0.7, with_start=False), hit(0, 100, 0.9, with_start=False)]
+    packed = pack_context(hits, min_score=0.0, token_budget=0)
+    assert packed.text == PAGE[0:160]
+    assert packed.merged == 1
+
+
+def test_does_not_merge_across_pages_or_gaps():
+    """다른 페이지이거나 떨어진 청크는 병합하지 않음, 점수 순으로 배치"""
+    hits = [hit(0, 100, 0.5), hit(200, 300, 0.8), hit(0, 100, 0.6, page=2)]
+    packed = pack_context(hits, min_score=0.0, token_budget=0)
+    assert packed.merged == 0
+    assert [doc.page_content for doc in packed.documents] == [PAGE[200:300], PAGE[0:100], PAGE[0:100]]
+    assert [doc.metadata["page"] for doc in packed.documents] == [1, 2, 1]
+
+
+def test_similarity_cutoff_keeps_at_least_one():
+    """컷오프 미만은 제외하되 점수 없는 청크는 유지, 모두 미달이면 최고 점수 1개"""
+    packed = pack_context([hit(0, 50, 0.1), hit(200, 250, None), hit(400, 450, 0.3)], min_score=0.25, token_budget=0)
+    assert packed.dropped == 1
+    assert {doc.page_content for doc in packed.documents} == {PAGE[200:250], PAGE[400:450]}
+
+    packed = pack_context([hit(0, 50, 0.1), hit(200, 250, 0.2)], min_score=0.25, token_budget=0)
+    assert packed.dropped == 1
+    assert packed.text == PAGE[200:250]
+
+
+def test_token_budget():
+    """예산을 넘는 블록은 건너뛰고, 첫 블록이 예산보다 크면 잘라서 포함"""
+    small, large = hit(0, 50, 0.9), hit(200, 800, 0.8)
+    budget = count_tokens(small.text) + 5
+    packed = pack_context([small, large], min_score=0.0, token_budget=budget)
+    assert packed.text == small.text
+    assert packed.over_budget == 1
+
+    packed = pack_context([hit(0, 800, 0.9)], min_score=0.0, token_budget=20)
+    assert len(packed.documents) == 1
+    assert PAGE.startswith(packed.text)
+    assert 0 < packed.tokens_after <= 20
+
+
+def test_empty_hits():
+    assert pack_context([]).text == ""
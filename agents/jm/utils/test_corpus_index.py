@@ -0,0 +1,199 @@
+"""
+증분 코퍼스 인덱스 (문서 추가 / 삭제 / 동기화 / 영속화) / 메타데이터 필터 검색 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_corpus_index.py
+"""
+
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+from langchain_core.documents import Document
+
+from jm.utils import corpus_index
+from jm.utils.corpus_index import CorpusIndex
+from jm.utils.embedding_providers import HashingEmbeddings
+from jm.utils.rag_tools import setup_shared_corpus_retriever
+
+
+class CountingHashingEmbeddings(HashingEmbeddings):
+    """실제로 임베딩한 청크 수를 세는 해싱 임베딩"""
+
+    def __init__(self):
+        super().__init__(dim=64)
+        self.embedded = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture(autouse=True)
+def text_pages(monkeypatch):
+    """PDF 파서 대신 폼 피드(\\f)로 페이지를 나눈 텍스트 파일을 페이지 Document로 읽음"""
+    def iter_pages(pdf_path, engine="pypdf"):
+        for page, text in enumerate(Path(pdf_path).read_text(encoding="utf-8").split("\f")):
+            yield Document(page_content=text, metadata={"source": pdf_path, "page": page})
+
+    monkeypatch.setattr(corpus_index, "iter_pdf_pages", iter_pages)
+
+
+@pytest.fixture
+def write_pdf(tmp_path):
+    def write(name: str, *pages: str) -> str:
+        path = tmp_path / "docs" / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text("\f".join(pages), encoding="utf-8")
+        return str(path)
+    return write
+
+
+def open_corpus(tmp_path, embeddings=None) -> CorpusIndex:
+    return CorpusIndex.open(
+        "tech", embeddings or CountingHashingEmbeddings(), "hashing-64",
+        chunk_size=200, chunk_overlap=0, root=str(tmp_path / "corpus"),
+    )
+
+
+def top_source(corpus: CorpusIndex, query: str) -> str:
+    return Path(corpus.search(query, k=1)[0][0].metadata["source"]).name
+
+
+def test_add_and_remove_pdf(tmp_path, write_pdf):
+    """문서 단위 추가 / 삭제, 삭제된 문서의 청크는 검색되지 않음"""
+    corpus = open_corpus(tmp_path)
+    lunit = write_pdf("lunit.pdf", "흉부 X선 판독 AI", "유방암 검진 AI")
+    vuno = write_pdf("vuno.pdf", "심정지 예측 AI")
+
+    assert corpus.add_pdf(lunit) == 2
+    assert corpus.add_pdf(vuno) == 1
+    assert (len(corpus), corpus.index.ntotal, corpus.revision) == (3, 3, 2)
+    assert top_source(corpus, "심정지 예측 AI") == "vuno.pdf"
+
+    assert corpus.remove_pdf(vuno) == 1
+    assert corpus.remove_pdf(vuno) == 0
+    assert (len(corpus), corpus.index.ntotal, corpus.revision) == (2, 2, 3)
+    assert {Path(doc.metadata["source"]).name for doc, _ in corpus.search("심정지 예측 AI", k=5)} == {"lunit.pdf"}
+
+
+def test_row_ids_are_never_reused(tmp_path, write_pdf):
+    """IndexIDMap2에서 삭제 후 추가해도 새 row id를 쓰므로 검색 결과가 다른 문서의 청크로 바뀌지 않음"""
+    corpus = open_corpus(tmp_path)
+    first = write_pdf("a.pdf", "영상 진단 알고리즘", "임상 검증 결과")
+    second = write_pdf("b.pdf", "보험 수가 적용")
+    corpus.add_pdf(first)
+    corpus.add_pdf(second)
+    removed_ids = corpus.documents[os.path.abspath(first)]["row_ids"]
+    corpus.remove_pdf(first)
+
+    third = write_pdf("c.pdf", "원격 모니터링 플랫폼", "웨어러블 심전도")
+    corpus.add_pdf(third)
+    new_ids = corpus.documents[os.path.abspath(third)]["row_ids"]
+
+    assert not set(new_ids) & set(removed_ids)
+    assert min(new_ids) == corpus.manifest["next_id"] - 2
+    for query, name in [("원격 모니터링 플랫폼", "c.pdf"), ("웨어러블 심전도", "c.pdf"), ("보험 수가 적용", "b.pdf")]:
+        doc, score = corpus.search(query, k=1)[0]
+        assert Path(doc.metadata["source"]).name == name
+        assert doc.page_content == query
+        assert score == pytest.approx(1.0, abs=1e-5)
+
+
+def test_sync_embeds_only_changed_documents(tmp_path, write_pdf):
+    """sync: 새 문서 / 내용이 바뀐 문서만 임베딩, 목록에서 빠진 문서는 삭제, 변화 없으면 저장도 생략"""
+    embeddings = CountingHashingEmbeddings()
+    corpus = open_corpus(tmp_path, embeddings)
+    a = write_pdf("a.pdf", "시장 규모")
+    b = write_pdf("b.pdf", "경쟁 구도")
+    corpus.sync([a, b])
+    assert embeddings.embedded == 2
+
+    report = corpus.sync([a, b])
+    assert (len(report["unchanged"]), embeddings.embedded) == (2, 2)
+
+    write_pdf("a.pdf", "시장 규모 개정판")
+    c = write_pdf("c.pdf", "규제 현황")
+    report = corpus.sync([a, c])
+    assert (report["added"], report["updated"], report["removed"]) == ([c], [a], [os.path.abspath(b)])
+    assert embeddings.embedded == 4
+    assert top_source(corpus, "시장 규모 개정판") == "a.pdf"
+    assert len(corpus) == 2
+
+
+def test_reopen_loads_without_reembedding(tmp_path, write_pdf):
+    """저장된 코퍼스는 다시 열 때 로딩만 하고, 청크 설정이 바뀌면 빈 코퍼스로 새로 시작"""
+    corpus = open_corpus(tmp_path)
+    corpus.add_pdf(write_pdf("a.pdf", "매출 성장률", "영업이익률"))
+
+    embeddings = CountingHashingEmbeddings()
+    reopened = open_corpus(tmp_path, embeddings)
+    assert (len(reopened), reopened.revision) == (2, 1)
+    assert top_source(reopened, "영업이익률") == "a.pdf"
+    assert embeddings.embedded == 0
+
+    rechunked = CorpusIndex.open(
+        "tech", embeddings, "hashing-64", chunk_size=500, chunk_overlap=0, root=str(tmp_path / "corpus")
+    )
+    assert len(rechunked) == 0
+
+
+@pytest.fixture
+def startups(tmp_path, write_pdf) -> CorpusIndex:
+    """두 스타트업의 IR / 시장 보고서가 섞인 공용 코퍼스"""
+    corpus = open_corpus(tmp_path)
+    corpus.add_pdf(write_pdf("lunit_ir.pdf", "흉부 X선 판독 AI 매출", "FDA 승인 현황"),
+                   metadata={"startup": "Lunit", "doc_type": "ir"})
+    corpus.add_pdf(write_pdf("lunit_market.pdf", "의료 영상 AI 시장 규모"),
+                   metadata={"startup": "Lunit", "doc_type": "market_report"})
+    corpus.add_pdf(write_pdf("vuno_ir.pdf", "심정지 예측 AI 매출", "FDA 승인 현황 요약"),
+                   metadata={"startup": "Vuno", "doc_type": "ir"})
+    return corpus
+
+
+def test_filtered_search_only_scores_selected_startup(startups):
+    """필터에 맞지 않는 청크는 더 유사해도 결과에 나오지 않음 (리스트 값은 OR, 필드끼리는 AND)"""
+    hits = startups.search("심정지 예측 AI 매출", k=5, filter={"startup": "Lunit"})
+    assert len(hits) == 3
+    assert {doc.metadata["startup"] for doc, _ in hits} == {"Lunit"}
+
+    ir_only = startups.search("시장 규모", k=5, filter={"startup": "Lunit", "doc_type": "ir"})
+    assert {Path(doc.metadata["source"]).name for doc, _ in ir_only} == {"lunit_ir.pdf"}
+
+    either = startups.search("FDA", k=5, filter={"startup": ["Lunit", "Vuno"], "doc_type": ["ir"]})
+    assert len(either) == 4
+    assert startups.search("FDA", k=5, filter={"startup": "Unknown"}) == []
+
+
+def test_search_by_startup_and_metadata_values(startups):
+    """스타트업별 상위 k개 비교, 메타데이터 값 목록은 삭제에 맞춰 갱신"""
+    results = startups.search_by_startup("FDA 승인 현황", k_per_startup=1, filter={"doc_type": "ir"})
+    assert {name: hits[0][0].page_content for name, hits in results.items()} == {
+        "Lunit": "FDA 승인 현황",
+        "Vuno": "FDA 승인 현황 요약",
+    }
+
+    assert startups.metadata_values("startup") == ["Lunit", "Vuno"]
+    vuno = next(path for path in startups.documents if path.endswith("vuno_ir.pdf"))
+    startups.remove_pdf(vuno)
+    assert startups.metadata_values("startup") == ["Lunit"]
+    assert startups.search("심정지", k=5, filter={"startup": "Vuno"}) == []
+
+
+def test_shared_corpus_retriever_indexes_once(tmp_path, write_pdf):
+    """같은 문서를 다시 등록하면 임베딩 없이 재사용, Retriever는 해당 스타트업 청크만 반환"""
+    embeddings = CountingHashingEmbeddings()
+    corpus = open_corpus(tmp_path, embeddings)
+    lunit = write_pdf("lunit_ir.pdf", "흉부 X선 판독 AI", "유방암 검진 AI")
+    vuno = write_pdf("vuno_ir.pdf", "흉부 X선 판독 AI 경쟁 제품")
+
+    setup_shared_corpus_retriever(vuno, "Vuno", doc_date="2025-01-01", corpus=corpus)
+    retriever = setup_shared_corpus_retriever(lunit, "Lunit", doc_date="2025-01-01", corpus=corpus)
+    again = setup_shared_corpus_retriever(lunit, "Lunit", doc_date="2025-01-01", corpus=corpus)
+
+    assert embeddings.embedded == 3
+    assert again.filter == retriever.filter == {"startup": "Lunit"}
+    docs = retriever.invoke("흉부 X선 판독 AI 경쟁 제품")
+    assert {Path(doc.metadata["source"]).name for doc in docs} == {"lunit_ir.pdf"}
+    assert docs[0].metadata["date"] == "2025-01-01"
@@ -0,0 +1,63 @@
+"""
+근사 중복 청크 제거 (SimHash) 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_dedup.py
+"""
+
+import random
+
+from langchain_core.documents import Document
+
+from jm.utils import dedup
+from jm.utils.dedup import NearDuplicateFilter, hamming, simhash
+from jm.utils.retrieval_hit import RetrievalHit
+
+DISCLAIMER = "본 자료는 투자 권유를 목적으로 하지 않으며 회사의 사전 동의 없이 배포할 수 없습니다."
+
+
+def chunk(text: str, page: int) -> Document:
+    return Document(page_content=text, metadata={"source": "ir.pdf", "page": page, "start_index": 0})
+
+
+def test_simhash_is_stable_and_token_based():
+    """같은 토큰 구성이면 같은 지문, 공백 차이는 무시, 다른 내용은 멀리 떨어짐"""
+    assert simhash(DISCLAIMER) == simhash(DISCLAIMER.replace(" ", "  "))
+    assert simhash("") == 0
+    assert hamming(simhash(DISCLAIMER), simhash("2024년 매출 120억 원, 영업이익 흑자 전환")) > 10
+
+
+def test_repeated_chunks_collapse_into_first_with_pages():
+    """배치가 나뉘어도 이전 배치의 청크와 비교, 유지된 청크에 중복 페이지를 모아 출처에 표기"""
+    duplicates = NearDuplicateFilter()
+    first = [chunk(DISCLAIMER, 1), chunk("시장 규모 3조 원", 2)]
+    second = [chunk(DISCLAIMER, 4), chunk("FDA 승인 2건", 5), chunk(DISCLAIMER, 7)]
+
+    kept = [doc for batch in duplicates.filter_batches([first, second]) for doc in batch]
+    assert [doc.metadata["page"] for doc in kept] == [1, 2, 5]
+    assert (duplicates.seen, duplicates.dropped) == (5, 2)
+    assert duplicates.reduction == 0.4
+
+    # 인덱스가 만든 새 Document에도 (출처, 페이지, 위치, 내용)으로 찾아 적용
+    stored = [Document(page_content=doc.page_content, metadata=dict(doc.metadata)) for doc in kept]
+    assert duplicates.annotate(stored) == 1
+    assert stored[0].metadata["pages"] == [1, 4, 7]
+    assert "pages" not in stored[1].metadata
+    assert RetrievalHit.from_document(stored[0]).citation == "ir.pdf (page 1, 4, 7)"
+
+
+def test_band_lookup_matches_brute_force(monkeypatch):
+    """구간 해시 후보 검색은 해밍 거리 ≤ max_distance인 지문을 빠짐없이 찾음"""
+    monkeypatch.setattr(dedup, "simhash", int)
+    rng = random.Random(0)
+    duplicates = NearDuplicateFilter(max_distance=3)
+    bases = [rng.getrandbits(64) for _ in range(50)]
+    duplicates.filter([chunk(str(base), i) for i, base in enumerate(bases)])
+
+    for flips in range(6):
+        for base in bases[:10]:
+            variant = base
+            for bit in rng.sample(range(64), flips):
+                variant ^= 1 << bit
+            expected = any(hamming(variant, other) <= 3 for other in bases)
+            assert (duplicates._find(variant) >= 0) == expected
@@ -0,0 +1,108 @@
+"""
+배치 임베딩 (토큰 한도 배치 / 순서 유지 / 429 재시도) 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_embedding_batcher.py
+"""
+
+import time
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from jm.utils import embedding_batcher
+from jm.utils.embedding_batcher import BatchedEmbeddings
+from jm.utils.rate_limiter import RateGovernor
+
+
+class RateLimitError(Exception):
+    """OpenAI SDK의 429 오류처럼 status_code / response.headers를 가진 오류"""
+
+    def __init__(self, retry_after=None):
+        super().__init__("Error code: 429 - rate limit exceeded")
+        self.status_code = 429
+        headers = {"retry-after": retry_after} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=429, headers=headers)
+
+
+class FlakyEmbeddings(Embeddings):
+    """처음 failures번은 error를 내고, 이후엔 텍스트 길이 벡터를 반환"""
+
+    def __init__(self, failures: int = 0, error: Exception = None):
+        self.failures = failures
+        self.error = error or RateLimitError()
+        self.calls: List[List[str]] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """백오프 대기는 실제로 자지 않고 기록만"""
+    recorded = []
+    monkeypatch.setattr(
+        embedding_batcher, "time", SimpleNamespace(sleep=recorded.append, perf_counter=time.perf_counter)
+    )
+    return recorded
+
+
+def make_batcher(underlying: Embeddings, **kwargs) -> BatchedEmbeddings:
+    batcher = BatchedEmbeddings(underlying, **kwargs)
+    # 프로세스 공용 거버너 대신 한도 없는 전용 거버너 (429 비우기가 다른 테스트에 번지지 않도록)
+    batcher.governor = RateGovernor("test:embedding", rpm=0)
+    batcher.count_tokens = len
+    return batcher
+
+
+def test_batches_keep_input_order(sleeps):
+    """토큰 / 개수 한도로 나눈 배치를 동시에 보내도 결과는 입력 순서"""
+    underlying = FlakyEmbeddings()
+    batcher = make_batcher(underlying, max_batch_tokens=6, max_batch_size=2, max_concurrency=4)
+    texts = ["a", "bb", "ccc", "dddd", "e", "ffffff", "gg"]
+
+    assert batcher.embed_documents(texts) == [[float(len(t))] for t in texts]
+    assert sorted(underlying.calls) == sorted([["a", "bb"], ["ccc"], ["dddd", "e"], ["ffffff"], ["gg"]])
+    assert batcher.last_stats["batches"] == 5
+    assert sleeps == []
+
+
+def test_rate_limit_error_is_retried_with_retry_after(sleeps):
+    """429는 Retry-After만큼 기다린 뒤 재시도하고, 재시도 횟수 / 429 횟수를 기록"""
+    underlying = FlakyEmbeddings(failures=2, error=RateLimitError(retry_after="3"))
+    batcher = make_batcher(underlying, max_retries=3)
+
+    assert batcher.embed_documents(["가나", "다"]) == [[2.0], [1.0]]
+    assert len(underlying.calls) == 3
+    assert sleeps == [3.0, 3.0]
+    assert batcher.last_stats["retries"] == 2
+    assert batcher.total_retries == 2
+    assert batcher.governor.stats["throttled"] == 2
+
+
+def test_backoff_without_retry_after_and_give_up(sleeps):
+    """Retry-After가 없으면 지수 백오프, max_retries를 넘으면 오류를 그대로 올림"""
+    batcher = make_batcher(FlakyEmbeddings(failures=5), max_retries=2)
+    with pytest.raises(RateLimitError):
+        batcher.embed_documents(["x"])
+    assert len(sleeps) == 2
+    assert 0.5 <= sleeps[0] <= 1.5 and 1.0 <= sleeps[1] <= 3.0
+
+
+def test_other_errors_are_not_retried(sleeps):
+    """429가 아닌 오류는 재시도 없이 바로 실패"""
+    underlying = FlakyEmbeddings(failures=1, error=ValueError("invalid input"))
+    batcher = make_batcher(underlying)
+    with pytest.raises(ValueError):
+        batcher.embed_query("x")
+    assert len(underlying.calls) == 1
+    assert sleeps == []
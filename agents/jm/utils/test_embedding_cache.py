@@ -0,0 +1,98 @@
+"""
+청크 임베딩 캐시 / 질의 임베딩 배치 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_embedding_cache.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from jm.utils.embedding_cache import CachedEmbeddings, EmbeddingStore, embed_queries, text_sha256
+from jm.utils.retrieval_cache import query_embedding_cache
+
+
+class CountingEmbeddings(Embeddings):
+    """텍스트 길이로 만든 2차원 벡터 + 실제로 임베딩한 텍스트 기록"""
+
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EmbeddingStore(str(tmp_path / "embeddings.sqlite3"))
+
+
+@pytest.fixture(autouse=True)
+def empty_query_cache():
+    query_embedding_cache.clear()
+    yield
+    query_embedding_cache.clear()
+
+
+def test_store_round_trip_per_model(store):
+    """(모델, 텍스트 해시) 단위로 저장, 다른 모델의 벡터는 보이지 않음"""
+    key = text_sha256("매출 성장률")
+    store.put_many("model-a", {key: [0.5, 0.25]})
+
+    assert store.get_many("model-a", [key, key, "missing"]) == {key: [0.5, 0.25]}
+    assert store.get_many("model-b", [key]) == {}
+    assert store.count() == 1
+    assert store.count("model-b") == 0
+
+
+def test_cached_embeddings_only_embeds_misses(store):
+    """캐시 미스만 실제 모델로 보내고, 같은 텍스트는 한 번만 임베딩"""
+    underlying = CountingEmbeddings()
+    embeddings = CachedEmbeddings(underlying, model_name="model-a", store=store)
+
+    first = embeddings.embed_documents(["가나", "다라마", "가나"])
+    assert underlying.calls == [["가나", "다라마"]]
+    assert first == [[2.0, 1.0], [3.0, 1.0], [2.0, 1.0]]
+
+    second = embeddings.embed_documents(["다라마", "바사아자"])
+    assert underlying.calls[-1] == ["바사아자"]
+    assert second == [[3.0, 1.0], [4.0, 1.0]]
+    assert (embeddings.hits, embeddings.misses) == (2, 3)
+
+    # 다른 모델명이면 같은 저장소라도 새로 임베딩
+    other = CachedEmbeddings(underlying, model_name="model-b", store=store)
+    other.embed_documents(["가나"])
+    assert underlying.calls[-1] == ["가나"]
+
+
+def test_embed_queries_batches_misses(store):
+    """질의는 LRU 캐시 적중분을 빼고 한 번의 배치 요청으로 임베딩"""
+    underlying = CountingEmbeddings()
+    embeddings = CachedEmbeddings(underlying, model_name="model-a", store=store)
+
+    embeddings.embed_query("시장 규모는?")
+    vectors = embed_queries(embeddings, ["시장 규모는?", "팀 구성은?", "팀 구성은?"])
+
+    assert underlying.calls == [["시장 규모는?"], ["팀 구성은?"]]
+    assert vectors == [[7.0, 1.0], [6.0, 1.0], [6.0, 1.0]]
+    # 질의는 청크 저장소에 쓰지 않음
+    assert store.count() == 0
+
+
+def test_hit_counters_under_concurrency(store):
+    """여러 스레드가 같은 인스턴스를 써도 적중 / 미스가 빠짐없이 집계됨"""
+    embeddings = CachedEmbeddings(CountingEmbeddings(), model_name="model-a", store=store)
+    embeddings.embed_documents(["공통 청크"])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: embeddings.embed_documents(["공통 청크", f"청크 {i}"]), range(200)))
+
+    assert embeddings.hits == 200
+    assert embeddings.misses == 201
@@ -0,0 +1,62 @@
+"""
+임베딩 제공자 모델 키 / 코퍼스 이름 분리 / 공용 모델 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_embedding_providers.py
+"""
+
+import numpy as np
+import pytest
+
+from jm.utils import embedding_providers
+from jm.utils.embedding_providers import (
+    HashingEmbeddings,
+    cached_embeddings,
+    provider_model_key,
+    scoped_index_name,
+    shared_embeddings,
+)
+
+
+def test_provider_model_key(monkeypatch):
+    """OpenAI는 기존 캐시와 호환되도록 모델명 그대로, 그 외는 제공자 접두사"""
+    monkeypatch.setattr(embedding_providers, "RAG_LOCAL_EMBEDDING_BACKEND", "onnx")
+    monkeypatch.setattr(embedding_providers, "RAG_LOCAL_EMBEDDING_ONNX_FILE", "onnx/model_qint8.onnx")
+    assert provider_model_key("openai", "text-embedding-3-small") == "text-embedding-3-small"
+    assert provider_model_key("hashing", "256") == "hashing:256"
+    assert provider_model_key("local", "BAAI/bge-m3") == "local:BAAI/bge-m3:onnx/model_qint8.onnx"
+    with pytest.raises(ValueError):
+        provider_model_key("cohere")
+
+
+def test_scoped_index_name():
+    """OpenAI는 기존 코퍼스 이름 유지, 로컬 / 해싱은 실제 모델 키별로 분리"""
+    assert scoped_index_name("tech_corpus", "text-embedding-3-small") == "tech_corpus"
+    assert scoped_index_name("tech_corpus", "hashing:512") == "tech_corpus--hashing_512"
+    onnx = scoped_index_name("tech_corpus", "local:BAAI/bge-m3:onnx/model_qint8.onnx")
+    torch = scoped_index_name("tech_corpus", "local:BAAI/bge-m3:torch")
+    assert onnx == "tech_corpus--local_BAAI_bge-m3_onnx_model_qint8.onnx"
+    assert onnx != torch
+
+
+def test_hashing_embeddings_are_deterministic_unit_vectors():
+    """같은 텍스트는 같은 정규화 벡터, 토큰이 겹치는 텍스트끼리 더 가까움"""
+    embeddings = HashingEmbeddings(dim=256)
+    first, again = embeddings.embed_documents(["FDA 510(k) 인허가", "FDA 510(k) 인허가"])
+    assert first == again
+    assert np.linalg.norm(first) == pytest.approx(1.0)
+
+    related = embeddings.embed_query("FDA 인허가 일정")
+    unrelated = embeddings.embed_query("팀 구성과 경영진")
+    assert np.dot(first, related) > np.dot(first, unrelated)
+    assert embeddings.embed_query("") == [0.0] * 256
+
+
+def test_shared_embeddings_are_memoized_per_model():
+    """(제공자, 모델)당 모델 하나를 공유하고, 캐시 래퍼의 모델명은 제공자 모델 키"""
+    assert shared_embeddings("hashing", "64") is shared_embeddings("hashing", "64")
+    assert shared_embeddings("hashing", "64") is not shared_embeddings("hashing", "128")
+
+    embeddings = cached_embeddings("hashing", "64")
+    assert embeddings.underlying is shared_embeddings("hashing", "64")
+    assert embeddings.model_name == "hashing:64"
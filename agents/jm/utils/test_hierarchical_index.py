@@ -0,0 +1,60 @@
+"""
+페이지 요약 2단계 인덱스 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_hierarchical_index.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from langchain_core.documents import Document
+
+from jm.utils.embedding_providers import HashingEmbeddings
+from jm.utils.hierarchical_index import PageSummaryIndex, use_hierarchical
+from jm.utils.vector_tiers import normalize
+
+TOPICS = ["매출 수익 영업이익 손익", "특허 알고리즘 기술 모델", "창업자 경영진 이사회 채용", "규제 인허가 FDA 승인"]
+
+
+def make_index(top_sections: int = 1) -> PageSummaryIndex:
+    """페이지마다 한 주제 청크 3개인 40페이지 문서"""
+    docs = [
+        Document(page_content=f"{TOPICS[page % len(TOPICS)]} {i}", metadata={"source": "ir.pdf", "page": page})
+        for page in range(40)
+        for i in range(3)
+    ]
+    embeddings = HashingEmbeddings(dim=64)
+    vectors = normalize(np.asarray(embeddings.embed_documents([doc.page_content for doc in docs])))
+    return PageSummaryIndex(vectors, docs, embeddings, top_sections=top_sections)
+
+
+def test_use_hierarchical_by_page_count():
+    """auto는 페이지 수 기준, true / false는 그대로"""
+    docs = [Document(page_content="x", metadata={"source": "a.pdf", "page": page}) for page in range(3)]
+    assert use_hierarchical(docs, "true")
+    assert not use_hierarchical(docs, "false")
+    assert not use_hierarchical(docs, "auto")
+
+
+def test_search_compares_only_selected_sections():
+    """요약 벡터로 고른 섹션의 청크만 비교하고, 그 섹션의 주제 청크를 반환"""
+    index = make_index(top_sections=1)
+    vector = np.asarray(index.embeddings.embed_documents([TOPICS[1]]), dtype=np.float32)
+    scores, ids, costs = index.search_by_vectors(vector, k=3)
+
+    assert all(index.documents[row].page_content.startswith(TOPICS[1]) for row in ids[0])
+    assert list(scores[0]) == sorted(scores[0], reverse=True)
+    assert costs[0] == {"sections": 1, "compared": 40 + 3, "full_scan": 120}
+
+
+def test_stats_under_concurrency():
+    """여러 스레드가 동시에 검색해도 통계가 빠짐없이 합산됨"""
+    index = make_index(top_sections=2)
+    queries = normalize(np.asarray(index.embeddings.embed_documents(TOPICS), dtype=np.float32))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: index.search_by_vectors(queries, k=3), range(50)))
+
+    assert index.stats == {"queries": 200, "compared": 200 * (40 + 6), "full_scan": 200 * 120}
+    assert index.cost_summary()["avg_compared"] == 46
@@ -0,0 +1,76 @@
+"""
+인덱스 캐시 키 / 임시 경로 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_index_cache.py
+"""
+
+import threading
+from pathlib import Path
+
+from jm.utils.index_cache import file_sha256, index_cache_key, temp_path
+
+BASE = dict(pdf_hash="a" * 64, chunk_size=1000, chunk_overlap=50, embedding_model="text-embedding-3-small")
+
+
+def test_index_cache_key_is_stable():
+    """같은 입력이면 항상 같은 키"""
+    assert index_cache_key(**BASE) == index_cache_key(**BASE)
+    assert len(index_cache_key(**BASE)) == 32
+
+
+def test_index_cache_key_changes_with_each_component():
+    """PDF 내용 / 청크 설정 / 임베딩 모델 / 수집 옵션 중 하나만 바뀌어도 다른 키"""
+    base = index_cache_key(**BASE)
+    variants = [
+        {**BASE, "pdf_hash": "b" * 64},
+        {**BASE, "chunk_size": 800},
+        {**BASE, "chunk_overlap": 100},
+        {**BASE, "embedding_model": "local:BAAI/bge-m3"},
+        {**BASE, "options": {"dedup": True}},
+    ]
+    keys = {index_cache_key(**variant) for variant in variants}
+    assert base not in keys
+    assert len(keys) == len(variants)
+
+
+def test_index_cache_key_ignores_option_order():
+    """수집 옵션은 순서와 무관 (JSON sort_keys)"""
+    first = index_cache_key(**BASE, options={"dedup": True, "engine": "pypdf"})
+    second = index_cache_key(**BASE, options={"engine": "pypdf", "dedup": True})
+    assert first == second
+
+
+def test_file_sha256_is_content_based(tmp_path):
+    """경로가 달라도 내용이 같으면 같은 해시, 내용이 바뀌면 다른 해시"""
+    first, second = tmp_path / "a.pdf", tmp_path / "b.pdf"
+    first.write_bytes(b"%PDF-1.4 same")
+    second.write_bytes(b"%PDF-1.4 same")
+    assert file_sha256(str(first)) == file_sha256(str(second))
+
+    second.write_bytes(b"%PDF-1.4 changed")
+    assert file_sha256(str(first)) != file_sha256(str(second))
+
+
+def test_temp_path_is_unique_per_thread():
+    """같은 프로세스의 스레드마다 다른 임시 경로, 디렉터리와 확장자는 유지"""
+    target = Path("/cache/pages/abc.pypdf.v2.json.zst")
+    paths = []
+    # 스레드 id는 종료 후 재사용되므로 네 스레드가 동시에 살아 있는 동안 경로를 만듦
+    barrier = threading.Barrier(4)
+
+    def worker():
+        paths.append(temp_path(target))
+        barrier.wait()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(paths)) == 4
+    for path in paths:
+        assert path.parent == target.parent
+        assert path.name.endswith(target.name)
+        assert path != target
@@ -0,0 +1,68 @@
+"""
+코퍼스 크기별 ANN 인덱스 선택 / index_factory 문자열 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_index_factory.py
+"""
+
+import numpy as np
+import pytest
+
+from jm.utils import index_factory
+from jm.utils.index_factory import ann_kind, build_index, choose_ann, factory_string, ivf_nlist
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch):
+    """환경변수와 무관하게 고정된 한도로 테스트"""
+    monkeypatch.setattr(index_factory, "RAG_ANN_FLAT_MAX", 20_000)
+    monkeypatch.setattr(index_factory, "RAG_ANN_HNSW_MAX", 2_000_000)
+    monkeypatch.setattr(index_factory, "RAG_HNSW_M", 32)
+
+
+def test_choose_ann_by_corpus_size():
+    """flat → hnsw → ivf 순으로 커지고, 삭제가 필요한 인덱스는 HNSW 대신 IVF"""
+    assert choose_ann(20_000, "auto") == "flat"
+    assert choose_ann(20_001, "auto") == "hnsw"
+    assert choose_ann(2_000_001, "auto") == "ivf"
+    assert choose_ann(500_000, "auto", deletable=True) == "ivf"
+    assert choose_ann(100, "auto", deletable=True) == "flat"
+
+
+def test_choose_ann_explicit():
+    """auto가 아니면 지정값 그대로 (삭제가 필요하면 hnsw만 ivf로), 모르는 값은 ValueError"""
+    assert choose_ann(10, "hnsw") == "hnsw"
+    assert choose_ann(10, "hnsw", deletable=True) == "ivf"
+    assert choose_ann(10_000_000, "flat") == "flat"
+    with pytest.raises(ValueError):
+        choose_ann(10, "annoy")
+
+
+def test_ivf_nlist():
+    """4 * sqrt(N), 리스트당 학습 벡터 39개 이상, 최소 1"""
+    assert ivf_nlist(1_000_000) == 4000
+    assert ivf_nlist(1_000) == 25
+    assert ivf_nlist(10) == 1
+
+
+def test_factory_string():
+    assert factory_string(1_000, 1536, "flat") == "Flat"
+    assert factory_string(1_000, 1536, "flat", "sq8") == "SQ8"
+    assert factory_string(1_000, 1536, "hnsw") == "HNSW32"
+    assert factory_string(1_000, 1536, "hnsw", "fp16") == "HNSW32_SQfp16"
+    assert factory_string(1_000_000, 1536, "ivf", "pq") == "IVF4000,PQ192"
+
+
+@pytest.mark.parametrize("ann", ["flat", "hnsw", "ivf"])
+def test_build_index_finds_itself(ann):
+    """정규화 벡터로 만든 인덱스에서 각 벡터의 최근접은 자기 자신, ann_kind로 구조 확인"""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((2_000, 32)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    index = build_index(vectors, factory_string(len(vectors), 32, ann))
+    assert ann_kind(index) == ann
+    assert index.ntotal == len(vectors)
+
+    _, ids = index.search(vectors[:20], 1)
+    assert (ids[:, 0] == np.arange(20)).mean() >= 0.9
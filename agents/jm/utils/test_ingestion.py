@@ -0,0 +1,111 @@
+"""
+스트리밍 PDF 수집 파이프라인 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_ingestion.py
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+from langchain_core.documents import Document
+
+from jm.utils.embedding_providers import HashingEmbeddings
+from jm.utils import ingestion
+from jm.utils.ingestion import (
+    create_text_splitter,
+    iter_chunk_batches,
+    load_pdf_pages,
+    prefetch,
+    stream_into_vectorstore,
+)
+
+# 저장소에 포함된 8페이지 샘플 PDF
+SAMPLE_PDF = str(Path(__file__).resolve().parents[2] / "health.pdf")
+
+
+def page(number: int, text: str) -> Document:
+    return Document(page_content=text, metadata={"source": "ir.pdf", "page": number})
+
+
+def test_iter_chunk_batches_fixed_size_in_page_order():
+    """페이지를 분할한 청크를 batch_chunks개씩 순서대로, 마지막 배치는 남은 만큼"""
+    splitter = create_text_splitter(chunk_size=20, chunk_overlap=0)
+    pages = [page(i, " ".join(f"p{i}w{j}" for j in range(8))) for i in range(3)]
+    expected = splitter.split_documents(pages)
+
+    batches = list(iter_chunk_batches(iter(pages), splitter, batch_chunks=4))
+    assert [len(batch) for batch in batches[:-1]] == [4] * (len(batches) - 1)
+    assert 0 < len(batches[-1]) <= 4
+    assert [doc.page_content for batch in batches for doc in batch] == [doc.page_content for doc in expected]
+
+
+def test_prefetch_is_bounded_and_keeps_order():
+    """백그라운드 스레드는 버퍼가 찰 때까지만 앞서 나가고, 소비 순서는 원래 순서"""
+    produced = []
+    finished = threading.Event()
+
+    def source():
+        for i in range(10):
+            produced.append(i)
+            yield i
+        finished.set()
+
+    items = prefetch(source(), max_buffered=2)
+    assert next(items) == 0
+    # 소비자가 멈춘 동안 생산자는 버퍼(2) + put 대기 중인 1개 이상 진행하지 못함
+    assert not finished.wait(timeout=0.2)
+    assert len(produced) <= 4
+    assert list(items) == list(range(1, 10))
+
+
+def test_prefetch_reraises_producer_error():
+    """파싱 스레드의 예외는 소비자 쪽에서 그대로 발생"""
+    def source():
+        yield 1
+        raise ValueError("손상된 페이지")
+
+    items = prefetch(source())
+    assert next(items) == 1
+    with pytest.raises(ValueError, match="손상된 페이지"):
+        next(items)
+
+
+def test_stream_into_vectorstore_grows_one_index():
+    """배치마다 같은 FAISS 인덱스에 추가하고, 첫 배치 직후부터 검색 가능"""
+    embeddings = HashingEmbeddings(dim=64)
+    batches = [
+        [page(0, "매출 성장률 40%"), page(0, "영업이익 흑자 전환")],
+        [page(1, "FDA 510(k) 승인"), page(2, "특허 12건 등록")],
+    ]
+
+    stores = []
+    for store in stream_into_vectorstore(iter(batches), embeddings):
+        stores.append((store, store.index.ntotal))
+        assert store.similarity_search("매출 성장률 40%", k=1)[0].metadata["page"] == 0
+
+    assert [n for _, n in stores] == [2, 4]
+    assert stores[0][0] is stores[1][0]
+    assert stores[-1][0].similarity_search("FDA 510(k) 승인", k=1)[0].metadata["page"] == 1
+
+
+@pytest.fixture
+def parallel_shards(monkeypatch):
+    """작은 PDF도 페이지 1개짜리 샤드로 나눠 프로세스 풀에서 추출 (테스트 후 풀 정리)"""
+    monkeypatch.setattr(ingestion, "RAG_PDF_PARALLEL_MIN_PAGES", 1)
+    monkeypatch.setattr(ingestion, "RAG_PDF_PAGES_PER_SHARD", 1)
+    yield
+    ingestion._reset_extraction_pool()
+
+
+def test_process_pool_pages_match_serial_order(parallel_shards):
+    """샤드 완료 순서와 무관하게 프로세스 풀 추출 결과는 순차 로더와 같은 순서 / 텍스트 / 메타데이터"""
+    serial = load_pdf_pages(SAMPLE_PDF, workers=1, use_cache=False)
+    parallel = load_pdf_pages(SAMPLE_PDF, workers=3, use_cache=False)
+    assert ingestion._pool is not None
+
+    assert len(serial) > 3
+    assert [doc.metadata for doc in parallel] == [doc.metadata for doc in serial]
+    assert [doc.page_content for doc in parallel] == [doc.page_content for doc in serial]
+    assert [doc.metadata["page"] for doc in parallel] == list(range(len(serial)))
@@ -0,0 +1,80 @@
+"""
+BM25 토큰화 / 역색인 / RRF 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_lexical_index.py
+"""
+
+import pytest
+from langchain_core.documents import Document
+
+from jm.utils.lexical_index import BM25Index, HybridRetriever, reciprocal_rank_fusion, tokenize
+
+
+def test_tokenize_korean_bigrams_and_identifiers():
+    """한글 어절은 어절 + 음절 bigram, 영문/숫자는 구두점을 뺀 소문자 단어"""
+    assert tokenize("FDA 510(k) 인허가를") == ["fda", "510k", "인허가를", "인허", "허가", "가를"]
+    assert tokenize("매출 1,000억") == ["매출", "1000", "억"]
+
+
+def test_tokenize_matches_particle_variants():
+    """조사가 붙은 어절도 bigram으로 같은 토큰을 공유 ("시장규모는" vs "시장 규모")"""
+    attached = set(tokenize("시장규모는"))
+    assert {"시장", "규모"} <= attached
+    assert {"시장", "규모"} <= set(tokenize("시장 규모"))
+
+
+def test_reciprocal_rank_fusion():
+    """두 목록에 모두 상위로 나온 항목이 먼저, 점수는 Σ 1 / (rrf_k + rank)"""
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], rrf_k=60)
+    assert [key for key, _ in fused] == ["b", "a", "d", "c"]
+    assert dict(fused)["b"] == pytest.approx(1 / 62 + 1 / 61)
+    assert dict(fused)["c"] == pytest.approx(1 / 63)
+    assert reciprocal_rank_fusion([]) == []
+
+
+def test_bm25_search_ranks_keyword_rows():
+    """질의 단어가 나오는 row만 점수를 받고, rows를 주면 그 row 중에서만 검색"""
+    index = BM25Index.from_texts([
+        "FDA 510(k) 인허가 획득",
+        "팀 구성과 경영진 소개",
+        "CE 인증과 FDA 승인 일정",
+    ])
+    hits = index.search("FDA 510(k)", k=5)
+    assert [row for row, _ in hits] == [0, 2]
+    assert all(score > 0 for _, score in hits)
+
+    assert [row for row, _ in index.search("FDA", k=5, rows=[2])] == [2]
+    assert index.search("없는단어", k=5) == []
+
+
+class _UnusedRetriever:
+    """fuse_scored에 dense 결과를 직접 넘기므로 dense 검색기는 자리만 채움"""
+
+
+def test_hybrid_fuse_keeps_dense_similarity():
+    """RRF 순위로 합치고, dense 유사도는 그대로 (BM25로만 찾은 청크는 None)"""
+    documents = [
+        Document(page_content="FDA 510(k) FDA 인허가", metadata={"source": "ir.pdf", "page": 3}),
+        Document(page_content="시장 규모와 성장률", metadata={"source": "ir.pdf", "page": 5}),
+        Document(page_content="FDA 승인 예정 일정과 향후 계획 안내", metadata={"source": "ir.pdf", "page": 9}),
+    ]
+    retriever = HybridRetriever.model_construct(
+        dense=_UnusedRetriever(),
+        lexical=BM25Index.from_texts([doc.page_content for doc in documents]),
+        documents=documents,
+        k=3,
+        fetch_k=5,
+        rrf_k=60,
+        shards=None,
+    )
+    # dense는 같은 청크를 다른 Document 객체로 돌려줄 수 있음 → 내용으로 같은 청크 판단
+    dense_hits = [
+        (Document(page_content=doc.page_content, metadata=dict(doc.metadata)), score)
+        for doc, score in ((documents[1], 0.8), (documents[0], 0.6))
+    ]
+    fused = retriever.fuse_scored("FDA", dense_hits)
+
+    # page 3: dense 2위 + BM25 1위, page 5: dense 1위, page 9: BM25 2위
+    assert [doc.metadata["page"] for doc, _ in fused] == [3, 5, 9]
+    assert [score for _, score in fused] == [0.6, 0.8, None]
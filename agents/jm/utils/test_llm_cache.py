@@ -0,0 +1,192 @@
+"""
+LLM 응답 캐시 키 / TTL 만료 / LRU 제거 / 캐시 대상 호출 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_llm_cache.py
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from jm.utils import llm_cache
+from jm.utils.llm_cache import (
+    LLMResponseCache,
+    LLMResponseStore,
+    cache_key,
+    cached_chat_completion,
+    is_cacheable,
+    llm_response_cache,
+)
+from jm.utils.llm_clients import LLMClientRegistry
+from jm.utils.run_metrics import collect_run_metrics
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """llm_cache가 보는 time.time()을 수동으로 움직이는 시계"""
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def make_store(tmp_path, **kwargs) -> LLMResponseStore:
+    return LLMResponseStore(path=str(tmp_path / "llm_cache.sqlite3"), **kwargs)
+
+
+def test_cache_key_depends_on_prompt_and_model():
+    """프롬프트나 모델/파라미터 문자열 중 하나만 달라도 다른 키"""
+    key = cache_key("질문", "gpt-4o-mini|temperature=0")
+    assert key == cache_key("질문", "gpt-4o-mini|temperature=0")
+    assert key != cache_key("다른 질문", "gpt-4o-mini|temperature=0")
+    assert key != cache_key("질문", "gpt-4o-mini|temperature=0.2")
+    # 구분자가 있으므로 경계를 옮긴 조합과 충돌하지 않음
+    assert cache_key("bc", "a") != cache_key("c", "ab")
+
+
+def test_get_put_and_namespaces(tmp_path, clock):
+    """네임스페이스별로 따로 저장 / 적중률 집계 / 네임스페이스 단위 삭제"""
+    store = make_store(tmp_path, ttl=0, max_entries=0)
+    store.put("market", "k", "시장 응답")
+    store.put("tech", "k", "기술 응답")
+
+    assert store.get("market", "k") == "시장 응답"
+    assert store.get("tech", "k") == "기술 응답"
+    assert store.get("market", "missing") is None
+    assert store.entries() == {"market": 1, "tech": 1}
+
+    report = store.report()
+    assert report["hits"] == 2 and report["misses"] == 1
+    assert report["namespaces"]["market"]["hit_rate"] == 0.5
+
+    assert store.clear("market") == 1
+    assert store.entries() == {"tech": 1}
+
+
+def test_ttl_expires_entries(tmp_path, clock):
+    """TTL이 지난 항목은 조회 시 삭제되고 미스로 집계"""
+    store = make_store(tmp_path, ttl=60, max_entries=0)
+    store.put("market", "k", "응답")
+
+    clock.value += 59
+    assert store.get("market", "k") == "응답"
+
+    clock.value += 2
+    assert store.get("market", "k") is None
+    assert store.entries() == {}
+    assert store.stats["market"]["expired"] == 1
+    assert store.stats["market"]["misses"] == 1
+
+
+def test_lru_evicts_least_recently_used(tmp_path, clock):
+    """상한을 넘으면 가장 오래 사용하지 않은 항목부터 제거 (조회하면 사용 시각 갱신)"""
+    store = make_store(tmp_path, ttl=0, max_entries=2)
+    store.put("market", "a", "A")
+    clock.value += 1
+    store.put("tech", "b", "B")
+    clock.value += 1
+    # a를 조회해 최근 사용으로 갱신 → 다음 저장에서 b가 제거됨
+    assert store.get("market", "a") == "A"
+    clock.value += 1
+    store.put("market", "c", "C")
+
+    assert store.get("tech", "b") is None
+    assert store.get("market", "a") == "A"
+    assert store.get("market", "c") == "C"
+    assert store.entries() == {"market": 2}
+    assert store.stats["tech"]["evicted"] == 1
+
+
+def test_langchain_cache_round_trip(tmp_path, clock):
+    """LLMResponseCache: update한 ChatGeneration을 lookup으로 그대로 복원"""
+    cache = LLMResponseCache(make_store(tmp_path, ttl=0, max_entries=0), namespace="market")
+    generations = [ChatGeneration(message=AIMessage(content="yes"))]
+
+    assert cache.lookup("prompt", "llm") is None
+    cache.update("prompt", "llm", generations)
+    restored = cache.lookup("prompt", "llm")
+    assert restored[0].message.content == "yes"
+    assert cache.lookup("prompt", "other-llm") is None
+
+
+class FakeOpenAIClient:
+    """client.chat.completions.create만 흉내 내고 호출 횟수를 세는 OpenAI SDK 클라이언트 대용"""
+
+    def __init__(self, content: str):
+        self.calls = 0
+        self.content = content
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **params):
+        self.calls += 1
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=20)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))], usage=usage)
+
+
+@pytest.fixture
+def report_store(tmp_path, monkeypatch):
+    store = make_store(tmp_path, ttl=0, max_entries=0)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE", True)
+    monkeypatch.setattr(llm_cache, "llm_response_store", lambda: store)
+    return store
+
+
+def report_call(temperature):
+    """report_generator_agent._openai_json_completion과 같은 파라미터"""
+    params = {"model": "gpt-4o-mini", "temperature": temperature, "response_format": {"type": "json_object"}}
+    messages = [{"role": "system", "content": "분석가"}, {"role": "user", "content": "강점/리스크"}]
+    return messages, params
+
+
+def test_is_cacheable_only_at_temperature_zero(monkeypatch):
+    """temperature=0인 결정적 호출만 캐시, LLM_CACHE가 꺼져 있으면 모두 제외"""
+    monkeypatch.setattr(llm_cache, "LLM_CACHE", True)
+    assert is_cacheable(0)
+    assert not is_cacheable(0.2)
+    assert llm_response_cache("market", temperature=0.7) is None
+    assert isinstance(llm_response_cache("market", temperature=0), LLMResponseCache)
+
+    monkeypatch.setattr(llm_cache, "LLM_CACHE", False)
+    assert not is_cacheable(0)
+
+
+def test_report_completion_hits_cache(report_store):
+    """보고서 생성 호출(temperature=0): 두 번째 호출은 API 대신 캐시 적중 + run_metrics에 cached로 기록"""
+    client = FakeOpenAIClient('{"strengths": ["FDA 승인"], "risks": []}')
+    messages, params = report_call(temperature=0)
+
+    with collect_run_metrics("report") as metrics:
+        first = cached_chat_completion(client, messages, params, namespace="report")
+        second = cached_chat_completion(client, messages, params, namespace="report")
+
+    assert first == second == {"strengths": ["FDA 승인"], "risks": []}
+    assert client.calls == 1
+    assert report_store.entries() == {"report": 1}
+    llm = metrics.totals()["llm"]
+    assert (llm["llm_calls"], llm["cached"]) == (2, 1)
+
+
+def test_sampled_or_unparsable_completions_are_not_cached(report_store):
+    """temperature가 0이 아니거나 JSON 파싱에 실패한 응답은 저장하지 않음"""
+    client = FakeOpenAIClient('{"strengths": []}')
+    messages, params = report_call(temperature=0.2)
+    cached_chat_completion(client, messages, params, namespace="report")
+    cached_chat_completion(client, messages, params, namespace="report")
+    assert client.calls == 2
+
+    broken = FakeOpenAIClient("JSON이 아닌 응답")
+    messages, params = report_call(temperature=0)
+    with pytest.raises(ValueError):
+        cached_chat_completion(broken, messages, params, namespace="report")
+    assert report_store.entries() == {}
+
+
+def test_registry_attaches_cache_only_to_deterministic_models(monkeypatch):
+    """공용 채팅 모델도 같은 규칙: temperature=0 모델만 디스크 캐시 사용"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(llm_cache, "LLM_CACHE", True)
+    registry = LLMClientRegistry()
+    assert isinstance(registry.get("gpt-4o-mini", temperature=0, namespace="market").cache, LLMResponseCache)
+    assert registry.get("gpt-4o-mini", temperature=0.7, namespace="market").cache is None
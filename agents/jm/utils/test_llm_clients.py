@@ -0,0 +1,51 @@
+"""
+공용 LLM 클라이언트 레지스트리 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_llm_clients.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from jm.utils import llm_clients
+from jm.utils.llm_clients import LLMClientRegistry
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """네트워크 대신 MockTransport로 응답하는 레지스트리 (레이트 리미터 없이)"""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(llm_clients, "RATE_LIMIT", False)
+    monkeypatch.setattr(
+        httpx, "HTTPTransport", lambda limits: httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+    )
+    return LLMClientRegistry()
+
+
+def test_same_combination_reuses_model(registry):
+    """같은 조합은 같은 객체, temperature가 다르면 새 모델이지만 HTTP 클라이언트는 공유"""
+    first = registry.get("gpt-4o-mini", temperature=0, namespace="market")
+    assert registry.get("gpt-4o-mini", temperature=0, namespace="market") is first
+
+    sampled = registry.get("gpt-4o-mini", temperature=0.7, namespace="market")
+    assert sampled is not first
+    assert sampled.http_client is first.http_client is registry.http_client
+    assert (registry.stats["hits"], registry.stats["misses"]) == (1, 2)
+    assert registry.pool_stats()["models"] == 2
+
+
+def test_request_count_under_concurrency(registry):
+    """여러 스레드가 공용 클라이언트로 동시에 요청해도 요청 수가 빠짐없이 집계됨"""
+    client = registry.http_client
+
+    def send(_):
+        for _ in range(50):
+            client.get("https://api.openai.com/v1/models")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(send, range(8)))
+
+    assert registry.pool_stats()["requests"] == 400
@@ -0,0 +1,65 @@
+"""
+PDF 페이지 텍스트 캐시 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_page_cache.py
+"""
+
+import pytest
+from langchain_core.documents import Document
+
+from jm.utils import page_cache
+from jm.utils.page_cache import PAGE_CACHE_VERSION, cache_pages, load_cached_pages, page_cache_path
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_cache, "RAG_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def pages(source: str):
+    return [
+        Document(page_content=f"{i}페이지 본문", metadata={"source": source, "page": i, "total_pages": 3})
+        for i in range(3)
+    ]
+
+
+def test_cache_path_depends_on_hash_engine_and_version():
+    """파일 해시 / 추출 엔진 / 캐시 버전이 다르면 다른 파일"""
+    path = page_cache_path("abc", "pypdf")
+    assert path.name.startswith(f"abc.pypdf.v{PAGE_CACHE_VERSION}.")
+    assert path != page_cache_path("abc", "pdfplumber")
+    assert path != page_cache_path("abd", "pypdf")
+
+
+def test_round_trip_uses_current_path():
+    """끝까지 읽은 페이지만 저장, 로딩 시 source는 현재 PDF 경로로 채움"""
+    assert load_cached_pages("/now/ir.pdf", "abc", "pypdf") is None
+
+    written = list(cache_pages(pages("/old/ir.pdf"), "abc", "pypdf"))
+    assert len(written) == 3
+
+    loaded = load_cached_pages("/now/ir.pdf", "abc", "pypdf")
+    assert [doc.page_content for doc in loaded] == [doc.page_content for doc in written]
+    assert loaded[1].metadata == {"source": "/now/ir.pdf", "page": 1, "total_pages": 3}
+
+
+def test_interrupted_write_leaves_no_cache(cache_dir):
+    """중간에 중단되면 캐시 파일도 임시 파일도 남지 않음"""
+    stream = cache_pages(pages("/old/ir.pdf"), "abc", "pypdf")
+    next(stream)
+    stream.close()
+
+    assert load_cached_pages("/now/ir.pdf", "abc", "pypdf") is None
+    assert list((cache_dir / "pages").iterdir()) == []
+
+
+def test_corrupt_cache_is_dropped():
+    """손상된 캐시는 지우고 None (PDF 재파싱)"""
+    path = page_cache_path("abc", "pypdf")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a compressed file")
+
+    assert load_cached_pages("/now/ir.pdf", "abc", "pypdf") is None
+    assert not path.exists()
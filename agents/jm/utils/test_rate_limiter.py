@@ -0,0 +1,158 @@
+"""
+토큰 버킷 예약 / 429 비우기 / 버킷 저장소 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_rate_limiter.py
+"""
+
+import asyncio
+import sqlite3
+
+import httpx
+import pytest
+
+from jm.utils.rate_limiter import (
+    MemoryBucketStore,
+    RateGovernor,
+    SQLiteBucketStore,
+    _drain,
+    _request_model_and_tokens,
+    _reserve,
+    _retry_after,
+)
+
+
+def test_reserve_allows_burst_then_waits():
+    """가득 찬 버킷은 rpm건까지 바로 통과, 그 다음부터는 빚을 갚을 때까지 대기"""
+    state = (60.0, 0.0, 0.0)
+    waits = []
+    for _ in range(62):
+        state, wait = _reserve(state, rpm=60, tpm=0, tokens=0, now=0.0)
+        waits.append(wait)
+
+    assert waits[:60] == [0.0] * 60
+    # 60 rpm = 1초에 1건 → 예약 순서대로 1초, 2초 대기
+    assert waits[60] == pytest.approx(1.0)
+    assert waits[61] == pytest.approx(2.0)
+
+
+def test_reserve_refills_over_time():
+    """비어 있던 버킷도 시간이 지나면 경과 시간만큼 다시 채워짐 (최대 rpm)"""
+    state = (0.0, 0.0, 0.0)
+    state, wait = _reserve(state, rpm=60, tpm=0, tokens=0, now=10.0)
+    assert wait == 0.0
+    assert state[0] == pytest.approx(9.0)
+
+    # 아무리 오래 지나도 rpm보다 많이 쌓이지 않음
+    state, _ = _reserve(state, rpm=60, tpm=0, tokens=0, now=10_000.0)
+    assert state[0] == pytest.approx(59.0)
+
+
+def test_reserve_token_bucket_and_oversized_request():
+    """TPM 초과분만큼 대기, TPM보다 큰 요청은 가득 찬 버킷 하나 분량으로 상한"""
+    state = (100.0, 1000.0, 0.0)
+    state, wait = _reserve(state, rpm=100, tpm=1000, tokens=1500, now=0.0)
+    assert wait == 0.0
+    assert state[1] == pytest.approx(0.0)
+
+    state, wait = _reserve(state, rpm=100, tpm=1000, tokens=500, now=0.0)
+    # 500토큰 빚 / (1000토큰 / 60초) = 30초
+    assert wait == pytest.approx(30.0)
+
+
+def test_drain_blocks_for_retry_after():
+    """429 Retry-After 초 동안은 다음 예약이 기다림"""
+    state = _drain((60.0, 0.0, 0.0), rpm=60, seconds=5.0, now=0.0)
+    _, wait = _reserve(state, rpm=60, tpm=0, tokens=0, now=0.0)
+    assert wait == pytest.approx(6.0)
+
+    # 이미 Retry-After보다 빚이 크면 그대로 둠
+    deeper = _drain((-10.0, 0.0, 0.0), rpm=60, seconds=5.0, now=0.0)
+    assert deeper[0] == pytest.approx(-10.0)
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_bucket_stores_share_state_per_key(tmp_path, backend):
+    """같은 키는 버킷을 공유하고 다른 키는 독립 (메모리 / SQLite 동일 동작)"""
+    store = MemoryBucketStore() if backend == "memory" else SQLiteBucketStore(str(tmp_path / "rate.sqlite3"))
+    assert [store.reserve("openai:a", 2, 0, 0) for _ in range(2)] == [0.0, 0.0]
+    assert store.reserve("openai:a", 2, 0, 0) > 25
+    assert store.reserve("openai:b", 2, 0, 0) == 0.0
+
+
+def test_sqlite_store_is_shared_between_connections(tmp_path):
+    """SQLite 저장소는 다른 연결(다른 프로세스)과 같은 버킷을 씀"""
+    path = str(tmp_path / "rate.sqlite3")
+    first, second = SQLiteBucketStore(path), SQLiteBucketStore(path)
+    assert first.reserve("k", 1, 0, 0) == 0.0
+    assert second.reserve("k", 1, 0, 0) > 55
+
+
+def test_async_acquire_with_sqlite_store(tmp_path):
+    """비동기 acquire는 SQLite 저장소에서도 예약 결과를 그대로 사용하고 통계에 기록"""
+    governor = RateGovernor("k", rpm=600, store=SQLiteBucketStore(str(tmp_path / "rate.sqlite3")))
+
+    async def run():
+        return [await governor.aacquire(10) for _ in range(3)]
+
+    assert asyncio.run(run()) == [0.0, 0.0, 0.0]
+    assert governor.stats["requests"] == 3
+    assert governor.stats["tokens"] == 30
+
+
+def test_request_model_and_tokens():
+    """요청 본문의 모델명 + (본문 4바이트당 1토큰 + 응답 토큰)"""
+    body = b'{"model": "gpt-4o-mini", "max_tokens": 100, "messages": []}'
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions", content=body)
+    assert _request_model_and_tokens(request) == ("gpt-4o-mini", len(body) // 4 + 100)
+
+
+def test_retry_after_prefers_milliseconds():
+    """retry-after-ms가 있으면 우선, 없으면 retry-after, 둘 다 없으면 None"""
+    assert _retry_after(httpx.Response(429, headers={"retry-after-ms": "1500", "retry-after": "9"})) == 1.5
+    assert _retry_after(httpx.Response(429, headers={"retry-after": "2"})) == 2.0
+    assert _retry_after(httpx.Response(429)) is None
+
+
+class LockedStore:
+    """처음 failures번은 SQLite 잠금 오류를 내는 버킷 저장소"""
+
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self.inner = MemoryBucketStore()
+
+    def reserve(self, key, rpm, tpm, tokens):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return self.inner.reserve(key, rpm, tpm, tokens)
+
+    def drain(self, key, rpm, seconds):
+        self.inner.drain(key, rpm, seconds)
+
+
+def test_enter_releases_slot_when_acquire_raises():
+    """버킷 예약이 실패해도 슬롯은 반납되어 다음 호출이 바로 슬롯을 잡음"""
+    governor = RateGovernor("k", rpm=600, max_concurrency=1, store=LockedStore())
+    with pytest.raises(sqlite3.OperationalError):
+        governor.enter()
+    assert governor.slots.in_flight == 0
+
+    release = governor.enter()
+    assert governor.slots.in_flight == 1
+    release()
+    assert governor.slots.in_flight == 0
+
+
+def test_aenter_releases_slot_when_acquire_raises():
+    """비동기 경로도 같은 보장"""
+    governor = RateGovernor("k", rpm=600, max_concurrency=1, store=LockedStore())
+
+    async def run():
+        with pytest.raises(sqlite3.OperationalError):
+            await governor.aenter()
+        release = await asyncio.wait_for(governor.aenter(), timeout=1)
+        release()
+
+    asyncio.run(run())
+    assert governor.slots.in_flight == 0
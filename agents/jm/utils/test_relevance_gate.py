@@ -0,0 +1,85 @@
+"""
+관련성 게이트 판정 / 임계값 보정 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_relevance_gate.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from jm.utils.relevance_gate import (
+    ACCEPT,
+    LLM,
+    REJECT,
+    fit_thresholds,
+    gate_decision,
+    gate_stats,
+    labeled_scores,
+    load_gate_log,
+    log_gate_decision,
+)
+
+
+def test_gate_decision_bands():
+    """최고 유사도 기준: accept 이상 → accept, reject 미만 → reject, 그 사이 / 점수 없음 → llm"""
+    assert gate_decision([0.3, 0.7], accept=0.6, reject=0.2) == ACCEPT
+    assert gate_decision([0.6], accept=0.6, reject=0.2) == ACCEPT
+    assert gate_decision([0.1, 0.19], accept=0.6, reject=0.2) == REJECT
+    assert gate_decision([0.2], accept=0.6, reject=0.2) == LLM
+    assert gate_decision([None, 0.4], accept=0.6, reject=0.2) == LLM
+    assert gate_decision([None, None], accept=0.6, reject=0.2) == LLM
+    assert gate_decision([], accept=0.6, reject=0.2) == LLM
+
+
+def test_fit_thresholds_separates_clean_bands():
+    """낮은 점수는 모두 "no", 높은 점수는 모두 "yes"면 그 경계가 임계값"""
+    samples = (
+        [(score, False) for score in (0.1, 0.15, 0.2, 0.25, 0.3)]
+        + [(0.4, True), (0.45, False)]
+        + [(score, True) for score in (0.6, 0.65, 0.7, 0.75, 0.8)]
+    )
+    reject, accept = fit_thresholds(samples, precision=0.95, min_support=5)
+    assert accept == 0.6
+    assert reject == 0.4
+
+
+def test_fit_thresholds_needs_support():
+    """구간 표본이 min_support개 미만이거나 한쪽 라벨뿐이면 해당 임계값은 None"""
+    assert fit_thresholds([(0.9, True), (0.1, False)], min_support=5) == (None, None)
+
+    all_yes = [(score, True) for score in (0.3, 0.4, 0.5, 0.6, 0.7, 0.8)]
+    reject, accept = fit_thresholds(all_yes, precision=0.95, min_support=5)
+    assert reject is None
+    assert accept == 0.3
+
+
+def test_fit_thresholds_keeps_reject_below_accept():
+    """두 구간이 겹치면 reject를 accept로 낮춤 (항상 reject ≤ accept)"""
+    samples = [(0.5, False)] * 5 + [(0.5, True)] * 5
+    assert fit_thresholds(samples, precision=0.5, min_support=5) == (0.5, 0.5)
+
+
+def test_log_round_trip(tmp_path):
+    """JSONL로 기록한 판정 중 LLM 평가가 있는 기록만 보정 표본으로 사용, 깨진 줄은 건너뜀"""
+    path = str(tmp_path / "gate.jsonl")
+    log_gate_decision("시장 규모는?", [0.7, 0.5], ACCEPT, path=path)
+    log_gate_decision("FDA 승인은?", [0.4], LLM, verdict="yes", path=path)
+    log_gate_decision("팀 구성은?", [None], LLM, verdict="no", path=path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("{broken\n")
+
+    records = load_gate_log(path)
+    assert [record["decision"] for record in records] == [ACCEPT, LLM, LLM]
+    assert records[0]["top_score"] == 0.7
+    assert labeled_scores(records) == [(0.4, True)]
+
+
+def test_gate_stats_count_concurrent_decisions(tmp_path):
+    """여러 스레드가 동시에 기록해도 판정 횟수가 빠짐없이 집계됨"""
+    path = str(tmp_path / "gate.jsonl")
+    before = gate_stats()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: log_gate_decision(f"질문 {i}", [0.9], ACCEPT, path=path), range(400)))
+
+    assert gate_stats()[ACCEPT] - before[ACCEPT] == 400
+    assert len(load_gate_log(path)) == 400
@@ -0,0 +1,63 @@
+"""
+LRU 캐시 / 검색 결과 캐시 키(인덱스 버전) 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_retrieval_cache.py
+"""
+
+from types import SimpleNamespace
+
+from jm.utils.lexical_index import HybridRetriever
+from jm.utils.retrieval_cache import LRUCache, index_version
+
+
+def test_lru_evicts_least_recently_used():
+    """상한을 넘으면 가장 오래 사용하지 않은 키부터 제거, 조회하면 최근 사용으로 갱신"""
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {
+        "hits": 3, "misses": 1, "evictions": 1, "size": 2, "maxsize": 2, "hit_rate": 0.75,
+    }
+
+
+def test_lru_disabled_and_default():
+    """maxsize 0이면 저장하지 않음, 미스 시 default 반환"""
+    cache = LRUCache(maxsize=0)
+    cache.put("a", 1)
+    assert len(cache) == 0
+    assert cache.get("a", "없음") == "없음"
+
+
+def dense(version, k=5):
+    """metadata에 index_version을 단 dense retriever 대용"""
+    return SimpleNamespace(metadata={"index_version": version} if version else {}, k=k)
+
+
+def test_index_version_from_metadata():
+    """인덱스 버전 + k로 키 구성, 버전을 모르면 None (캐시하지 않음)"""
+    assert index_version(dense("abc", k=5)) == "abc|k:5"
+    assert index_version(dense("abc", k=5)) != index_version(dense("abc", k=10))
+    assert index_version(dense("abc")) != index_version(dense("def"))
+    assert index_version(dense(None)) is None
+
+
+def test_index_version_for_hybrid_retriever():
+    """하이브리드는 dense 버전 + RRF 설정, dense 버전을 모르면 None"""
+
+    def hybrid(inner, **settings):
+        return HybridRetriever.model_construct(
+            dense=inner, lexical=None, documents=[], k=settings.get("k", 5),
+            fetch_k=settings.get("fetch_k", 20), rrf_k=settings.get("rrf_k", 60), shards=None,
+        )
+
+    version = index_version(hybrid(dense("abc", k=20)))
+    assert version == "abc|k:20|hybrid:5:20:60"
+    assert index_version(hybrid(dense("abc", k=20), rrf_k=30)) != version
+    assert index_version(hybrid(dense(None))) is None
@@ -0,0 +1,61 @@
+"""
+구조화된 검색 결과 (RetrievalHit) 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_retrieval_hit.py
+"""
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from jm.utils.embedding_providers import HashingEmbeddings
+from jm.utils.rag_tools import retrieve_with_sources
+from jm.utils.retrieval_cache import retrieval_result_cache
+from jm.utils.retrieval_hit import RetrievalHit, dedupe_hits, hit_sources
+
+
+def chunk(text: str, page=None, start=None, **metadata) -> Document:
+    return Document(page_content=text, metadata={"source": "ir.pdf", "page": page, "start_index": start, **metadata})
+
+
+def test_chunk_id_and_span():
+    """chunk_id는 코퍼스 id → 출처/페이지/시작 위치 → 내용 해시 순, 원본 Document는 복사하지 않음"""
+    doc = chunk("매출 성장률 40%", page=3, start=120)
+    hit = RetrievalHit.from_document(doc, 0.82)
+    assert (hit.chunk_id, hit.page, hit.span) == ("ir.pdf#p3@120", 3, (120, 130))
+    assert hit.document is doc and hit.text == "매출 성장률 40%"
+    assert hit.citation == "ir.pdf (page 3)"
+
+    assert RetrievalHit.from_document(chunk("x", page=1, chunk_id="abc-0")).chunk_id == "abc-0"
+    web = RetrievalHit.from_text("웹 검색 결과", "https://example.com")
+    assert web.score is None and web.span is None
+    assert web.chunk_id == RetrievalHit.from_text("웹 검색 결과", "https://other.com").chunk_id
+
+
+def test_dedupe_hits_and_sources_keep_rank_order():
+    """같은 청크는 처음 순위에 한 번만, 점수는 더 높은 쪽 / 출처는 순위 순서로 중복 제거"""
+    a = chunk("팀 소개", page=1, start=0)
+    b = chunk("FDA 승인", page=4, start=0)
+    hits = [
+        RetrievalHit.from_document(a, None),
+        RetrievalHit.from_document(b, 0.7),
+        RetrievalHit.from_document(a, 0.9),
+        RetrievalHit.from_document(chunk("FDA 일정", page=4, start=300), 0.5),
+    ]
+    deduped = dedupe_hits(hits)
+    assert [(hit.page, hit.score) for hit in deduped] == [(1, 0.9), (4, 0.7), (4, 0.5)]
+    assert hit_sources(deduped) == ["ir.pdf (page 1)", "ir.pdf (page 4)"]
+
+
+def test_retrieve_with_sources_returns_cosine_scores():
+    """FAISS(L2 거리) 검색 결과도 코사인 유사도 점수로, 검색 순위 순서"""
+    retrieval_result_cache.clear()
+    docs = [chunk(text, page=i, start=0) for i, text in enumerate(["시장 규모", "매출 구조", "경쟁 구도"])]
+    vectorstore = FAISS.from_documents(docs, HashingEmbeddings(dim=64))
+    hits = retrieve_with_sources(vectorstore.as_retriever(search_kwargs={"k": 3}), "매출 구조")
+
+    assert hits[0].page == 1
+    assert hits[0].score == pytest.approx(1.0, abs=1e-5)
+    assert [hit.score for hit in hits] == sorted((hit.score for hit in hits), reverse=True)
+    assert all(-1.0 <= hit.score <= 1.0 + 1e-5 for hit in hits)
@@ -0,0 +1,105 @@
+"""
+실행 단위 계측 (노드 / LLM 호출 / 캐시 적중 / 재시도 / 비용) 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_run_metrics.py
+"""
+
+import itertools
+import json
+from typing import TypedDict
+
+import pytest
+from langchain_core.caches import InMemoryCache
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+
+from jm.utils.run_metrics import collect_run_metrics, estimate_cost, note_http_request, track_call
+
+USAGE = {"input_tokens": 100, "output_tokens": 20, "total_tokens": 120}
+
+
+class FakeChatModel(GenericFakeChatModel):
+    """같은 응답(토큰 사용량 포함)을 반복하는 채팅 모델, invocation_params에 모델명이 들어감"""
+
+    model_name: str = "gpt-4o-mini"
+
+
+def fake_llm(cache=None) -> FakeChatModel:
+    return FakeChatModel(messages=itertools.repeat(AIMessage(content="yes", usage_metadata=USAGE)), cache=cache)
+
+
+def test_estimate_cost_uses_model_prefix():
+    """날짜 접미사가 붙은 모델명은 앞부분 단가로, 모르는 모델은 0"""
+    assert estimate_cost("gpt-4o-mini", 1_000_000, 0) == pytest.approx(0.15)
+    assert estimate_cost("gpt-4o-mini-2024-07-18", 0, 1_000_000) == pytest.approx(0.60)
+    assert estimate_cost("gpt-4o-2024-08-06", 1_000_000, 0) == pytest.approx(2.50)
+    assert estimate_cost("local-model", 1_000, 1_000) == 0.0
+
+
+def test_cache_hit_is_detected_and_not_billed():
+    """LLM 캐시에서 복원한 응답은 cached로 기록, 비용 0, 토큰은 saved_tokens로 따로 집계"""
+    llm = fake_llm(cache=InMemoryCache())
+    with collect_run_metrics("Lunit") as metrics:
+        llm.invoke("매출 구조는?")
+        llm.invoke("매출 구조는?")
+
+    first, second = metrics.records
+    assert (first.name, first.cached, second.cached) == ("gpt-4o-mini", False, True)
+    assert first.cost == pytest.approx(estimate_cost("gpt-4o-mini", 100, 20))
+    assert second.cost == 0.0
+
+    llm_totals = metrics.totals()["llm"]
+    assert (llm_totals["llm_calls"], llm_totals["cached"]) == (2, 1)
+    assert (llm_totals["prompt_tokens"], llm_totals["completion_tokens"]) == (100, 20)
+    assert llm_totals["saved_tokens"] == 120
+
+
+def test_llm_calls_are_attributed_to_graph_nodes():
+    """LangGraph 노드 행에는 노드 실행 횟수와 그 안에서 일어난 LLM 호출이 합산됨"""
+    class State(TypedDict):
+        answer: str
+
+    llm = fake_llm()
+
+    def grade(state):
+        return {"answer": llm.invoke("관련 있나?").content}
+
+    builder = StateGraph(State)
+    builder.add_node("grade", grade)
+    builder.add_edge(START, "grade")
+    builder.add_edge("grade", END)
+    graph = builder.compile()
+
+    with collect_run_metrics("Lunit") as metrics:
+        graph.invoke({"answer": ""})
+
+    node = metrics.totals()["nodes"]["grade"]
+    assert (node["calls"], node["llm_calls"], node["prompt_tokens"]) == (1, 1, 100)
+    assert [record.node for record in metrics.records if record.kind == "llm"] == ["grade"]
+
+
+def test_track_call_counts_retries_and_errors(tmp_path):
+    """직접 호출 계측: 첫 HTTP 요청 이후 요청은 재시도, 예외는 기록 후 그대로 전파, JSONL 마지막 줄은 합계"""
+    with collect_run_metrics("Lunit") as metrics:
+        with track_call("tool", "tavily_web") as call:
+            for _ in range(3):
+                note_http_request()
+        with pytest.raises(TimeoutError):
+            with track_call("tool", "tavily_news"):
+                raise TimeoutError("timeout")
+
+    assert (call.http_requests, call.retries) == (3, 2)
+    tools = metrics.totals()["tools"]
+    assert (tools["tavily_web"]["retries"], tools["tavily_news"]["errors"]) == (2, 1)
+
+    path = metrics.export_jsonl(str(tmp_path / "run_metrics.jsonl"))
+    lines = [json.loads(line) for line in open(path, encoding="utf-8")]
+    assert [line.get("kind") for line in lines] == ["tool", "tool", "run"]
+    assert lines[1]["error"] == "TimeoutError: timeout"
+
+    # 수집 중이 아니어도 호출부는 그대로 동작
+    with track_call("llm", "gpt-4o-mini") as untracked:
+        untracked.add_usage("gpt-4o-mini", 10, 5)
+    assert untracked.cost > 0
@@ -0,0 +1,52 @@
+"""
+섹션 유형 분류 / 질의 라우팅 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_section_router.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from langchain_core.documents import Document
+
+from jm.utils.embedding_providers import HashingEmbeddings
+from jm.utils.section_router import GENERAL, SectionShardIndex, classify_sections, route_query
+
+
+def test_route_query():
+    """키워드 점수 순 섹션, 키워드가 없으면 None (전체 검색)"""
+    assert route_query("수익 모델과 매출 구조는?", ratio=0.3)[0] == "financials"
+    assert route_query("FDA 510(k) 승인 현황은?", ratio=0.3)[0] == "regulation"
+    assert route_query("오늘 날씨는?") is None
+
+
+def test_classify_sections_follows_page_topic():
+    """키워드가 적은 청크도 같은 페이지의 주제를 따라가고, 적중이 부족하면 general"""
+    docs = [
+        Document(page_content="창업자와 경영진 소개", metadata={"source": "ir.pdf", "page": 1}),
+        Document(page_content="이사회 구성", metadata={"source": "ir.pdf", "page": 1}),
+        Document(page_content="감사합니다", metadata={"source": "ir.pdf", "page": 9}),
+    ]
+    counts = classify_sections(docs)
+    assert [doc.metadata["section"] for doc in docs] == ["team", "team", GENERAL]
+    assert counts == {"team": 2, GENERAL: 1}
+
+
+def test_search_batch_counts_under_concurrency():
+    """여러 스레드가 동시에 검색해도 통계가 빠짐없이 합산됨"""
+    texts = ["매출 수익 영업이익"] * 20 + ["특허 알고리즘 기술"] * 20 + ["기타 안내"] * 5
+    docs = [Document(page_content=text, metadata={"source": "ir.pdf", "page": i}) for i, text in enumerate(texts)]
+    embeddings = HashingEmbeddings(dim=64)
+    vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    index = SectionShardIndex(vectors, docs, embeddings)
+
+    queries = ["매출 구조는?", "특허 현황은?", "오늘 날씨는?"]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: index.search_batch(queries, k=3), range(40)))
+
+    assert all(len(hits) == 3 for batch in results for hits in batch)
+    assert index.stats["queries"] == 120
+    assert index.stats["fallback"] == 40
+    assert index.stats["full_scan"] == 120 * len(texts)
+    assert 0 < index.cost_summary()["saved"] < 1
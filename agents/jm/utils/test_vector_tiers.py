@@ -0,0 +1,86 @@
+"""
+벡터 저장 계층 선택 / 압축 인덱스 재채점 테스트
+
+실행 (agents/ 디렉터리에서):
+    python -m pytest -q jm/utils/test_vector_tiers.py
+"""
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from jm.utils import vector_tiers
+from jm.utils.vector_tiers import TieredVectorStore, build_compressed_index, choose_tier, normalize
+
+
+def random_vectors(n: int, dim: int = 32, seed: int = 0) -> np.ndarray:
+    return normalize(np.random.default_rng(seed).standard_normal((n, dim)))
+
+
+def test_choose_tier_by_corpus_size(monkeypatch):
+    """auto: flat → sq8 → pq, 그 외 값은 그대로 (모르는 값은 ValueError)"""
+    monkeypatch.setattr(vector_tiers, "RAG_TIER_FLAT_MAX", 50_000)
+    monkeypatch.setattr(vector_tiers, "RAG_TIER_SQ8_MAX", 1_000_000)
+    assert choose_tier(50_000, "auto") == "flat"
+    assert choose_tier(50_001, "auto") == "sq8"
+    assert choose_tier(1_000_001, "auto") == "pq"
+    assert choose_tier(10, "fp16") == "fp16"
+    with pytest.raises(ValueError):
+        choose_tier(10, "int4")
+
+
+def test_normalize():
+    """행마다 단위 길이, 0 벡터는 0으로 유지"""
+    vectors = normalize(np.array([[3.0, 4.0], [0.0, 0.0]]))
+    assert vectors.dtype == np.float32
+    assert np.allclose(vectors[0], [0.6, 0.8])
+    assert np.allclose(vectors[1], [0.0, 0.0])
+
+
+def test_pq_falls_back_to_sq8_when_too_small():
+    """PQ 학습 표본이 부족하면 SQ8로 대체"""
+    _, tier = build_compressed_index(random_vectors(500), "pq")
+    assert tier == "sq8"
+
+
+def test_pq_fallback_store_matches_pq_request(tmp_path):
+    """pq를 요청해 sq8로 대체 저장된 인덱스도 다음 pq 요청에서 캐시 적중 (다른 계층 요청은 불일치)"""
+    vectors = random_vectors(500)
+    documents = [Document(page_content=f"chunk {i}") for i in range(len(vectors))]
+    TieredVectorStore.build(vectors, documents, embeddings=None, tier="pq", path=tmp_path / "tier")
+
+    reloaded = TieredVectorStore.load(tmp_path / "tier", embeddings=None)
+    assert (reloaded.tier, reloaded.requested_tier) == ("sq8", "pq")
+    assert reloaded.matches("pq", "auto")
+    assert reloaded.matches("sq8", "flat")
+    assert reloaded.matches("auto", "auto")
+    assert not reloaded.matches("fp16", "auto")
+    assert not reloaded.matches("pq", "hnsw")
+
+
+def test_tiered_store_rescores_with_exact_vectors(tmp_path):
+    """SQ8 후보를 원본 벡터로 재채점 → 점수는 정확한 내적, 디스크에서 다시 로딩해도 같은 결과"""
+    vectors = random_vectors(1_000)
+    documents = [Document(page_content=f"chunk {i}", metadata={"row": i}) for i in range(len(vectors))]
+    path = tmp_path / "tier"
+    store = TieredVectorStore.build(vectors, documents, embeddings=None, tier="sq8", path=path)
+
+    assert store.tier == "sq8"
+    assert isinstance(store.vectors, np.memmap)
+    assert store.memory_bytes()["index_bytes"] < store.memory_bytes()["exact_vector_bytes"]
+
+    queries = vectors[:10]
+    scores, ids = store.search_by_vectors(queries, k=3)
+    assert (ids[:, 0] == np.arange(10)).all()
+    exact = np.einsum("qd,qkd->qk", queries, vectors[ids])
+    assert np.allclose(scores, exact, atol=1e-5)
+
+    reloaded = TieredVectorStore.load(path, embeddings=None)
+    reloaded_scores, reloaded_ids = reloaded.search_by_vectors(queries, k=3)
+    assert (reloaded_ids == ids).all()
+    assert np.allclose(reloaded_scores, scores)
+    assert reloaded._to_documents(scores, ids)[0][0][0].metadata["row"] == 0
+
+
+def test_load_missing_store(tmp_path):
+    assert TieredVectorStore.load(tmp_path / "missing", embeddings=None) is None
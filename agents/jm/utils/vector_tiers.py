@@ -0,0 +1,288 @@
+"""
+대형 코퍼스용 압축 + 메모리 매핑 벡터 저장 계층
+
+setup_rag_pipeline 기본 FAISS 인덱스는 float32 전체 벡터를 RAM에 올리므로
+IR 자료/시장 보고서가 수천 개가 되면 메모리가 감당되지 않습니다.
+여기서는 압축 인덱스(fp16 / SQ8 / PQ)로 후보를 넉넉히 뽑은 뒤,
+디스크의 float32 원본 벡터(np.memmap, 필요한 행만 페이지 인)로 정확한 점수를 다시 매깁니다.
+
+계층 (코퍼스 크기로 자동 선택, RAG_VECTOR_TIER로 고정 가능):
+    flat   float32 전체 (기존 FAISS, 작을 때)         4 * dim 바이트/벡터
+    fp16   half precision                             2 * dim
+    sq8    8bit 스칼라 양자화                          1 * dim
+    pq     product quantization (dim/8 서브벡터)       dim / 8
+
+저장 구조 (RAG_CACHE_DIR/tiered/<key>/):
+    index.faiss   압축 인덱스 (내적, 정규화 벡터)
+    vectors.f32   float32 원본 벡터 (rescoring용, 메모리 매핑)
+    docstore.pkl  row → Document
+    meta.json     계층, 벡터 수, 차원
+"""
+
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from jm.utils.embedding_cache import embed_queries
+from jm.utils.index_cache import RAG_CACHE_DIR, temp_path
+from jm.utils.index_factory import ann_kind, build_index, factory_string, tune_index
+
+# ===== 설정값 =====
+RAG_VECTOR_TIER = os.getenv("RAG_VECTOR_TIER", "auto")  # auto | flat | fp16 | sq8 | pq
+# 자동 선택 기준 (벡터 수)
+RAG_TIER_FLAT_MAX = int(os.getenv("RAG_TIER_FLAT_MAX", "50000"))
+RAG_TIER_SQ8_MAX = int(os.getenv("RAG_TIER_SQ8_MAX", "1000000"))
+# 압축 인덱스에서 k * RAG_RESCORE_FACTOR개 후보를 뽑아 원본 벡터로 재채점
+RAG_RESCORE_FACTOR = int(os.getenv("RAG_RESCORE_FACTOR", "4"))
+# PQ 코드북 학습에 필요한 최소 벡터 수 (부족하면 SQ8 사용)
+PQ_MIN_TRAIN = 10000
+
+TIERS = ("flat", "fp16", "sq8", "pq")
+
+
+def choose_tier(num_vectors: int, tier: str = RAG_VECTOR_TIER) -> str:
+    """코퍼스 크기로 저장 계층 선택 (tier가 auto가 아니면 그대로 사용)"""
+    if tier != "auto":
+        if tier not in TIERS:
+            raise ValueError(f"알 수 없는 벡터 계층: {tier} (가능: auto, {', '.join(TIERS)})")
+        return tier
+    if num_vectors <= RAG_TIER_FLAT_MAX:
+        return "flat"
+    if num_vectors <= RAG_TIER_SQ8_MAX:
+        return "sq8"
+    return "pq"
+
+
+def build_compressed_index(vectors: np.ndarray, tier: str, ann: str = "flat"):
+    """
+    정규화 벡터로 압축 인덱스 생성 및 학습 (내적 = 코사인 유사도)
+
+    tier는 벡터 인코딩, ann은 검색 구조(flat | hnsw | ivf, index_factory 참고)를 정합니다.
+    """
+    n, dim = vectors.shape
+    if tier == "pq" and (n < PQ_MIN_TRAIN or dim % 8 != 0):
+        print(f"⚠️ [Vector Tier] PQ 학습 조건 미달(벡터 {n}개, 차원 {dim}) → SQ8 사용")
+        tier = "sq8"
+
+    return build_index(vectors, factory_string(n, dim, ann, tier)), tier
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+class TieredVectorStore:
+    """
+    압축 인덱스 후보 검색 + 메모리 매핑 원본 벡터 재채점
+
+    Args:
+        index: 압축 FAISS 인덱스
+        vectors: float32 원본 벡터 (np.memmap 또는 ndarray, 정규화됨)
+        documents: row 순서의 Document 리스트
+        embeddings: 질의 임베딩에 사용할 Embeddings
+        tier: 계층 이름
+        rescore_factor: 재채점 후보 배수 (0이면 재채점 안 함)
+        requested_tier: 구축 시 요청한 계층 (pq → sq8 대체 시 "pq", 없으면 tier와 같음)
+    """
+
+    def __init__(
+        self,
+        index,
+        vectors: np.ndarray,
+        documents: List[Document],
+        embeddings: Embeddings,
+        tier: str,
+        rescore_factor: int = RAG_RESCORE_FACTOR,
+        requested_tier: Optional[str] = None,
+    ):
+        self.index = index
+        self.vectors = vectors
+        self.documents = documents
+        self.embeddings = embeddings
+        self.tier = tier
+        self.rescore_factor = rescore_factor
+        self.requested_tier = requested_tier or tier
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @property
+    def ann(self) -> str:
+        """검색 구조 (flat | hnsw | ivf)"""
+        return ann_kind(self.index)
+
+    def matches(self, tier: str, ann: str) -> bool:
+        """요청한 계층/검색 구조로 다시 구축해도 같은 인덱스인지 (auto는 무엇이든 허용)"""
+        return tier in ("auto", self.tier, self.requested_tier) and ann in ("auto", self.ann)
+
+    # ========== 생성 / 저장 / 로딩 ==========
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        documents: List[Document],
+        embeddings: Embeddings,
+        tier: str,
+        path: Path,
+        ann: str = "flat",
+    ) -> "TieredVectorStore":
+        """벡터/문서로 압축 인덱스와 원본 벡터 파일을 만들고 path에 저장한 뒤 메모리 매핑으로 다시 로딩"""
+        import faiss
+
+        vectors = normalize(vectors)
+        requested_tier = tier
+        index, tier = build_compressed_index(vectors, tier, ann)
+
+        tmp_path = temp_path(path)
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+
+        faiss.write_index(index, str(tmp_path / "index.faiss"))
+        vectors.tofile(tmp_path / "vectors.f32")
+        with open(tmp_path / "docstore.pkl", "wb") as f:
+            pickle.dump(documents, f)
+        with open(tmp_path / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "tier": tier,
+                # pq → sq8 대체 후에도 같은 요청이면 캐시 적중으로 보도록 요청 계층도 기록
+                "requested_tier": requested_tier,
+                "ann": ann_kind(index),
+                "num_vectors": len(documents),
+                "dim": int(vectors.shape[1]),
+            }, f)
+
+        if path.exists():
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        else:
+            try:
+                tmp_path.rename(path)
+            except OSError:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+
+        del index, vectors
+        return cls.load(path, embeddings)
+
+    @classmethod
+    def load(cls, path: Path, embeddings: Embeddings) -> Optional["TieredVectorStore"]:
+        """저장된 계층 인덱스 로딩 (원본 벡터는 메모리 매핑), 없거나 손상 시 None"""
+        import faiss
+
+        path = Path(path)
+        if not (path / "meta.json").exists():
+            return None
+
+        try:
+            with open(path / "meta.json", encoding="utf-8") as f:
+                meta = json.load(f)
+            try:
+                index = faiss.read_index(str(path / "index.faiss"), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            except Exception:
+                index = faiss.read_index(str(path / "index.faiss"))
+            vectors = np.memmap(
+                path / "vectors.f32", dtype=np.float32, mode="r", shape=(meta["num_vectors"], meta["dim"])
+            )
+            with open(path / "docstore.pkl", "rb") as f:
+                documents = pickle.load(f)
+        except Exception as e:
+            print(f"⚠️ [Vector Tier] 인덱스 로딩 실패, 재구축합니다: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+
+        return cls(
+            tune_index(index), vectors, documents, embeddings, meta["tier"],
+            requested_tier=meta.get("requested_tier"),
+        )
+
+    def memory_bytes(self) -> Dict[str, int]:
+        """압축 인덱스(RAM 상주)와 원본 벡터(디스크, 메모리 매핑) 크기"""
+        import faiss
+
+        try:
+            index_bytes = self.index.sa_code_size() * self.index.ntotal
+        except RuntimeError:
+            # HNSW/IVF는 코드 크기만으로 계산할 수 없음 (그래프/리스트 포함 직렬화 크기)
+            index_bytes = faiss.serialize_index(self.index).nbytes
+        return {
+            "index_bytes": int(index_bytes),
+            "exact_vector_bytes": int(self.vectors.nbytes),
+        }
+
+    # ========== 검색 ==========
+
+    def search_by_vectors(self, queries: np.ndarray, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (n, dim) 질의 행렬 검색 → (점수, row id) 각각 (n, k)
+
+        압축 인덱스에서 k * rescore_factor개 후보를 뽑고,
+        후보 행만 원본 벡터에서 읽어 정확한 내적으로 재정렬합니다.
+        """
+        queries = normalize(queries)
+        k = min(k, len(self))
+        n_candidates = min(len(self), k * max(self.rescore_factor, 1))
+        approx_scores, candidates = self.index.search(queries, n_candidates)
+
+        if self.rescore_factor <= 0 or self.tier == "flat":
+            return approx_scores[:, :k], candidates[:, :k]
+
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        for qi, row_ids in enumerate(candidates):
+            row_ids = row_ids[row_ids >= 0]
+            # memmap 팬시 인덱싱은 정렬된 행을 읽을 때 디스크 접근이 순차적
+            row_ids = np.sort(row_ids)
+            exact = self.vectors[row_ids] @ queries[qi]
+            top = np.argsort(-exact)[:k]
+            scores[qi, :len(top)] = exact[top]
+            ids[qi, :len(top)] = row_ids[top]
+        return scores, ids
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[Document, float]]:
+        """질의와 코사인 유사도가 높은 청크 상위 k개 (Document, 점수)"""
+        vector = np.asarray([self.embeddings.embed_query(query)], dtype=np.float32)
+        return self._to_documents(*self.search_by_vectors(vector, k))[0]
+
+    def search_batch(self, queries: List[str], k: int = 5) -> List[List[Tuple[Document, float]]]:
+        """여러 질의를 한 번의 임베딩 요청 + 한 번의 행렬 검색으로 처리"""
+        vectors = np.asarray(embed_queries(self.embeddings, queries), dtype=np.float32)
+        return self._to_documents(*self.search_by_vectors(vectors, k))
+
+    def _to_documents(self, scores: np.ndarray, ids: np.ndarray) -> List[List[Tuple[Document, float]]]:
+        return [
+            [
+                (self.documents[int(row_id)], float(score))
+                for score, row_id in zip(row_scores, row_ids)
+                if row_id != -1
+            ]
+            for row_scores, row_ids in zip(scores, ids)
+        ]
+
+    def as_retriever(self, k: int = 5):
+        """LangChain Retriever로 변환"""
+        from jm.utils.retrievers import CorpusRetriever
+
+        return CorpusRetriever(corpus=self, k=k)
+
+
+def tiered_store_path(key: str) -> Path:
+    """캐시 키에 해당하는 계층 인덱스 디렉터리"""
+    return Path(RAG_CACHE_DIR) / "tiered" / key
+
+
+def faiss_to_arrays(vectorstore) -> Tuple[np.ndarray, List[Document]]:
+    """LangChain FAISS 벡터 스토어에서 (벡터 행렬, row 순서 Document 리스트) 추출"""
+    index = vectorstore.index
+    vectors = index.reconstruct_n(0, index.ntotal)
+    documents = [
+        vectorstore.docstore.search(vectorstore.index_to_docstore_id[i]) for i in range(index.ntotal)
+    ]
+    return vectors, documents
+
@@ -7,12 +7,15 @@
 #
 # 실행 예:
 #   python orchestrator.py
+#   (여러 스타트업 동시 평가) asyncio.run(arun_evaluations([example, ...]))
 #
 # 필요 ENV:
 #   OPENAI_API_KEY, (선택)TAVILY_API_KEY
 #   INV_DECISION_* (선택) 가중치/임계치
 
-from typing import Dict, Any, TypedDict, Annotated, Sequence, Literal, Optional
+import asyncio
+import os
+from typing import Dict, Any, TypedDict, Annotated, Sequence, Literal, Optional, List
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 
@@ -23,16 +26,28 @@ from langgraph.graph.message import add_messages
 from tech_summary_agent import build_graph as build_tech_graph
 
 # 시장성 평가: market_analyst_node(state) 제공  :contentReference[oaicite:5]{index=5}
-from jm.market_analyst import market_analyst_node
+from jm.market_analyst import market_analyst_node, amarket_analyst_node
 
 # 경쟁사 비교 그래프(run_competitor_analysis 또는 build_graph)  :contentReference[oaicite:6]{index=6}
-from gj.competitor_analysis_agent import run_competitor_analysis
+from gj.competitor_analysis_agent import run_competitor_analysis, arun_competitor_analysis
 
 # 투자판단 함수형 노드  :contentReference[oaicite:7]{index=7}
 from estimation_agent import investment_decider_node
 
 from report_generator_agent import build_graph as build_report_graph
+# 실행 종료 시 LLM 응답 캐시 적중률 / 공용 클라이언트 풀 / 관련성 게이트 / 검색 캐시 통계 출력 (프로세스 전체 기준)
+from jm.utils.llm_cache import print_llm_cache_stats
+from jm.utils.llm_clients import print_llm_pool_stats
+from jm.utils.relevance_gate import print_gate_stats
+from jm.utils.retrieval_cache import print_retrieval_cache_stats
+# 실행 종료 시 제공자 / 모델별 레이트 리미터 사용률 출력
+from jm.utils.rate_limiter import print_rate_limit_stats, rate_limit_stats
+# 노드 / LLM / 도구 호출별 시간·토큰·비용 계측
+from jm.utils.run_metrics import collect_run_metrics
 report_graph = build_report_graph()
+
+# 비동기 실행(arun_evaluations) 시 동시에 진행할 평가 수 상한
+ORCH_MAX_CONCURRENCY = int(os.getenv("ORCH_MAX_CONCURRENCY", "8"))
 # ─────────────────────────────────────────────────────────────
 # 2) 메인 State 정의
 # ─────────────────────────────────────────────────────────────
@@ -56,6 +71,9 @@ class MainState(TypedDict):
     # 최종
     investment_decision: dict
 
+    # 계측 합계 (그래프 실행 후 collect_run_metrics 결과를 붙임)
+    run_metrics: dict
+
 # ─────────────────────────────────────────────────────────────
 # 3) 어댑터: 각 서브그래프 → 투자판단 입력 스키마로 변환
 # ─────────────────────────────────────────────────────────────
@@ -177,24 +195,40 @@ def tech_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     graph = build_tech_graph()
     out = graph.invoke({"messages": state.get("messages", [])})
+    return {"tech_summary": _last_message_text(out)}
+
+async def atech_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """tech_node의 비동기 버전"""
+    graph = build_tech_graph(use_async=True)
+    out = await graph.ainvoke({"messages": state.get("messages", [])})
+    return {"tech_summary": _last_message_text(out)}
+
+def _last_message_text(out: Dict[str, Any]) -> str:
     # 최종 메시지 텍스트만 저장
     msg_list = out.get("messages") or []
     text = ""
     if msg_list:
         last = msg_list[-1]
         text = getattr(last, "content", "") if hasattr(last, "content") else str(last)
-    return {"tech_summary": text}
+    return text
 
 def market_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     시장성 평가 노드 호출 (이미 래퍼 제공)  :contentReference[oaicite:9]{index=9}
     """
     # market_analyst_node는 state를 받아 {"market_analysis": {...}}를 반환
-    res = market_analyst_node({
+    res = market_analyst_node(_market_input(state))
+    return res  # {"market_analysis": {...}}
+
+async def amarket_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """market_node의 비동기 버전"""
+    return await amarket_analyst_node(_market_input(state))
+
+def _market_input(state: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         "startup_name": state.get("startup_info", {}).get("name", "Unknown"),
         "document_path": state.get("document_path", f"data/{state.get('startup_info', {}).get('name','Unknown')}_IR.pdf")
-    })
-    return res  # {"market_analysis": {...}}
+    }
 
 def competitor_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -206,6 +240,14 @@ def competitor_node(state: Dict[str, Any]) -> Dict[str, Any]:
     final_state = run_competitor_analysis(company_name=company, tech_summary=ts, startup_info=info)
     return {"competitor_output": final_state}
 
+async def acompetitor_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """competitor_node의 비동기 버전"""
+    company = state.get("startup_info", {}).get("name", "Target Startup")
+    ts = state.get("tech_summary", "") or "No tech summary"
+    info = state.get("startup_info", {}) or {}
+    final_state = await arun_competitor_analysis(company_name=company, tech_summary=ts, startup_info=info)
+    return {"competitor_output": final_state}
+
 def invest_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     투자판단 함수형 노드 호출 전, 어댑터로 스키마 맞추기  :contentReference[oaicite:11]{index=11}
@@ -217,12 +259,18 @@ def invest_node(state: Dict[str, Any]) -> Dict[str, Any]:
 # ─────────────────────────────────────────────────────────────
 # 5) 메인 그래프 컴파일
 # ─────────────────────────────────────────────────────────────
-def build_orchestrator():
+def build_orchestrator(use_async: bool = False):
+    """
+    메인 그래프 컴파일
+
+    use_async=True면 서브그래프 노드를 비동기 버전으로 등록 → `await graph.ainvoke(...)`
+    (여러 스타트업 평가를 한 이벤트 루프에서 동시에 실행할 때는 arun_evaluations 사용)
+    """
     workflow = StateGraph(MainState)
 
-    workflow.add_node("tech_summary", tech_node)
-    workflow.add_node("market_eval_raw", market_node)
-    workflow.add_node("competitor_raw", competitor_node)
+    workflow.add_node("tech_summary", atech_node if use_async else tech_node)
+    workflow.add_node("market_eval_raw", amarket_node if use_async else market_node)
+    workflow.add_node("competitor_raw", acompetitor_node if use_async else competitor_node)
     workflow.add_node("invest", invest_node)
 
     workflow.add_edge(START, "tech_summary")
@@ -233,6 +281,47 @@ def build_orchestrator():
 
     return workflow.compile()
 
+async def arun_evaluations(
+    examples: List[Dict[str, Any]], max_concurrency: int = ORCH_MAX_CONCURRENCY
+) -> List[Dict[str, Any]]:
+    """
+    여러 스타트업 평가(메인 그래프 + 보고서 PDF)를 한 이벤트 루프에서 동시에 실행
+
+    Args:
+        examples: 메인 그래프 입력 목록 (__main__의 example 형식)
+        max_concurrency: 동시에 진행할 평가 수 상한
+
+    Returns:
+        입력 순서대로 최종 State (보고서 경로는 "report_path", 계측 합계는 "run_metrics", 실패 시 "error")
+    """
+    graph = build_orchestrator(use_async=True)
+    areport_graph = build_report_graph(use_async=True)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def evaluate(example: Dict[str, Any]) -> Dict[str, Any]:
+        name = example.get("startup_info", {}).get("name", "Unknown")
+        async with semaphore:
+            with collect_run_metrics(name) as metrics:
+                try:
+                    final = await graph.ainvoke(example, config={"recursion_limit": 100})
+                    report_out = await areport_graph.ainvoke(final)
+                    result = {**final, "report_path": report_out["report_path"]}
+                except Exception as e:
+                    print(f"❌ [Orchestrator] {name} 평가 실패: {e}")
+                    result = {**example, "error": str(e)}
+            metrics.print_summary()
+            metrics.export_jsonl()
+            return {**result, "run_metrics": metrics.totals()}
+
+    results = await asyncio.gather(*(evaluate(example) for example in examples))
+    # 동시 평가 전체 기준 LLM 응답 캐시 적중률 / 제공자 한도 사용률
+    print_llm_cache_stats()
+    print_llm_pool_stats()
+    print_gate_stats()
+    print_retrieval_cache_stats()
+    print_rate_limit_stats()
+    return results
+
 # ─────────────────────────────────────────────────────────────
 # 6) 예시 실행
 # ─────────────────────────────────────────────────────────────
@@ -246,11 +335,20 @@ if __name__ == "__main__":
         "document_path": "Lunit_IR_2025.pdf",
     }
 
-    final = graph.invoke(example, config={"recursion_limit": 100})
-    decision = final.get("investment_decision", {})
-    print("\n" + "="*80)
-    print("🧭 투자 판단 결과")
-    print("="*80)
-    print(decision)
-    report_out = report_graph.invoke(final)
-    print(report_out["report_path"])
\ No newline at end of file
+    with collect_run_metrics(example["startup_info"]["name"]) as metrics:
+        final = graph.invoke(example, config={"recursion_limit": 100})
+        decision = final.get("investment_decision", {})
+        print("\n" + "="*80)
+        print("🧭 투자 판단 결과")
+        print("="*80)
+        print(decision)
+        report_out = report_graph.invoke(final)
+        print(report_out["report_path"])
+    final["run_metrics"] = {**metrics.totals(), "rate_limits": rate_limit_stats()}
+    metrics.print_summary()
+    print(f"📝 [Run Metrics] 호출 기록: {metrics.export_jsonl()}")
+    print_llm_cache_stats()
+    print_llm_pool_stats()
+    print_gate_stats()
+    print_retrieval_cache_stats()
+    print_rate_limit_stats()
\ No newline at end of file
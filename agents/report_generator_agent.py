@@ -10,6 +10,7 @@
 #   {"report_path": "reports/<startup>_investment_report_YYYYMMDD_HHMMSS.pdf"}
 
 from __future__ import annotations
+import asyncio
 import os, re, datetime, json
 from typing import Dict, Any, TypedDict, Annotated, Sequence, List, Optional
 
@@ -27,19 +28,25 @@ from reportlab.platypus import (
 from reportlab.pdfbase.pdfmetrics import registerFont, registerFontFamily
 from reportlab.pdfbase.ttfonts import TTFont
 
+# 디스크 LLM 응답 캐시 (다른 에이전트와 같은 저장소, "report" 네임스페이스) + 호출별 계측
+from jm.utils.llm_cache import cached_chat_completion
+# 공용 커넥션 풀 + 레이트 리미터 (다른 에이전트와 같은 OpenAI 한도)
+from jm.utils.llm_clients import llm_registry
+
 # ─────────────────────────────────────────────────────────────
 # LLM 유틸 (OpenAI)
 # ─────────────────────────────────────────────────────────────
 def _get_openai_client():
     """
     OpenAI 클라이언트. 패키지나 키가 없으면 None 반환(폴백 사용).
+    다른 에이전트와 같은 공용 HTTP 클라이언트를 써서 레이트 리미터를 함께 통과.
     """
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         return None
     try:
         from openai import OpenAI
-        return OpenAI(api_key=api_key)
+        return OpenAI(api_key=api_key, http_client=llm_registry.http_client)
     except Exception:
         return None
 
@@ -47,24 +54,24 @@ def _openai_json_completion(system_prompt: str, user_prompt: str, schema_hint: s
     """
     JSON만 반환하도록 지시하여 파싱. 실패 시 None.
     schema_hint: 사용자에게 JSON 스키마 요구사항을 추가로 알려주는 텍스트(예: keys).
+    다른 에이전트와 같이 temperature=0으로 호출하고, 같은 (모델, 파라미터, 메시지) 응답은
+    LLM 응답 캐시("report" 네임스페이스)에서 재사용.
     """
     client = _get_openai_client()
     if client is None:
         return None
 
-    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    params = {
+        "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+        "temperature": 0,
+        "response_format": {"type": "json_object"},
+    }
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt + "\n\n" + schema_hint}
+    ]
     try:
-        resp = client.chat.completions.create(
-            model=model,
-            temperature=0.2,
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt + "\n\n" + schema_hint}
-            ],
-        )
-        txt = resp.choices[0].message.content
-        return json.loads(txt)
+        return cached_chat_completion(client, messages, params, namespace="report")
     except Exception:
         return None
 
@@ -473,10 +480,19 @@ def render_pdf(state: Dict[str, Any]) -> Dict[str, Any]:
 # ─────────────────────────────────────────────────────────────
 # 그래프 컴파일
 # ─────────────────────────────────────────────────────────────
-def build_graph():
+async def aassemble_sections(state: Dict[str, Any]) -> Dict[str, Any]:
+    # 동기 OpenAI 호출(+ 캐시 조회)을 워커 스레드에서 실행해 이벤트 루프를 막지 않음
+    return await asyncio.to_thread(assemble_sections, state)
+
+async def arender_pdf(state: Dict[str, Any]) -> Dict[str, Any]:
+    # ReportLab 렌더링 / 파일 쓰기는 워커 스레드에서 실행
+    return await asyncio.to_thread(render_pdf, state)
+
+def build_graph(use_async: bool = False):
+    """use_async=True면 두 노드를 비동기 버전으로 등록 → `await graph.ainvoke(...)`"""
     g = StateGraph(ReportState)
-    g.add_node("assemble_sections", assemble_sections)
-    g.add_node("render_pdf", render_pdf)
+    g.add_node("assemble_sections", aassemble_sections if use_async else assemble_sections)
+    g.add_node("render_pdf", arender_pdf if use_async else render_pdf)
     g.add_edge(START, "assemble_sections")
     g.add_edge("assemble_sections", "render_pdf")
     g.add_edge("render_pdf", END)
@@ -7,6 +7,7 @@
 # - 나중에 단일 서비스로 합치기 쉽도록 구조/이름/흐름은 템플릿과 동일
 # ------------------------------------------------------------
 
+import asyncio
 import os
 from dotenv import load_dotenv
 
@@ -25,24 +26,29 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools.retriever import create_retriever_tool
-from langchain_openai import ChatOpenAI
 
 # LangGraph imports
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
 
-# Custom imports (opentutorial / teddynote)
-from langchain_opentutorial.rag.pdf import PDFRetrievalChain
+# Custom imports (teddynote)
 from langchain_teddynote.messages import random_uuid, stream_graph
 from langchain_teddynote.models import LLMs, get_model_name
 
+# 증분 코퍼스 인덱스 + 청크 임베딩 캐시 (시장성 평가 에이전트와 공유)
+from jm.utils.corpus_index import CorpusIndex
+from jm.utils.embedding_providers import cached_embeddings, scoped_index_name
+# 공용 LLM 클라이언트 레지스트리 (노드 간 커넥션 풀 재사용)
+from jm.utils.llm_clients import get_chat_model
+
 # -----------------------------
 # 0) 환경 변수/모델 설정
 # -----------------------------
 load_dotenv()
 # 템플릿과 동일한 헬퍼 사용 (추후 단일 서비스로 병합 시 호환성↑)
 MODEL_NAME = get_model_name(LLMs.GPT4o_MINI)  # 필요 시 환경변수로 교체 가능 (e.g., os.getenv("OPENAI_MODEL"))
+LLM_NAMESPACE = "tech_summary"  # LLM 응답 캐시 네임스페이스
 
 # -----------------------------
 # 1) 파일 경로 설정
@@ -59,9 +65,21 @@ file_path = [
 # -----------------------------
 # 2) PDF 체인/리트리버 생성
 # -----------------------------
-pdf_file = PDFRetrievalChain(file_path).create_chain()
-pdf_retriever = pdf_file.retriever
-pdf_chain = pdf_file.chain
+# import 시마다 전체 인덱스를 새로 만들지 않고, 디스크에 유지되는 코퍼스 인덱스를
+# file_path 목록과 동기화 (새로 추가/변경된 PDF만 임베딩, 목록에서 빠진 PDF는 삭제)
+# 청크/검색 설정은 기존 PDFRetrievalChain 기본값(300/50, k=10)과 동일
+# 임베딩 제공자(RAG_EMBEDDING_PROVIDER)마다 코퍼스를 따로 유지
+tech_embeddings = cached_embeddings()
+tech_corpus = CorpusIndex.open(
+    scoped_index_name("tech_summary", tech_embeddings.model_name),
+    embeddings=tech_embeddings,
+    embedding_model=tech_embeddings.model_name,
+    chunk_size=300,
+    chunk_overlap=50,
+    engine="pdfplumber",
+)
+tech_corpus.sync(file_path)
+pdf_retriever = tech_corpus.as_retriever(k=10)
 
 retriever_tool = create_retriever_tool(
     pdf_retriever,
@@ -94,10 +112,11 @@ class Grade(BaseModel):
 # -----------------------------
 # 4) 문서 관련성 평가 라우팅
 # -----------------------------
-def grade_documents(state) -> Literal["generate", "rewrite"]:
-    """문서 관련성 평가 (템플릿 유지)"""
-    model = ChatOpenAI(temperature=0, model=MODEL_NAME, streaming=True)
-    llm_with_tool = model.with_structured_output(Grade)
+def _grade_chain():
+    """관련성 평가 체인 (템플릿 유지)"""
+    llm_with_tool = get_chat_model(
+        MODEL_NAME, temperature=0, streaming=True, schema=Grade, namespace=LLM_NAMESPACE
+    )
 
     prompt = PromptTemplate(
         template=(
@@ -111,14 +130,13 @@ def grade_documents(state) -> Literal["generate", "rewrite"]:
         input_variables=["context", "question"],
     )
 
-    chain = prompt | llm_with_tool
+    return prompt | llm_with_tool
 
+def _grade_inputs(state):
     messages = state["messages"]
-    last_message = messages[-1]
-    question = messages[0].content
-    retrieved_docs = last_message.content
+    return {"question": messages[0].content, "context": messages[-1].content}
 
-    scored_result = chain.invoke({"question": question, "context": retrieved_docs})
+def _route_by_grade(scored_result) -> Literal["generate", "rewrite"]:
     score = scored_result.binary_score
 
     if score.strip().lower() == "yes":
@@ -128,27 +146,39 @@ def grade_documents(state) -> Literal["generate", "rewrite"]:
         print("==== [DECISION: DOCS NOT RELEVANT] ====")
         return "rewrite"
 
+def grade_documents(state) -> Literal["generate", "rewrite"]:
+    """문서 관련성 평가 (템플릿 유지)"""
+    return _route_by_grade(_grade_chain().invoke(_grade_inputs(state)))
+
+async def agrade_documents(state) -> Literal["generate", "rewrite"]:
+    """문서 관련성 평가 (비동기)"""
+    return _route_by_grade(await _grade_chain().ainvoke(_grade_inputs(state)))
+
 # -----------------------------
 # 5) Agent 노드
 # -----------------------------
+def _agent_model():
+    model = get_chat_model(MODEL_NAME, temperature=0, streaming=True, namespace=LLM_NAMESPACE)
+    return model.bind_tools(tools)
+
 def agent(state):
     """에이전트 (템플릿 유지)"""
-    messages = state["messages"]
-    model = ChatOpenAI(temperature=0, streaming=True, model=MODEL_NAME)
-    model = model.bind_tools(tools)
-    response = model.invoke(messages)
+    response = _agent_model().invoke(state["messages"])
+    return {"messages": [response]}
+
+async def aagent(state):
+    """에이전트 (비동기)"""
+    response = await _agent_model().ainvoke(state["messages"])
     return {"messages": [response]}
 
 # -----------------------------
 # 6) Rewrite 노드
 # -----------------------------
-def rewrite(state):
-    """질문 재작성 (템플릿 유지) — 의료 AI 스타트업 질의에 유리한 개선 유도"""
-    print("==== [QUERY REWRITE] ====")
-    messages = state["messages"]
-    question = messages[0].content
+def _rewrite_messages(state):
+    """질문 재작성 프롬프트 — 의료 AI 스타트업 질의에 유리한 개선 유도"""
+    question = state["messages"][0].content
 
-    msg = [
+    return [
         HumanMessage(
             content=(
                 "Look at the input and infer the underlying semantic intent.\n"
@@ -163,36 +193,65 @@ def rewrite(state):
         )
     ]
 
-    model = ChatOpenAI(temperature=0, model=MODEL_NAME, streaming=True)
-    response = model.invoke(msg)
+def rewrite(state):
+    """질문 재작성 (템플릿 유지)"""
+    print("==== [QUERY REWRITE] ====")
+    model = get_chat_model(MODEL_NAME, temperature=0, streaming=True, namespace=LLM_NAMESPACE)
+    response = model.invoke(_rewrite_messages(state))
+    return {"messages": [response]}
+
+async def arewrite(state):
+    """질문 재작성 (비동기)"""
+    print("==== [QUERY REWRITE] ====")
+    model = get_chat_model(MODEL_NAME, temperature=0, streaming=True, namespace=LLM_NAMESPACE)
+    response = await model.ainvoke(_rewrite_messages(state))
     return {"messages": [response]}
 
 # -----------------------------
 # 7) Generate 노드 (최종 응답)
 # -----------------------------
-def generate(state):
-    """최종 답변 생성 (템플릿 유지)"""
+_rag_prompt = None
+
+def _rag_chain():
+    # hub 프롬프트는 네트워크 조회이므로 처음 한 번만 가져옴
+    global _rag_prompt
+    if _rag_prompt is None:
+        _rag_prompt = hub.pull("teddynote/rag-prompt")
+    llm = get_chat_model(MODEL_NAME, temperature=0, streaming=True, namespace=LLM_NAMESPACE)
+    return _rag_prompt | llm | StrOutputParser()
+
+def _rag_inputs(state):
     messages = state["messages"]
-    question = messages[0].content
-    docs = messages[-1].content
+    return {"context": messages[-1].content, "question": messages[0].content}
 
-    prompt = hub.pull("teddynote/rag-prompt")
-    llm = ChatOpenAI(model=MODEL_NAME, temperature=0, streaming=True)
-    rag_chain = prompt | llm | StrOutputParser()
+def generate(state):
+    """최종 답변 생성 (템플릿 유지)"""
+    response = _rag_chain().invoke(_rag_inputs(state))
+    return {"messages": [response]}
 
-    response = rag_chain.invoke({"context": docs, "question": question})
+async def agenerate(state):
+    """최종 답변 생성 (비동기, hub 프롬프트 첫 조회는 워커 스레드에서)"""
+    if _rag_prompt is None:
+        await asyncio.to_thread(_rag_chain)
+    response = await _rag_chain().ainvoke(_rag_inputs(state))
     return {"messages": [response]}
 
 # -----------------------------
 # 8) 그래프 구성/실행 유틸
 # -----------------------------
-def build_graph():
+def build_graph(use_async: bool = False):
+    """
+    기술 요약 그래프 구성
+
+    use_async=True면 agent / rewrite / generate / 관련성 평가를 비동기 노드로 등록
+    (ToolNode는 ainvoke 시 비동기로 도구를 실행) → `await graph.ainvoke(...)`
+    """
     workflow = StateGraph(AgentState)
-    workflow.add_node("agent", agent)
+    workflow.add_node("agent", aagent if use_async else agent)
     retrieve = ToolNode([retriever_tool])
     workflow.add_node("retrieve", retrieve)
-    workflow.add_node("rewrite", rewrite)
-    workflow.add_node("generate", generate)
+    workflow.add_node("rewrite", arewrite if use_async else rewrite)
+    workflow.add_node("generate", agenerate if use_async else generate)
 
     workflow.add_edge(START, "agent")
     workflow.add_conditional_edges(
@@ -200,7 +259,7 @@ def build_graph():
         tools_condition,
         {"tools": "retrieve", END: END},
     )
-    workflow.add_conditional_edges("retrieve", grade_documents)
+    workflow.add_conditional_edges("retrieve", agrade_documents if use_async else grade_documents)
     workflow.add_edge("generate", END)
     workflow.add_edge("rewrite", "agent")
 